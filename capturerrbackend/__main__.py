@@ -0,0 +1,163 @@
+"""Maintenance commands: ``python -m capturerrbackend <command>``."""
+import argparse
+import asyncio
+from contextlib import suppress
+from typing import AsyncIterator, Optional
+
+from loguru import logger
+
+from capturerrbackend.app.infrastructure.dependencies import capture_command_usecase
+from capturerrbackend.app.infrastructure.sqlite.capture import rebuild_capture_fts
+from capturerrbackend.app.infrastructure.sqlite.database_async import sessionmanager
+from capturerrbackend.app.infrastructure.sqlite.job import run_job_pool
+from capturerrbackend.app.infrastructure.sqlite.purge import expired_before, purge_trash
+from capturerrbackend.app.infrastructure.sqlite.user import UserStatsRepositoryImpl
+from capturerrbackend.app.usecase.capture import (
+    MAX_CAPTURE_BATCH,
+    CaptureImportFormat,
+    CaptureImportReadModel,
+    read_records,
+)
+from capturerrbackend.config.configurator import config
+
+
+async def rebuild_search() -> None:
+    """Re-index all captures in the full-text search table."""
+    sessionmanager.init(str(config.db_url))
+    try:
+        async with sessionmanager.connect() as connection:
+            await rebuild_capture_fts(connection)
+    finally:
+        await sessionmanager.close()
+    logger.info("Capture search index rebuilt.")
+
+
+async def recompute_stats(user_id: Optional[str] = None) -> None:
+    """Recompute the per-user capture statistics from the capture table."""
+    sessionmanager.init(str(config.db_url))
+    try:
+        async with sessionmanager.session() as session:
+            await UserStatsRepositoryImpl(session).recompute(user_id)
+            await session.commit()
+    finally:
+        await sessionmanager.close()
+    logger.info(f"User statistics recomputed for {user_id or 'all users'}.")
+
+
+async def purge_expired_trash(retention_days: int) -> None:
+    """Purge the trash of rows deleted more than the retention days ago."""
+    sessionmanager.init(str(config.db_url))
+    try:
+        async with sessionmanager.session() as session:
+            purged = await purge_trash(
+                session,
+                expired_before(retention_days),
+                config.purge_batch_size,
+                config.purge_batch_pause,
+            )
+    finally:
+        await sessionmanager.close()
+    logger.info(f"Trash purged: {purged}")
+
+
+async def read_file(path: str, size: int = 1 << 16) -> AsyncIterator[bytes]:
+    with open(path, "rb") as file:
+        while chunk := file.read(size):
+            yield chunk
+
+
+async def import_captures(
+    user_id: str,
+    path: str,
+    format: CaptureImportFormat,
+    chunk_size: int,
+) -> None:
+    """Import a user's captures from an NDJSON or CSV file."""
+
+    def log_progress(report: CaptureImportReadModel) -> None:
+        logger.info(
+            f"{report.rows} rows: {report.created} created, "
+            f"{report.duplicates} duplicates, {report.failed} failed",
+        )
+
+    sessionmanager.init(str(config.db_url))
+    try:
+        async with sessionmanager.session() as session:
+            report = await capture_command_usecase(session).import_captures(
+                user_id,
+                read_records(read_file(path), format),
+                chunk_size,
+                log_progress,
+            )
+    finally:
+        await sessionmanager.close()
+    for error in report.errors:
+        logger.warning(f"line {error.line}: {error.error}")
+    logger.info(f"Import of {path} done.")
+
+
+async def worker(concurrency: int) -> None:
+    """Run the background job workers until interrupted."""
+    sessionmanager.init(str(config.db_url))
+    logger.info(f"Job worker started with {concurrency} workers.")
+    try:
+        await run_job_pool(
+            concurrency,
+            config.job_poll_seconds,
+            config.job_lease_seconds,
+        )
+    finally:
+        await sessionmanager.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="capturerrbackend")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("rebuild-search", help=rebuild_search.__doc__)
+    recompute = commands.add_parser("recompute-stats", help=recompute_stats.__doc__)
+    recompute.add_argument("--user-id", help="only this user (default: all)")
+    purge = commands.add_parser("purge-trash", help=purge_expired_trash.__doc__)
+    purge.add_argument(
+        "--retention-days",
+        type=int,
+        default=config.trash_retention_days,
+        help=f"days deleted rows are kept (default: {config.trash_retention_days})",
+    )
+
+    imports = commands.add_parser("import-captures", help=import_captures.__doc__)
+    imports.add_argument("path", help="the file to import")
+    imports.add_argument("--user-id", required=True, help="the owner of the captures")
+    imports.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    imports.add_argument(
+        "--chunk-size",
+        type=int,
+        default=MAX_CAPTURE_BATCH,
+        help=f"captures per transaction (default: {MAX_CAPTURE_BATCH})",
+    )
+
+    workers = commands.add_parser("worker", help=worker.__doc__)
+    workers.add_argument(
+        "--concurrency",
+        type=int,
+        default=config.job_workers,
+        help=f"jobs run at the same time (default: {config.job_workers})",
+    )
+
+    args = parser.parse_args()
+    if args.command == "rebuild-search":
+        asyncio.run(rebuild_search())
+    elif args.command == "recompute-stats":
+        asyncio.run(recompute_stats(args.user_id))
+    elif args.command == "purge-trash":
+        asyncio.run(purge_expired_trash(args.retention_days))
+    elif args.command == "import-captures":
+        asyncio.run(
+            import_captures(args.user_id, args.path, args.format, args.chunk_size),
+        )
+    elif args.command == "worker":
+        with suppress(KeyboardInterrupt):
+            asyncio.run(worker(args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
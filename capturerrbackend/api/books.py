@@ -1,6 +1,6 @@
-from typing import Annotated, List, Optional
+from typing import Annotated, Optional, Union
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Request, Response, status
 
 from capturerrbackend.api.custom_error_route_handler import CustomErrorRouteHandler
 from capturerrbackend.app.infrastructure.dependencies import (
@@ -9,24 +9,41 @@ from capturerrbackend.app.infrastructure.dependencies import (
     get_current_active_user,
     user_query_usecase,
 )
+from capturerrbackend.app.presentation.conditional_get import (
+    collection_validators,
+    is_not_modified,
+)
+from capturerrbackend.app.presentation.pagination_response import (
+    PaginatedResponse,
+    pagination_params,
+)
+from capturerrbackend.app.presentation.sparse_fieldset import (
+    fields_params,
+    sparse_response,
+)
 from capturerrbackend.app.usecase.book import (
     BookCommandUseCase,
     BookCreateModel,
+    BookPatchModel,
     BookQueryUseCase,
     BookReadModel,
     BookUpdateModel,
 )
+from capturerrbackend.app.usecase.fields import FieldSet
+from capturerrbackend.app.usecase.pagination import PageParams
 from capturerrbackend.app.usecase.user import UserQueryUseCase, UserReadModel
 
 router = APIRouter(route_class=CustomErrorRouteHandler)
 
+book_fields = fields_params(BookReadModel)
+
 
 @router.post(
     "/books",
     response_model=BookReadModel,
     status_code=status.HTTP_201_CREATED,
 )
-def create_book(
+async def create_book(
     data: BookCreateModel,
     current_user: Annotated[UserReadModel, Depends(get_current_active_user)],
     user_query_usecase: Annotated[UserQueryUseCase, Depends(user_query_usecase)],
@@ -35,21 +52,52 @@ def create_book(
     """Get the user and create a book."""
     # user = user_query_usecase.fetch_user_by_id(current_user.id)
     data.user_id = current_user.id
-    book = book_command_usecase.create_book(data)
+    book = await book_command_usecase.create_book(data)
     return book
 
 
 @router.get(
     "/books",
-    response_model=List[BookReadModel],
+    response_model=PaginatedResponse[BookReadModel],
     status_code=status.HTTP_200_OK,
 )
 #
 async def get_books(
+    request: Request,
+    response: Response,
+    page: Annotated[PageParams, Depends(pagination_params)],
+    fields: Annotated[FieldSet, Depends(book_fields)],
     book_query_usecase: BookQueryUseCase = Depends(book_query_usecase),
-) -> List[BookReadModel]:
-    """Get a list of books."""
-    return book_query_usecase.fetch_books()
+) -> Union[PaginatedResponse[BookReadModel], Response]:
+    """Get a page of books, or a 304 if the client's copy is current."""
+    validators = collection_validators(
+        request,
+        await book_query_usecase.fetch_version(),
+    )
+    if is_not_modified(request, validators):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=validators)
+    response.headers.update(validators)
+
+    books = await book_query_usecase.fetch_books(page, fields)
+    return sparse_response(PaginatedResponse.from_page(books), fields, response)
+
+
+@router.get(
+    "/me/books/trash",
+    response_model=PaginatedResponse[BookReadModel],
+    status_code=status.HTTP_200_OK,
+)
+async def get_my_trashed_books(
+    page: Annotated[PageParams, Depends(pagination_params)],
+    current_user: Annotated[UserReadModel, Depends(get_current_active_user)],
+    book_query_usecase: Annotated[BookQueryUseCase, Depends(book_query_usecase)],
+) -> PaginatedResponse[BookReadModel]:
+    """Get a page of my deleted books, most recently deleted first."""
+    books = await book_query_usecase.fetch_trashed_books_for_user(
+        current_user.id,
+        page,
+    )
+    return PaginatedResponse.from_page(books)
 
 
 @router.get(
@@ -59,10 +107,12 @@ async def get_books(
 )
 async def get_book(
     book_id: str,
+    fields: Annotated[FieldSet, Depends(book_fields)],
     book_query_usecase: BookQueryUseCase = Depends(book_query_usecase),
 ) -> Optional[BookReadModel]:
     """Get a book."""
-    return book_query_usecase.fetch_book_by_id(book_id)
+    book = await book_query_usecase.fetch_book_by_id(book_id, fields)
+    return None if book is None else sparse_response(book, fields)
 
 
 async def get_books_for_user(
@@ -70,7 +120,7 @@ async def get_books_for_user(
     book_query_usecase: BookQueryUseCase = Depends(book_query_usecase),
 ) -> Optional[BookReadModel]:
     """Get a book."""
-    return book_query_usecase.fetch_book_by_id(book_id)
+    return await book_query_usecase.fetch_book_by_id(book_id)
 
 
 @router.put(
@@ -84,7 +134,22 @@ async def update_book(
     book_command_usecase: BookCommandUseCase = Depends(book_command_usecase),
 ) -> Optional[BookReadModel]:
     """Update a book."""
-    return book_command_usecase.update_book(book_id, data)
+    return await book_command_usecase.update_book(book_id, data)
+
+
+@router.patch(
+    "/me/books/{book_id}",
+    response_model=BookReadModel,
+    status_code=status.HTTP_200_OK,
+)
+async def patch_my_book(
+    book_id: str,
+    data: BookPatchModel,
+    current_user: Annotated[UserReadModel, Depends(get_current_active_user)],
+    book_command_usecase: Annotated[BookCommandUseCase, Depends(book_command_usecase)],
+) -> BookReadModel:
+    """Change some fields of one of my books."""
+    return await book_command_usecase.patch_book(book_id, current_user.id, data)
 
 
 @router.delete(
@@ -96,4 +161,18 @@ async def delete_book(
     book_command_usecase: BookCommandUseCase = Depends(book_command_usecase),
 ) -> None:
     """Delete a book."""
-    book_command_usecase.delete_book_by_id(book_id)
+    await book_command_usecase.delete_book_by_id(book_id)
+
+
+@router.post(
+    "/me/books/{book_id}/restore",
+    response_model=BookReadModel,
+    status_code=status.HTTP_200_OK,
+)
+async def restore_my_book(
+    book_id: str,
+    current_user: Annotated[UserReadModel, Depends(get_current_active_user)],
+    book_command_usecase: Annotated[BookCommandUseCase, Depends(book_command_usecase)],
+) -> BookReadModel:
+    """Take one of my books back out of the trash."""
+    return await book_command_usecase.restore_book_by_id(book_id, current_user.id)
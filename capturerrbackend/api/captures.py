@@ -1,6 +1,9 @@
-from typing import Annotated, List, Optional
+from datetime import date, datetime, timezone
+from typing import Annotated, AsyncIterator, List, Literal, Optional, Union
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from loguru import logger
 
 from capturerrbackend.api.custom_error_route_handler import CustomErrorRouteHandler
 from capturerrbackend.app.infrastructure.dependencies import (
@@ -8,36 +11,158 @@ from capturerrbackend.app.infrastructure.dependencies import (
     capture_query_usecase,
     get_current_active_super_user,
     get_current_active_user,
-    tag_command_usecase,
+    idempotency_repository,
     tag_query_usecase,
 )
+from capturerrbackend.app.presentation.conditional_get import (
+    collection_validators,
+    is_not_modified,
+)
+from capturerrbackend.app.presentation.export import ExportFormat, export_response
+from capturerrbackend.app.presentation.idempotency import (
+    idempotency_key_header,
+    idempotent,
+)
+from capturerrbackend.app.presentation.pagination_response import (
+    PaginatedResponse,
+    pagination_params,
+)
+from capturerrbackend.app.presentation.sparse_fieldset import (
+    fields_params,
+    sparse_response,
+)
 from capturerrbackend.app.usecase.capture import (
+    CaptureBatchCreateModel,
+    CaptureBatchReadModel,
+    CaptureCalendarReadModel,
     CaptureCommandUseCase,
     CaptureCreateModel,
+    CaptureDateField,
+    CaptureImportFormat,
+    CaptureImportReadModel,
+    CapturePatchModel,
     CaptureQueryUseCase,
     CaptureReadModel,
+    CaptureSearchReadModel,
+    CaptureStatsReadModel,
+    CaptureTagFilter,
+    CaptureTagLinksModel,
+    CaptureTagLinksReadModel,
+    CaptureTimeFilter,
     CaptureUpdateModel,
+    read_records,
+    time_zone,
 )
-from capturerrbackend.app.usecase.tag import (
-    TagCommandUseCase,
-    TagCreateModel,
-    TagQueryUseCase,
-)
+from capturerrbackend.app.usecase.fields import FieldSet
+from capturerrbackend.app.usecase.idempotency import IdempotencyRepository
+from capturerrbackend.app.usecase.pagination import PageParams
+from capturerrbackend.app.usecase.tag import TagCreateModel, TagQueryUseCase
 from capturerrbackend.app.usecase.user import UserReadModel
+from capturerrbackend.utils.utils import get_int_timestamp, get_week_edges
 
 router = APIRouter(route_class=CustomErrorRouteHandler)
 
+capture_fields = fields_params(CaptureReadModel)
+
+
+def capture_tag_filter(
+    all_tags: Annotated[
+        List[str],
+        Query(description="captures having every one of these tags"),
+    ] = [],
+    any_tags: Annotated[
+        List[str],
+        Query(description="captures having at least one of these tags"),
+    ] = [],
+    exclude_tags: Annotated[
+        List[str],
+        Query(description="captures having none of these tags"),
+    ] = [],
+) -> CaptureTagFilter:
+    """Read the tag filter of a capture listing from the query string."""
+    return CaptureTagFilter(
+        include_all=all_tags,
+        include_any=any_tags,
+        exclude=exclude_tags,
+    )
+
+
+def capture_time_filter(
+    happened_after: Annotated[
+        Optional[int],
+        Query(description="captures that happened at or after this epoch"),
+    ] = None,
+    happened_before: Annotated[
+        Optional[int],
+        Query(description="captures that happened before this epoch"),
+    ] = None,
+    due_after: Annotated[
+        Optional[int],
+        Query(description="captures due at or after this epoch"),
+    ] = None,
+    due_before: Annotated[
+        Optional[int],
+        Query(description="captures due before this epoch"),
+    ] = None,
+    due: Annotated[
+        Optional[Literal["overdue", "this_week"]],
+        Query(description="captures due before now or in the current week"),
+    ] = None,
+    tz: Annotated[
+        str,
+        Query(description="IANA time zone the current week is taken in"),
+    ] = "UTC",
+) -> CaptureTimeFilter:
+    """Read the date range filter of a capture listing from the query string.
+
+    A ``due`` preset narrows the explicit ``due_*`` bounds, if any.
+    """
+    now = datetime.now(timezone.utc)
+    due_from, due_to = due_after, due_before
+    if due == "overdue":
+        due_to = min_bound(due_to, get_int_timestamp(now))
+    elif due == "this_week":
+        week_start, week_end = get_week_edges(now, time_zone(tz))
+        due_from = week_start if due_from is None else max(due_from, week_start)
+        due_to = min_bound(due_to, week_end)
+    return CaptureTimeFilter(
+        happened_from=happened_after,
+        happened_to=happened_before,
+        due_from=due_from,
+        due_to=due_to,
+    )
+
+
+def min_bound(bound: Optional[int], other: int) -> int:
+    return other if bound is None else min(bound, other)
+
+
+async def with_tags(
+    chunks: AsyncIterator[List[CaptureReadModel]],
+    tag_query_usecase: TagQueryUseCase,
+) -> AsyncIterator[List[CaptureReadModel]]:
+    """Attach their tags to each chunk of captures, one query per chunk."""
+    async for caps in chunks:
+        tags = await tag_query_usecase.fetch_tags_for_captures(
+            [cap.id for cap in caps],
+        )
+        for cap in caps:
+            cap.tags = tags[cap.id]
+        yield caps
+
 
 ##### Super User Routes #####
 
 
 @router.get(
     "/captures",
-    response_model=List[CaptureReadModel],
+    response_model=PaginatedResponse[CaptureReadModel],
     status_code=status.HTTP_200_OK,
     dependencies=[Depends(get_current_active_super_user)],
 )
 async def get_captures(
+    page: Annotated[PageParams, Depends(pagination_params)],
+    fields: Annotated[FieldSet, Depends(capture_fields)],
     capture_query_usecase: Annotated[
         CaptureQueryUseCase,
         Depends(capture_query_usecase),
@@ -46,15 +171,28 @@ async def get_captures(
         TagQueryUseCase,
         Depends(tag_query_usecase),
     ],
-) -> List[CaptureReadModel]:
-    """Get a list of captures."""
-    caps = capture_query_usecase.fetch_captures()
+    format: Annotated[
+        Optional[ExportFormat],
+        Query(description="stream every capture in this format instead of a page"),
+    ] = None,
+) -> Union[PaginatedResponse[CaptureReadModel], StreamingResponse]:
+    """Get a page of captures, or all of them streamed as ``format``."""
+    if format is not None:
+        return export_response(
+            with_tags(capture_query_usecase.export_captures(), tag_query_usecase),
+            format,
+        )
+
+    caps = await capture_query_usecase.fetch_captures(page, fields)
 
-    for cap in caps:
-        tags = tag_query_usecase.fetch_tags_for_capture(cap.id)
-        cap.tags = [tag for tag in tags]
+    if fields.includes("tags"):
+        tags = await tag_query_usecase.fetch_tags_for_captures(
+            [cap.id for cap in caps.items],
+        )
+        for cap in caps.items:
+            cap.tags = tags[cap.id]
 
-    return caps
+    return sparse_response(PaginatedResponse.from_page(caps), fields)
 
 
 @router.delete(
@@ -67,7 +205,7 @@ async def delete_a_capture(
     capture_command_usecase: CaptureCommandUseCase = Depends(capture_command_usecase),
 ) -> None:
     """Delete a capture."""
-    capture_command_usecase.delete_capture_by_id(capture_id)
+    await capture_command_usecase.delete_capture_by_id(capture_id)
 
 
 ### User Routes ###
@@ -77,10 +215,167 @@ async def delete_a_capture(
 ### Query Routes ###
 @router.get(
     "/me/captures",
-    response_model=List[CaptureReadModel],
+    response_model=PaginatedResponse[CaptureReadModel],
     status_code=status.HTTP_200_OK,
 )
 async def get_my_captures(
+    request: Request,
+    response: Response,
+    page: Annotated[PageParams, Depends(pagination_params)],
+    fields: Annotated[FieldSet, Depends(capture_fields)],
+    tag_filter: Annotated[CaptureTagFilter, Depends(capture_tag_filter)],
+    time_filter: Annotated[CaptureTimeFilter, Depends(capture_time_filter)],
+    current_user: Annotated[UserReadModel, Depends(get_current_active_user)],
+    tag_query_usecase: Annotated[
+        TagQueryUseCase,
+        Depends(tag_query_usecase),
+    ],
+    capture_query_usecase: Annotated[
+        CaptureQueryUseCase,
+        Depends(capture_query_usecase),
+    ],
+) -> Union[PaginatedResponse[CaptureReadModel], Response]:
+    """
+    Get a page of captures.
+
+    Answers a current ``If-None-Match``/``If-Modified-Since`` with a 304
+    from the captures' and tags' versions alone; tags count as they are
+    embedded and filtered on.
+    """
+    validators = collection_validators(
+        request,
+        await capture_query_usecase.fetch_version(current_user.id),
+        await tag_query_usecase.fetch_version(current_user.id),
+        extra=time_filter.model_dump_json(),
+    )
+    if is_not_modified(request, validators):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=validators)
+    response.headers.update(validators)
+
+    caps = await capture_query_usecase.fetch_captures_for_user(
+        current_user.id,
+        page,
+        tag_filter,
+        time_filter,
+        fields,
+    )
+
+    if fields.includes("tags"):
+        tags = await tag_query_usecase.fetch_tags_for_captures(
+            [cap.id for cap in caps.items],
+        )
+        for cap in caps.items:
+            cap.tags = tags[cap.id]
+
+    return sparse_response(PaginatedResponse.from_page(caps), fields, response)
+
+
+@router.get(
+    "/me/captures/search",
+    response_model=PaginatedResponse[CaptureSearchReadModel],
+    status_code=status.HTTP_200_OK,
+)
+async def search_my_captures(
+    q: Annotated[str, Query(min_length=1, description="words to search for")],
+    page: Annotated[PageParams, Depends(pagination_params)],
+    current_user: Annotated[UserReadModel, Depends(get_current_active_user)],
+    tag_query_usecase: Annotated[
+        TagQueryUseCase,
+        Depends(tag_query_usecase),
+    ],
+    capture_query_usecase: Annotated[
+        CaptureQueryUseCase,
+        Depends(capture_query_usecase),
+    ],
+) -> PaginatedResponse[CaptureSearchReadModel]:
+    """Full-text search the entry and notes of my captures, best match first."""
+    caps = await capture_query_usecase.search_captures_for_user(
+        current_user.id,
+        q,
+        page,
+    )
+
+    tags = await tag_query_usecase.fetch_tags_for_captures(
+        [cap.id for cap in caps.items],
+    )
+    for cap in caps.items:
+        cap.tags = tags[cap.id]
+
+    return PaginatedResponse.from_page(caps)
+
+
+@router.get(
+    "/me/captures/calendar",
+    response_model=CaptureCalendarReadModel,
+    status_code=status.HTTP_200_OK,
+)
+async def get_my_capture_calendar(
+    year: Annotated[int, Query(ge=1970, le=9999)],
+    month: Annotated[int, Query(ge=1, le=12)],
+    current_user: Annotated[UserReadModel, Depends(get_current_active_user)],
+    capture_query_usecase: Annotated[
+        CaptureQueryUseCase,
+        Depends(capture_query_usecase),
+    ],
+    field: Annotated[
+        CaptureDateField,
+        Query(description="the date the captures are counted on"),
+    ] = "happened_at",
+    tz: Annotated[
+        str,
+        Query(description="IANA time zone the days are taken in"),
+    ] = "UTC",
+) -> CaptureCalendarReadModel:
+    """Count my captures per day of a month."""
+    return await capture_query_usecase.fetch_calendar_for_user(
+        current_user.id,
+        year,
+        month,
+        field,
+        tz,
+    )
+
+
+@router.get(
+    "/me/captures/stats",
+    response_model=CaptureStatsReadModel,
+    status_code=status.HTTP_200_OK,
+)
+async def get_my_capture_stats(
+    current_user: Annotated[UserReadModel, Depends(get_current_active_user)],
+    capture_query_usecase: Annotated[
+        CaptureQueryUseCase,
+        Depends(capture_query_usecase),
+    ],
+    days: Annotated[
+        int,
+        Query(ge=1, le=366, description="length of the window in days"),
+    ] = 30,
+    until: Annotated[
+        Optional[date],
+        Query(description="last day of the window, today by default"),
+    ] = None,
+    tz: Annotated[
+        str,
+        Query(description="IANA time zone the days are taken in"),
+    ] = "UTC",
+) -> CaptureStatsReadModel:
+    """Count my captures by type, priority, tag, day and week."""
+    return await capture_query_usecase.fetch_stats_for_user(
+        current_user.id,
+        days,
+        until,
+        tz,
+    )
+
+
+@router.get(
+    "/me/captures/trash",
+    response_model=PaginatedResponse[CaptureReadModel],
+    status_code=status.HTTP_200_OK,
+)
+async def get_my_trashed_captures(
+    page: Annotated[PageParams, Depends(pagination_params)],
     current_user: Annotated[UserReadModel, Depends(get_current_active_user)],
     tag_query_usecase: Annotated[
         TagQueryUseCase,
@@ -90,15 +385,56 @@ async def get_my_captures(
         CaptureQueryUseCase,
         Depends(capture_query_usecase),
     ],
-) -> List[CaptureReadModel]:
-    """Get a list of captures."""
-    caps = capture_query_usecase.fetch_captures_for_user(current_user.id)
+) -> PaginatedResponse[CaptureReadModel]:
+    """Get a page of my deleted captures, most recently deleted first."""
+    caps = await capture_query_usecase.fetch_trashed_captures_for_user(
+        current_user.id,
+        page,
+    )
+
+    tags = await tag_query_usecase.fetch_tags_for_captures(
+        [cap.id for cap in caps.items],
+    )
+    for cap in caps.items:
+        cap.tags = tags[cap.id]
+
+    return PaginatedResponse.from_page(caps)
 
-    for cap in caps:
-        tags = tag_query_usecase.fetch_tags_for_capture(cap.id)
-        cap.tags = [tag for tag in tags]
 
-    return caps
+@router.get(
+    "/me/captures/export",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def export_my_captures(
+    current_user: Annotated[UserReadModel, Depends(get_current_active_user)],
+    capture_query_usecase: Annotated[
+        CaptureQueryUseCase,
+        Depends(capture_query_usecase),
+    ],
+    tag_query_usecase: Annotated[
+        TagQueryUseCase,
+        Depends(tag_query_usecase),
+    ],
+    format: Annotated[
+        ExportFormat,
+        Query(description="ndjson (one capture per line), csv or a json array"),
+    ] = "ndjson",
+) -> StreamingResponse:
+    """
+    Download all my captures with their tags.
+
+    The captures are read from a server-side cursor and written out a
+    chunk at a time, so there is no page size and no upper bound.  A CSV
+    export can be imported again.
+    """
+    return export_response(
+        with_tags(
+            capture_query_usecase.export_captures(current_user.id),
+            tag_query_usecase,
+        ),
+        format,
+    )
 
 
 @router.get(
@@ -108,17 +444,27 @@ async def get_my_captures(
 )
 async def get_my_capture(
     capture_id: str,
+    fields: Annotated[FieldSet, Depends(capture_fields)],
     current_user: Annotated[UserReadModel, Depends(get_current_active_user)],
     capture_query_usecase: Annotated[
         CaptureQueryUseCase,
         Depends(capture_query_usecase),
     ],
+    tag_query_usecase: Annotated[
+        TagQueryUseCase,
+        Depends(tag_query_usecase),
+    ],
 ) -> Optional[CaptureReadModel]:
-    """Get a capture."""
-    cap = capture_query_usecase.fetch_capture_by_id(capture_id)
-    if cap.user_id != current_user.id:
-        return None
-    return cap
+    """Get one of my captures."""
+    cap = await capture_query_usecase.fetch_capture_by_id(
+        capture_id,
+        fields,
+        current_user.id,
+    )
+    if fields.includes("tags"):
+        tags = await tag_query_usecase.fetch_tags_for_captures([cap.id])
+        cap.tags = tags[cap.id]
+    return sparse_response(cap, fields)
 
 
 ### Command Routes ###
@@ -127,18 +473,80 @@ async def get_my_capture(
     response_model=CaptureReadModel,
     status_code=status.HTTP_201_CREATED,
 )
-def create_capture(
+async def create_capture(
+    request: Request,
     data: CaptureCreateModel,
     current_user: Annotated[UserReadModel, Depends(get_current_active_user)],
     capture_command_usecase: Annotated[
         CaptureCommandUseCase,
         Depends(capture_command_usecase),
     ],
-) -> Optional[CaptureReadModel]:
-    """Get the user and create a capture."""
+    idempotency_key: Annotated[Optional[str], Depends(idempotency_key_header)],
+    idempotency_repository: Annotated[
+        Optional[IdempotencyRepository],
+        Depends(idempotency_repository),
+    ],
+) -> Union[CaptureReadModel, Response]:
+    """Get the user and create a capture; safe to retry with an Idempotency-Key."""
     data.user_id = current_user.id
-    capture = capture_command_usecase.create_capture(data)
-    return capture
+    return await idempotent(
+        request,
+        idempotency_key,
+        current_user.id,
+        lambda: capture_command_usecase.create_capture(data),
+        idempotency_repository,
+    )
+
+
+@router.post(
+    "/me/captures:batch",
+    response_model=CaptureBatchReadModel,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_captures(
+    data: CaptureBatchCreateModel,
+    current_user: Annotated[UserReadModel, Depends(get_current_active_user)],
+    capture_command_usecase: Annotated[
+        CaptureCommandUseCase,
+        Depends(capture_command_usecase),
+    ],
+) -> CaptureBatchReadModel:
+    """Create many captures, with their tags, in one transaction."""
+    return await capture_command_usecase.create_captures(current_user.id, data)
+
+
+@router.post(
+    "/me/captures:import",
+    response_model=CaptureImportReadModel,
+    status_code=status.HTTP_200_OK,
+)
+async def import_my_captures(
+    request: Request,
+    current_user: Annotated[UserReadModel, Depends(get_current_active_user)],
+    capture_command_usecase: Annotated[
+        CaptureCommandUseCase,
+        Depends(capture_command_usecase),
+    ],
+    format: Annotated[
+        CaptureImportFormat,
+        Query(description="ndjson: a capture per line, csv: a header line first"),
+    ] = "ndjson",
+) -> CaptureImportReadModel:
+    """
+    Import my captures from an NDJSON or CSV body.
+
+    The body is read as it streams in and written a chunk at a time, one
+    commit per chunk; records that cannot be imported are reported by line.
+    """
+
+    def log_progress(report: CaptureImportReadModel) -> None:
+        logger.info(f"Import for {current_user.id}: {report.rows} rows read")
+
+    return await capture_command_usecase.import_captures(
+        current_user.id,
+        read_records(request.stream(), format),
+        on_progress=log_progress,
+    )
 
 
 @router.put(
@@ -154,16 +562,35 @@ async def update_my_capture(
         CaptureCommandUseCase,
         Depends(capture_command_usecase),
     ],
-    capture_query_usecase: Annotated[
-        CaptureQueryUseCase,
-        Depends(capture_query_usecase),
+) -> CaptureReadModel:
+    """Replace the fields of one of my captures."""
+    return await capture_command_usecase.patch_capture(
+        capture_id,
+        current_user.id,
+        CapturePatchModel(**data.model_dump(exclude={"user_id"})),
+    )
+
+
+@router.patch(
+    "/me/captures/{capture_id}",
+    response_model=CaptureReadModel,
+    status_code=status.HTTP_200_OK,
+)
+async def patch_my_capture(
+    capture_id: str,
+    data: CapturePatchModel,
+    current_user: Annotated[UserReadModel, Depends(get_current_active_user)],
+    capture_command_usecase: Annotated[
+        CaptureCommandUseCase,
+        Depends(capture_command_usecase),
     ],
-) -> Optional[CaptureReadModel]:
-    """Update a capture."""
-    cap = capture_query_usecase.fetch_capture_by_id(capture_id)
-    if cap.user_id != current_user.id:
-        return None
-    return capture_command_usecase.update_capture(capture_id, data)
+) -> CaptureReadModel:
+    """Change some fields of one of my captures."""
+    return await capture_command_usecase.patch_capture(
+        capture_id,
+        current_user.id,
+        data,
+    )
 
 
 @router.delete(
@@ -177,16 +604,63 @@ async def delete_capture(
         CaptureCommandUseCase,
         Depends(capture_command_usecase),
     ],
-    capture_query_usecase: Annotated[
-        CaptureQueryUseCase,
-        Depends(capture_query_usecase),
-    ],
 ) -> None:
-    """Delete a capture."""
-    cap = capture_query_usecase.fetch_capture_by_id(capture_id)
-    if cap.user_id != current_user.id:
-        return None
-    capture_command_usecase.delete_capture_by_id(capture_id)
+    """Move one of my captures to the trash."""
+    await capture_command_usecase.delete_capture_by_id(capture_id, current_user.id)
+
+
+@router.post(
+    "/me/captures/{capture_id}/restore",
+    response_model=CaptureReadModel,
+    status_code=status.HTTP_200_OK,
+)
+async def restore_my_capture(
+    capture_id: str,
+    current_user: Annotated[UserReadModel, Depends(get_current_active_user)],
+    capture_command_usecase: Annotated[
+        CaptureCommandUseCase,
+        Depends(capture_command_usecase),
+    ],
+) -> CaptureReadModel:
+    """Take one of my captures back out of the trash."""
+    return await capture_command_usecase.restore_capture_by_id(
+        capture_id,
+        current_user.id,
+    )
+
+
+@router.post(
+    "/me/captures:attach-tags",
+    response_model=CaptureTagLinksReadModel,
+    status_code=status.HTTP_200_OK,
+)
+async def attach_tags_to_my_captures(
+    data: CaptureTagLinksModel,
+    current_user: Annotated[UserReadModel, Depends(get_current_active_user)],
+    capture_command_usecase: Annotated[
+        CaptureCommandUseCase,
+        Depends(capture_command_usecase),
+    ],
+) -> CaptureTagLinksReadModel:
+    """Tag each of my captures with each tag, creating the missing tags."""
+    return await capture_command_usecase.attach_tags(current_user.id, data)
+
+
+@router.post(
+    "/me/captures:detach-tags",
+    response_model=CaptureTagLinksReadModel,
+    status_code=status.HTTP_200_OK,
+)
+async def detach_tags_from_my_captures(
+    data: CaptureTagLinksModel,
+    current_user: Annotated[UserReadModel, Depends(get_current_active_user)],
+    capture_command_usecase: Annotated[
+        CaptureCommandUseCase,
+        Depends(capture_command_usecase),
+    ],
+) -> CaptureTagLinksReadModel:
+    """Take each tag off each of my captures."""
+    return await capture_command_usecase.detach_tags(current_user.id, data)
 
 
 @router.post(
@@ -194,7 +668,8 @@ async def delete_capture(
     response_model=CaptureReadModel,
     status_code=status.HTTP_201_CREATED,
 )
-def add_tag_to_capture(
+async def add_tag_to_capture(
+    request: Request,
     capture_id: str,
     data: TagCreateModel,
     current_user: Annotated[UserReadModel, Depends(get_current_active_user)],
@@ -202,17 +677,33 @@ def add_tag_to_capture(
         CaptureCommandUseCase,
         Depends(capture_command_usecase),
     ],
-    tag_command_usecase: Annotated[
-        TagCommandUseCase,
-        Depends(tag_command_usecase),
+    capture_query_usecase: Annotated[
+        CaptureQueryUseCase,
+        Depends(capture_query_usecase),
     ],
-    tag_query_usecase: Annotated[
-        TagQueryUseCase,
-        Depends(tag_query_usecase),
+    idempotency_key: Annotated[Optional[str], Depends(idempotency_key_header)],
+    idempotency_repository: Annotated[
+        Optional[IdempotencyRepository],
+        Depends(idempotency_repository),
     ],
-) -> Optional[CaptureReadModel]:
-    """Get the user and create a capture."""
-    data.user_id = current_user.id
-    existing_tag = tag_command_usecase.get_or_create_tag(data)
-    capture = capture_command_usecase.add_tag_to_capture(capture_id, existing_tag.id)
-    return capture
+) -> Union[CaptureReadModel, Response]:
+    """Tag one of my captures, creating the tag if I do not have it;
+    safe to retry with an Idempotency-Key."""
+
+    async def tag_capture() -> CaptureReadModel:
+        await capture_command_usecase.attach_tags(
+            current_user.id,
+            CaptureTagLinksModel(capture_ids=[capture_id], tags=[data.text]),
+        )
+        return await capture_query_usecase.fetch_capture_by_id(
+            capture_id,
+            user_id=current_user.id,
+        )
+
+    return await idempotent(
+        request,
+        idempotency_key,
+        current_user.id,
+        tag_capture,
+        idempotency_repository,
+    )
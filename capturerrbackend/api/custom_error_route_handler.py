@@ -18,8 +18,16 @@ class CustomErrorRouteHandler(APIRoute):
         async def custom_route_handler(request: Request) -> Response:
             if request.method == "GET" or request.method == "DELETE":
                 request_payload = request.query_params
-            else:
+            elif not request.headers.get("content-type", "").startswith(
+                "application/json",
+            ):
+                # imports stream their body, reading it here would buffer it all
+                request_payload = None
+            elif await request.body():
                 request_payload = await request.json()
+            else:
+                # action endpoints like .../restore have no body
+                request_payload = None
 
             logger.debug(f"Requested URL: {request.url}.")
             logger.debug(f"Payload: {request_payload} ")
@@ -59,12 +67,15 @@ class CustomErrorRouteHandler(APIRoute):
 
         return custom_route_handler
 
-    async def readable_errors_from_pydantic_message(self, exc: Any) -> dict[Any, Any]:
-        readable_error = defaultdict(list)
+    async def readable_errors_from_pydantic_message(
+        self,
+        exc: RequestValidationError,
+    ) -> dict[str, list[str]]:
+        readable_error: defaultdict[str, list[str]] = defaultdict(list)
         for errors in exc.errors():
             loc, msg = errors["loc"], errors["msg"]
             filtered_loc = loc[1:] if loc[0] in ("body", "query", "path") else loc
-            field_string = ".".join(filtered_loc)
+            field_string = ".".join(str(part) for part in filtered_loc)
             readable_error[field_string].append(msg)
         return readable_error
 
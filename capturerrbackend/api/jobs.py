@@ -0,0 +1,70 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Response, status
+
+from capturerrbackend.api.custom_error_route_handler import CustomErrorRouteHandler
+from capturerrbackend.app.infrastructure.dependencies import (
+    get_current_active_super_user,
+    get_current_active_user,
+    job_usecase,
+)
+from capturerrbackend.app.presentation.job_response import accepted
+from capturerrbackend.app.usecase.job import JobCreateModel, JobReadModel, JobUseCase
+from capturerrbackend.app.usecase.user import UserReadModel
+
+router = APIRouter(route_class=CustomErrorRouteHandler)
+
+
+##### Super User Routes #####
+
+
+@router.post(
+    "/jobs",
+    response_model=JobReadModel,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def create_job(
+    data: JobCreateModel,
+    response: Response,
+    current_user: Annotated[UserReadModel, Depends(get_current_active_super_user)],
+    job_usecase: Annotated[JobUseCase, Depends(job_usecase)],
+) -> JobReadModel:
+    """
+    Queue a maintenance job: ``rebuild-search``, ``recompute-stats`` (of
+    ``params.user_id``, or everyone) or ``purge-trash``.
+
+    It runs on a worker; poll the ``Location`` for its status.
+    """
+    job = await job_usecase.enqueue_job(data, current_user.id)
+    return accepted(response, job)
+
+
+@router.get(
+    "/jobs/{job_id}",
+    response_model=JobReadModel,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(get_current_active_super_user)],
+)
+async def get_job(
+    job_id: str,
+    job_usecase: Annotated[JobUseCase, Depends(job_usecase)],
+) -> JobReadModel:
+    """Get the status of any job."""
+    return await job_usecase.fetch_job_by_id(job_id)
+
+
+### User Routes ###
+
+
+@router.get(
+    "/me/jobs/{job_id}",
+    response_model=JobReadModel,
+    status_code=status.HTTP_200_OK,
+)
+async def get_my_job(
+    job_id: str,
+    current_user: Annotated[UserReadModel, Depends(get_current_active_user)],
+    job_usecase: Annotated[JobUseCase, Depends(job_usecase)],
+) -> JobReadModel:
+    """Get the status of one of my jobs."""
+    return await job_usecase.fetch_job_by_id(job_id, current_user.id)
@@ -2,6 +2,8 @@ from fastapi.routing import APIRouter
 
 from capturerrbackend.api.books import router as books_router
 from capturerrbackend.api.captures import router as captures_router
+from capturerrbackend.api.jobs import router as jobs_router
+from capturerrbackend.api.sync import router as sync_router
 from capturerrbackend.api.tags import router as tags_router
 from capturerrbackend.api.users import router as users_router
 
@@ -11,3 +13,5 @@ api_router.include_router(books_router, tags=["books"])
 api_router.include_router(users_router, tags=["users"])
 api_router.include_router(tags_router, tags=["tags"])
 api_router.include_router(captures_router, tags=["captures"])
+api_router.include_router(sync_router, tags=["sync"])
+api_router.include_router(jobs_router, tags=["jobs"])
@@ -0,0 +1,53 @@
+from typing import Annotated, Optional
+
+from fastapi import APIRouter, Depends, Query, status
+
+from capturerrbackend.api.custom_error_route_handler import CustomErrorRouteHandler
+from capturerrbackend.app.infrastructure.dependencies import (
+    get_current_active_user,
+    sync_query_usecase,
+)
+from capturerrbackend.app.usecase.sync import (
+    MAX_SYNC_PAGE_LIMIT,
+    SYNC_PAGE_LIMIT,
+    SyncQueryUseCase,
+    SyncReadModel,
+)
+from capturerrbackend.app.usecase.user import UserReadModel
+
+router = APIRouter(route_class=CustomErrorRouteHandler)
+
+
+@router.get(
+    "/me/sync",
+    response_model=SyncReadModel,
+    status_code=status.HTTP_200_OK,
+)
+async def get_my_changes(
+    current_user: Annotated[UserReadModel, Depends(get_current_active_user)],
+    sync_query_usecase: Annotated[SyncQueryUseCase, Depends(sync_query_usecase)],
+    since: Annotated[
+        Optional[str],
+        Query(description="cursor of the previous sync; omit for a full sync"),
+    ] = None,
+    limit: Annotated[
+        int,
+        Query(
+            ge=1,
+            le=MAX_SYNC_PAGE_LIMIT,
+            description="captures, tags and deleted ids each, per page",
+        ),
+    ] = SYNC_PAGE_LIMIT,
+) -> SyncReadModel:
+    """
+    Get the captures, tags and links changed since the last sync.
+
+    Pass the returned ``cursor`` as ``since`` next time; while ``has_more``
+    is set, do so right away for the next page.  Deleted captures and tags
+    are listed by id.
+    """
+    return await sync_query_usecase.fetch_changes_for_user(
+        current_user.id,
+        since,
+        limit,
+    )
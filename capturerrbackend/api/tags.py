@@ -1,6 +1,6 @@
-from typing import Annotated, List, Optional
+from typing import Annotated, Optional, Union
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Request, Response, status
 
 from capturerrbackend.api.custom_error_route_handler import CustomErrorRouteHandler
 from capturerrbackend.app.infrastructure.dependencies import (
@@ -9,9 +9,24 @@ from capturerrbackend.app.infrastructure.dependencies import (
     tag_command_usecase,
     tag_query_usecase,
 )
+from capturerrbackend.app.presentation.conditional_get import (
+    collection_validators,
+    is_not_modified,
+)
+from capturerrbackend.app.presentation.pagination_response import (
+    PaginatedResponse,
+    pagination_params,
+)
+from capturerrbackend.app.presentation.sparse_fieldset import (
+    fields_params,
+    sparse_response,
+)
+from capturerrbackend.app.usecase.fields import FieldSet
+from capturerrbackend.app.usecase.pagination import PageParams
 from capturerrbackend.app.usecase.tag import (
     TagCommandUseCase,
     TagCreateModel,
+    TagPatchModel,
     TagQueryUseCase,
     TagReadModel,
     TagUpdateModel,
@@ -20,20 +35,25 @@ from capturerrbackend.app.usecase.user import UserReadModel
 
 router = APIRouter(route_class=CustomErrorRouteHandler)
 
+tag_fields = fields_params(TagReadModel)
+
 ##### Super User Routes #####
 
 
 @router.get(
     "/tags",
-    response_model=List[TagReadModel],
+    response_model=PaginatedResponse[TagReadModel],
     status_code=status.HTTP_200_OK,
     dependencies=[Depends(get_current_active_super_user)],
 )
 async def get_tags(
+    page: Annotated[PageParams, Depends(pagination_params)],
+    fields: Annotated[FieldSet, Depends(tag_fields)],
     tag_query_usecase: TagQueryUseCase = Depends(tag_query_usecase),
-) -> List[TagReadModel]:
-    """Get a list of tags."""
-    return tag_query_usecase.fetch_tags()
+) -> PaginatedResponse[TagReadModel]:
+    """Get a page of tags."""
+    tags = await tag_query_usecase.fetch_tags(page, fields)
+    return sparse_response(PaginatedResponse.from_page(tags), fields)
 
 
 @router.delete(
@@ -46,21 +66,52 @@ async def delete_a_tag(
     tag_command_usecase: TagCommandUseCase = Depends(tag_command_usecase),
 ) -> None:
     """Delete a tag."""
-    tag_command_usecase.delete_tag_by_id(tag_id)
+    await tag_command_usecase.delete_tag_by_id(tag_id)
 
 
 ### Query Routes ###
 @router.get(
     "/me/tags",
-    response_model=List[TagReadModel],
+    response_model=PaginatedResponse[TagReadModel],
     status_code=status.HTTP_200_OK,
 )
 async def get_my_tags(
+    request: Request,
+    response: Response,
+    page: Annotated[PageParams, Depends(pagination_params)],
+    fields: Annotated[FieldSet, Depends(tag_fields)],
     current_user: UserReadModel = Depends(get_current_active_user),
     tag_query_usecase: TagQueryUseCase = Depends(tag_query_usecase),
-) -> List[TagReadModel]:
-    """Get a list of tags."""
-    return tag_query_usecase.fetch_tags_for_user(current_user.id)
+) -> Union[PaginatedResponse[TagReadModel], Response]:
+    """Get a page of tags, or a 304 if the client's copy is current."""
+    validators = collection_validators(
+        request,
+        await tag_query_usecase.fetch_version(current_user.id),
+    )
+    if is_not_modified(request, validators):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=validators)
+    response.headers.update(validators)
+
+    tags = await tag_query_usecase.fetch_tags_for_user(current_user.id, page, fields)
+    return sparse_response(PaginatedResponse.from_page(tags), fields, response)
+
+
+@router.get(
+    "/me/tags/trash",
+    response_model=PaginatedResponse[TagReadModel],
+    status_code=status.HTTP_200_OK,
+)
+async def get_my_trashed_tags(
+    page: Annotated[PageParams, Depends(pagination_params)],
+    current_user: Annotated[UserReadModel, Depends(get_current_active_user)],
+    tag_query_usecase: Annotated[
+        TagQueryUseCase,
+        Depends(tag_query_usecase),
+    ],
+) -> PaginatedResponse[TagReadModel]:
+    """Get a page of my deleted tags, most recently deleted first."""
+    tags = await tag_query_usecase.fetch_trashed_tags_for_user(current_user.id, page)
+    return PaginatedResponse.from_page(tags)
 
 
 @router.get(
@@ -70,17 +121,16 @@ async def get_my_tags(
 )
 async def get_my_tag(
     tag_id: str,
+    fields: Annotated[FieldSet, Depends(tag_fields)],
     current_user: Annotated[UserReadModel, Depends(get_current_active_user)],
     tag_query_usecase: Annotated[
         TagQueryUseCase,
         Depends(tag_query_usecase),
     ],
 ) -> Optional[TagReadModel]:
-    """Get a tag."""
-    cap = tag_query_usecase.fetch_tag_by_id(tag_id)
-    if cap.user_id != current_user.id:
-        return None
-    return cap
+    """Get one of my tags."""
+    tag = await tag_query_usecase.fetch_tag_by_id(tag_id, fields, current_user.id)
+    return sparse_response(tag, fields)
 
 
 ### Command Routes ###
@@ -89,7 +139,7 @@ async def get_my_tag(
     response_model=TagReadModel,
     status_code=status.HTTP_201_CREATED,
 )
-def create_tag(
+async def create_tag(
     data: TagCreateModel,
     current_user: Annotated[UserReadModel, Depends(get_current_active_user)],
     tag_command_usecase: Annotated[
@@ -99,7 +149,7 @@ def create_tag(
 ) -> Optional[TagReadModel]:
     """Get the user and create a tag."""
     data.user_id = current_user.id
-    tag = tag_command_usecase.create_tag(data)
+    tag = await tag_command_usecase.create_tag(data)
     return tag
 
 
@@ -116,16 +166,31 @@ async def update_my_tag(
         TagCommandUseCase,
         Depends(tag_command_usecase),
     ],
-    tag_query_usecase: Annotated[
-        TagQueryUseCase,
-        Depends(tag_query_usecase),
+) -> TagReadModel:
+    """Replace the text of one of my tags."""
+    return await tag_command_usecase.patch_tag(
+        tag_id,
+        current_user.id,
+        TagPatchModel(text=data.text),
+    )
+
+
+@router.patch(
+    "/me/tags/{tag_id}",
+    response_model=TagReadModel,
+    status_code=status.HTTP_200_OK,
+)
+async def patch_my_tag(
+    tag_id: str,
+    data: TagPatchModel,
+    current_user: Annotated[UserReadModel, Depends(get_current_active_user)],
+    tag_command_usecase: Annotated[
+        TagCommandUseCase,
+        Depends(tag_command_usecase),
     ],
-) -> Optional[TagReadModel]:
-    """Update a tag."""
-    tag = tag_query_usecase.fetch_tag_by_id(tag_id)
-    if tag.user_id != current_user.id:
-        return None
-    return tag_command_usecase.update_tag(tag_id, data)
+) -> TagReadModel:
+    """Change some fields of one of my tags."""
+    return await tag_command_usecase.patch_tag(tag_id, current_user.id, data)
 
 
 @router.delete(
@@ -139,16 +204,26 @@ async def delete_my_tag(
         TagCommandUseCase,
         Depends(tag_command_usecase),
     ],
-    tag_query_usecase: Annotated[
-        TagQueryUseCase,
-        Depends(tag_query_usecase),
-    ],
 ) -> None:
-    """Delete a tag."""
-    tag = tag_query_usecase.fetch_tag_by_id(tag_id)
-    if tag.user_id != current_user.id:
-        return None
-    tag_command_usecase.delete_tag_by_id(tag_id)
+    """Move one of my tags to the trash."""
+    await tag_command_usecase.delete_tag_by_id(tag_id, current_user.id)
+
+
+@router.post(
+    "/me/tags/{tag_id}/restore",
+    response_model=TagReadModel,
+    status_code=status.HTTP_200_OK,
+)
+async def restore_my_tag(
+    tag_id: str,
+    current_user: Annotated[UserReadModel, Depends(get_current_active_user)],
+    tag_command_usecase: Annotated[
+        TagCommandUseCase,
+        Depends(tag_command_usecase),
+    ],
+) -> TagReadModel:
+    """Take one of my tags back out of the trash."""
+    return await tag_command_usecase.restore_tag_by_id(tag_id, current_user.id)
 
 
 # @router.post(
@@ -1,6 +1,6 @@
-from typing import Annotated, List, Optional
+from typing import Annotated, Optional
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Response, status
 from loguru import logger
 
 from capturerrbackend.api.custom_error_route_handler import CustomErrorRouteHandler
@@ -12,51 +12,71 @@ from capturerrbackend.app.infrastructure.dependencies import (
     user_command_usecase,
     user_query_usecase,
 )
+from capturerrbackend.app.presentation.job_response import accepted
+from capturerrbackend.app.presentation.pagination_response import (
+    PaginatedResponse,
+    pagination_params,
+)
+from capturerrbackend.app.presentation.sparse_fieldset import (
+    fields_params,
+    sparse_response,
+)
 from capturerrbackend.app.usecase.book import (
     BookCommandUseCase,
     BookCreateModel,
     BookQueryUseCase,
     BookReadModel,
 )
+from capturerrbackend.app.usecase.fields import FieldSet
+from capturerrbackend.app.usecase.job import JobReadModel
+from capturerrbackend.app.usecase.pagination import PageParams
 from capturerrbackend.app.usecase.user import (
     Token,
     UserCommandUseCase,
     UserCreateModel,
     UserLoginModel,
+    UserPatchModel,
     UserQueryUseCase,
     UserReadModel,
+    UserStatsReadModel,
     UserUpdateModel,
     create_access_token,
 )
 
 router = APIRouter(route_class=CustomErrorRouteHandler)
 
+user_fields = fields_params(UserReadModel)
+book_fields = fields_params(BookReadModel)
+
 
 @router.post(
     "/users",
     response_model=None,  # UserReadModel,
     status_code=status.HTTP_201_CREATED,
 )
-def create_user(
+async def create_user(
     data: UserCreateModel,
     user_command_usecase: Annotated[UserCommandUseCase, Depends(user_command_usecase)],
 ) -> UserReadModel:
     """Create a user."""
-    return user_command_usecase.create_user(data)
+    return await user_command_usecase.create_user(data)
 
 
 @router.get(
     "/users",
-    response_model=List[UserReadModel],
+    response_model=PaginatedResponse[UserReadModel],
     status_code=status.HTTP_200_OK,
 )
-def get_users(
+async def get_users(
+    page: Annotated[PageParams, Depends(pagination_params)],
+    fields: Annotated[FieldSet, Depends(user_fields)],
     active_user: UserReadModel = Depends(get_current_active_user),
     user_query_usecase: UserQueryUseCase = Depends(user_query_usecase),
-) -> List[UserReadModel]:
-    """Get a list of users."""
+) -> PaginatedResponse[UserReadModel]:
+    """Get a page of users."""
     logger.debug(f"Getting all users.  Requested by {active_user.user_name}")
-    return user_query_usecase.fetch_users()
+    users = await user_query_usecase.fetch_users(page, fields)
+    return sparse_response(PaginatedResponse.from_page(users), fields)
 
 
 @router.get(
@@ -65,29 +85,68 @@ def get_users(
     status_code=status.HTTP_200_OK,
 )
 async def get_me(
+    fields: Annotated[FieldSet, Depends(user_fields)],
     active_user: Annotated[UserReadModel, Depends(get_current_active_user)],
     user_query_usecase: Annotated[UserQueryUseCase, Depends(user_query_usecase)],
     book_query_usecase: Annotated[BookQueryUseCase, Depends(book_query_usecase)],
 ) -> UserReadModel:
     """Get a user."""
     logger.debug("In get_me route")
-    user = user_query_usecase.fetch_user_by_user_name(active_user.user_name)
-    user.books = book_query_usecase.fetch_books_by_user_id(user.id)
-    return user
+    user = await user_query_usecase.fetch_user_by_id(active_user.id, fields)
+    if fields.includes("books"):
+        books = await book_query_usecase.fetch_books_by_user_id(user.id)
+        user.books = books.items
+    if fields.includes("stats"):
+        user.stats = await user_query_usecase.fetch_user_stats(user.id)
+    return sparse_response(user, fields)
+
+
+@router.patch(
+    "/users/me",
+    response_model=UserReadModel,
+    status_code=status.HTTP_200_OK,
+)
+async def patch_me(
+    data: UserPatchModel,
+    active_user: Annotated[UserReadModel, Depends(get_current_active_user)],
+    user_command_usecase: Annotated[UserCommandUseCase, Depends(user_command_usecase)],
+) -> UserReadModel:
+    """Change some fields of my user."""
+    return await user_command_usecase.patch_user(active_user.id, data)
+
+
+@router.get(
+    "/users/me/stats",
+    response_model=UserStatsReadModel,
+    status_code=status.HTTP_200_OK,
+)
+async def get_my_stats(
+    active_user: Annotated[UserReadModel, Depends(get_current_active_user)],
+    user_query_usecase: Annotated[UserQueryUseCase, Depends(user_query_usecase)],
+) -> UserStatsReadModel:
+    """Get the running capture counters of the user."""
+    return await user_query_usecase.fetch_user_stats(active_user.id)
 
 
 @router.get(
     "/users/me/books",
-    response_model=List[BookReadModel],
+    response_model=PaginatedResponse[BookReadModel],
     status_code=status.HTTP_200_OK,
 )
 async def get_my_books(
+    page: Annotated[PageParams, Depends(pagination_params)],
+    fields: Annotated[FieldSet, Depends(book_fields)],
     active_user: Annotated[UserReadModel, Depends(get_current_active_user)],
     book_query_usecase: Annotated[BookQueryUseCase, Depends(book_query_usecase)],
-) -> List[BookReadModel]:
-    """Get a user."""
+) -> PaginatedResponse[BookReadModel]:
+    """Get a page of the user's books."""
     logger.debug("In route: (GET) '/users/me/books'")
-    return book_query_usecase.fetch_books_by_user_id(active_user.id)
+    books = await book_query_usecase.fetch_books_by_user_id(
+        active_user.id,
+        page,
+        fields,
+    )
+    return sparse_response(PaginatedResponse.from_page(books), fields)
 
 
 @router.get(
@@ -97,19 +156,21 @@ async def get_my_books(
 )
 async def get_user(
     user_id: str,
+    fields: Annotated[FieldSet, Depends(user_fields)],
     active_user: Annotated[UserReadModel, Depends(get_current_active_user)],
     book_query_usecase: Annotated[BookQueryUseCase, Depends(book_query_usecase)],
     user_query_usecase: Annotated[UserQueryUseCase, Depends(user_query_usecase)],
 ) -> UserReadModel:
     logger.debug(f"In route: (GET) '/users/{user_id}'")
 
-    user = user_query_usecase.fetch_user_by_id(user_id)
+    user = await user_query_usecase.fetch_user_by_id(user_id, fields)
     if user.id != active_user.id and not active_user.is_superuser:
         raise UserNotSuperError
 
-    books = book_query_usecase.fetch_books_by_user_id(user.id)
-    user.books = books
-    return user
+    if fields.includes("books"):
+        books = await book_query_usecase.fetch_books_by_user_id(user.id)
+        user.books = books.items
+    return sparse_response(user, fields)
 
 
 @router.put(
@@ -123,19 +184,34 @@ async def update_user(
     user_command_usecase: Annotated[UserCommandUseCase, Depends(user_command_usecase)],
 ) -> Optional[UserReadModel]:
     """Update a user."""
-    return user_command_usecase.update_user(user_id, data)
+    return await user_command_usecase.update_user(user_id, data)
 
 
 @router.delete(
     "/users/{user_id}",
+    response_model=JobReadModel,
     status_code=status.HTTP_202_ACCEPTED,
 )
 async def delete_user(
     user_id: str,
+    response: Response,
+    active_user: Annotated[UserReadModel, Depends(get_current_active_user)],
+    user_query_usecase: Annotated[UserQueryUseCase, Depends(user_query_usecase)],
     user_command_usecase: Annotated[UserCommandUseCase, Depends(user_command_usecase)],
-) -> None:
-    """Delete a user."""
-    user_command_usecase.delete_user_by_id(user_id)
+) -> JobReadModel:
+    """
+    Delete a user: yourself, or anyone as a super user.
+
+    The user is deactivated at once; their captures, tags and books are
+    then deleted in batches by a ``delete-user`` job, followed at the
+    ``Location``.
+    """
+    user = await user_query_usecase.fetch_user_by_id(user_id)
+    if user.id != active_user.id and not active_user.is_superuser:
+        raise UserNotSuperError
+
+    job = await user_command_usecase.delete_user_by_id(user_id, active_user.id)
+    return accepted(response, job, "/jobs" if active_user.is_superuser else "/me/jobs")
 
 
 @router.post(
@@ -148,7 +224,7 @@ async def login_user(
     user_query_usecase: Annotated[UserQueryUseCase, Depends(user_query_usecase)],
     user_command_usecase: Annotated[UserCommandUseCase, Depends(user_command_usecase)],
 ) -> Token:
-    potential_user = user_query_usecase.login_user(user)
+    potential_user = await user_query_usecase.login_user(user)
 
     token = Token(
         access_token=create_access_token(potential_user.model_dump()),
@@ -175,5 +251,5 @@ async def create_book_for_user(
         raise UserNotSuperError
 
     book.user_id = user_id
-    book_command_usecase.create_book(data=book)
-    return user_query_usecase.fetch_user_by_id(user_id)
+    await book_command_usecase.create_book(data=book)
+    return await user_query_usecase.fetch_user_by_id(user_id)
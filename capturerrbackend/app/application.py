@@ -1,10 +1,18 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from pprint import pprint
+from typing import AsyncIterator
 
 from fastapi import FastAPI
 from loguru import logger
 
 from capturerrbackend.api.router import api_router
-from capturerrbackend.app.infrastructure.sqlite.database import create_tables
+from capturerrbackend.app.infrastructure.sqlite.database_async import (
+    create_tables,
+    sessionmanager,
+)
+from capturerrbackend.app.infrastructure.sqlite.job import run_job_pool
+from capturerrbackend.app.infrastructure.sqlite.purge import purge_worker
 from capturerrbackend.app.logging import configure_logging
 from capturerrbackend.app.middlewares import add_middleware
 from capturerrbackend.config.configurator import config
@@ -32,22 +40,55 @@ def get_app(init_db: bool = True) -> FastAPI:
     configure_logging()
     logger.warning("💥💥💥  Starting application ...💥💥💥")
 
-    if "prod" not in config.env:
-        if init_db:
-            logger.debug("Creating tables from main app.  init_db was true")
-            create_tables()
-            logger.debug("Tables created from main app")
-
     if "dev" in config.env:
         pprint(config.model_dump())
         logger.info(f"Environment: {config.env}")
         logger.info(f"Log Level: {config.log_level}")
 
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        """Create the pooled engine and start the trash purge and the job
+        workers on startup, stop them all on shutdown."""
+        sessionmanager.init(str(config.db_url))
+        if "prod" not in config.env:
+            if init_db:
+                logger.debug("Creating tables from main app.  init_db was true")
+                await create_tables()
+                logger.debug("Tables created from main app")
+        purge = None
+        if config.purge_enabled:
+            purge = asyncio.create_task(
+                purge_worker(
+                    config.trash_retention_days,
+                    config.purge_batch_size,
+                    config.purge_batch_pause,
+                    config.purge_interval_seconds,
+                    (config.purge_window_start, config.purge_window_end),
+                ),
+            )
+        jobs = None
+        if config.jobs_enabled:
+            jobs = asyncio.create_task(
+                run_job_pool(
+                    config.job_workers,
+                    config.job_poll_seconds,
+                    config.job_lease_seconds,
+                ),
+            )
+        yield
+        for task in (purge, jobs):
+            if task is not None:
+                task.cancel()
+                with suppress(asyncio.CancelledError):
+                    await task
+        await sessionmanager.close()
+
     app = FastAPI(
         title="capturerr",
         docs_url="/api/docs",
         redoc_url="/api/redoc",
         openapi_url="/api/openapi.json",
+        lifespan=lifespan,
     )
 
     # Main router for the API.
@@ -32,3 +32,14 @@ class BookIsbnAlreadyExistsError(CustomException):
 
     def __str__(self) -> str:
         return BookIsbnAlreadyExistsError.detail
+
+
+class BookReadPageOutOfRangeError(CustomException):
+    """BookReadPageOutOfRangeError is an error that occurs when a change
+    would leave the read page beyond the page count of the book."""
+
+    status_code = 422
+    detail = "The read page must be between 0 and the page count of the book."
+
+    def __str__(self) -> str:
+        return BookReadPageOutOfRangeError.detail
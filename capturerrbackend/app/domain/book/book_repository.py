@@ -2,7 +2,7 @@
 """Book repository"""
 
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from .book import Book
 
@@ -11,21 +11,42 @@ class BookRepository(ABC):
     """BookRepository defines a repository interface for Book entity."""
 
     @abstractmethod
-    def create(self, book: Book) -> Optional[Book]:
+    async def create(self, book: Book) -> Book:
+        """Raises BookIsbnAlreadyExistsError when the ISBN is taken."""
         raise NotImplementedError
 
     @abstractmethod
-    def find_by_id(self, book_id: str) -> Optional[Book]:
+    async def find_by_id(self, book_id: str) -> Optional[Book]:
         raise NotImplementedError
 
     @abstractmethod
-    def find_by_isbn(self, isbn: str) -> Optional[Book]:
+    async def find_by_isbn(self, isbn: str) -> Optional[Book]:
         raise NotImplementedError
 
     @abstractmethod
-    def update(self, book: Book) -> Optional[Book]:
+    async def patch(
+        self,
+        book_id: str,
+        user_id: str,
+        changes: Dict[str, Any],
+    ) -> Optional[Book]:
+        """Change the given columns of a live book of ``user_id`` with one
+        statement; None if there is no such book."""
         raise NotImplementedError
 
     @abstractmethod
-    def delete_by_id(self, book_id: str) -> Optional[Book]:
+    async def update(self, book: Book) -> Optional[Book]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete_by_id(self, book_id: str) -> Optional[Book]:
+        """Move the book to the trash."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def find_trashed_by_id(self, book_id: str) -> Optional[Book]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def restore_by_id(self, book_id: str) -> Optional[Book]:
         raise NotImplementedError
@@ -32,3 +32,25 @@ class CaptureAlreadyExistsError(CustomException):
 
     def __str__(self) -> str:
         return CaptureAlreadyExistsError.detail
+
+
+class CaptureSearchUnavailableError(CustomException):
+    """CaptureSearchUnavailableError is an error that occurs when the
+    database backend has no full-text index for captures."""
+
+    status_code = 501
+    detail = "Full-text search is not available on this database."
+
+    def __str__(self) -> str:
+        return CaptureSearchUnavailableError.detail
+
+
+class InvalidTimeZoneError(CustomException):
+    """InvalidTimeZoneError is an error that occurs when a time zone name
+    is not known to the tz database."""
+
+    status_code = 400
+    detail = "The time zone you specified is not a valid IANA time zone."
+
+    def __str__(self) -> str:
+        return InvalidTimeZoneError.detail
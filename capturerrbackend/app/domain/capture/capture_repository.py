@@ -2,7 +2,7 @@
 """Capture repository"""
 
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from .capture import Capture
 
@@ -11,25 +11,76 @@ class CaptureRepository(ABC):
     """CaptureRepository defines a repository interface for Capture entity."""
 
     @abstractmethod
-    def create(self, capture: Capture) -> Optional[Capture]:
+    async def create(self, capture: Capture) -> Capture:
+        """Raises CaptureAlreadyExistsError when the entry is taken."""
         raise NotImplementedError
 
     @abstractmethod
-    def find_by_id(self, capture_id: str) -> Optional[Capture]:
+    async def find_by_id(
+        self,
+        capture_id: str,
+        user_id: Optional[str] = None,
+    ) -> Optional[Capture]:
+        """A live capture; with ``user_id`` only if that user owns it."""
         raise NotImplementedError
 
     @abstractmethod
-    def find_by_entry(self, entry: str) -> Optional[Capture]:
+    async def find_by_entry(self, entry: str) -> Optional[Capture]:
         raise NotImplementedError
 
     @abstractmethod
-    def update(self, capture: Capture) -> Optional[Capture]:
+    async def patch(
+        self,
+        capture_id: str,
+        user_id: str,
+        changes: Dict[str, Any],
+    ) -> Optional[Capture]:
+        """Change the given columns of a live capture of ``user_id`` with one
+        statement; None if there is no such capture."""
         raise NotImplementedError
 
     @abstractmethod
-    def delete_by_id(self, capture_id: str) -> Optional[Capture]:
+    async def delete_by_id(self, capture_id: str) -> Optional[Capture]:
+        """Move the capture to the trash."""
         raise NotImplementedError
 
     @abstractmethod
-    def add_tag(self, capture_id: str, tag_id: str) -> None:
+    async def find_trashed_by_id(self, capture_id: str) -> Optional[Capture]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def restore_by_id(self, capture_id: str) -> Optional[Capture]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def add_tag(self, capture_id: str, tag_id: str) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def find_existing_entries(self, entries: List[str]) -> Set[str]:
+        """The ``entries`` already taken, by any capture in or out of the trash."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def create_many(self, captures: List[Capture]) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def add_tags_many(self, links: List[Tuple[str, str]]) -> None:
+        """Link each ``(capture_id, tag_id)`` pair."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def find_owned_ids(self, user_id: str, capture_ids: List[str]) -> Set[str]:
+        """Those of ``capture_ids`` that are live captures of ``user_id``."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def attach_tags(self, capture_ids: List[str], tag_ids: List[str]) -> int:
+        """Link every capture to every tag; returns how many links are new."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def detach_tags(self, capture_ids: List[str], tag_ids: List[str]) -> int:
+        """Unlink the tags from the captures; returns how many links went."""
         raise NotImplementedError
@@ -2,7 +2,7 @@
 """Tag repository"""
 
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Any, Dict, Iterable, Optional
 
 from .tag import Tag
 
@@ -11,21 +11,65 @@ class TagRepository(ABC):
     """TagRepository defines a repository interface for Tag entity."""
 
     @abstractmethod
-    def create(self, tag: Tag) -> Optional[Tag]:
+    async def create(self, tag: Tag) -> Tag:
+        """Raises TagAlreadyExistsError when the text is taken."""
         raise NotImplementedError
 
     @abstractmethod
-    def find_by_id(self, tag_id: str) -> Optional[Tag]:
+    async def find_by_id(
+        self,
+        tag_id: str,
+        user_id: Optional[str] = None,
+    ) -> Optional[Tag]:
+        """A live tag; with ``user_id`` only if that user owns it."""
         raise NotImplementedError
 
     @abstractmethod
-    def find_by_text(self, text: str) -> Optional[Tag]:
+    async def find_by_text(self, text: str) -> Optional[Tag]:
         raise NotImplementedError
 
     @abstractmethod
-    def update(self, tag: Tag) -> Optional[Tag]:
+    async def patch(
+        self,
+        tag_id: str,
+        user_id: str,
+        changes: Dict[str, Any],
+    ) -> Optional[Tag]:
+        """Change the given columns of a live tag of ``user_id`` with one
+        statement; None if there is no such tag."""
         raise NotImplementedError
 
     @abstractmethod
-    def delete_by_id(self, tag_id: str) -> Optional[Tag]:
+    async def update(self, tag: Tag) -> Optional[Tag]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete_by_id(self, tag_id: str) -> Optional[Tag]:
+        """Move the tag to the trash."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def find_trashed_by_id(self, tag_id: str) -> Optional[Tag]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def restore_by_id(self, tag_id: str) -> Optional[Tag]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def find_or_create_by_texts(
+        self,
+        user_id: str,
+        texts: Iterable[str],
+    ) -> Dict[str, str]:
+        """Map each text to the id of the user's tag, creating the missing ones."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def find_ids_by_texts(
+        self,
+        user_id: str,
+        texts: Iterable[str],
+    ) -> Dict[str, str]:
+        """Map those of the texts the user has a tag for to its id."""
         raise NotImplementedError
@@ -2,7 +2,7 @@
 """User repository"""
 
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from .user import User
 
@@ -11,21 +11,27 @@ class UserRepository(ABC):
     """UserRepository defines a repository interface for User entity."""
 
     @abstractmethod
-    def create(self, user: User) -> Optional[User]:
+    async def create(self, user: User) -> User:
+        """Raises UserNameAlreadyExistsError when the user name is taken."""
         raise NotImplementedError
 
     @abstractmethod
-    def find_by_id(self, user_id: str) -> Optional[User]:
+    async def find_by_id(self, user_id: str) -> Optional[User]:
         raise NotImplementedError
 
     @abstractmethod
-    def find_by_user_name(self, user_name: str) -> Optional[User]:
+    async def find_by_user_name(self, user_name: str) -> Optional[User]:
         raise NotImplementedError
 
     @abstractmethod
-    def update(self, user: User) -> Optional[User]:
+    async def patch(self, user_id: str, changes: Dict[str, Any]) -> Optional[User]:
+        """Change the given columns with one statement; None if there is no such user."""
         raise NotImplementedError
 
     @abstractmethod
-    def delete_by_id(self, user_id: str) -> Optional[User]:
+    async def update(self, user: User) -> Optional[User]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete_by_id(self, user_id: str) -> Optional[User]:
         raise NotImplementedError
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""User statistics repository"""
+
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+from ..capture.capture import Capture
+
+
+class UserStatsRepository(ABC):
+    """UserStatsRepository keeps the per-user capture counters in step with
+    the capture writes of the same unit of work."""
+
+    @abstractmethod
+    async def add_capture(self, capture: Capture) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def add_captures(self, captures: List[Capture]) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def remove_capture(self, capture: Capture) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def add_tag(self, capture_id: str) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def count_tag_links(self, user_id: str, delta: int) -> None:
+        """Move the tag counter by ``delta`` links between live rows."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def remove_tags(self, capture_id: str) -> None:
+        """Must run before the capture is trashed or its tag links deleted."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def restore_tags(self, capture_id: str) -> None:
+        """Must run after the capture is restored from the trash."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def remove_tag_links(self, tag_id: str) -> None:
+        """Must run before the tag is trashed or its capture links deleted."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def restore_tag_links(self, tag_id: str) -> None:
+        """Must run after the tag is restored from the trash."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def recompute(self, user_id: Optional[str] = None) -> None:
+        raise NotImplementedError
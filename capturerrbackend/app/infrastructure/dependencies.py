@@ -1,11 +1,11 @@
-from typing import Annotated
+from typing import Annotated, AsyncIterator, Optional
 
 from fastapi import Depends
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from loguru import logger
-from sqlalchemy import create_engine, exc
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from capturerrbackend.app.domain.book.book_repository import BookRepository
 from capturerrbackend.app.domain.capture.capture_repository import CaptureRepository
@@ -16,6 +16,7 @@ from capturerrbackend.app.domain.user.user_exception import (
     UserNotSuperError,
 )
 from capturerrbackend.app.domain.user.user_repository import UserRepository
+from capturerrbackend.app.domain.user.user_stats_repository import UserStatsRepository
 from capturerrbackend.app.infrastructure.sqlite.book import (
     BookCommandUseCaseUnitOfWorkImpl,
     BookQueryServiceImpl,
@@ -26,6 +27,15 @@ from capturerrbackend.app.infrastructure.sqlite.capture import (
     CaptureQueryServiceImpl,
     CaptureRepositoryImpl,
 )
+from capturerrbackend.app.infrastructure.sqlite.database_async import sessionmanager
+from capturerrbackend.app.infrastructure.sqlite.idempotency import (
+    IdempotencyRepositoryImpl,
+)
+from capturerrbackend.app.infrastructure.sqlite.job import (
+    JOB_HANDLERS,
+    JobRepositoryImpl,
+)
+from capturerrbackend.app.infrastructure.sqlite.sync import SyncQueryServiceImpl
 from capturerrbackend.app.infrastructure.sqlite.tag import (
     TagCommandUseCaseUnitOfWorkImpl,
     TagQueryServiceImpl,
@@ -35,6 +45,7 @@ from capturerrbackend.app.infrastructure.sqlite.user import (
     UserCommandUseCaseUnitOfWorkImpl,
     UserQueryServiceImpl,
     UserRepositoryImpl,
+    UserStatsRepositoryImpl,
 )
 from capturerrbackend.app.usecase.book import (
     BookCommandUseCase,
@@ -52,6 +63,13 @@ from capturerrbackend.app.usecase.capture import (
     CaptureQueryUseCase,
     CaptureQueryUseCaseImpl,
 )
+from capturerrbackend.app.usecase.idempotency import IdempotencyRepository
+from capturerrbackend.app.usecase.job import JobRepository, JobUseCase, JobUseCaseImpl
+from capturerrbackend.app.usecase.sync import (
+    SyncQueryService,
+    SyncQueryUseCase,
+    SyncQueryUseCaseImpl,
+)
 from capturerrbackend.app.usecase.tag import (
     TagCommandUseCase,
     TagCommandUseCaseImpl,
@@ -75,21 +93,19 @@ from capturerrbackend.config.configurator import config
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/users/login")
 
 
-def get_sync_session():  # type: ignore
-    engine = create_engine(str(config.db_url), echo=config.db_echo)
-    factory = sessionmaker(engine)
-    with factory() as session:
+async def get_async_session() -> AsyncIterator[AsyncSession]:
+    async with sessionmanager.session() as session:
         try:
             yield session
-            session.commit()
+            await session.commit()
         except exc.SQLAlchemyError as error:
-            session.rollback()
+            await session.rollback()
             logger.error(error)
             raise
 
 
 def user_query_usecase(
-    db_fixture: Session = Depends(get_sync_session),
+    db_fixture: AsyncSession = Depends(get_async_session),
 ) -> UserQueryUseCase:
     """Get a user query use case."""
     user_query_service: UserQueryService = UserQueryServiceImpl(db_fixture)
@@ -97,18 +113,20 @@ def user_query_usecase(
 
 
 def user_command_usecase(
-    db_fixture: Annotated[Session, Depends(get_sync_session)],
+    db_fixture: Annotated[AsyncSession, Depends(get_async_session)],
 ) -> UserCommandUseCase:
     """Get a user command use case."""
     user_repository: UserRepository = UserRepositoryImpl(db_fixture)
+    job_repository: JobRepository = JobRepositoryImpl(db_fixture)
     uow: UserCommandUseCaseUnitOfWork = UserCommandUseCaseUnitOfWorkImpl(
         db_fixture,
         user_repository=user_repository,
+        job_repository=job_repository,
     )
-    return UserCommandUseCaseImpl(uow)
+    return UserCommandUseCaseImpl(uow, config.job_max_attempts)
 
 
-def get_current_user(
+async def get_current_user(
     token: Annotated[str, Depends(oauth2_scheme)],
     user_query: Annotated[UserQueryUseCase, Depends(user_query_usecase)],
 ) -> UserReadModel:
@@ -122,7 +140,7 @@ def get_current_user(
         raise UserBadCredentialsError
     if td.user_name is None:
         raise UserBadCredentialsError
-    user = user_query.fetch_user_by_user_name(td.user_name)
+    user = await user_query.fetch_user_by_user_name(td.user_name)
     if user is None:
         raise UserBadCredentialsError
     return user
@@ -145,7 +163,7 @@ def get_current_active_super_user(
 
 
 def book_query_usecase(
-    session: Annotated[Session, Depends(get_sync_session)],
+    session: Annotated[AsyncSession, Depends(get_async_session)],
 ) -> BookQueryUseCase:
     """Get a book query use case."""
     book_query_service: BookQueryService = BookQueryServiceImpl(session)
@@ -153,7 +171,7 @@ def book_query_usecase(
 
 
 def book_command_usecase(
-    session: Annotated[Session, Depends(get_sync_session)],
+    session: Annotated[AsyncSession, Depends(get_async_session)],
 ) -> BookCommandUseCase:
     """Get a book command use case."""
     book_repository: BookRepository = BookRepositoryImpl(session)
@@ -165,7 +183,7 @@ def book_command_usecase(
 
 
 def tag_query_usecase(
-    session: Annotated[Session, Depends(get_sync_session)],
+    session: Annotated[AsyncSession, Depends(get_async_session)],
 ) -> TagQueryUseCase:
     """Get a tag query use case."""
     tag_query_service: TagQueryService = TagQueryServiceImpl(session)
@@ -173,19 +191,21 @@ def tag_query_usecase(
 
 
 def tag_command_usecase(
-    session: Annotated[Session, Depends(get_sync_session)],
+    session: Annotated[AsyncSession, Depends(get_async_session)],
 ) -> TagCommandUseCase:
     """Get a tag command use case."""
     tag_repository: TagRepository = TagRepositoryImpl(session)
+    user_stats_repository: UserStatsRepository = UserStatsRepositoryImpl(session)
     uow: TagCommandUseCaseUnitOfWork = TagCommandUseCaseUnitOfWorkImpl(
         session,
         tag_repository=tag_repository,
+        user_stats_repository=user_stats_repository,
     )
     return TagCommandUseCaseImpl(uow)
 
 
 def capture_query_usecase(
-    session: Annotated[Session, Depends(get_sync_session)],
+    session: Annotated[AsyncSession, Depends(get_async_session)],
 ) -> CaptureQueryUseCase:
     """Get a capture query use case."""
     capture_query_service: CaptureQueryService = CaptureQueryServiceImpl(session)
@@ -193,12 +213,41 @@ def capture_query_usecase(
 
 
 def capture_command_usecase(
-    session: Annotated[Session, Depends(get_sync_session)],
+    session: Annotated[AsyncSession, Depends(get_async_session)],
 ) -> CaptureCommandUseCase:
     """Get a capture command use case."""
     capture_repository: CaptureRepository = CaptureRepositoryImpl(session)
+    tag_repository: TagRepository = TagRepositoryImpl(session)
+    user_stats_repository: UserStatsRepository = UserStatsRepositoryImpl(session)
     uow: CaptureCommandUseCaseUnitOfWork = CaptureCommandUseCaseUnitOfWorkImpl(
         session,
         capture_repository=capture_repository,
+        tag_repository=tag_repository,
+        user_stats_repository=user_stats_repository,
     )
     return CaptureCommandUseCaseImpl(uow)
+
+
+def sync_query_usecase(
+    session: Annotated[AsyncSession, Depends(get_async_session)],
+) -> SyncQueryUseCase:
+    """Get a delta sync query use case."""
+    sync_query_service: SyncQueryService = SyncQueryServiceImpl(session)
+    return SyncQueryUseCaseImpl(sync_query_service)
+
+
+def idempotency_repository(
+    session: Annotated[AsyncSession, Depends(get_async_session)],
+) -> Optional[IdempotencyRepository]:
+    """Get the shared store of idempotent responses, if it is enabled."""
+    if not config.idempotency_db_enabled:
+        return None
+    return IdempotencyRepositoryImpl(session)
+
+
+def job_usecase(
+    session: Annotated[AsyncSession, Depends(get_async_session)],
+) -> JobUseCase:
+    """Get a background job use case."""
+    job_repository: JobRepository = JobRepositoryImpl(session)
+    return JobUseCaseImpl(job_repository, JOB_HANDLERS, config.job_max_attempts)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from sqlalchemy import Column, ForeignKey, Table
+from sqlalchemy import Column, ForeignKey, Index, Table
 
 from capturerrbackend.app.infrastructure.sqlite.database import Base
 
@@ -9,4 +9,6 @@ capture_tags = Table(
     Base.metadata,
     Column("capture_id", ForeignKey("capture.id"), primary_key=True),
     Column("tag_id", ForeignKey("tag.id"), primary_key=True),
+    # the primary key covers lookups by capture_id; this one serves tag_id
+    Index("ix_capture_tags_tag_id_capture_id", "tag_id", "capture_id"),
 )
@@ -7,6 +7,7 @@ from sqlalchemy.orm import Mapped, mapped_column, relationship
 from capturerrbackend.app.domain.book.book import Book
 from capturerrbackend.app.domain.book.isbn import Isbn
 from capturerrbackend.app.infrastructure.sqlite.database import Base
+from capturerrbackend.app.infrastructure.sqlite.trash import live_index, trash_indexes
 from capturerrbackend.app.usecase.book import BookReadModel
 
 if TYPE_CHECKING:
@@ -21,6 +22,10 @@ class BookDTO(Base):
     """BookDTO is a data transfer object associated with Book entity."""
 
     __tablename__ = "book"
+    __table_args__ = (
+        live_index("ix_book_user_id_updated_at_id", "user_id", "updated_at", "id"),
+        *trash_indexes("book"),
+    )
     isbn: Mapped[str] = mapped_column(String(17), unique=True, nullable=False)
     title: Mapped[str] = mapped_column(nullable=False)
     page: Mapped[int] = mapped_column(nullable=False)
@@ -51,6 +56,7 @@ class BookDTO(Base):
             read_page=self.read_page,
             created_at=self.created_at,
             updated_at=self.updated_at,
+            deleted_at=self.deleted_at,
         )
 
     @staticmethod
@@ -1,7 +1,19 @@
-from typing import List, Optional
+from typing import Optional
 
+from sqlalchemy import select
 from sqlalchemy.exc import NoResultFound
-from sqlalchemy.orm.session import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from capturerrbackend.app.infrastructure.sqlite.fields import find_one
+from capturerrbackend.app.infrastructure.sqlite.pagination import (
+    paginate,
+    paginate_trash,
+)
+from capturerrbackend.app.infrastructure.sqlite.trash import live
+from capturerrbackend.app.infrastructure.sqlite.version import collection_version
+from capturerrbackend.app.usecase.fields import FieldSet
+from capturerrbackend.app.usecase.pagination import Page, PageParams
+from capturerrbackend.app.usecase.version import CollectionVersion
 
 from ....usecase.book import BookQueryService, BookReadModel
 from .book_dto import BookDTO
@@ -11,12 +23,28 @@ class BookQueryServiceImpl(BookQueryService):
     """BookQueryServiceImpl implements READ operations
     related Book entity using SQLAlchemy."""
 
-    def __init__(self, session: Session):
-        self.session: Session = session
+    def __init__(self, session: AsyncSession):
+        self.session: AsyncSession = session
+
+    async def find_by_id(
+        self,
+        id: str,
+        fields: FieldSet = FieldSet(),
+    ) -> Optional[BookReadModel]:
+        if not fields.is_all:
+            return await find_one(
+                self.session,
+                BookDTO,
+                fields,
+                BookDTO.id == id,
+                live(BookDTO),
+            )
 
-    def find_by_id(self, id: str) -> Optional[BookReadModel]:
         try:
-            book_dto = self.session.query(BookDTO).filter_by(id=id).one()
+            result = await self.session.execute(
+                select(BookDTO).filter_by(id=id).where(live(BookDTO)),
+            )
+            book_dto = result.scalar_one()
         except NoResultFound:
             return None
         except:
@@ -24,35 +52,57 @@ class BookQueryServiceImpl(BookQueryService):
 
         return book_dto.to_read_model()
 
-    def find_all(self) -> List[BookReadModel]:
-        try:
-            book_dtos = (
-                self.session.query(BookDTO)
-                .order_by(BookDTO.updated_at)
-                .limit(100)
-                .all()
-            )
-        except:
-            raise
-
-        if len(book_dtos) == 0:
-            return []
+    async def find_all(
+        self,
+        page: PageParams = PageParams(),
+        fields: FieldSet = FieldSet(),
+    ) -> Page[BookReadModel]:
+        return await paginate(
+            self.session,
+            select(BookDTO).where(live(BookDTO)),
+            BookDTO,
+            page,
+            lambda book_dto: book_dto.to_read_model(),
+            fields,
+        )
 
-        return list(map(lambda book_dto: book_dto.to_read_model(), book_dtos))
-
-    def find_by_user_id(self, user_id: str) -> List[BookReadModel]:
-        try:
-            book_dtos = (
-                self.session.query(BookDTO)
-                .where(BookDTO.user_id == user_id)
-                .order_by(BookDTO.updated_at)
-                .limit(100)
-                .all()
-            )
-        except:
-            raise
+    async def find_by_user_id(
+        self,
+        user_id: str,
+        page: PageParams = PageParams(),
+        fields: FieldSet = FieldSet(),
+    ) -> Page[BookReadModel]:
+        return await paginate(
+            self.session,
+            select(BookDTO).where(BookDTO.user_id == user_id, live(BookDTO)),
+            BookDTO,
+            page,
+            lambda book_dto: book_dto.to_read_model(),
+            fields,
+        )
 
-        if len(book_dtos) == 0:
-            return []
+    async def find_version(
+        self,
+        user_id: Optional[str] = None,
+    ) -> CollectionVersion:
+        if user_id is None:
+            return await collection_version(self.session, BookDTO, live(BookDTO))
+        return await collection_version(
+            self.session,
+            BookDTO,
+            BookDTO.user_id == user_id,
+            live(BookDTO),
+        )
 
-        return list(map(lambda book_dto: book_dto.to_read_model(), book_dtos))
+    async def find_trashed_by_user_id(
+        self,
+        user_id: str,
+        page: PageParams = PageParams(),
+    ) -> Page[BookReadModel]:
+        return await paginate_trash(
+            self.session,
+            select(BookDTO).where(BookDTO.user_id == user_id),
+            BookDTO,
+            page,
+            lambda book_dto: book_dto.to_read_model(),
+        )
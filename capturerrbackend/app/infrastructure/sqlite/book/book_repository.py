@@ -1,25 +1,32 @@
-from typing import Optional
+from typing import Any, Dict, Optional
 
-from sqlalchemy.exc import NoResultFound
-from sqlalchemy.orm.session import Session
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.exc import IntegrityError, NoResultFound
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from capturerrbackend.app.domain.book.book import Book
+from capturerrbackend.app.domain.book.book_exception import BookIsbnAlreadyExistsError
 from capturerrbackend.app.domain.book.book_repository import BookRepository
+from capturerrbackend.app.infrastructure.sqlite.database import is_unique_violation
+from capturerrbackend.app.infrastructure.sqlite.trash import live, trashed
 from capturerrbackend.app.usecase.book import BookCommandUseCaseUnitOfWork
 
-from .book_dto import BookDTO
+from .book_dto import BookDTO, unixtimestamp
 
 
 class BookRepositoryImpl(BookRepository):
     """BookRepositoryImpl implements CRUD operations related Book
     entity using SQLAlchemy."""
 
-    def __init__(self, session: Session) -> None:
-        self.session: Session = session
+    def __init__(self, session: AsyncSession) -> None:
+        self.session: AsyncSession = session
 
-    def find_by_id(self, book_id: str) -> Optional[Book]:
+    async def find_by_id(self, book_id: str) -> Optional[Book]:
         try:
-            book_dto = self.session.query(BookDTO).filter_by(id=book_id).one()
+            result = await self.session.execute(
+                select(BookDTO).filter_by(id=book_id).where(live(BookDTO)),
+            )
+            book_dto = result.scalar_one()
         except NoResultFound:
             return None
         except:
@@ -27,9 +34,12 @@ class BookRepositoryImpl(BookRepository):
 
         return book_dto.to_entity()
 
-    def find_by_isbn(self, isbn: str) -> Optional[Book]:
+    async def find_trashed_by_id(self, book_id: str) -> Optional[Book]:
         try:
-            book_dto = self.session.query(BookDTO).filter_by(isbn=isbn).one()
+            result = await self.session.execute(
+                select(BookDTO).filter_by(id=book_id).where(trashed(BookDTO)),
+            )
+            book_dto = result.scalar_one()
         except NoResultFound:
             return None
         except:
@@ -37,17 +47,73 @@ class BookRepositoryImpl(BookRepository):
 
         return book_dto.to_entity()
 
-    def create(self, book: Book) -> None:
-        book_dto = BookDTO.from_entity(book)
+    async def find_by_isbn(self, isbn: str) -> Optional[Book]:
+        try:
+            result = await self.session.execute(select(BookDTO).filter_by(isbn=isbn))
+            book_dto = result.scalar_one()
+        except NoResultFound:
+            return None
+        except:
+            raise
+
+        return book_dto.to_entity()
+
+    async def create(self, book: Book) -> Book:
+        # the unique constraint detects the conflict, RETURNING reads it back
+        row = BookDTO.from_entity(book).to_row()
         try:
-            self.session.add(book_dto)
+            result = await self.session.execute(
+                insert(BookDTO).values(row).returning(BookDTO),
+            )
+            book_dto = result.scalar_one()
+        except IntegrityError as error:
+            if is_unique_violation(error):
+                raise BookIsbnAlreadyExistsError from error
+            raise
         except:
             raise
 
-    def update(self, book: Book) -> None:
+        return book_dto.to_entity()
+
+    async def patch(
+        self,
+        book_id: str,
+        user_id: str,
+        changes: Dict[str, Any],
+    ) -> Optional[Book]:
+        # a partial change can only be checked against the row itself
+        in_range = func.coalesce(changes.get("read_page"), BookDTO.read_page) <= (
+            func.coalesce(changes.get("page"), BookDTO.page)
+        )
+        try:
+            result = await self.session.execute(
+                update(BookDTO)
+                .where(
+                    BookDTO.id == book_id,
+                    BookDTO.user_id == user_id,
+                    live(BookDTO),
+                    in_range,
+                )
+                .values({**changes, "updated_at": unixtimestamp()})
+                .returning(BookDTO),
+            )
+            book_dto = result.scalar_one_or_none()
+        except IntegrityError as error:
+            if is_unique_violation(error):
+                raise BookIsbnAlreadyExistsError from error
+            raise
+        except:
+            raise
+
+        return None if book_dto is None else book_dto.to_entity()
+
+    async def update(self, book: Book) -> None:
         book_dto = BookDTO.from_entity(book)
         try:
-            _book = self.session.query(BookDTO).filter_by(id=book_dto.id).one()
+            result = await self.session.execute(
+                select(BookDTO).filter_by(id=book_dto.id),
+            )
+            _book = result.scalar_one()
             _book.title = book_dto.title
             _book.page = book_dto.page
             _book.read_page = book_dto.read_page
@@ -56,9 +122,24 @@ class BookRepositoryImpl(BookRepository):
         except:
             raise
 
-    def delete_by_id(self, book_id: str) -> None:
+    async def delete_by_id(self, book_id: str) -> None:
+        now = unixtimestamp()
+        try:
+            await self.session.execute(
+                update(BookDTO)
+                .where(BookDTO.id == book_id, live(BookDTO))
+                .values(deleted_at=now, updated_at=now),
+            )
+        except:
+            raise
+
+    async def restore_by_id(self, book_id: str) -> None:
         try:
-            self.session.query(BookDTO).filter_by(id=book_id).delete()
+            await self.session.execute(
+                update(BookDTO)
+                .where(BookDTO.id == book_id, trashed(BookDTO))
+                .values(deleted_at=None, updated_at=unixtimestamp()),
+            )
         except:
             raise
 
@@ -66,17 +147,17 @@ class BookRepositoryImpl(BookRepository):
 class BookCommandUseCaseUnitOfWorkImpl(BookCommandUseCaseUnitOfWork):
     def __init__(
         self,
-        session: Session,
+        session: AsyncSession,
         book_repository: BookRepository,
     ):
-        self.session: Session = session
+        self.session: AsyncSession = session
         self.book_repository: BookRepository = book_repository
 
-    def begin(self) -> None:
-        self.session.begin()
+    async def begin(self) -> None:
+        await self.session.begin()
 
-    def commit(self) -> None:
-        self.session.commit()
+    async def commit(self) -> None:
+        await self.session.commit()
 
-    def rollback(self) -> None:
-        self.session.rollback()
+    async def rollback(self) -> None:
+        await self.session.rollback()
@@ -4,10 +4,12 @@ from .capture_repository import (
     CaptureCommandUseCaseUnitOfWorkImpl,
     CaptureRepositoryImpl,
 )
+from .capture_search import rebuild_capture_fts
 
 __all__ = [
     "CaptureDTO",
     "CaptureQueryServiceImpl",
     "CaptureRepositoryImpl",
     "CaptureCommandUseCaseUnitOfWorkImpl",
+    "rebuild_capture_fts",
 ]
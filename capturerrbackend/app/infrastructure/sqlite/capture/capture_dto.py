@@ -1,12 +1,13 @@
 from datetime import datetime
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, List, Optional
 
-from sqlalchemy import ForeignKey, String
+from sqlalchemy import BigInteger, ForeignKey, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from capturerrbackend.app.domain.capture.capture import Capture
 from capturerrbackend.app.infrastructure.sqlite.associations import capture_tags
 from capturerrbackend.app.infrastructure.sqlite.database import Base
+from capturerrbackend.app.infrastructure.sqlite.trash import live_index, trash_indexes
 from capturerrbackend.app.usecase.capture import CaptureReadModel
 
 if TYPE_CHECKING:
@@ -22,6 +23,12 @@ class CaptureDTO(Base):
 
     __allow_unmapped__ = True
     __tablename__ = "capture"
+    __table_args__ = (
+        live_index("ix_capture_user_id_updated_at_id", "user_id", "updated_at", "id"),
+        live_index("ix_capture_user_id_happened_at", "user_id", "happened_at"),
+        live_index("ix_capture_user_id_due_date", "user_id", "due_date"),
+        *trash_indexes("capture"),
+    )
     entry: Mapped[str] = mapped_column(String, unique=True, nullable=False)
 
     entry_type: Mapped[str] = mapped_column(String, nullable=True)
@@ -30,8 +37,16 @@ class CaptureDTO(Base):
     location: Mapped[str] = mapped_column(String, nullable=True)
     flagged: Mapped[bool] = mapped_column(unique=False, nullable=True)
     priority: Mapped[str] = mapped_column(String, nullable=True)
-    happened_at: Mapped[int] = mapped_column(String, nullable=True)
-    due_date: Mapped[int] = mapped_column(String, nullable=True)
+    # epoch seconds
+    happened_at: Mapped[int] = mapped_column(BigInteger, nullable=True)
+    due_date: Mapped[int] = mapped_column(BigInteger, nullable=True)
+    # the key of the full-text index; set by its insert trigger (SQLite)
+    search_id: Mapped[Optional[int]] = mapped_column(
+        Integer,
+        unique=True,
+        index=True,
+        nullable=True,
+    )
 
     user_id: Mapped[str] = mapped_column(ForeignKey("user.id"))
     user: Mapped["UserDTO"] = relationship(back_populates="captures")
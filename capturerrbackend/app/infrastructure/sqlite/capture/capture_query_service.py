@@ -1,23 +1,133 @@
-from typing import List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
+from sqlalchemy import ColumnElement, Select, case, exists, func, select
 from sqlalchemy.exc import NoResultFound
-from sqlalchemy.orm.session import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from capturerrbackend.app.usecase.capture import CaptureQueryService, CaptureReadModel
+from capturerrbackend.app.domain.capture.capture_exception import (
+    CaptureSearchUnavailableError,
+)
+from capturerrbackend.app.infrastructure.sqlite.associations import capture_tags
+from capturerrbackend.app.infrastructure.sqlite.fields import find_one
+from capturerrbackend.app.infrastructure.sqlite.pagination import (
+    paginate,
+    paginate_rows,
+    paginate_trash,
+)
+from capturerrbackend.app.infrastructure.sqlite.trash import live
+from capturerrbackend.app.infrastructure.sqlite.version import collection_version
+from capturerrbackend.app.usecase.capture import (
+    CAPTURE_EXPORT_CHUNK,
+    CaptureDateField,
+    CaptureGroupField,
+    CaptureQueryService,
+    CaptureReadModel,
+    CaptureSearchReadModel,
+    CaptureTagFilter,
+    CaptureTimeFilter,
+)
+from capturerrbackend.app.usecase.fields import FieldSet
+from capturerrbackend.app.usecase.pagination import Page, PageParams
+from capturerrbackend.app.usecase.version import CollectionVersion
 
+from ..tag.tag_dto import TagDTO
 from .capture_dto import CaptureDTO
+from .capture_search import (
+    bm25_rank,
+    capture_fts,
+    capture_fts_table,
+    highlighted_snippet,
+    match_expression,
+)
+
+
+def tag_filter_clauses(
+    user_id: str,
+    tags: CaptureTagFilter,
+) -> List[ColumnElement[bool]]:
+    """
+    Compile a tag filter into set-based predicates on ``CaptureDTO``.
+
+    Each tag set only walks the ``capture_tags`` postings of its own tags
+    (via ``ix_tag_user_id_text`` and ``ix_capture_tags_tag_id_capture_id``):
+    include-all keeps the captures that hit every tag (GROUP BY/HAVING),
+    include-any those that hit one, and exclude is an anti-join.
+    """
+
+    def postings(texts: List[str]) -> Select[Tuple[str]]:
+        return (
+            select(capture_tags.c.capture_id)
+            .join(TagDTO, TagDTO.id == capture_tags.c.tag_id)
+            .where(TagDTO.user_id == user_id, live(TagDTO))
+            .where(TagDTO.text.in_(texts))
+        )
+
+    clauses: List[ColumnElement[bool]] = []
+    if tags.include_all:
+        wanted = set(tags.include_all)
+        clauses.append(
+            CaptureDTO.id.in_(
+                postings(list(wanted))
+                .group_by(capture_tags.c.capture_id)
+                .having(func.count(capture_tags.c.tag_id) == len(wanted)),
+            ),
+        )
+    if tags.include_any:
+        clauses.append(CaptureDTO.id.in_(postings(tags.include_any)))
+    if tags.exclude:
+        clauses.append(
+            ~exists(
+                postings(tags.exclude).where(
+                    capture_tags.c.capture_id == CaptureDTO.id,
+                ),
+            ),
+        )
+    return clauses
+
+
+def time_filter_clauses(times: CaptureTimeFilter) -> List[ColumnElement[bool]]:
+    """
+    Compile a time filter into half-open range predicates on ``CaptureDTO``.
+
+    The bounds compare integer epochs, so together with the user id they
+    are answered by ``ix_capture_user_id_happened_at`` and
+    ``ix_capture_user_id_due_date``.  Rows with a NULL date never match.
+    """
+    bounds: List[Tuple[Any, Optional[int], Optional[int]]] = [
+        (CaptureDTO.happened_at, times.happened_from, times.happened_to),
+        (CaptureDTO.due_date, times.due_from, times.due_to),
+    ]
+    clauses: List[ColumnElement[bool]] = []
+    for column, lower, upper in bounds:
+        if lower is not None:
+            clauses.append(column >= lower)
+        if upper is not None:
+            clauses.append(column < upper)
+    return clauses
 
 
 class CaptureQueryServiceImpl(CaptureQueryService):
     """CaptureQueryServiceImpl implements READ operations
     related Capture entity using SQLAlchemy."""
 
-    def __init__(self, session: Session):
-        self.session: Session = session
+    def __init__(self, session: AsyncSession):
+        self.session: AsyncSession = session
+
+    async def find_by_id(
+        self,
+        id: str,
+        fields: FieldSet = FieldSet(),
+        user_id: Optional[str] = None,
+    ) -> Optional[CaptureReadModel]:
+        criteria = [CaptureDTO.id == id, live(CaptureDTO)]
+        if user_id is not None:
+            criteria.append(CaptureDTO.user_id == user_id)
+        if not fields.is_all:
+            return await find_one(self.session, CaptureDTO, fields, *criteria)
 
-    def find_by_id(self, id: str) -> Optional[CaptureReadModel]:
         try:
-            capture_dto = self.session.query(CaptureDTO).filter_by(id=id).one()
+            result = await self.session.execute(select(CaptureDTO).where(*criteria))
+            capture_dto = result.scalar_one()
         except NoResultFound:
             return None
         except:
@@ -25,35 +135,219 @@ class CaptureQueryServiceImpl(CaptureQueryService):
 
         return capture_dto.to_read_model()
 
-    def find_all(self) -> List[CaptureReadModel]:
+    async def find_all(
+        self,
+        page: PageParams = PageParams(),
+        fields: FieldSet = FieldSet(),
+    ) -> Page[CaptureReadModel]:
+        return await paginate(
+            self.session,
+            select(CaptureDTO).where(live(CaptureDTO)),
+            CaptureDTO,
+            page,
+            lambda capture_dto: capture_dto.to_read_model(),
+            fields,
+        )
+
+    async def find_by_user_id(
+        self,
+        user_id: str,
+        page: PageParams = PageParams(),
+        tags: CaptureTagFilter = CaptureTagFilter(),
+        times: CaptureTimeFilter = CaptureTimeFilter(),
+        fields: FieldSet = FieldSet(),
+    ) -> Page[CaptureReadModel]:
+        return await paginate(
+            self.session,
+            select(CaptureDTO)
+            .where(CaptureDTO.user_id == user_id, live(CaptureDTO))
+            .where(*tag_filter_clauses(user_id, tags))
+            .where(*time_filter_clauses(times)),
+            CaptureDTO,
+            page,
+            lambda capture_dto: capture_dto.to_read_model(),
+            fields,
+        )
+
+    async def stream_by_user_id(
+        self,
+        user_id: Optional[str] = None,
+        chunk_size: int = CAPTURE_EXPORT_CHUNK,
+    ) -> AsyncIterator[List[CaptureReadModel]]:
+        """
+        Stream the live captures, most recently updated first.
+
+        ``yield_per`` reads ``chunk_size`` rows per fetch from a server-side
+        cursor and keeps the identity map from growing, so memory follows
+        the chunk size, not the number of captures.
+        """
+        criteria = [live(CaptureDTO)]
+        if user_id is not None:
+            criteria.append(CaptureDTO.user_id == user_id)
+        stmt = (
+            select(CaptureDTO)
+            .where(*criteria)
+            .order_by(CaptureDTO.updated_at.desc(), CaptureDTO.id.desc())
+            .execution_options(yield_per=chunk_size)
+        )
         try:
-            capture_dtos = (
-                self.session.query(CaptureDTO)
-                .order_by(CaptureDTO.updated_at)
-                .limit(100)
-                .all()
-            )
+            result = await self.session.stream_scalars(stmt)
+            async for capture_dtos in result.partitions():
+                yield [capture_dto.to_read_model() for capture_dto in capture_dtos]
         except:
             raise
 
-        if len(capture_dtos) == 0:
-            return []
+    async def search_by_user_id(
+        self,
+        user_id: str,
+        query: str,
+        page: PageParams = PageParams(),
+    ) -> Page[CaptureSearchReadModel]:
+        if self.session.bind.dialect.name != "sqlite":
+            raise CaptureSearchUnavailableError
+
+        match = match_expression(query)
+        if match is None:
+            return Page()
+
+        rank = bm25_rank.label("rank")
+        snippet = highlighted_snippet.label("snippet")
+        stmt = (
+            select(CaptureDTO, rank, snippet)
+            .select_from(capture_fts_table)
+            .join(CaptureDTO, CaptureDTO.search_id == capture_fts_table.c.rowid)
+            .where(capture_fts.op("MATCH")(match))
+            .where(CaptureDTO.user_id == user_id, live(CaptureDTO))
+        )
+        # best (lowest) bm25 first; a cursor keeps the order it was issued for
+        page = PageParams(cursor=page.cursor, limit=page.limit, order="asc")
 
-        return list(map(lambda capture_dto: capture_dto.to_read_model(), capture_dtos))
+        return await paginate_rows(
+            self.session,
+            stmt,
+            (bm25_rank, CaptureDTO.id),
+            page,
+            lambda row: (row.rank, row[0].id),
+            lambda row: CaptureSearchReadModel(
+                **row[0].to_read_model().model_dump(),
+                rank=row.rank,
+                snippet=row.snippet,
+            ),
+        )
 
-    def find_by_user_id(self, user_id: str) -> List[CaptureReadModel]:
+    async def count_by_bucket(
+        self,
+        user_id: str,
+        field: CaptureDateField,
+        edges: List[int],
+    ) -> Dict[int, int]:
+        """
+        Count a user's captures per ``[edges[i], edges[i + 1])`` bucket.
+
+        One grouped query: the outer edges bound an index range scan and a
+        CASE maps each row to the index of its bucket.
+        """
+        column = getattr(CaptureDTO, field)
+        bucket = case(
+            *((column < edge, i) for i, edge in enumerate(edges[1:])),
+        ).label("bucket")
+        stmt = (
+            select(bucket, func.count().label("captures"))
+            .where(CaptureDTO.user_id == user_id, live(CaptureDTO))
+            .where(column >= edges[0], column < edges[-1])
+            .group_by(bucket)
+        )
         try:
-            capture_dtos = (
-                self.session.query(CaptureDTO)
-                .where(CaptureDTO.user_id == user_id)
-                .order_by(CaptureDTO.updated_at)
-                .limit(100)
-                .all()
+            result = await self.session.execute(stmt)
+        except:
+            raise
+
+        return {row.bucket: row.captures for row in result.all()}
+
+    async def count_totals(
+        self,
+        user_id: str,
+        times: CaptureTimeFilter = CaptureTimeFilter(),
+    ) -> Tuple[int, int]:
+        """Count a user's captures and how many of them are flagged."""
+        stmt = (
+            select(
+                func.count().label("total"),
+                func.count(case((CaptureDTO.flagged.is_(True), 1))).label("flagged"),
             )
+            .where(CaptureDTO.user_id == user_id, live(CaptureDTO))
+            .where(*time_filter_clauses(times))
+        )
+        try:
+            result = await self.session.execute(stmt)
+            row = result.one()
         except:
             raise
 
-        if len(capture_dtos) == 0:
-            return []
+        return row.total, row.flagged
+
+    async def count_by_group(
+        self,
+        user_id: str,
+        field: CaptureGroupField,
+        times: CaptureTimeFilter = CaptureTimeFilter(),
+    ) -> Dict[str, int]:
+        """Count a user's captures per entry_type, priority or tag text.
+
+        Captures without a value are left out; with tags a capture counts
+        once for every tag it has.
+        """
+        if field == "tag":
+            key: Any = TagDTO.text
+            stmt = (
+                select(key, func.count().label("captures"))
+                .select_from(CaptureDTO)
+                .join(capture_tags, capture_tags.c.capture_id == CaptureDTO.id)
+                .join(TagDTO, TagDTO.id == capture_tags.c.tag_id)
+                .where(live(TagDTO))
+            )
+        else:
+            key = getattr(CaptureDTO, field)
+            stmt = select(key, func.count().label("captures"))
+        stmt = (
+            stmt.where(CaptureDTO.user_id == user_id, live(CaptureDTO))
+            .where(*time_filter_clauses(times))
+            .where(key.is_not(None))
+            .group_by(key)
+        )
+        try:
+            result = await self.session.execute(stmt)
+        except:
+            raise
+
+        return {row[0]: row.captures for row in result.all()}
+
+    async def find_version(
+        self,
+        user_id: Optional[str] = None,
+    ) -> CollectionVersion:
+        if user_id is None:
+            return await collection_version(
+                self.session,
+                CaptureDTO,
+                live(CaptureDTO),
+            )
+        return await collection_version(
+            self.session,
+            CaptureDTO,
+            CaptureDTO.user_id == user_id,
+            live(CaptureDTO),
+        )
 
-        return list(map(lambda capture_dto: capture_dto.to_read_model(), capture_dtos))
+    async def find_trashed_by_user_id(
+        self,
+        user_id: str,
+        page: PageParams = PageParams(),
+    ) -> Page[CaptureReadModel]:
+        return await paginate_trash(
+            self.session,
+            select(CaptureDTO).where(CaptureDTO.user_id == user_id),
+            CaptureDTO,
+            page,
+            lambda capture_dto: capture_dto.to_read_model(),
+        )
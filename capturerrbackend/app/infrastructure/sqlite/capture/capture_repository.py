@@ -1,13 +1,28 @@
-from typing import Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 
-from sqlalchemy import insert
-from sqlalchemy.exc import NoResultFound
-from sqlalchemy.orm.session import Session
+from sqlalchemy import delete, insert, select, true, update
+from sqlalchemy.exc import IntegrityError, NoResultFound
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from capturerrbackend.app.domain.capture.capture import Capture
+from capturerrbackend.app.domain.capture.capture_exception import (
+    CaptureAlreadyExistsError,
+)
 from capturerrbackend.app.domain.capture.capture_repository import CaptureRepository
+from capturerrbackend.app.domain.tag.tag_repository import TagRepository
+from capturerrbackend.app.domain.user.user_stats_repository import UserStatsRepository
 from capturerrbackend.app.infrastructure.sqlite.associations import capture_tags
-from capturerrbackend.app.infrastructure.sqlite.capture.capture_dto import CaptureDTO
+from capturerrbackend.app.infrastructure.sqlite.capture.capture_dto import (
+    CaptureDTO,
+    unixtimestamp,
+)
+from capturerrbackend.app.infrastructure.sqlite.database import (
+    is_unique_violation,
+    upsert,
+)
+from capturerrbackend.app.infrastructure.sqlite.tag.tag_dto import TagDTO
+from capturerrbackend.app.infrastructure.sqlite.tombstones import bury, unbury
+from capturerrbackend.app.infrastructure.sqlite.trash import live, trashed
 from capturerrbackend.app.usecase.capture import CaptureCommandUseCaseUnitOfWork
 
 
@@ -15,12 +30,33 @@ class CaptureRepositoryImpl(CaptureRepository):
     """CaptureRepositoryImpl implements CRUD operations related Capture
     entity using SQLAlchemy."""
 
-    def __init__(self, session: Session) -> None:
-        self.session: Session = session
+    def __init__(self, session: AsyncSession) -> None:
+        self.session: AsyncSession = session
 
-    def find_by_id(self, capture_id: str) -> Optional[Capture]:
+    async def find_by_id(
+        self,
+        capture_id: str,
+        user_id: Optional[str] = None,
+    ) -> Optional[Capture]:
+        stmt = select(CaptureDTO).filter_by(id=capture_id).where(live(CaptureDTO))
+        if user_id is not None:
+            stmt = stmt.where(CaptureDTO.user_id == user_id)
+        try:
+            result = await self.session.execute(stmt)
+            capture_dto = result.scalar_one()
+        except NoResultFound:
+            return None
+        except:
+            raise
+
+        return capture_dto.to_entity()
+
+    async def find_trashed_by_id(self, capture_id: str) -> Optional[Capture]:
         try:
-            capture_dto = self.session.query(CaptureDTO).filter_by(id=capture_id).one()
+            result = await self.session.execute(
+                select(CaptureDTO).filter_by(id=capture_id).where(trashed(CaptureDTO)),
+            )
+            capture_dto = result.scalar_one()
         except NoResultFound:
             return None
         except:
@@ -28,9 +64,12 @@ class CaptureRepositoryImpl(CaptureRepository):
 
         return capture_dto.to_entity()
 
-    def find_by_entry(self, entry: str) -> Optional[Capture]:
+    async def find_by_entry(self, entry: str) -> Optional[Capture]:
         try:
-            capture_dto = self.session.query(CaptureDTO).filter_by(entry=entry).one()
+            result = await self.session.execute(
+                select(CaptureDTO).filter_by(entry=entry),
+            )
+            capture_dto = result.scalar_one()
         except NoResultFound:
             return None
         except:
@@ -38,55 +77,200 @@ class CaptureRepositoryImpl(CaptureRepository):
 
         return capture_dto.to_entity()
 
-    def create(self, capture: Capture) -> None:
-        capture_dto = CaptureDTO.from_entity(capture)
+    async def create(self, capture: Capture) -> Capture:
+        # the unique constraint detects the conflict, RETURNING reads it back
+        row = CaptureDTO.from_entity(capture).to_row()
+        try:
+            result = await self.session.execute(
+                insert(CaptureDTO).values(row).returning(CaptureDTO),
+            )
+            capture_dto = result.scalar_one()
+        except IntegrityError as error:
+            if is_unique_violation(error):
+                raise CaptureAlreadyExistsError from error
+            raise
+        except:
+            raise
+
+        return capture_dto.to_entity()
+
+    async def find_existing_entries(self, entries: List[str]) -> Set[str]:
+        # one IN lookup on the unique entry index, trash included
+        try:
+            result = await self.session.execute(
+                select(CaptureDTO.entry).where(CaptureDTO.entry.in_(set(entries))),
+            )
+        except:
+            raise
+
+        return set(result.scalars().all())
+
+    async def create_many(self, captures: List[Capture]) -> None:
+        rows = [CaptureDTO.from_entity(capture).to_row() for capture in captures]
+        try:
+            await self.session.execute(insert(CaptureDTO), rows)
+        except:
+            raise
+
+    async def patch(
+        self,
+        capture_id: str,
+        user_id: str,
+        changes: Dict[str, Any],
+    ) -> Optional[Capture]:
         try:
-            self.session.add(capture_dto)
+            result = await self.session.execute(
+                update(CaptureDTO)
+                .where(
+                    CaptureDTO.id == capture_id,
+                    CaptureDTO.user_id == user_id,
+                    live(CaptureDTO),
+                )
+                .values({**changes, "updated_at": unixtimestamp()})
+                .returning(CaptureDTO),
+            )
+            capture_dto = result.scalar_one_or_none()
+        except IntegrityError as error:
+            if is_unique_violation(error):
+                raise CaptureAlreadyExistsError from error
+            raise
         except:
             raise
 
-    def update(self, capture: Capture) -> None:
-        capture_dto = CaptureDTO.from_entity(capture)
+        return None if capture_dto is None else capture_dto.to_entity()
+
+    async def delete_by_id(self, capture_id: str) -> None:
+        # the tag links stay for a restore; the purge deletes them with the row
+        now = unixtimestamp()
         try:
-            _capture = self.session.query(CaptureDTO).filter_by(id=capture_dto.id).one()
-            _capture.entry = capture_dto.entry
-            _capture.entry_type = capture_dto.entry_type
-            _capture.notes = capture_dto.notes
-            _capture.location = capture_dto.location
-            _capture.priority = capture_dto.priority
-            _capture.flagged = capture_dto.flagged
-            _capture.updated_at = capture_dto.updated_at
+            await self.session.execute(
+                bury(CaptureDTO, "capture", CaptureDTO.id == capture_id),
+            )
+            await self.session.execute(
+                update(CaptureDTO)
+                .where(CaptureDTO.id == capture_id, live(CaptureDTO))
+                .values(deleted_at=now, updated_at=now),
+            )
         except:
             raise
 
-    def delete_by_id(self, capture_id: str) -> None:
+    async def restore_by_id(self, capture_id: str) -> None:
         try:
-            self.session.query(CaptureDTO).filter_by(id=capture_id).delete()
+            await self.session.execute(
+                update(CaptureDTO)
+                .where(CaptureDTO.id == capture_id, trashed(CaptureDTO))
+                .values(deleted_at=None, updated_at=unixtimestamp()),
+            )
+            await self.session.execute(unbury("capture", capture_id))
         except:
             raise
 
-    def add_tag(self, capture_id: str, tag_id: str) -> None:
+    async def add_tag(self, capture_id: str, tag_id: str) -> None:
         try:
             stmt = insert(capture_tags).values(capture_id=capture_id, tag_id=tag_id)
-            self.session.execute(stmt)
+            await self.session.execute(stmt)
+            # a new tag changes the capture as listed, and its validator
+            await self.session.execute(
+                update(CaptureDTO)
+                .where(CaptureDTO.id == capture_id)
+                .values(updated_at=unixtimestamp()),
+            )
+        except:
+            raise
+
+    async def add_tags_many(self, links: List[Tuple[str, str]]) -> None:
+        # the captures are new, so unlike add_tag there is no updated_at to bump
+        rows = [
+            {"capture_id": capture_id, "tag_id": tag_id} for capture_id, tag_id in links
+        ]
+        try:
+            await self.session.execute(insert(capture_tags), rows)
+        except:
+            raise
+
+    async def find_owned_ids(self, user_id: str, capture_ids: List[str]) -> Set[str]:
+        try:
+            result = await self.session.execute(
+                select(CaptureDTO.id).where(
+                    CaptureDTO.id.in_(set(capture_ids)),
+                    CaptureDTO.user_id == user_id,
+                    live(CaptureDTO),
+                ),
+            )
         except:
             raise
 
+        return set(result.scalars().all())
+
+    async def attach_tags(self, capture_ids: List[str], tag_ids: List[str]) -> int:
+        # every capture x tag pair in one INSERT … SELECT; existing links
+        # are skipped and only the new ones come back
+        insert = upsert(self.session)
+        pairs = (
+            select(CaptureDTO.id, TagDTO.id)
+            .join_from(CaptureDTO, TagDTO, true())
+            .where(CaptureDTO.id.in_(set(capture_ids)), TagDTO.id.in_(set(tag_ids)))
+        )
+        try:
+            result = await self.session.execute(
+                insert(capture_tags)
+                .from_select([capture_tags.c.capture_id, capture_tags.c.tag_id], pairs)
+                .on_conflict_do_nothing()
+                .returning(capture_tags.c.capture_id),
+            )
+            linked = list(result.scalars().all())
+            await self._touch(linked)
+        except:
+            raise
+
+        return len(linked)
+
+    async def detach_tags(self, capture_ids: List[str], tag_ids: List[str]) -> int:
+        try:
+            result = await self.session.execute(
+                delete(capture_tags)
+                .where(
+                    capture_tags.c.capture_id.in_(set(capture_ids)),
+                    capture_tags.c.tag_id.in_(set(tag_ids)),
+                )
+                .returning(capture_tags.c.capture_id),
+            )
+            unlinked = list(result.scalars().all())
+            await self._touch(unlinked)
+        except:
+            raise
+
+        return len(unlinked)
+
+    async def _touch(self, capture_ids: List[str]) -> None:
+        """Bump ``updated_at`` of the captures whose tags changed."""
+        if len(capture_ids) == 0:
+            return
+        await self.session.execute(
+            update(CaptureDTO)
+            .where(CaptureDTO.id.in_(set(capture_ids)))
+            .values(updated_at=unixtimestamp()),
+        )
+
 
 class CaptureCommandUseCaseUnitOfWorkImpl(CaptureCommandUseCaseUnitOfWork):
     def __init__(
         self,
-        session: Session,
+        session: AsyncSession,
         capture_repository: CaptureRepository,
+        tag_repository: TagRepository,
+        user_stats_repository: UserStatsRepository,
     ):
-        self.session: Session = session
+        self.session: AsyncSession = session
         self.capture_repository: CaptureRepository = capture_repository
+        self.tag_repository: TagRepository = tag_repository
+        self.user_stats_repository: UserStatsRepository = user_stats_repository
 
-    def begin(self) -> None:
-        self.session.begin()
+    async def begin(self) -> None:
+        await self.session.begin()
 
-    def commit(self) -> None:
-        self.session.commit()
+    async def commit(self) -> None:
+        await self.session.commit()
 
-    def rollback(self) -> None:
-        self.session.rollback()
+    async def rollback(self) -> None:
+        await self.session.rollback()
@@ -0,0 +1,138 @@
+from typing import Any, List, Optional
+
+from sqlalchemy import (
+    ColumnClause,
+    Connection,
+    column,
+    event,
+    func,
+    literal_column,
+    table,
+    text,
+)
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from .capture_dto import CaptureDTO
+
+CAPTURE_FTS_TABLE = "capture_fts"
+""" FTS5 index over capture.entry/capture.notes (external content). """
+
+# Weights handed to bm25(): a hit in the entry counts more than in the notes.
+ENTRY_WEIGHT = 10.0
+NOTES_WEIGHT = 1.0
+
+CAPTURE_FTS_KEY = "search_id"
+""" The integer column of capture the index is keyed by.
+
+``capture`` has a text primary key, so its implicit rowid is no stable key:
+VACUUM and table rebuilds may renumber it, and the index would then point
+at the wrong captures.  ``search_id`` is a real column, kept as it is.
+"""
+
+
+def capture_fts_ddl(key: str = CAPTURE_FTS_KEY) -> List[str]:
+    """
+    The FTS5 table over capture and the triggers that keep it in sync.
+
+    A new capture gets the next ``key`` on insert.  Migrations of the
+    schema before ``search_id`` pass ``"rowid"``.
+    """
+    assign = (
+        ""
+        if key == "rowid"
+        else f"""
+        UPDATE capture
+        SET {key} = (SELECT coalesce(max({key}), 0) + 1 FROM capture)
+        WHERE rowid = new.rowid AND new.{key} IS NULL;"""
+    )
+    return [
+        f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {CAPTURE_FTS_TABLE} USING fts5(
+            entry,
+            notes,
+            content='capture',
+            content_rowid='{key}',
+            tokenize='porter unicode61'
+        )
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS capture_fts_ai AFTER INSERT ON capture BEGIN{assign}
+            INSERT INTO {CAPTURE_FTS_TABLE}(rowid, entry, notes)
+            SELECT {key}, entry, notes FROM capture WHERE rowid = new.rowid;
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS capture_fts_ad AFTER DELETE ON capture BEGIN
+            INSERT INTO {CAPTURE_FTS_TABLE}({CAPTURE_FTS_TABLE}, rowid, entry, notes)
+            VALUES ('delete', old.{key}, old.entry, old.notes);
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS capture_fts_au
+        AFTER UPDATE OF entry, notes ON capture BEGIN
+            INSERT INTO {CAPTURE_FTS_TABLE}({CAPTURE_FTS_TABLE}, rowid, entry, notes)
+            VALUES ('delete', old.{key}, old.entry, old.notes);
+            INSERT INTO {CAPTURE_FTS_TABLE}(rowid, entry, notes)
+            VALUES (new.{key}, new.entry, new.notes);
+        END
+        """,
+    ]
+
+
+CREATE_CAPTURE_FTS: List[str] = capture_fts_ddl()
+
+DROP_CAPTURE_FTS: List[str] = [
+    "DROP TRIGGER IF EXISTS capture_fts_au",
+    "DROP TRIGGER IF EXISTS capture_fts_ad",
+    "DROP TRIGGER IF EXISTS capture_fts_ai",
+    f"DROP TABLE IF EXISTS {CAPTURE_FTS_TABLE}",
+]
+
+REBUILD_CAPTURE_FTS = (
+    f"INSERT INTO {CAPTURE_FTS_TABLE}({CAPTURE_FTS_TABLE}) VALUES ('rebuild')"
+)
+
+
+@event.listens_for(CaptureDTO.__table__, "after_create")
+def create_capture_fts(target: Any, connection: Connection, **kw: Any) -> None:
+    """Create the FTS5 table and its sync triggers next to ``capture``."""
+    if connection.dialect.name != "sqlite":
+        return
+    for ddl in CREATE_CAPTURE_FTS:
+        connection.execute(text(ddl))
+
+
+@event.listens_for(CaptureDTO.__table__, "before_drop")
+def drop_capture_fts(target: Any, connection: Connection, **kw: Any) -> None:
+    if connection.dialect.name != "sqlite":
+        return
+    for ddl in DROP_CAPTURE_FTS:
+        connection.execute(text(ddl))
+
+
+async def rebuild_capture_fts(connection: AsyncConnection) -> None:
+    """Re-index every capture, e.g. for rows written before the triggers."""
+    await connection.execute(text(REBUILD_CAPTURE_FTS))
+
+
+def match_expression(query: str) -> Optional[str]:
+    """
+    Turn free text into an FTS5 MATCH expression.
+
+    Every whitespace separated term becomes a quoted string, so user input
+    can never be parsed as FTS5 query syntax; the terms are ANDed.  The last
+    term is matched as a prefix to support search-as-you-type.
+    """
+    terms = ['"' + term.replace('"', '""') + '"' for term in query.split()]
+    if len(terms) == 0:
+        return None
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+capture_fts_table = table(CAPTURE_FTS_TABLE, column("rowid"))
+# the hidden column named like the table, used by MATCH and the rank functions
+capture_fts: ColumnClause[Any] = literal_column(CAPTURE_FTS_TABLE)
+
+bm25_rank = func.bm25(capture_fts, ENTRY_WEIGHT, NOTES_WEIGHT)
+highlighted_snippet = func.snippet(capture_fts, -1, "<mark>", "</mark>", "…", 16)
@@ -1,26 +1,120 @@
+from typing import Any, Callable
+
 import sqlalchemy as sa
-from sqlalchemy import Boolean, Integer, create_engine, func
+from loguru import logger
+from sqlalchemy import Boolean, Engine, Integer, event, func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.ext.declarative import declared_attr
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, sessionmaker
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from capturerrbackend.config.configurator import config
 
-engine = create_engine(
-    str(config.db_url),
-    connect_args={
-        "check_same_thread": False,
-    },
-)
-
-SessionLocal = sessionmaker(
-    bind=engine,
-    autocommit=False,
-    autoflush=False,
-)
 
-
-def create_tables() -> None:
-    Base.metadata.create_all(bind=engine)
+def engine_options(url: str) -> dict[str, Any]:
+    """
+    Build the keyword arguments used to create the process wide engine.
+
+    Pool sizing, recycling and pre-ping come from ``config``.  In-memory
+    SQLite databases use a singleton pool, so the queue pool options are
+    only passed for real files and server databases.
+    """
+    options: dict[str, Any] = {
+        "echo": config.db_echo,
+        "pool_pre_ping": config.db_pool_pre_ping,
+        "pool_recycle": config.db_pool_recycle,
+    }
+    db_url = make_url(url)
+    if db_url.get_backend_name() == "sqlite":
+        options["connect_args"] = {"check_same_thread": False}
+        if db_url.database in (None, "", ":memory:"):
+            return options
+        if db_url.get_dialect().is_async:
+            # aiosqlite defaults to NullPool for files; keep connections pooled.
+            options["poolclass"] = AsyncAdaptedQueuePool
+
+    options["pool_size"] = config.db_pool_size
+    options["max_overflow"] = config.db_max_overflow
+    return options
+
+
+SQLITE_PROFILES: dict[str, dict[str, Any]] = {
+    # Safe for data that must survive a power loss: every commit is fsynced.
+    "durable": {
+        "busy_timeout": 5000,
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "foreign_keys": "ON",
+        "temp_store": "DEFAULT",
+        "cache_size": -16000,
+        "mmap_size": 64 * 1024 * 1024,
+    },
+    # WAL + NORMAL only fsyncs at checkpoints; a crash can lose the last
+    # commits but never corrupts the file.
+    "throughput": {
+        "busy_timeout": 5000,
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "foreign_keys": "ON",
+        "temp_store": "MEMORY",
+        "cache_size": -64000,
+        "mmap_size": 256 * 1024 * 1024,
+    },
+    "none": {},
+}
+""" Named PRAGMA presets, applied in order to every new SQLite connection. """
+
+
+def apply_sqlite_profile(engine: Engine, profile: str) -> None:
+    """
+    Run the PRAGMAs of ``profile`` on every connection ``engine`` opens.
+
+    Async engines pass their ``sync_engine``.  The values SQLite reports
+    back are logged for the first connection (e.g. in-memory databases
+    answer ``journal_mode=memory`` instead of ``wal``).
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(f"Unknown SQLite profile: {profile}")
+
+    pragmas = SQLITE_PROFILES[profile]
+    logged = False
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+        nonlocal logged
+        cursor = dbapi_connection.cursor()
+        applied: dict[str, Any] = {}
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name} = {value}")
+                cursor.execute(f"PRAGMA {name}")
+                row = cursor.fetchone()
+                applied[name] = row[0] if row else None
+        finally:
+            cursor.close()
+
+        if not logged:
+            logger.info(f"SQLite profile '{profile}' applied: {applied}")
+            logged = True
+
+
+def upsert(session: AsyncSession) -> Callable[..., Any]:
+    """The INSERT … ON CONFLICT construct of the session's dialect."""
+    if session.bind.dialect.name == "postgresql":
+        return postgresql.insert
+    return sqlite.insert
+
+
+def is_unique_violation(error: IntegrityError) -> bool:
+    """Whether ``error`` is a UNIQUE (not a NOT NULL or FOREIGN KEY) violation."""
+    if getattr(error.orig, "pgcode", None) == "23505":
+        return True
+    return "UNIQUE constraint failed" in str(error.orig)
 
 
 class Base(DeclarativeBase):
@@ -33,6 +127,22 @@ class Base(DeclarativeBase):
 
     is_active = mapped_column(Boolean, default=True)
 
+    def to_row(self) -> dict[str, Any]:
+        """
+        The column values of this (not yet added) object, for a bulk INSERT.
+
+        Unset columns with a plain value default get it, as a flush would
+        give them; every row of an executemany needs the same keys.
+        """
+        row: dict[str, Any] = {}
+        for column in self.__table__.columns:
+            value = getattr(self, column.key)
+            if value is None and column.default is not None:
+                if column.default.is_scalar:
+                    value = column.default.arg  # type: ignore[attr-defined]
+            row[column.key] = value
+        return row
+
     @declared_attr
     def created_at(self) -> Mapped[int]:
         """
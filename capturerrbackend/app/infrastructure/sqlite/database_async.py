@@ -1,128 +1,97 @@
-# import contextlib
-# from typing import AsyncIterator, Iterator
-
-# from sqlalchemy import create_engine
-# from sqlalchemy.engine import Connection, Engine
-# from sqlalchemy.ext.asyncio import (
-#     AsyncConnection,
-#     AsyncEngine,
-#     AsyncSession,
-#     async_sessionmaker,
-#     create_async_engine,
-# )
-# from sqlalchemy.orm import declarative_base, sessionmaker
-# from sqlalchemy.orm.session import Session
-
-# Base = declarative_base()
-
-
-# class DatabaseSessionManagerAsync:
-#     def __init__(self):
-#         self._engine: AsyncEngine | None = None
-#         self._sessionmaker: async_sessionmaker | None = None
-
-#     def init(self, host: str):
-#         self._engine = create_async_engine(host)
-#         self._sessionmaker = async_sessionmaker(autocommit=False, bind=self._engine)
-
-#     async def close(self):
-#         if self._engine is None:
-#             raise Exception("DatabaseSessionManager is not initialized")
-#         await self._engine.dispose()
-#         self._engine = None
-#         self._sessionmaker = None
-
-#     @contextlib.asynccontextmanager
-#     async def connect(self) -> AsyncIterator[AsyncConnection]:
-#         if self._engine is None:
-#             raise Exception("DatabaseSessionManager is not initialized")
-
-#         async with self._engine.begin() as connection:
-#             try:
-#                 yield connection
-#             except Exception:
-#                 await connection.rollback()
-#                 raise
-
-#     @contextlib.asynccontextmanager
-#     async def session(self) -> AsyncIterator[AsyncSession]:
-#         if self._sessionmaker is None:
-#             raise Exception("DatabaseSessionManager is not initialized")
-
-#         session = self._sessionmaker()
-#         try:
-#             yield session
-#         except Exception:
-#             await session.rollback()
-#             raise
-#         finally:
-#             await session.close()
-
-#     async def create_all(self, connection: AsyncConnection):
-#         await connection.run_sync(Base.metadata.create_all)
-
-#     async def drop_all(self, connection: AsyncConnection):
-#         await connection.run_sync(Base.metadata.drop_all)
-
-
-# class DatabaseSessionManagerSync:
-#     def __init__(self):
-#         self._engine: Engine | None = None
-#         self._sessionmaker: sessionmaker | None = None
-
-#     def init(self, host: str):
-#         self._engine = create_engine(host)
-#         self._sessionmaker = sessionmaker(autocommit=False, bind=self._engine)
-
-#     def close(self):
-#         if self._engine is None:
-#             raise Exception("DatabaseSessionManager is not initialized")
-#         self._engine.dispose()
-#         self._engine = None
-#         self._sessionmaker = None
-
-#     @contextlib.contextmanager
-#     def connect(self) -> Iterator[Connection]:
-#         if self._engine is None:
-#             raise Exception("DatabaseSessionManager is not initialized")
-
-#         with self._engine.begin() as connection:
-#             try:
-#                 yield connection
-#             except Exception:
-#                 connection.rollback()
-#                 raise
-
-#     @contextlib.contextmanager
-#     def session(self) -> Iterator[Session]:
-#         if self._sessionmaker is None:
-#             raise Exception("DatabaseSessionManager is not initialized")
-
-#         session = self._sessionmaker()
-#         try:
-#             yield session
-#         except Exception:
-#             session.rollback()
-#             raise
-#         finally:
-#             session.close()
-
-#     def create_all(self, connection: Session):
-#         connection.run_sync(Base.metadata.create_all)
-
-#     def drop_all(self, connection: Session):
-#         connection.run_sync(Base.metadata.drop_all)
-
-
-# sessionmanager = DatabaseSessionManagerSync()
-# sessionmanagerAsync = DatabaseSessionManagerAsync()
-
-
-# def get_db():
-#     with sessionmanager.session() as session:
-#         yield session
-
-
-# def get_db_async():
-#     with sessionmanagerAsync.session() as session:
-#         yield session
+import contextlib
+from typing import AsyncIterator, Optional
+
+from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from capturerrbackend.app.infrastructure.sqlite.database import (
+    Base,
+    apply_sqlite_profile,
+    engine_options,
+)
+from capturerrbackend.config.configurator import config
+
+
+class DatabaseSessionManager:
+    """Owns the AsyncEngine and session factory shared by the whole process.
+
+    ``init`` is called once at application startup and ``close`` at
+    shutdown.  Every request borrows a pooled connection through
+    ``session()``; the driver (aiosqlite / asyncpg) awaits the database
+    so concurrent requests overlap their I/O on the event loop.
+    """
+
+    def __init__(self) -> None:
+        self._engine: Optional[AsyncEngine] = None
+        self._sessionmaker: Optional[async_sessionmaker[AsyncSession]] = None
+
+    @property
+    def engine(self) -> AsyncEngine:
+        if self._engine is None:
+            raise Exception("DatabaseSessionManager is not initialized")
+        return self._engine
+
+    @property
+    def is_initialized(self) -> bool:
+        return self._engine is not None
+
+    def init(self, url: str) -> None:
+        self._engine = create_async_engine(url, **engine_options(url))
+        apply_sqlite_profile(self._engine.sync_engine, config.db_sqlite_profile)
+        # Objects must stay readable after commit: an expired attribute
+        # would need implicit (blocking) IO to reload.
+        self._sessionmaker = async_sessionmaker(
+            bind=self._engine,
+            autocommit=False,
+            autoflush=False,
+            expire_on_commit=False,
+        )
+
+    async def close(self) -> None:
+        if self._engine is None:
+            raise Exception("DatabaseSessionManager is not initialized")
+        await self._engine.dispose()
+        self._engine = None
+        self._sessionmaker = None
+
+    @contextlib.asynccontextmanager
+    async def connect(self) -> AsyncIterator[AsyncConnection]:
+        async with self.engine.begin() as connection:
+            try:
+                yield connection
+            except Exception:
+                await connection.rollback()
+                raise
+
+    @contextlib.asynccontextmanager
+    async def session(self) -> AsyncIterator[AsyncSession]:
+        if self._sessionmaker is None:
+            raise Exception("DatabaseSessionManager is not initialized")
+
+        session = self._sessionmaker()
+        try:
+            yield session
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+    async def create_all(self, connection: AsyncConnection) -> None:
+        await connection.run_sync(Base.metadata.create_all)
+
+    async def drop_all(self, connection: AsyncConnection) -> None:
+        await connection.run_sync(Base.metadata.drop_all)
+
+
+sessionmanager = DatabaseSessionManager()
+
+
+async def create_tables() -> None:
+    async with sessionmanager.connect() as connection:
+        await sessionmanager.create_all(connection)
@@ -0,0 +1,51 @@
+from typing import Any, List, Optional, Type, get_args
+
+from sqlalchemy import ColumnElement, String, cast, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from capturerrbackend.app.infrastructure.sqlite.database import Base
+from capturerrbackend.app.usecase.fields import FieldSet
+
+KEY_COLUMNS = ("id", "user_id", "updated_at")
+""" Always loaded: paging sorts on updated_at/id, routes check user_id. """
+
+
+def projection(dto: Type[Base], fields: FieldSet) -> List[ColumnElement[Any]]:
+    """
+    The columns of ``dto`` a sparse fieldset needs, instead of the entity.
+
+    A column whose read model field is a ``str`` (say a stringified
+    timestamp) is cast in SQL, the same conversion ``to_read_model`` does.
+    """
+    read_model = fields.read_model
+    columns: List[ColumnElement[Any]] = []
+    for name, column in dto.__table__.columns.items():
+        if name not in fields.names and name not in KEY_COLUMNS:
+            continue
+        field = read_model.model_fields.get(name) if read_model else None
+        wants_str = field is not None and (
+            field.annotation is str or str in get_args(field.annotation)
+        )
+        if wants_str and column.type.python_type is not str:
+            columns.append(cast(column, String).label(name))
+        else:
+            columns.append(column)
+    return columns
+
+
+async def find_one(
+    session: AsyncSession,
+    dto: Type[Base],
+    fields: FieldSet,
+    *criteria: ColumnElement[bool],
+) -> Optional[Any]:
+    """Load the sparse read model of the one ``dto`` row matching ``criteria``."""
+    try:
+        result = await session.execute(
+            select(*projection(dto, fields)).where(*criteria),
+        )
+        row = result.one_or_none()
+    except:
+        raise
+
+    return None if row is None else fields.build(dict(row._mapping))
@@ -0,0 +1,87 @@
+from typing import Optional
+
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Index,
+    Integer,
+    String,
+    Table,
+    Text,
+    delete,
+    select,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from capturerrbackend.app.infrastructure.sqlite.database import Base, upsert
+from capturerrbackend.app.usecase.idempotency import (
+    IdempotencyRepository,
+    StoredResponse,
+)
+
+idempotency_keys = Table(
+    "idempotency_keys",
+    Base.metadata,
+    # "<user id>:<method>:<path>:<Idempotency-Key>"
+    Column("key", String, primary_key=True),
+    Column("fingerprint", String, nullable=False),
+    Column("status_code", Integer, nullable=False),
+    Column("body", Text, nullable=False),
+    # milliseconds, like updated_at
+    Column("expires_at", BigInteger, nullable=False),
+    Index("ix_idempotency_keys_expires_at", "expires_at"),
+)
+""" The responses of idempotent requests, shared by every worker process. """
+
+
+class IdempotencyRepositoryImpl(IdempotencyRepository):
+    """IdempotencyRepositoryImpl keeps the stored responses in ``idempotency_keys``."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session: AsyncSession = session
+
+    async def find(self, key: str, now: int) -> Optional[StoredResponse]:
+        try:
+            result = await self.session.execute(
+                select(idempotency_keys).where(
+                    idempotency_keys.c.key == key,
+                    idempotency_keys.c.expires_at > now,
+                ),
+            )
+            row = result.one_or_none()
+        except:
+            raise
+
+        return None if row is None else StoredResponse.model_validate(row._mapping)
+
+    async def save(self, key: str, response: StoredResponse) -> None:
+        """
+        Store ``response``, replacing an expired one of the same key.
+
+        It commits right away: the write it answers for is committed
+        already, and a retry on another worker must find it.
+        """
+        insert = upsert(self.session)
+        row = {"key": key, **response.model_dump()}
+        try:
+            await self.session.execute(
+                insert(idempotency_keys)
+                .values(row)
+                .on_conflict_do_update(index_elements=["key"], set_=row),
+            )
+            await self.session.commit()
+        except:
+            await self.session.rollback()
+            raise
+
+    async def delete_expired(self, now: int) -> int:
+        try:
+            result = await self.session.execute(
+                delete(idempotency_keys).where(idempotency_keys.c.expires_at <= now),
+            )
+            await self.session.commit()
+        except:
+            await self.session.rollback()
+            raise
+
+        return result.rowcount
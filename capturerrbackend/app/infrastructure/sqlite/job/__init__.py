@@ -0,0 +1,11 @@
+from .job_repository import JobRepositoryImpl, job_table
+from .job_worker import JOB_HANDLERS, JobHandler, run_job_pool, run_next_job
+
+__all__ = [
+    "JobRepositoryImpl",
+    "job_table",
+    "JOB_HANDLERS",
+    "JobHandler",
+    "run_job_pool",
+    "run_next_job",
+]
@@ -0,0 +1,250 @@
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import (
+    JSON,
+    BigInteger,
+    Column,
+    ColumnElement,
+    Index,
+    Integer,
+    String,
+    Table,
+    Text,
+    case,
+    insert,
+    select,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from capturerrbackend.app.infrastructure.sqlite.database import Base
+from capturerrbackend.app.usecase.job import JobReadModel, JobRepository
+
+job_table = Table(
+    "job",
+    Base.metadata,
+    Column("id", String, primary_key=True),
+    Column("kind", String, nullable=False),
+    Column("params", JSON, nullable=False),
+    # who asked for it; not a foreign key, a job may outlive its user
+    Column("user_id", String, nullable=True, index=True),
+    Column("status", String, nullable=False),
+    Column("attempts", Integer, nullable=False),
+    Column("max_attempts", Integer, nullable=False),
+    # milliseconds, like updated_at
+    Column("run_after", BigInteger, nullable=False),
+    Column("locked_by", String, nullable=True),
+    Column("locked_at", BigInteger, nullable=True),
+    Column("result", JSON, nullable=True),
+    Column("error", Text, nullable=True),
+    Column("created_at", BigInteger, nullable=False),
+    Column("updated_at", BigInteger, nullable=False),
+    Column("finished_at", BigInteger, nullable=True),
+    Index("ix_job_status_run_after", "status", "run_after"),
+)
+""" The queue of background jobs, shared by the API and the worker processes. """
+
+
+class JobRepositoryImpl(JobRepository):
+    """JobRepositoryImpl keeps the jobs in the ``job`` table.
+
+    Every state change commits at once: a job is claimed, retried or
+    finished independently of whatever else the session does.  Only
+    ``add`` leaves the commit to the caller, so a job can be queued
+    together with the change that asks for it.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session: AsyncSession = session
+
+    async def create(self, job: JobReadModel) -> JobReadModel:
+        try:
+            await self.add(job)
+            await self.session.commit()
+        except:
+            await self.session.rollback()
+            raise
+
+        return job
+
+    async def add(self, job: JobReadModel) -> JobReadModel:
+        try:
+            await self.session.execute(insert(job_table).values(job.model_dump()))
+        except:
+            raise
+
+        return job
+
+    async def find_by_id(
+        self,
+        id: str,
+        user_id: Optional[str] = None,
+    ) -> Optional[JobReadModel]:
+        criteria = [job_table.c.id == id]
+        if user_id is not None:
+            criteria.append(job_table.c.user_id == user_id)
+        try:
+            result = await self.session.execute(select(job_table).where(*criteria))
+            row = result.one_or_none()
+        except:
+            raise
+
+        return None if row is None else JobReadModel.model_validate(row._mapping)
+
+    async def claim_next(self, worker: str, now: int) -> Optional[JobReadModel]:
+        """
+        Mark the oldest due job running with an ``UPDATE ... RETURNING``.
+
+        The due job is looked up first, so an idle poll only reads.  The
+        UPDATE checks the status again, so of two workers racing for the
+        same job only one gets it back; the other finds nothing this round.
+        """
+        try:
+            result = await self.session.execute(
+                select(job_table.c.id)
+                .where(job_table.c.status == "queued", job_table.c.run_after <= now)
+                .order_by(job_table.c.run_after, job_table.c.created_at)
+                .limit(1),
+            )
+            id = result.scalar_one_or_none()
+            if id is None:
+                await self.session.rollback()
+                return None
+
+            result = await self.session.execute(
+                update(job_table)
+                .where(job_table.c.id == id, job_table.c.status == "queued")
+                .values(
+                    status="running",
+                    attempts=job_table.c.attempts + 1,
+                    locked_by=worker,
+                    locked_at=now,
+                    updated_at=now,
+                )
+                .returning(*job_table.c),
+            )
+            row = result.one_or_none()
+            await self.session.commit()
+        except:
+            await self.session.rollback()
+            raise
+
+        return None if row is None else JobReadModel.model_validate(row._mapping)
+
+    async def renew(self, id: str, worker: str, now: int) -> bool:
+        try:
+            result = await self.session.execute(
+                update(job_table)
+                .where(*self._held(id, worker))
+                .values(locked_at=now, updated_at=now),
+            )
+            await self.session.commit()
+        except:
+            await self.session.rollback()
+            raise
+
+        return result.rowcount == 1
+
+    async def succeed(
+        self,
+        id: str,
+        worker: str,
+        result: Dict[str, Any],
+        now: int,
+    ) -> bool:
+        return await self._finish(
+            id,
+            worker,
+            status="succeeded",
+            result=result,
+            error=None,
+            finished_at=now,
+            updated_at=now,
+        )
+
+    async def fail(
+        self,
+        id: str,
+        worker: str,
+        error: str,
+        now: int,
+        retry_at: Optional[int] = None,
+    ) -> bool:
+        if retry_at is None:
+            return await self._finish(
+                id,
+                worker,
+                status="failed",
+                error=error,
+                finished_at=now,
+                updated_at=now,
+            )
+        return await self._finish(
+            id,
+            worker,
+            status="queued",
+            error=error,
+            run_after=retry_at,
+            updated_at=now,
+        )
+
+    async def requeue_stale(self, before: int, now: int) -> int:
+        """
+        Queue the jobs whose lease was last renewed before ``before``
+        again, or fail them when they are out of attempts: their worker is
+        gone.  A live worker renews its lease while the job runs.
+        """
+        spent = job_table.c.attempts >= job_table.c.max_attempts
+        try:
+            result = await self.session.execute(
+                update(job_table)
+                .where(
+                    job_table.c.status == "running",
+                    job_table.c.locked_by.is_not(None),
+                    job_table.c.locked_at < before,
+                )
+                .values(
+                    status=case((spent, "failed"), else_="queued"),
+                    finished_at=case((spent, now), else_=None),
+                    error="the worker running the job stopped",
+                    run_after=now,
+                    locked_by=None,
+                    locked_at=None,
+                    updated_at=now,
+                ),
+            )
+            await self.session.commit()
+        except:
+            await self.session.rollback()
+            raise
+
+        return result.rowcount
+
+    @staticmethod
+    def _held(id: str, worker: str) -> List[ColumnElement[bool]]:
+        """The job is running, under the lease of ``worker``."""
+        return [
+            job_table.c.id == id,
+            job_table.c.status == "running",
+            job_table.c.locked_by == worker,
+        ]
+
+    async def _finish(self, id: str, worker: str, **values: Any) -> bool:
+        """
+        Release the job with ``values``, only if ``worker`` still holds it.
+
+        A worker whose lease ran out may have had its job handed to another;
+        what it reports then is dropped instead of overwriting the new run.
+        """
+        try:
+            result = await self.session.execute(
+                update(job_table)
+                .where(*self._held(id, worker))
+                .values(locked_by=None, locked_at=None, **values),
+            )
+            await self.session.commit()
+        except:
+            await self.session.rollback()
+            raise
+
+        return result.rowcount == 1
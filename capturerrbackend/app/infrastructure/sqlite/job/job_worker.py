@@ -0,0 +1,254 @@
+import asyncio
+import os
+import socket
+from contextlib import suppress
+from datetime import datetime
+from typing import Any, AsyncContextManager, Awaitable, Callable, Dict, Optional
+
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from capturerrbackend.app.infrastructure.sqlite.capture import rebuild_capture_fts
+from capturerrbackend.app.infrastructure.sqlite.database_async import sessionmanager
+from capturerrbackend.app.infrastructure.sqlite.purge import (
+    expired_before,
+    purge_trash,
+    purge_user,
+)
+from capturerrbackend.app.infrastructure.sqlite.user import UserStatsRepositoryImpl
+from capturerrbackend.app.usecase.job import JobReadModel, retry_delay
+from capturerrbackend.config.configurator import config
+
+from .job_repository import JobRepositoryImpl
+
+JobHandler = Callable[[AsyncSession, Dict[str, Any]], Awaitable[Dict[str, Any]]]
+""" Runs one kind of job with its params; returns what the job reports. """
+
+SessionFactory = Callable[[], AsyncContextManager[AsyncSession]]
+
+
+def unixtimestamp() -> int:
+    return int(datetime.now().timestamp() * 1000)
+
+
+async def rebuild_search_job(
+    session: AsyncSession,
+    params: Dict[str, Any],
+) -> Dict[str, Any]:
+    await rebuild_capture_fts(await session.connection())
+    await session.commit()
+    return {}
+
+
+async def recompute_stats_job(
+    session: AsyncSession,
+    params: Dict[str, Any],
+) -> Dict[str, Any]:
+    user_id = params.get("user_id")
+    await UserStatsRepositoryImpl(session).recompute(user_id)
+    await session.commit()
+    return {"user_id": user_id}
+
+
+async def purge_trash_job(
+    session: AsyncSession,
+    params: Dict[str, Any],
+) -> Dict[str, Any]:
+    retention_days = int(params.get("retention_days", config.trash_retention_days))
+    return await purge_trash(
+        session,
+        expired_before(retention_days),
+        config.purge_batch_size,
+        config.purge_batch_pause,
+    )
+
+
+async def delete_user_job(
+    session: AsyncSession,
+    params: Dict[str, Any],
+) -> Dict[str, Any]:
+    return await purge_user(
+        session,
+        params["user_id"],
+        config.purge_batch_size,
+        config.purge_batch_pause,
+    )
+
+
+JOB_HANDLERS: Dict[str, JobHandler] = {
+    "rebuild-search": rebuild_search_job,
+    "recompute-stats": recompute_stats_job,
+    "purge-trash": purge_trash_job,
+    "delete-user": delete_user_job,
+}
+""" The kinds of job the workers run. """
+
+
+async def keep_lease(
+    job: JobReadModel,
+    worker: str,
+    interval: float,
+    session_factory: SessionFactory = sessionmanager.session,
+) -> None:
+    """Renew the lease of ``worker`` on ``job`` every ``interval`` seconds,
+    so a long job is not taken for a dead one.  Runs until cancelled or
+    the lease is lost."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with session_factory() as session:
+                held = await JobRepositoryImpl(session).renew(
+                    job.id,
+                    worker,
+                    unixtimestamp(),
+                )
+        except Exception:
+            logger.exception(f"Lease of job {job.id} not renewed, retrying")
+            continue
+        if not held:
+            logger.warning(f"Job {job.id} ({job.kind}) lease lost by {worker}")
+            return
+
+
+async def run_next_job(
+    worker: str,
+    handlers: Dict[str, JobHandler] = JOB_HANDLERS,
+    session_factory: SessionFactory = sessionmanager.session,
+    lease_seconds: int = config.job_lease_seconds,
+) -> Optional[JobReadModel]:
+    """
+    Claim the next due job and run it; None when there was nothing to do.
+
+    The handler gets a session of its own, so a failure rolls back only
+    its work, and the lease is renewed every quarter ``lease_seconds``
+    while it runs.  A failed attempt is queued again after an exponential
+    backoff until the job runs out of attempts; a kind no worker knows
+    fails at once, another attempt would not help.
+    """
+    async with session_factory() as session:
+        job = await JobRepositoryImpl(session).claim_next(worker, unixtimestamp())
+    if job is None:
+        return None
+
+    handler = handlers.get(job.kind)
+    if handler is None:
+        logger.error(f"Job {job.id} has an unknown kind {job.kind!r}")
+        async with session_factory() as session:
+            await JobRepositoryImpl(session).fail(
+                job.id,
+                worker,
+                f"unknown job kind: {job.kind!r}",
+                unixtimestamp(),
+            )
+        return job
+
+    logger.info(f"Job {job.id} ({job.kind}) attempt {job.attempts} on {worker}")
+    lease = asyncio.create_task(
+        keep_lease(job, worker, lease_seconds / 4, session_factory),
+    )
+    try:
+        async with session_factory() as session:
+            result = await handler(session, job.params)
+    except Exception as error:
+        now = unixtimestamp()
+        retry_at = None
+        if job.attempts < job.max_attempts:
+            delay = retry_delay(
+                job.attempts,
+                config.job_retry_base_seconds,
+                config.job_retry_max_seconds,
+            )
+            retry_at = now + int(delay * 1000)
+        logger.exception(f"Job {job.id} ({job.kind}) failed")
+        outcome = "failure"
+        async with session_factory() as session:
+            held = await JobRepositoryImpl(session).fail(
+                job.id,
+                worker,
+                str(error) or type(error).__name__,
+                now,
+                retry_at,
+            )
+    else:
+        outcome = "result"
+        async with session_factory() as session:
+            held = await JobRepositoryImpl(session).succeed(
+                job.id,
+                worker,
+                result,
+                unixtimestamp(),
+            )
+        if held:
+            logger.info(f"Job {job.id} ({job.kind}) succeeded")
+    finally:
+        lease.cancel()
+        with suppress(asyncio.CancelledError):
+            await lease
+
+    if not held:
+        logger.warning(f"Job {job.id} ({job.kind}) {outcome} dropped, lease lost")
+    return job
+
+
+async def job_worker(
+    worker: str,
+    poll_interval: float,
+    lease_seconds: int = config.job_lease_seconds,
+) -> None:
+    """Run jobs one after the other, polling while the queue is empty.
+    Runs until cancelled."""
+    while True:
+        try:
+            job = await run_next_job(worker, lease_seconds=lease_seconds)
+        except Exception:
+            logger.exception("Job queue unavailable, retrying")
+            job = None
+        if job is None:
+            await asyncio.sleep(poll_interval)
+
+
+async def requeue_stale_jobs(lease_seconds: int) -> None:
+    """Every quarter lease, release the jobs of workers that stopped
+    without finishing them.  Runs until cancelled."""
+    while True:
+        now = unixtimestamp()
+        try:
+            async with sessionmanager.session() as session:
+                released = await JobRepositoryImpl(session).requeue_stale(
+                    now - lease_seconds * 1000,
+                    now,
+                )
+        except Exception:
+            logger.exception("Stale jobs not released, retrying")
+        else:
+            if released:
+                logger.warning(f"Released {released} stale jobs")
+        await asyncio.sleep(lease_seconds / 4)
+
+
+async def run_job_pool(
+    concurrency: int,
+    poll_interval: float,
+    lease_seconds: int,
+) -> None:
+    """
+    Run ``concurrency`` workers on the job queue until cancelled.
+
+    In the API process this is a lifespan task; ``python -m
+    capturerrbackend worker`` runs it on its own.  Any number of pools can
+    share the queue.
+    """
+    name = f"{socket.gethostname()}:{os.getpid()}"
+    tasks = [
+        asyncio.create_task(job_worker(f"{name}:{i}", poll_interval, lease_seconds))
+        for i in range(concurrency)
+    ]
+    tasks.append(asyncio.create_task(requeue_stale_jobs(lease_seconds)))
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with suppress(asyncio.CancelledError):
+                await task
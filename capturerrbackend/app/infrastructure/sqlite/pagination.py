@@ -0,0 +1,125 @@
+from typing import Any, Callable, Optional, Sequence, Tuple, Type, TypeVar
+
+from sqlalchemy import Row, Select, SQLColumnExpression, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from capturerrbackend.app.infrastructure.sqlite.database import Base
+from capturerrbackend.app.infrastructure.sqlite.fields import projection
+from capturerrbackend.app.infrastructure.sqlite.trash import trashed
+from capturerrbackend.app.usecase.fields import FieldSet
+from capturerrbackend.app.usecase.pagination import Cursor, Direction, Page, PageParams
+
+D = TypeVar("D", bound=Base)
+M = TypeVar("M")
+
+
+async def paginate_rows(
+    session: AsyncSession,
+    stmt: Select[Any],
+    sort: Tuple[SQLColumnExpression[Any], SQLColumnExpression[Any]],
+    page: PageParams,
+    key_of: Callable[[Row[Any]], Tuple[Any, str]],
+    to_model: Callable[[Row[Any]], M],
+) -> Page[M]:
+    """
+    Run ``stmt`` as a keyset (seek) query ordered on the ``sort`` pair.
+
+    The cursor row becomes a ``(sort) < / > (:k1, :k2)`` predicate instead
+    of an OFFSET, so every page costs one index range scan no matter how
+    deep it is.  One extra row is fetched to know if a further page
+    exists.  Pages walked backwards are queried in the opposite order and
+    flipped before they are returned.  ``key_of`` reads the sort pair back
+    from a result row to build the cursors.
+    """
+    order = page.effective_order
+    cursor: Optional[Cursor] = page.cursor
+    backwards = cursor is not None and cursor.direction == "prev"
+    # sort the query runs in: descending unless asc xor walking backwards
+    descending = (order == "desc") != backwards
+
+    key = tuple_(*sort)
+    if cursor is not None:
+        stmt = stmt.where(key < cursor.key if descending else key > cursor.key)
+    if descending:
+        stmt = stmt.order_by(*(column.desc() for column in sort))
+    else:
+        stmt = stmt.order_by(*(column.asc() for column in sort))
+
+    try:
+        result = await session.execute(stmt.limit(page.limit + 1))
+        fetched: Sequence[Row[Any]] = result.all()
+    except:
+        raise
+
+    has_more = len(fetched) > page.limit
+    rows = list(fetched[: page.limit])
+    if backwards:
+        rows.reverse()
+
+    def boundary(row: Row[Any], direction: Direction) -> str:
+        value, id = key_of(row)
+        return Cursor(value=value, id=id, direction=direction, order=order).encode()
+
+    next_cursor = None
+    prev_cursor = None
+    if len(rows) > 0:
+        if has_more or backwards:
+            next_cursor = boundary(rows[-1], "next")
+        if (has_more and backwards) or (cursor is not None and not backwards):
+            prev_cursor = boundary(rows[0], "prev")
+
+    return Page(
+        items=list(map(to_model, rows)),
+        next_cursor=next_cursor,
+        prev_cursor=prev_cursor,
+    )
+
+
+async def paginate(
+    session: AsyncSession,
+    stmt: Select[Any],
+    dto: Type[D],
+    page: PageParams,
+    to_model: Callable[[D], M],
+    fields: FieldSet = FieldSet(),
+) -> Page[M]:
+    """
+    Keyset-page a ``select(dto)`` on ``(updated_at, id)``.
+
+    A sparse fieldset swaps the entity for just the columns it needs.
+    """
+    if not fields.is_all:
+        return await paginate_rows(
+            session,
+            stmt.with_only_columns(*projection(dto, fields)),
+            (dto.updated_at, dto.id),
+            page,
+            lambda row: (row.updated_at, row.id),
+            lambda row: fields.build(dict(row._mapping)),
+        )
+    return await paginate_rows(
+        session,
+        stmt,
+        (dto.updated_at, dto.id),
+        page,
+        lambda row: (row[0].updated_at, row[0].id),
+        lambda row: to_model(row[0]),
+    )
+
+
+async def paginate_trash(
+    session: AsyncSession,
+    stmt: Select[Any],
+    dto: Type[D],
+    page: PageParams,
+    to_model: Callable[[D], M],
+) -> Page[M]:
+    """Keyset-page the trashed rows of a ``select(dto)`` on ``(deleted_at, id)``."""
+    return await paginate_rows(
+        session,
+        stmt.where(trashed(dto)),
+        (dto.deleted_at, dto.id),
+        page,
+        lambda row: (row[0].deleted_at, row[0].id),
+        lambda row: to_model(row[0]),
+    )
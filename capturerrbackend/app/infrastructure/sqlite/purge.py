@@ -0,0 +1,275 @@
+import asyncio
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
+
+from loguru import logger
+from sqlalchemy import ColumnElement, Delete, Table, delete, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from capturerrbackend.app.infrastructure.sqlite.associations import capture_tags
+from capturerrbackend.app.infrastructure.sqlite.book.book_dto import BookDTO
+from capturerrbackend.app.infrastructure.sqlite.capture.capture_dto import CaptureDTO
+from capturerrbackend.app.infrastructure.sqlite.database import Base
+from capturerrbackend.app.infrastructure.sqlite.database_async import sessionmanager
+from capturerrbackend.app.infrastructure.sqlite.idempotency import (
+    IdempotencyRepositoryImpl,
+)
+from capturerrbackend.app.infrastructure.sqlite.tag.tag_dto import TagDTO
+from capturerrbackend.app.infrastructure.sqlite.tombstones import sync_tombstones
+from capturerrbackend.app.infrastructure.sqlite.trash import trashed
+from capturerrbackend.app.infrastructure.sqlite.user.user_dto import UserDTO
+from capturerrbackend.app.infrastructure.sqlite.user.user_stats import (
+    user_stats,
+    user_stats_counts,
+)
+
+PURGED: List[Tuple[Type[Base], List[Any]]] = [
+    (CaptureDTO, [capture_tags.c.capture_id]),
+    (TagDTO, [capture_tags.c.tag_id]),
+    (BookDTO, []),
+]
+""" The tables with a trash, and their association columns pointing at them. """
+
+USER_OWNED: List[Table] = [user_stats_counts, user_stats, sync_tombstones]
+""" The other tables with rows of a user, deleted before the user row. """
+
+DAY_MS = 24 * 60 * 60 * 1000
+
+
+def expired_before(retention_days: int, now: Optional[datetime] = None) -> int:
+    """The deleted_at (ms) before which trashed rows are due for the purge."""
+    now = now or datetime.now(timezone.utc)
+    return int(now.timestamp() * 1000) - retention_days * DAY_MS
+
+
+def in_window(hour: int, start: int, end: int) -> bool:
+    """Whether ``hour`` is in ``[start, end)``, which may wrap past midnight."""
+    if start <= end:
+        return start <= hour < end
+    return hour >= start or hour < end
+
+
+async def delete_batch(
+    session: AsyncSession,
+    dto: Type[Base],
+    links: Sequence[Any],
+    criteria: Sequence[ColumnElement[bool]],
+    batch_size: int,
+    order_by: Sequence[Any] = (),
+) -> int:
+    """
+    Hard-delete up to ``batch_size`` rows of ``dto`` matching ``criteria``.
+
+    The ids are read in ``order_by``; their association rows go first,
+    then the rows, each with one ``DELETE ... WHERE ... IN``, in one
+    short transaction.
+    """
+    try:
+        result = await session.execute(
+            select(dto.id).where(*criteria).order_by(*order_by).limit(batch_size),
+        )
+        ids = list(result.scalars().all())
+        if len(ids) == 0:
+            return 0
+
+        for link in links:
+            await session.execute(delete(capture_tags).where(link.in_(ids)))
+        await session.execute(delete(dto).where(dto.id.in_(ids)))
+        await session.commit()
+    except:
+        await session.rollback()
+        raise
+
+    return len(ids)
+
+
+async def delete_in_batches(
+    session: AsyncSession,
+    dto: Type[Base],
+    links: Sequence[Any],
+    criteria: Sequence[ColumnElement[bool]],
+    batch_size: int,
+    pause: float,
+    order_by: Sequence[Any] = (),
+) -> int:
+    """
+    Delete every row of ``dto`` matching ``criteria``, batch by batch.
+
+    Every batch commits on its own and ``pause`` seconds pass between
+    batches, so locks are held briefly and requests get their turn.
+    """
+    total = 0
+    while True:
+        count = await delete_batch(session, dto, links, criteria, batch_size, order_by)
+        total += count
+        if count < batch_size:
+            return total
+        await asyncio.sleep(pause)
+
+
+def delete_rows_batch(
+    table: Table,
+    criteria: Sequence[ColumnElement[bool]],
+    batch_size: int,
+) -> Delete:
+    """
+    One ``DELETE`` of up to ``batch_size`` rows of ``table`` matching
+    ``criteria``, picked by the table's primary key, so it runs on SQLite
+    and PostgreSQL alike (the latter has no ``DELETE ... LIMIT``).
+    """
+    key = tuple_(*table.primary_key.columns)
+    return delete(table).where(
+        key.in_(
+            select(*table.primary_key.columns).where(*criteria).limit(batch_size),
+        ),
+    )
+
+
+async def delete_rows_in_batches(
+    session: AsyncSession,
+    table: Table,
+    criteria: Sequence[ColumnElement[bool]],
+    batch_size: int,
+    pause: float,
+) -> int:
+    """
+    Delete every row of ``table`` matching ``criteria``, batch by batch.
+
+    For tables without an ``id``: every batch is one statement from
+    ``delete_rows_batch``, then committed.
+    """
+    total = 0
+    while True:
+        try:
+            result = await session.execute(
+                delete_rows_batch(table, criteria, batch_size),
+            )
+            await session.commit()
+        except:
+            await session.rollback()
+            raise
+        count = result.rowcount
+        total += count
+        if count < batch_size:
+            return total
+        await asyncio.sleep(pause)
+
+
+async def purge_trash(
+    session: AsyncSession,
+    before: int,
+    batch_size: int = 500,
+    pause: float = 0.0,
+) -> Dict[str, int]:
+    """
+    Purge everything trashed before ``before``, in batches; the ids come
+    from the ``ix_<table>_purge`` indexes.  Returns how many rows were
+    purged per table.
+    """
+    return {
+        dto.__tablename__: await delete_in_batches(
+            session,
+            dto,
+            links,
+            [trashed(dto), dto.deleted_at < before],
+            batch_size,
+            pause,
+            [dto.deleted_at],
+        )
+        for dto, links in PURGED
+    }
+
+
+async def purge_user(
+    session: AsyncSession,
+    user_id: str,
+    batch_size: int = 500,
+    pause: float = 0.0,
+) -> Dict[str, int]:
+    """
+    Delete a deleted user for good, with everything they own.
+
+    Their captures, tags and books go in batches, links first, then
+    their statistics and sync tombstones, then the user row.  Nothing is
+    left to ``ON DELETE CASCADE``, which SQLite ignores under the
+    ``none`` profile (no ``PRAGMA foreign_keys``), and every table is
+    batched the same way.  A user that is not deleted, or already
+    gone, is left alone, so running it again is harmless.  Returns how
+    many rows were deleted per table.
+    """
+    try:
+        result = await session.execute(
+            select(UserDTO.id).where(
+                UserDTO.id == user_id,
+                UserDTO.deleted_at.is_not(None),
+            ),
+        )
+        found = result.scalar_one_or_none()
+    except:
+        raise
+    if found is None:
+        return {}
+
+    purged = {
+        dto.__tablename__: await delete_in_batches(
+            session,
+            dto,
+            links,
+            [dto.__table__.c.user_id == user_id],
+            batch_size,
+            pause,
+        )
+        for dto, links in PURGED
+    }
+    for table in USER_OWNED:
+        purged[table.name] = await delete_rows_in_batches(
+            session,
+            table,
+            [table.c.user_id == user_id],
+            batch_size,
+            pause,
+        )
+    try:
+        await session.execute(delete(UserDTO).where(UserDTO.id == user_id))
+        await session.commit()
+    except:
+        await session.rollback()
+        raise
+
+    purged[UserDTO.__tablename__] = 1
+    return purged
+
+
+async def purge_worker(
+    retention_days: int,
+    batch_size: int,
+    pause: float,
+    interval: float,
+    window: Tuple[int, int],
+) -> None:
+    """
+    Purge the expired trash and idempotent responses every ``interval``
+    seconds, but only in the ``window`` of low-load hours (UTC).  Runs
+    until cancelled.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        if not in_window(datetime.now(timezone.utc).hour, *window):
+            continue
+        try:
+            async with sessionmanager.session() as session:
+                purged = await purge_trash(
+                    session,
+                    expired_before(retention_days),
+                    batch_size,
+                    pause,
+                )
+                # expired Idempotency-Key responses go in the same round
+                purged["idempotency_keys"] = await IdempotencyRepositoryImpl(
+                    session,
+                ).delete_expired(expired_before(0))
+        except Exception:
+            logger.exception("Trash purge failed, retrying next round")
+            continue
+        if any(purged.values()):
+            logger.info(f"Trash purged: {purged}")
@@ -0,0 +1,5 @@
+from .sync_query_service import SyncQueryServiceImpl
+
+__all__ = [
+    "SyncQueryServiceImpl",
+]
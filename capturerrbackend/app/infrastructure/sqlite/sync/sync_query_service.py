@@ -0,0 +1,140 @@
+from typing import Any, List, Optional, Sequence, Tuple
+
+from sqlalchemy import ColumnElement, Select, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from capturerrbackend.app.infrastructure.sqlite.associations import capture_tags
+from capturerrbackend.app.infrastructure.sqlite.tombstones import sync_tombstones
+from capturerrbackend.app.infrastructure.sqlite.trash import live
+from capturerrbackend.app.usecase.sync import (
+    CaptureTagLinkModel,
+    SyncChangesModel,
+    SyncPosition,
+    SyncQueryService,
+)
+
+from ..capture.capture_dto import CaptureDTO
+from ..tag.tag_dto import TagDTO
+
+
+def keyset_page(
+    stmt: Select[Any],
+    key: Sequence[Any],
+    after: Optional[Tuple[Any, ...]],
+    limit: Optional[int],
+) -> Select[Any]:
+    """``stmt`` in ``key`` order, from the row after ``after``; one row past
+    ``limit`` is read to tell whether more follow."""
+    if after is not None:
+        stmt = stmt.where(tuple_(*key) > tuple(after))
+    stmt = stmt.order_by(*key)
+    return stmt if limit is None else stmt.limit(limit + 1)
+
+
+def cut(rows: List[Any], limit: Optional[int]) -> Tuple[List[Any], bool]:
+    """The rows of the page, and whether there were more."""
+    if limit is None or len(rows) <= limit:
+        return rows, False
+    return rows[:limit], True
+
+
+class SyncQueryServiceImpl(SyncQueryService):
+    """SyncQueryServiceImpl reads the delta sync of a user.
+
+    Every query is a range scan of a ``(user_id, updated_at/deleted_at)``
+    index starting at the cursor, so a sync costs what changed, not what
+    the user has.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session: AsyncSession = session
+
+    async def find_changes(
+        self,
+        user_id: str,
+        since: Optional[int] = None,
+        limit: Optional[int] = None,
+        after: SyncPosition = SyncPosition(),
+    ) -> SyncChangesModel:
+        captures_changed: List[ColumnElement[bool]] = [
+            CaptureDTO.user_id == user_id,
+            live(CaptureDTO),
+        ]
+        tags_changed: List[ColumnElement[bool]] = [
+            TagDTO.user_id == user_id,
+            live(TagDTO),
+        ]
+        if since is not None:
+            captures_changed.append(CaptureDTO.updated_at >= since)
+            tags_changed.append(TagDTO.updated_at >= since)
+
+        try:
+            result = await self.session.execute(
+                keyset_page(
+                    select(CaptureDTO).where(*captures_changed),
+                    (CaptureDTO.updated_at, CaptureDTO.id),
+                    after.captures,
+                    limit,
+                ),
+            )
+            captures, more_captures = cut(list(result.scalars()), limit)
+            result = await self.session.execute(
+                keyset_page(
+                    select(TagDTO).where(*tags_changed),
+                    (TagDTO.updated_at, TagDTO.id),
+                    after.tags,
+                    limit,
+                ),
+            )
+            tags, more_tags = cut(list(result.scalars()), limit)
+            links = await self.session.execute(
+                select(capture_tags.c.capture_id, capture_tags.c.tag_id)
+                .join(TagDTO, TagDTO.id == capture_tags.c.tag_id)
+                .where(live(TagDTO))
+                .where(capture_tags.c.capture_id.in_([dto.id for dto in captures])),
+            )
+            tombstones: List[Any] = []
+            more_tombstones = False
+            if since is not None:
+                result = await self.session.execute(
+                    keyset_page(
+                        select(
+                            sync_tombstones.c.deleted_at,
+                            sync_tombstones.c.kind,
+                            sync_tombstones.c.object_id,
+                        )
+                        .where(sync_tombstones.c.user_id == user_id)
+                        .where(sync_tombstones.c.deleted_at >= since),
+                        (
+                            sync_tombstones.c.deleted_at,
+                            sync_tombstones.c.kind,
+                            sync_tombstones.c.object_id,
+                        ),
+                        after.tombstones,
+                        limit,
+                    ),
+                )
+                tombstones, more_tombstones = cut(list(result.all()), limit)
+        except:
+            raise
+
+        return SyncChangesModel(
+            captures=[dto.to_read_model() for dto in captures],
+            tags=[dto.to_read_model() for dto in tags],
+            links=[
+                CaptureTagLinkModel(capture_id=capture_id, tag_id=tag_id)
+                for capture_id, tag_id in links.all()
+            ],
+            deleted_captures=[id for _, kind, id in tombstones if kind == "capture"],
+            deleted_tags=[id for _, kind, id in tombstones if kind == "tag"],
+            has_more=more_captures or more_tags or more_tombstones,
+            position=SyncPosition(
+                captures=(
+                    (captures[-1].updated_at, captures[-1].id)
+                    if captures
+                    else after.captures
+                ),
+                tags=(tags[-1].updated_at, tags[-1].id) if tags else after.tags,
+                tombstones=tuple(tombstones[-1]) if tombstones else after.tombstones,
+            ),
+        )
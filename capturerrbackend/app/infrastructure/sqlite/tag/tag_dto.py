@@ -7,6 +7,7 @@ from sqlalchemy.orm import Mapped, mapped_column, relationship
 from capturerrbackend.app.domain.tag.tag import Tag
 from capturerrbackend.app.infrastructure.sqlite.associations import capture_tags
 from capturerrbackend.app.infrastructure.sqlite.database import Base
+from capturerrbackend.app.infrastructure.sqlite.trash import live_index, trash_indexes
 from capturerrbackend.app.usecase.tag import TagReadModel
 
 if TYPE_CHECKING:
@@ -22,6 +23,11 @@ class TagDTO(Base):
 
     __allow_unmapped__ = True
     __tablename__ = "tag"
+    __table_args__ = (
+        live_index("ix_tag_user_id_updated_at_id", "user_id", "updated_at", "id"),
+        live_index("ix_tag_user_id_text", "user_id", "text", unique=True),
+        *trash_indexes("tag"),
+    )
     text: Mapped[str] = mapped_column(String(17), nullable=False)
 
     user_id: Mapped[str] = mapped_column(ForeignKey("user.id"))
@@ -50,6 +56,7 @@ class TagDTO(Base):
             user_id=self.user_id,
             created_at=self.created_at,
             updated_at=self.updated_at,
+            deleted_at=self.deleted_at,
         )
 
     @staticmethod
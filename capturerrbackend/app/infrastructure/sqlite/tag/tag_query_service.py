@@ -1,9 +1,20 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 
+from sqlalchemy import select
 from sqlalchemy.exc import NoResultFound
-from sqlalchemy.orm.session import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from capturerrbackend.app.infrastructure.sqlite.associations import capture_tags
+from capturerrbackend.app.infrastructure.sqlite.fields import find_one
+from capturerrbackend.app.infrastructure.sqlite.pagination import (
+    paginate,
+    paginate_trash,
+)
+from capturerrbackend.app.infrastructure.sqlite.trash import live
+from capturerrbackend.app.infrastructure.sqlite.version import collection_version
+from capturerrbackend.app.usecase.fields import FieldSet
+from capturerrbackend.app.usecase.pagination import Page, PageParams
+from capturerrbackend.app.usecase.version import CollectionVersion
 
 from ....usecase.tag import TagQueryService, TagReadModel
 from .tag_dto import TagDTO
@@ -13,12 +24,24 @@ class TagQueryServiceImpl(TagQueryService):
     """TagQueryServiceImpl implements READ operations
     related Tag entity using SQLAlchemy."""
 
-    def __init__(self, session: Session):
-        self.session: Session = session
+    def __init__(self, session: AsyncSession):
+        self.session: AsyncSession = session
+
+    async def find_by_id(
+        self,
+        id: str,
+        fields: FieldSet = FieldSet(),
+        user_id: Optional[str] = None,
+    ) -> Optional[TagReadModel]:
+        criteria = [TagDTO.id == id, live(TagDTO)]
+        if user_id is not None:
+            criteria.append(TagDTO.user_id == user_id)
+        if not fields.is_all:
+            return await find_one(self.session, TagDTO, fields, *criteria)
 
-    def find_by_id(self, id: str) -> Optional[TagReadModel]:
         try:
-            tag_dto = self.session.query(TagDTO).filter_by(id=id).one()
+            result = await self.session.execute(select(TagDTO).where(*criteria))
+            tag_dto = result.scalar_one()
         except NoResultFound:
             return None
         except:
@@ -26,39 +49,41 @@ class TagQueryServiceImpl(TagQueryService):
 
         return tag_dto.to_read_model()
 
-    def find_all(self) -> List[TagReadModel]:
+    async def find_all(
+        self,
+        page: PageParams = PageParams(),
+        fields: FieldSet = FieldSet(),
+    ) -> Page[TagReadModel]:
+        return await paginate(
+            self.session,
+            select(TagDTO).where(live(TagDTO)),
+            TagDTO,
+            page,
+            lambda tag_dto: tag_dto.to_read_model(),
+            fields,
+        )
+
+    async def find_by_user_id(
+        self,
+        user_id: str,
+        page: PageParams = PageParams(),
+        fields: FieldSet = FieldSet(),
+    ) -> Page[TagReadModel]:
+        return await paginate(
+            self.session,
+            select(TagDTO).where(TagDTO.user_id == user_id, live(TagDTO)),
+            TagDTO,
+            page,
+            lambda tag_dto: tag_dto.to_read_model(),
+            fields,
+        )
+
+    async def find_by_text(self, text: str) -> Optional[TagReadModel]:
         try:
-            tag_dtos = (
-                self.session.query(TagDTO).order_by(TagDTO.updated_at).limit(100).all()
+            result = await self.session.execute(
+                select(TagDTO).filter_by(text=text).where(live(TagDTO)),
             )
-        except:
-            raise
-
-        if len(tag_dtos) == 0:
-            return []
-
-        return list(map(lambda tag_dto: tag_dto.to_read_model(), tag_dtos))
-
-    def find_by_user_id(self, user_id: str) -> List[TagReadModel]:
-        try:
-            tag_dtos = (
-                self.session.query(TagDTO)
-                .where(TagDTO.user_id == user_id)
-                .order_by(TagDTO.updated_at)
-                .limit(100)
-                .all()
-            )
-        except:
-            raise
-
-        if len(tag_dtos) == 0:
-            return []
-
-        return list(map(lambda tag_dto: tag_dto.to_read_model(), tag_dtos))
-
-    def find_by_text(self, text: str) -> Optional[TagReadModel]:
-        try:
-            tag_dto = self.session.query(TagDTO).filter_by(text=text).one()
+            tag_dto = result.scalar_one()
         except NoResultFound:
             return None
         except:
@@ -66,15 +91,16 @@ class TagQueryServiceImpl(TagQueryService):
 
         return tag_dto.to_read_model()
 
-    def find_by_capture_id(self, capture_id: str) -> List[TagReadModel]:
+    async def find_by_capture_id(self, capture_id: str) -> List[TagReadModel]:
         try:
-            cap_tag_dtos = (
-                self.session.query(TagDTO)
+            result = await self.session.execute(
+                select(TagDTO)
                 .join(capture_tags)
                 .where(capture_id == capture_tags.c.capture_id)  # type: ignore
-                .limit(100)
-                .all()
+                .where(live(TagDTO))
+                .limit(100),
             )
+            cap_tag_dtos = result.scalars().all()
         except:
             raise
 
@@ -82,3 +108,56 @@ class TagQueryServiceImpl(TagQueryService):
             return []
 
         return list(map(lambda tag_dto: tag_dto.to_read_model(), cap_tag_dtos))
+
+    async def find_by_capture_ids(
+        self,
+        capture_ids: List[str],
+    ) -> Dict[str, List[TagReadModel]]:
+        """Load the tags of a whole page of captures with one query."""
+        tags_by_capture: Dict[str, List[TagReadModel]] = {
+            capture_id: [] for capture_id in capture_ids
+        }
+        if len(capture_ids) == 0:
+            return tags_by_capture
+
+        try:
+            result = await self.session.execute(
+                select(capture_tags.c.capture_id, TagDTO)
+                .join(TagDTO, TagDTO.id == capture_tags.c.tag_id)
+                .where(capture_tags.c.capture_id.in_(capture_ids))
+                .where(live(TagDTO)),
+            )
+            rows = result.all()
+        except:
+            raise
+
+        for capture_id, tag_dto in rows:
+            tags_by_capture[capture_id].append(tag_dto.to_read_model())
+
+        return tags_by_capture
+
+    async def find_version(
+        self,
+        user_id: Optional[str] = None,
+    ) -> CollectionVersion:
+        if user_id is None:
+            return await collection_version(self.session, TagDTO, live(TagDTO))
+        return await collection_version(
+            self.session,
+            TagDTO,
+            TagDTO.user_id == user_id,
+            live(TagDTO),
+        )
+
+    async def find_trashed_by_user_id(
+        self,
+        user_id: str,
+        page: PageParams = PageParams(),
+    ) -> Page[TagReadModel]:
+        return await paginate_trash(
+            self.session,
+            select(TagDTO).where(TagDTO.user_id == user_id),
+            TagDTO,
+            page,
+            lambda tag_dto: tag_dto.to_read_model(),
+        )
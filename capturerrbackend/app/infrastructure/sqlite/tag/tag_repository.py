@@ -1,25 +1,48 @@
-from typing import Optional
+from typing import Any, Dict, Iterable, Optional
+from uuid import uuid4
 
-from sqlalchemy.exc import NoResultFound
-from sqlalchemy.orm.session import Session
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError, NoResultFound
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from capturerrbackend.app.domain.tag.tag import Tag
+from capturerrbackend.app.domain.tag.tag_exception import TagAlreadyExistsError
 from capturerrbackend.app.domain.tag.tag_repository import TagRepository
+from capturerrbackend.app.domain.user.user_stats_repository import UserStatsRepository
+from capturerrbackend.app.infrastructure.sqlite.associations import capture_tags
+from capturerrbackend.app.infrastructure.sqlite.capture.capture_dto import CaptureDTO
+from capturerrbackend.app.infrastructure.sqlite.database import (
+    is_unique_violation,
+    upsert,
+)
+from capturerrbackend.app.infrastructure.sqlite.tombstones import bury, unbury
+from capturerrbackend.app.infrastructure.sqlite.trash import live, trashed
 from capturerrbackend.app.usecase.tag import TagCommandUseCaseUnitOfWork
 
-from .tag_dto import TagDTO
+from .tag_dto import TagDTO, unixtimestamp
+
+TAG_UPSERT_CHUNK = 1000
+""" Tags per INSERT, at 7 bound parameters each. """
 
 
 class TagRepositoryImpl(TagRepository):
     """TagRepositoryImpl implements CRUD operations related Tag
     entity using SQLAlchemy."""
 
-    def __init__(self, session: Session) -> None:
-        self.session: Session = session
+    def __init__(self, session: AsyncSession) -> None:
+        self.session: AsyncSession = session
 
-    def find_by_id(self, tag_id: str) -> Optional[Tag]:
+    async def find_by_id(
+        self,
+        tag_id: str,
+        user_id: Optional[str] = None,
+    ) -> Optional[Tag]:
+        stmt = select(TagDTO).filter_by(id=tag_id).where(live(TagDTO))
+        if user_id is not None:
+            stmt = stmt.where(TagDTO.user_id == user_id)
         try:
-            tag_dto = self.session.query(TagDTO).filter_by(id=tag_id).one()
+            result = await self.session.execute(stmt)
+            tag_dto = result.scalar_one()
         except NoResultFound:
             return None
         except:
@@ -27,9 +50,12 @@ class TagRepositoryImpl(TagRepository):
 
         return tag_dto.to_entity()
 
-    def find_by_text(self, text: str) -> Optional[Tag]:
+    async def find_trashed_by_id(self, tag_id: str) -> Optional[Tag]:
         try:
-            tag_dto = self.session.query(TagDTO).filter_by(text=text).one()
+            result = await self.session.execute(
+                select(TagDTO).filter_by(id=tag_id).where(trashed(TagDTO)),
+            )
+            tag_dto = result.scalar_one()
         except NoResultFound:
             return None
         except:
@@ -37,25 +63,149 @@ class TagRepositoryImpl(TagRepository):
 
         return tag_dto.to_entity()
 
-    def create(self, tag: Tag) -> None:
-        tag_dto = TagDTO.from_entity(tag)
+    async def find_by_text(self, text: str) -> Optional[Tag]:
+        try:
+            result = await self.session.execute(
+                select(TagDTO).filter_by(text=text).where(live(TagDTO)),
+            )
+            tag_dto = result.scalar_one()
+        except NoResultFound:
+            return None
+        except:
+            raise
+
+        return tag_dto.to_entity()
+
+    async def create(self, tag: Tag) -> Tag:
+        # the unique constraint detects the conflict, RETURNING reads it back
+        row = TagDTO.from_entity(tag).to_row()
+        try:
+            result = await self.session.execute(
+                insert(TagDTO).values(row).returning(TagDTO),
+            )
+            tag_dto = result.scalar_one()
+        except IntegrityError as error:
+            if is_unique_violation(error):
+                raise TagAlreadyExistsError from error
+            raise
+        except:
+            raise
+
+        return tag_dto.to_entity()
+
+    async def find_or_create_by_texts(
+        self,
+        user_id: str,
+        texts: Iterable[str],
+    ) -> Dict[str, str]:
+        # the unique live (user_id, text) index arbitrates: texts the user
+        # has already are skipped, also when a concurrent request adds them
+        wanted = set(texts)
+        if len(wanted) == 0:
+            return {}
+        insert = upsert(self.session)
+        rows = [
+            TagDTO.from_entity(Tag(id=uuid4().hex, text=text, user_id=user_id)).to_row()
+            for text in wanted
+        ]
         try:
-            self.session.add(tag_dto)
+            # one statement per chunk keeps under the bound parameter limit
+            for start in range(0, len(rows), TAG_UPSERT_CHUNK):
+                await self.session.execute(
+                    insert(TagDTO)
+                    .values(rows[start : start + TAG_UPSERT_CHUNK])
+                    .on_conflict_do_nothing(
+                        index_elements=[TagDTO.user_id, TagDTO.text],
+                        index_where=live(TagDTO),
+                    ),
+                )
         except:
             raise
 
-    def update(self, tag: Tag) -> None:
+        return await self.find_ids_by_texts(user_id, wanted)
+
+    async def find_ids_by_texts(
+        self,
+        user_id: str,
+        texts: Iterable[str],
+    ) -> Dict[str, str]:
+        try:
+            result = await self.session.execute(
+                select(TagDTO.text, TagDTO.id).where(
+                    TagDTO.user_id == user_id,
+                    TagDTO.text.in_(set(texts)),
+                    live(TagDTO),
+                ),
+            )
+        except:
+            raise
+
+        return {text: id for text, id in result.all()}
+
+    async def patch(
+        self,
+        tag_id: str,
+        user_id: str,
+        changes: Dict[str, Any],
+    ) -> Optional[Tag]:
+        try:
+            result = await self.session.execute(
+                update(TagDTO)
+                .where(TagDTO.id == tag_id, TagDTO.user_id == user_id, live(TagDTO))
+                .values({**changes, "updated_at": unixtimestamp()})
+                .returning(TagDTO),
+            )
+            tag_dto = result.scalar_one_or_none()
+        except IntegrityError as error:
+            if is_unique_violation(error):
+                raise TagAlreadyExistsError from error
+            raise
+        except:
+            raise
+
+        return None if tag_dto is None else tag_dto.to_entity()
+
+    async def update(self, tag: Tag) -> None:
         tag_dto = TagDTO.from_entity(tag)
         try:
-            _tag = self.session.query(TagDTO).filter_by(id=tag_dto.id).one()
+            result = await self.session.execute(select(TagDTO).filter_by(id=tag_dto.id))
+            _tag = result.scalar_one()
             _tag.text = tag_dto.text
             _tag.updated_at = tag_dto.updated_at
         except:
             raise
 
-    def delete_by_id(self, tag_id: str) -> None:
+    async def delete_by_id(self, tag_id: str) -> None:
+        # the capture links stay for a restore; the purge deletes them with the row
+        now = unixtimestamp()
+        try:
+            await self.session.execute(bury(TagDTO, "tag", TagDTO.id == tag_id))
+            await self.session.execute(
+                update(TagDTO)
+                .where(TagDTO.id == tag_id, live(TagDTO))
+                .values(deleted_at=now, updated_at=now),
+            )
+        except:
+            raise
+
+    async def restore_by_id(self, tag_id: str) -> None:
+        now = unixtimestamp()
+        tagged = select(capture_tags.c.capture_id).where(
+            capture_tags.c.tag_id == tag_id,
+        )
         try:
-            self.session.query(TagDTO).filter_by(id=tag_id).delete()
+            await self.session.execute(
+                update(TagDTO)
+                .where(TagDTO.id == tag_id, trashed(TagDTO))
+                .values(deleted_at=None, updated_at=now),
+            )
+            await self.session.execute(unbury("tag", tag_id))
+            # the links come back too, which changes the captures holding them
+            await self.session.execute(
+                update(CaptureDTO)
+                .where(CaptureDTO.id.in_(tagged), live(CaptureDTO))
+                .values(updated_at=now),
+            )
         except:
             raise
 
@@ -63,17 +213,19 @@ class TagRepositoryImpl(TagRepository):
 class TagCommandUseCaseUnitOfWorkImpl(TagCommandUseCaseUnitOfWork):
     def __init__(
         self,
-        session: Session,
+        session: AsyncSession,
         tag_repository: TagRepository,
+        user_stats_repository: UserStatsRepository,
     ):
-        self.session: Session = session
+        self.session: AsyncSession = session
         self.tag_repository: TagRepository = tag_repository
+        self.user_stats_repository: UserStatsRepository = user_stats_repository
 
-    def begin(self) -> None:
-        self.session.begin()
+    async def begin(self) -> None:
+        await self.session.begin()
 
-    def commit(self) -> None:
-        self.session.commit()
+    async def commit(self) -> None:
+        await self.session.commit()
 
-    def rollback(self) -> None:
-        self.session.rollback()
+    async def rollback(self) -> None:
+        await self.session.rollback()
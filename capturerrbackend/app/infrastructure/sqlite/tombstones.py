@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Literal, Type
+
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    ColumnElement,
+    Delete,
+    ForeignKey,
+    Index,
+    Insert,
+    String,
+    Table,
+    delete,
+    insert,
+    literal,
+    select,
+)
+
+from capturerrbackend.app.infrastructure.sqlite.database import Base
+
+TombstoneKind = Literal["capture", "tag"]
+
+sync_tombstones = Table(
+    "sync_tombstones",
+    Base.metadata,
+    Column("kind", String, primary_key=True),
+    Column("object_id", String, primary_key=True),
+    Column("user_id", ForeignKey("user.id", ondelete="CASCADE"), nullable=False),
+    # milliseconds, like updated_at
+    Column("deleted_at", BigInteger, nullable=False),
+    Index("ix_sync_tombstones_user_id_deleted_at", "user_id", "deleted_at"),
+)
+""" What a delete leaves behind for the delta sync of offline clients. """
+
+
+def unixtimestamp() -> int:
+    return int(datetime.now().timestamp() * 1000)
+
+
+def bury(
+    dto: Type[Base],
+    kind: TombstoneKind,
+    *criteria: ColumnElement[bool],
+) -> Insert:
+    """
+    Record a tombstone for every ``dto`` row matching ``criteria``.
+
+    Run it right before the rows are trashed or deleted, in the same
+    transaction; it is one ``INSERT … SELECT`` however many rows go.
+    """
+    table = dto.__table__
+    rows = select(
+        literal(kind),
+        table.c.id,
+        table.c.user_id,
+        literal(unixtimestamp()),
+    ).where(*criteria)
+    return insert(sync_tombstones).from_select(
+        ["kind", "object_id", "user_id", "deleted_at"],
+        rows,
+    )
+
+
+def unbury(kind: TombstoneKind, object_id: str) -> Delete:
+    """Drop the tombstone of a row restored from the trash."""
+    return delete(sync_tombstones).where(
+        sync_tombstones.c.kind == kind,
+        sync_tombstones.c.object_id == object_id,
+    )
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from typing import Any, Tuple, Type
+
+from sqlalchemy import ColumnElement, Index, TextClause, text
+
+from capturerrbackend.app.infrastructure.sqlite.database import Base
+
+LIVE: TextClause = text("deleted_at IS NULL")
+""" WHERE clause of the partial indexes over rows not in the trash. """
+
+TRASHED: TextClause = text("deleted_at IS NOT NULL")
+""" WHERE clause of the partial indexes over the trash. """
+
+
+def live_index(name: str, *columns: str, unique: bool = False) -> Index:
+    """
+    An index over the rows not in the trash.
+
+    Queries pass ``live(dto)``, which matches the index's WHERE clause, so
+    hiding the trash costs nothing and the trash does not bloat the index.
+    ``deleted_at`` trails the columns (always NULL, so it costs next to
+    nothing): SQLite still checks the term itself and would otherwise have
+    to read the table, losing covering scans.  A ``unique`` index goes
+    without it, since NULLs never collide and it would let duplicates in;
+    it is the arbiter of ``ON CONFLICT (columns) WHERE deleted_at IS NULL``.
+    """
+    trailing = () if unique else ("deleted_at",)
+    return Index(
+        name,
+        *columns,
+        *trailing,
+        unique=unique,
+        sqlite_where=LIVE,
+        postgresql_where=LIVE,
+    )
+
+
+def trash_indexes(table: str) -> Tuple[Index, Index]:
+    """
+    The indexes over a table's trash: per user for the trash listing and
+    by age for the purge.  Both only hold trashed rows, so they stay small.
+    """
+    return (
+        Index(
+            f"ix_{table}_trash",
+            "user_id",
+            "deleted_at",
+            "id",
+            sqlite_where=TRASHED,
+            postgresql_where=TRASHED,
+        ),
+        Index(
+            f"ix_{table}_purge",
+            "deleted_at",
+            sqlite_where=TRASHED,
+            postgresql_where=TRASHED,
+        ),
+    )
+
+
+def live(dto: Type[Base] | Any) -> ColumnElement[bool]:
+    """Rows of ``dto`` that are not in the trash."""
+    return dto.deleted_at.is_(None)  # type: ignore[no-any-return]
+
+
+def trashed(dto: Type[Base] | Any) -> ColumnElement[bool]:
+    """Rows of ``dto`` that are in the trash."""
+    return dto.deleted_at.is_not(None)  # type: ignore[no-any-return]
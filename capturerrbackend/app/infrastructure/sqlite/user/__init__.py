@@ -1,10 +1,16 @@
 from .user_dto import UserDTO
 from .user_query_service import UserQueryServiceImpl
 from .user_repository import UserCommandUseCaseUnitOfWorkImpl, UserRepositoryImpl
+from .user_stats import recompute_statements, user_stats, user_stats_counts
+from .user_stats_repository import UserStatsRepositoryImpl
 
 __all__ = [
     "UserDTO",
     "UserQueryServiceImpl",
     "UserRepositoryImpl",
     "UserCommandUseCaseUnitOfWorkImpl",
+    "UserStatsRepositoryImpl",
+    "user_stats",
+    "user_stats_counts",
+    "recompute_statements",
 ]
@@ -1,23 +1,41 @@
-from typing import List, Optional
+from typing import Optional
 
+from sqlalchemy import select
 from sqlalchemy.exc import NoResultFound
-from sqlalchemy.orm.session import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from capturerrbackend.app.usecase.user import UserQueryService, UserReadModel
+from capturerrbackend.app.infrastructure.sqlite.fields import find_one
+from capturerrbackend.app.infrastructure.sqlite.pagination import paginate
+from capturerrbackend.app.usecase.fields import FieldSet
+from capturerrbackend.app.usecase.pagination import Page, PageParams
+from capturerrbackend.app.usecase.user import (
+    UserQueryService,
+    UserReadModel,
+    UserStatsReadModel,
+)
 
 from .user_dto import UserDTO
+from .user_stats import user_stats, user_stats_counts
 
 
 class UserQueryServiceImpl(UserQueryService):
     """UserQueryServiceImpl implements READ operations
     related User entity using SQLAlchemy."""
 
-    def __init__(self, session: Session):
-        self.session: Session = session
+    def __init__(self, session: AsyncSession):
+        self.session: AsyncSession = session
+
+    async def find_by_id(
+        self,
+        id: str,
+        fields: FieldSet = FieldSet(),
+    ) -> Optional[UserReadModel]:
+        if not fields.is_all:
+            return await find_one(self.session, UserDTO, fields, UserDTO.id == id)
 
-    def find_by_id(self, id: str) -> Optional[UserReadModel]:
         try:
-            user_dto = self.session.query(UserDTO).filter_by(id=id).one()
+            result = await self.session.execute(select(UserDTO).filter_by(id=id))
+            user_dto = result.scalar_one()
         except NoResultFound:
             return None
         except:
@@ -25,28 +43,62 @@ class UserQueryServiceImpl(UserQueryService):
 
         return user_dto.to_read_model()
 
-    def find_all(self) -> List[UserReadModel]:
+    async def find_all(
+        self,
+        page: PageParams = PageParams(),
+        fields: FieldSet = FieldSet(),
+    ) -> Page[UserReadModel]:
+        return await paginate(
+            self.session,
+            select(UserDTO),
+            UserDTO,
+            page,
+            lambda user_dto: user_dto.to_read_model(),
+            fields,
+        )
+
+    async def find_by_user_name(self, user_name: str) -> Optional[UserReadModel]:
         try:
-            user_dtos = (
-                self.session.query(UserDTO)
-                .order_by(UserDTO.updated_at)
-                .limit(100)
-                .all()
+            result = await self.session.execute(
+                select(UserDTO).filter_by(user_name=user_name),
             )
+            user_dto = result.scalar_one()
+        except NoResultFound:
+            return None
         except:
             raise
 
-        if len(user_dtos) == 0:
-            return []
-
-        return list(map(lambda user_dto: user_dto.to_read_model(), user_dtos))
+        return user_dto.to_read_model()
 
-    def find_by_user_name(self, user_name: str) -> Optional[UserReadModel]:
+    async def find_stats_by_user_id(
+        self,
+        user_id: str,
+    ) -> Optional[UserStatsReadModel]:
         try:
-            user_dto = self.session.query(UserDTO).filter_by(user_name=user_name).one()
-        except NoResultFound:
-            return None
+            result = await self.session.execute(
+                select(user_stats).where(user_stats.c.user_id == user_id),
+            )
+            row = result.one_or_none()
+            if row is None:
+                return None
+            result = await self.session.execute(
+                select(user_stats_counts).where(
+                    user_stats_counts.c.user_id == user_id,
+                ),
+            )
+            counts = result.mappings().all()
         except:
             raise
 
-        return user_dto.to_read_model()
+        return UserStatsReadModel(
+            captures=row.captures,
+            flagged=row.flagged,
+            tags=row.tags,
+            last_activity_at=row.last_activity_at,
+            by_priority={
+                c["key"]: c["count"] for c in counts if c["field"] == "priority"
+            },
+            by_entry_type={
+                c["key"]: c["count"] for c in counts if c["field"] == "entry_type"
+            },
+        )
@@ -1,26 +1,30 @@
-from datetime import datetime
-from typing import Optional, cast
+from typing import Any, Dict, Optional
 
-from sqlalchemy.exc import NoResultFound
-from sqlalchemy.orm.session import Session
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError, NoResultFound
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from capturerrbackend.app.domain.user.user import User
+from capturerrbackend.app.domain.user.user_exception import UserNameAlreadyExistsError
 from capturerrbackend.app.domain.user.user_repository import UserRepository
+from capturerrbackend.app.infrastructure.sqlite.database import is_unique_violation
+from capturerrbackend.app.usecase.job import JobRepository
 from capturerrbackend.app.usecase.user import UserCommandUseCaseUnitOfWork
 
-from .user_dto import UserDTO
+from .user_dto import UserDTO, unixtimestamp
 
 
 class UserRepositoryImpl(UserRepository):
     """UserRepositoryImpl implements CRUD operations related User
     entity using SQLAlchemy."""
 
-    def __init__(self, session: Session) -> None:
-        self.session: Session = session
+    def __init__(self, session: AsyncSession) -> None:
+        self.session: AsyncSession = session
 
-    def find_by_id(self, user_id: str) -> Optional[User]:
+    async def find_by_id(self, user_id: str) -> Optional[User]:
         try:
-            user_dto = self.session.query(UserDTO).filter_by(id=user_id).one()
+            result = await self.session.execute(select(UserDTO).filter_by(id=user_id))
+            user_dto = result.scalar_one()
         except NoResultFound:
             return None
         except:
@@ -28,9 +32,12 @@ class UserRepositoryImpl(UserRepository):
 
         return user_dto.to_entity()
 
-    def find_by_user_name(self, user_name: str) -> Optional[User]:
+    async def find_by_user_name(self, user_name: str) -> Optional[User]:
         try:
-            user_dto = self.session.query(UserDTO).filter_by(user_name=user_name).one()
+            result = await self.session.execute(
+                select(UserDTO).filter_by(user_name=user_name),
+            )
+            user_dto = result.scalar_one()
         except NoResultFound:
             return None
         except:
@@ -38,17 +45,48 @@ class UserRepositoryImpl(UserRepository):
 
         return user_dto.to_entity()
 
-    def create(self, user: User) -> None:
-        user_dto = UserDTO.from_entity(user)
+    async def create(self, user: User) -> User:
+        # the unique constraint detects the conflict, RETURNING reads it back
+        row = UserDTO.from_entity(user).to_row()
+        try:
+            result = await self.session.execute(
+                insert(UserDTO).values(row).returning(UserDTO),
+            )
+            user_dto = result.scalar_one()
+        except IntegrityError as error:
+            if is_unique_violation(error):
+                raise UserNameAlreadyExistsError from error
+            raise
+        except:
+            raise
+
+        return user_dto.to_entity()
+
+    async def patch(self, user_id: str, changes: Dict[str, Any]) -> Optional[User]:
         try:
-            self.session.add(user_dto)
+            result = await self.session.execute(
+                update(UserDTO)
+                .where(UserDTO.id == user_id)
+                .values({**changes, "updated_at": unixtimestamp()})
+                .returning(UserDTO),
+            )
+            user_dto = result.scalar_one_or_none()
+        except IntegrityError as error:
+            if is_unique_violation(error):
+                raise UserNameAlreadyExistsError from error
+            raise
         except:
             raise
 
-    def update(self, user: User) -> None:
+        return None if user_dto is None else user_dto.to_entity()
+
+    async def update(self, user: User) -> None:
         user_dto = UserDTO.from_entity(user)
         try:
-            _user = self.session.query(UserDTO).filter_by(id=user_dto.id).one()
+            result = await self.session.execute(
+                select(UserDTO).filter_by(id=user_dto.id),
+            )
+            _user = result.scalar_one()
             _user.user_name = user_dto.user_name
             _user.first_name = user_dto.first_name
             _user.last_name = user_dto.last_name
@@ -57,11 +95,12 @@ class UserRepositoryImpl(UserRepository):
         except:
             raise
 
-    def delete_by_id(self, user_id: str) -> None:
+    async def delete_by_id(self, user_id: str) -> None:
         try:
-            user_dto = self.session.query(UserDTO).filter_by(id=user_id).one()
+            result = await self.session.execute(select(UserDTO).filter_by(id=user_id))
+            user_dto = result.scalar_one()
             user_dto.is_active = False
-            user_dto.deleted_at = cast(int, datetime.now())
+            user_dto.deleted_at = unixtimestamp()
         except:
             raise
 
@@ -69,17 +108,19 @@ class UserRepositoryImpl(UserRepository):
 class UserCommandUseCaseUnitOfWorkImpl(UserCommandUseCaseUnitOfWork):
     def __init__(
         self,
-        session: Session,
+        session: AsyncSession,
         user_repository: UserRepository,
+        job_repository: JobRepository,
     ):
-        self.session: Session = session
+        self.session: AsyncSession = session
         self.user_repository: UserRepository = user_repository
+        self.job_repository: JobRepository = job_repository
 
-    def begin(self) -> None:
-        self.session.begin()
+    async def begin(self) -> None:
+        await self.session.begin()
 
-    def commit(self) -> None:
-        self.session.commit()
+    async def commit(self) -> None:
+        await self.session.commit()
 
-    def rollback(self) -> None:
-        self.session.rollback()
+    async def rollback(self) -> None:
+        await self.session.rollback()
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from typing import List, Optional
+
+from sqlalchemy import (
+    Column,
+    Executable,
+    ForeignKey,
+    Integer,
+    String,
+    Table,
+    and_,
+    delete,
+    func,
+    literal,
+    select,
+)
+
+from capturerrbackend.app.infrastructure.sqlite.associations import capture_tags
+from capturerrbackend.app.infrastructure.sqlite.capture.capture_dto import CaptureDTO
+from capturerrbackend.app.infrastructure.sqlite.database import Base
+from capturerrbackend.app.infrastructure.sqlite.tag.tag_dto import TagDTO
+from capturerrbackend.app.infrastructure.sqlite.trash import live
+from capturerrbackend.app.infrastructure.sqlite.user.user_dto import UserDTO
+
+user_stats = Table(
+    "user_stats",
+    Base.metadata,
+    Column("user_id", ForeignKey("user.id", ondelete="CASCADE"), primary_key=True),
+    Column("captures", Integer, nullable=False, default=0),
+    Column("flagged", Integer, nullable=False, default=0),
+    # links between the user's captures and tags
+    Column("tags", Integer, nullable=False, default=0),
+    Column("last_activity_at", Integer, nullable=True),
+)
+""" One row of capture counters per user, kept up to date on every write. """
+
+user_stats_counts = Table(
+    "user_stats_counts",
+    Base.metadata,
+    Column("user_id", ForeignKey("user.id", ondelete="CASCADE"), primary_key=True),
+    # "priority" or "entry_type"
+    Column("field", String, primary_key=True),
+    Column("key", String, primary_key=True),
+    Column("count", Integer, nullable=False, default=0),
+)
+""" Per-user capture counts for each priority and entry_type value. """
+
+COUNTED_FIELDS = ("priority", "entry_type")
+
+
+def recompute_statements(user_id: Optional[str] = None) -> List[Executable]:
+    """
+    Rebuild the counters of one or all users from the captures out of the trash.
+
+    Every user gets a ``user_stats`` row, even without captures.
+    """
+    users = select(UserDTO.id)
+    stale = [delete(user_stats), delete(user_stats_counts)]
+    if user_id is not None:
+        users = users.where(UserDTO.id == user_id)
+        stale = [
+            delete(user_stats).where(user_stats.c.user_id == user_id),
+            delete(user_stats_counts).where(user_stats_counts.c.user_id == user_id),
+        ]
+
+    owned = and_(CaptureDTO.user_id == UserDTO.id, live(CaptureDTO))
+    tag_links = (
+        select(func.count())
+        .select_from(capture_tags)
+        .join(CaptureDTO, CaptureDTO.id == capture_tags.c.capture_id)
+        .join(TagDTO, TagDTO.id == capture_tags.c.tag_id)
+        .where(owned, live(TagDTO))
+        .scalar_subquery()
+    )
+    totals = select(
+        UserDTO.id,
+        select(func.count()).where(owned).scalar_subquery(),
+        select(func.count())
+        .where(owned, CaptureDTO.flagged.is_(True))
+        .scalar_subquery(),
+        tag_links,
+        select(func.max(CaptureDTO.updated_at)).where(owned).scalar_subquery(),
+    ).where(UserDTO.id.in_(users))
+
+    statements: List[Executable] = [
+        *stale,
+        user_stats.insert().from_select(
+            ["user_id", "captures", "flagged", "tags", "last_activity_at"],
+            totals,
+        ),
+    ]
+    for field in COUNTED_FIELDS:
+        column = getattr(CaptureDTO, field)
+        statements.append(
+            user_stats_counts.insert().from_select(
+                ["user_id", "field", "key", "count"],
+                select(CaptureDTO.user_id, literal(field), column, func.count())
+                .where(CaptureDTO.user_id.in_(users), live(CaptureDTO))
+                .where(column.is_not(None))
+                .group_by(CaptureDTO.user_id, column),
+            ),
+        )
+    return statements
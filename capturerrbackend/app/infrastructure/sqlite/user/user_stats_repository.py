@@ -0,0 +1,194 @@
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import ColumnElement, Select, delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from capturerrbackend.app.domain.capture.capture import Capture
+from capturerrbackend.app.domain.user.user_stats_repository import UserStatsRepository
+from capturerrbackend.app.infrastructure.sqlite.associations import capture_tags
+from capturerrbackend.app.infrastructure.sqlite.capture.capture_dto import (
+    CaptureDTO,
+    unixtimestamp,
+)
+from capturerrbackend.app.infrastructure.sqlite.database import upsert
+from capturerrbackend.app.infrastructure.sqlite.tag.tag_dto import TagDTO
+from capturerrbackend.app.infrastructure.sqlite.trash import live
+
+from .user_stats import (
+    COUNTED_FIELDS,
+    recompute_statements,
+    user_stats,
+    user_stats_counts,
+)
+
+
+class UserStatsRepositoryImpl(UserStatsRepository):
+    """UserStatsRepositoryImpl maintains the user_stats tables with
+    relative UPSERTs, so concurrent writers never lose an increment.
+
+    Updated columns are given as Column keys: the statements mention
+    ``CaptureDTO``, whose ``tags`` relationship a plain "tags" key would
+    otherwise resolve to.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session: AsyncSession = session
+
+    async def add_capture(self, capture: Capture) -> None:
+        await self._count_captures([capture], 1)
+
+    async def add_captures(self, captures: List[Capture]) -> None:
+        await self._count_captures(captures, 1)
+
+    async def remove_capture(self, capture: Capture) -> None:
+        await self._count_captures([capture], -1)
+
+    async def add_tag(self, capture_id: str) -> None:
+        owner = select(CaptureDTO.user_id).where(CaptureDTO.id == capture_id)
+        try:
+            await self.session.execute(
+                update(user_stats)
+                .where(user_stats.c.user_id == owner.scalar_subquery())
+                .values(
+                    {
+                        user_stats.c.tags: user_stats.c.tags + 1,
+                        user_stats.c.last_activity_at: unixtimestamp(),
+                    },
+                ),
+            )
+        except:
+            raise
+
+    async def count_tag_links(self, user_id: str, delta: int) -> None:
+        try:
+            await self.session.execute(
+                update(user_stats)
+                .where(user_stats.c.user_id == user_id)
+                .values(
+                    {
+                        user_stats.c.tags: user_stats.c.tags + delta,
+                        user_stats.c.last_activity_at: unixtimestamp(),
+                    },
+                ),
+            )
+        except:
+            raise
+
+    async def remove_tags(self, capture_id: str) -> None:
+        owner = select(CaptureDTO.user_id).where(CaptureDTO.id == capture_id)
+        await self._count_links(owner, capture_tags.c.capture_id == capture_id, -1)
+
+    async def restore_tags(self, capture_id: str) -> None:
+        owner = select(CaptureDTO.user_id).where(CaptureDTO.id == capture_id)
+        await self._count_links(owner, capture_tags.c.capture_id == capture_id, 1)
+
+    async def remove_tag_links(self, tag_id: str) -> None:
+        owner = select(TagDTO.user_id).where(TagDTO.id == tag_id)
+        await self._count_links(owner, capture_tags.c.tag_id == tag_id, -1)
+
+    async def restore_tag_links(self, tag_id: str) -> None:
+        owner = select(TagDTO.user_id).where(TagDTO.id == tag_id)
+        await self._count_links(owner, capture_tags.c.tag_id == tag_id, 1)
+
+    async def recompute(self, user_id: Optional[str] = None) -> None:
+        try:
+            for statement in recompute_statements(user_id):
+                await self.session.execute(statement)
+        except:
+            raise
+
+    async def _count_captures(self, captures: List[Capture], delta: int) -> None:
+        """
+        Move the counters of ``captures`` by ``delta`` each.
+
+        The deltas are summed per user and per counted value first, so a
+        whole batch costs one UPSERT per table however many captures it has.
+        """
+        totals: Dict[str, List[int]] = {}
+        counts: Counter[Tuple[str, str, str]] = Counter()
+        for capture in captures:
+            total = totals.setdefault(capture.user_id, [0, 0])
+            total[0] += delta
+            total[1] += delta if capture.flagged else 0
+            for field in COUNTED_FIELDS:
+                key = getattr(capture, field)
+                if key is not None:
+                    counts[(capture.user_id, field, key)] += delta
+        if len(totals) == 0:
+            return
+
+        insert = upsert(self.session)
+        now = unixtimestamp()
+        user_totals = insert(user_stats).values(
+            [
+                {
+                    "user_id": user_id,
+                    "captures": captures_delta,
+                    "flagged": flagged_delta,
+                    "tags": 0,
+                    "last_activity_at": now,
+                }
+                for user_id, (captures_delta, flagged_delta) in totals.items()
+            ],
+        )
+        user_totals = user_totals.on_conflict_do_update(
+            index_elements=[user_stats.c.user_id],
+            set_={
+                "captures": user_stats.c.captures + user_totals.excluded.captures,
+                "flagged": user_stats.c.flagged + user_totals.excluded.flagged,
+                "last_activity_at": user_totals.excluded.last_activity_at,
+            },
+        )
+        try:
+            await self.session.execute(user_totals)
+            if len(counts) > 0:
+                user_counts = insert(user_stats_counts).values(
+                    [
+                        {"user_id": user_id, "field": field, "key": key, "count": count}
+                        for (user_id, field, key), count in counts.items()
+                    ],
+                )
+                user_counts = user_counts.on_conflict_do_update(
+                    index_elements=[
+                        user_stats_counts.c.user_id,
+                        user_stats_counts.c.field,
+                        user_stats_counts.c.key,
+                    ],
+                    set_={
+                        "count": user_stats_counts.c.count + user_counts.excluded.count,
+                    },
+                )
+                await self.session.execute(user_counts)
+            if delta < 0:
+                await self.session.execute(
+                    delete(user_stats_counts)
+                    .where(user_stats_counts.c.user_id.in_(totals.keys()))
+                    .where(user_stats_counts.c.count <= 0),
+                )
+        except:
+            raise
+
+    async def _count_links(
+        self,
+        owner: Select[Tuple[str]],
+        links: ColumnElement[bool],
+        sign: int,
+    ) -> None:
+        """Move the tag counter by the ``links`` between live captures and tags."""
+        tag_links = (
+            select(func.count())
+            .select_from(capture_tags)
+            .join(CaptureDTO, CaptureDTO.id == capture_tags.c.capture_id)
+            .join(TagDTO, TagDTO.id == capture_tags.c.tag_id)
+            .where(links, live(CaptureDTO), live(TagDTO))
+            .scalar_subquery()
+        )
+        try:
+            await self.session.execute(
+                update(user_stats)
+                .where(user_stats.c.user_id == owner.scalar_subquery())
+                .values({user_stats.c.tags: user_stats.c.tags + sign * tag_links}),
+            )
+        except:
+            raise
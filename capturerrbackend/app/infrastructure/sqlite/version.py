@@ -0,0 +1,32 @@
+from typing import Type
+
+from sqlalchemy import ColumnElement, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from capturerrbackend.app.infrastructure.sqlite.database import Base
+from capturerrbackend.app.usecase.version import CollectionVersion
+
+
+async def collection_version(
+    session: AsyncSession,
+    dto: Type[Base],
+    *criteria: ColumnElement[bool],
+) -> CollectionVersion:
+    """
+    Count the ``dto`` rows matching ``criteria`` and find the newest one.
+
+    Scoped to a user this is answered from the covering
+    ``(user_id, updated_at, id)`` index alone; no row is read.
+    """
+    try:
+        result = await session.execute(
+            select(
+                func.count().label("rows"),
+                func.max(dto.updated_at).label("updated_at"),
+            ).where(*criteria),
+        )
+        row = result.one()
+    except:
+        raise
+
+    return CollectionVersion(count=row.rows, updated_at=row.updated_at)
@@ -0,0 +1,72 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Dict, Mapping, Optional
+
+from fastapi import Request
+
+from capturerrbackend.app.usecase.version import CollectionVersion
+
+
+def collection_validators(
+    request: Request,
+    *versions: CollectionVersion,
+    extra: str = "",
+) -> Dict[str, str]:
+    """
+    The ETag/Last-Modified headers of a listing read from ``versions``.
+
+    The ETag also hashes the path and query string, so every page, filter
+    and fieldset of a listing has its own, and ``extra``: whatever else the
+    body depends on, like a filter resolved against the clock.
+    Last-Modified is the newest ``updated_at``; a delete does not move it,
+    so clients should prefer ``If-None-Match``.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{request.url.path}?{request.url.query}|{extra}".encode())
+    for version in versions:
+        digest.update(f"|{version.count}:{version.updated_at}".encode())
+
+    headers = {
+        "ETag": f'W/"{digest.hexdigest()}"',
+        "Cache-Control": "private, no-cache",
+    }
+    newest = max(
+        (v.updated_at for v in versions if v.updated_at is not None),
+        default=None,
+    )
+    if newest is not None:
+        headers["Last-Modified"] = formatdate(newest // 1000, usegmt=True)
+    return headers
+
+
+def http_date(value: Optional[str]) -> Optional[datetime]:
+    if value is None:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def is_not_modified(request: Request, validators: Mapping[str, str]) -> bool:
+    """
+    Whether the client's copy is still current, so a 304 will do.
+
+    ``If-None-Match`` is compared weakly and, when sent, wins over
+    ``If-Modified-Since`` (RFC 9110, 13.2.2).
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        etag = validators["ETag"].removeprefix("W/")
+        return any(
+            tag.strip() == "*" or tag.strip().removeprefix("W/") == etag
+            for tag in if_none_match.split(",")
+        )
+
+    since = http_date(request.headers.get("if-modified-since"))
+    last_modified = http_date(validators.get("Last-Modified"))
+    return since is not None and last_modified is not None and last_modified <= since
@@ -0,0 +1,100 @@
+import csv
+import io
+from typing import AsyncIterable, AsyncIterator, List, Literal
+
+from fastapi.responses import StreamingResponse
+
+from capturerrbackend.app.usecase.capture import CSV_TAG_SEPARATOR, CaptureReadModel
+
+ExportFormat = Literal["ndjson", "csv", "json"]
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+    "json": "application/json",
+}
+
+CSV_COLUMNS = [
+    "id",
+    "entry",
+    "entry_type",
+    "notes",
+    "location",
+    "flagged",
+    "priority",
+    "happened_at",
+    "due_date",
+    "created_at",
+    "updated_at",
+    "tags",
+]
+""" The columns of a CSV export; it reads back in as a CSV import. """
+
+
+def capture_json(capture: CaptureReadModel) -> str:
+    return capture.model_dump_json(exclude={"user", "deleted_at"})
+
+
+def csv_row(capture: CaptureReadModel) -> List[str]:
+    row = capture.model_dump(include=set(CSV_COLUMNS) - {"tags"})
+    row["flagged"] = "true" if capture.flagged else "false"
+    row["tags"] = CSV_TAG_SEPARATOR.join(tag.text for tag in capture.tags or [])
+    return [str(row[column]) for column in CSV_COLUMNS]
+
+
+async def encode_ndjson(
+    chunks: AsyncIterable[List[CaptureReadModel]],
+) -> AsyncIterator[str]:
+    async for captures in chunks:
+        yield "".join(f"{capture_json(capture)}\n" for capture in captures)
+
+
+async def encode_json(
+    chunks: AsyncIterable[List[CaptureReadModel]],
+) -> AsyncIterator[str]:
+    separator = "["
+    async for captures in chunks:
+        if captures:
+            yield separator + ",".join(capture_json(capture) for capture in captures)
+            separator = ","
+    yield "[]" if separator == "[" else "]"
+
+
+async def encode_csv(
+    chunks: AsyncIterable[List[CaptureReadModel]],
+) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_COLUMNS)
+    yield buffer.getvalue()
+    async for captures in chunks:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(csv_row(capture) for capture in captures)
+        yield buffer.getvalue()
+
+
+def export_response(
+    chunks: AsyncIterable[List[CaptureReadModel]],
+    format: ExportFormat,
+    filename: str = "captures",
+) -> StreamingResponse:
+    """
+    Stream ``chunks`` of captures as a download, encoding one at a time.
+
+    Nothing is buffered beyond the chunk being written, so a client that
+    reads slowly holds the cursor back instead of filling memory.
+    """
+    if format == "csv":
+        body = encode_csv(chunks)
+    elif format == "json":
+        body = encode_json(chunks)
+    else:
+        body = encode_ndjson(chunks)
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}.{format}"',
+        },
+    )
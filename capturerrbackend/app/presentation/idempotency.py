@@ -0,0 +1,165 @@
+import asyncio
+import hashlib
+import json
+from collections import OrderedDict
+from datetime import datetime
+from typing import Annotated, Awaitable, Callable, Dict, Optional, TypeVar, Union
+
+from fastapi import Header, Request, Response
+from fastapi.encoders import jsonable_encoder
+
+from capturerrbackend.app.domain.custom_exception import CustomException
+from capturerrbackend.app.usecase.idempotency import (
+    IdempotencyRepository,
+    StoredResponse,
+)
+from capturerrbackend.config.configurator import config
+
+M = TypeVar("M")
+
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+
+class IdempotencyKeyReusedError(CustomException):
+    """IdempotencyKeyReusedError is an error that occurs when an
+    Idempotency-Key is sent again with another request body."""
+
+    status_code = 422
+    detail = "The Idempotency-Key was already used for another request."
+
+    def __str__(self) -> str:
+        return IdempotencyKeyReusedError.detail
+
+
+def unixtimestamp() -> int:
+    return int(datetime.now().timestamp() * 1000)
+
+
+class IdempotencyCache:
+    """
+    The per-process memory of idempotent requests.
+
+    Stored responses live in an LRU of at most ``max_size`` keys and are
+    dropped once expired; the keys whose first request is still running
+    have an event their duplicates wait on.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self.responses: OrderedDict[str, StoredResponse] = OrderedDict()
+        self.in_flight: Dict[str, asyncio.Event] = {}
+
+    def get(self, key: str, now: int) -> Optional[StoredResponse]:
+        stored = self.responses.get(key)
+        if stored is None:
+            return None
+        if stored.expires_at <= now:
+            del self.responses[key]
+            return None
+        self.responses.move_to_end(key)
+        return stored
+
+    def put(self, key: str, stored: StoredResponse) -> None:
+        self.responses[key] = stored
+        self.responses.move_to_end(key)
+        while len(self.responses) > self.max_size:
+            self.responses.popitem(last=False)
+
+    async def claim(self, key: str) -> Optional[StoredResponse]:
+        """
+        The response stored for ``key``, once a running first request is
+        done; None when the caller is the one to run it and ``release`` it.
+        """
+        while True:
+            stored = self.get(key, unixtimestamp())
+            if stored is not None:
+                return stored
+            running = self.in_flight.get(key)
+            if running is None:
+                break
+            await running.wait()
+        # no await between the check and the claim, so only one wins
+        self.in_flight[key] = asyncio.Event()
+        return None
+
+    def release(self, key: str, stored: Optional[StoredResponse]) -> None:
+        """Store the outcome of a claimed key, None for a failed request,
+        and wake its duplicates: they replay it or run again."""
+        if stored is not None:
+            self.put(key, stored)
+        running = self.in_flight.pop(key, None)
+        if running is not None:
+            running.set()
+
+
+idempotency_cache = IdempotencyCache(config.idempotency_cache_size)
+
+
+def replay(stored: StoredResponse) -> Response:
+    return Response(
+        content=stored.body,
+        status_code=stored.status_code,
+        media_type="application/json",
+        headers={REPLAYED_HEADER: "true"},
+    )
+
+
+async def idempotent(
+    request: Request,
+    key: Optional[str],
+    owner: str,
+    run: Callable[[], Awaitable[M]],
+    repository: Optional[IdempotencyRepository] = None,
+) -> Union[M, Response]:
+    """
+    Run a command once per ``Idempotency-Key``.
+
+    Without a key this is just ``run()``.  With one, a retry gets the
+    stored status and body back without running the command again, and a
+    duplicate arriving while the first request still runs waits for it.
+    Only successes are stored, so a failed request can be retried for real.
+    Keys are scoped to the ``owner``, method and path; the same key with
+    another body is refused.  The ``repository``, when given, shares the
+    responses between processes and outlives restarts.
+    """
+    if key is None:
+        return await run()
+
+    scoped = f"{owner}:{request.method}:{request.url.path}:{key}"
+    fingerprint = hashlib.blake2b(await request.body(), digest_size=16).hexdigest()
+
+    stored = await idempotency_cache.claim(scoped)
+    if stored is None:
+        try:
+            if repository is not None:
+                stored = await repository.find(scoped, unixtimestamp())
+            if stored is None:
+                result = await run()
+                stored = StoredResponse(
+                    fingerprint=fingerprint,
+                    status_code=request.scope["route"].status_code,
+                    body=json.dumps(jsonable_encoder(result)),
+                    expires_at=unixtimestamp() + config.idempotency_ttl_seconds * 1000,
+                )
+                if repository is not None:
+                    await repository.save(scoped, stored)
+                return result
+        finally:
+            idempotency_cache.release(scoped, stored)
+
+    if stored.fingerprint != fingerprint:
+        raise IdempotencyKeyReusedError
+    return replay(stored)
+
+
+def idempotency_key_header(
+    idempotency_key: Annotated[
+        Optional[str],
+        Header(
+            max_length=255,
+            description="a client-chosen unique key that makes retries safe",
+        ),
+    ] = None,
+) -> Optional[str]:
+    """Read the ``Idempotency-Key`` header of a command."""
+    return idempotency_key
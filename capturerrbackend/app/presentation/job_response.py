@@ -0,0 +1,11 @@
+from fastapi import Response
+
+from capturerrbackend.app.usecase.job import JobReadModel
+
+
+def accepted(
+    response: Response, job: JobReadModel, path: str = "/jobs"
+) -> JobReadModel:
+    """Answer with a queued job: 202 Accepted and where to follow it."""
+    response.headers["Location"] = f"/api{path}/{job.id}"
+    return job
@@ -1,43 +1,43 @@
-# 💥💥💥💥💥 This should be used as a go-by for the custom response class.
-
-
-# from typing import Generic, TypeVar, List, Optional
-# from pydantic import Field, AnyHttpUrl
-
-# # from pydantic.BaseModel import GenericModel
-# from pydantic import BaseModel
-# from fastapi import Query
-# from sqlalchemy import select, func, Select
-# from sqlalchemy.orm import Session
-
-# M = TypeVar("M")
-
-
-# class PaginatedResponse(BaseModel, Generic[M]):
-#     count: int = Field(description="Number of items returned in the response")
-#     items: List[M] = Field(description="List of items
-# returned in a paginated response")
-#     next_page: Optional[AnyHttpUrl] = Field(
-#         None, description="url of the next page if it exists"
-#     )
-#     previous_page: Optional[AnyHttpUrl] = Field(
-#         None, description="url of the previous page if it exists"
-#     )
-
-
-# class PaginatedParams:
-#     def __init__(self, page: int = Query(1, ge=1), per_page: int = Query(100, ge=0)):
-#         self.limit = per_page * page
-#         self.offset = (page - 1) * per_page
-
-
-# ...
-
-
-# def paginate(session: Session, query: Select, limit: int, offset: int) -> dict:
-#     return {
-#         "count": session.scalar(select(func.count()).select_from(query.subquery())),
-#         "items": [
-#             capture for capture in session.scalars(query.limit(limit).offset(offset))
-#         ],
-#     }
+from typing import Generic, List, Optional, TypeVar
+
+from fastapi import Query
+from pydantic import BaseModel, Field
+
+from capturerrbackend.app.usecase.pagination import Cursor, Order, Page, PageParams
+
+M = TypeVar("M")
+
+
+class PaginatedResponse(BaseModel, Generic[M]):
+    count: int = Field(description="Number of items returned in the response")
+    items: List[M] = Field(description="List of items returned in the response")
+    next_cursor: Optional[str] = Field(
+        None,
+        description="cursor of the next page if it exists",
+    )
+    prev_cursor: Optional[str] = Field(
+        None,
+        description="cursor of the previous page if it exists",
+    )
+
+    @staticmethod
+    def from_page(page: Page[M]) -> "PaginatedResponse[M]":
+        return PaginatedResponse(
+            count=len(page.items),
+            items=page.items,
+            next_cursor=page.next_cursor,
+            prev_cursor=page.prev_cursor,
+        )
+
+
+def pagination_params(
+    cursor: Optional[str] = Query(None, description="next_cursor/prev_cursor"),
+    limit: int = Query(100, ge=1, le=500),
+    order: Order = Query("desc", description="by updated_at; ignored with cursor"),
+) -> PageParams:
+    """Read the keyset paging query parameters of a list route."""
+    return PageParams(
+        cursor=Cursor.decode(cursor) if cursor is not None else None,
+        limit=limit,
+        order=order,
+    )
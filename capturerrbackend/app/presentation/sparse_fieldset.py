@@ -0,0 +1,47 @@
+from typing import Callable, Optional, Type, TypeVar, cast
+
+from fastapi import Query, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from capturerrbackend.app.usecase.fields import FieldSet
+
+C = TypeVar("C", bound=BaseModel)
+
+
+def fields_params(read_model: Type[BaseModel]) -> Callable[..., FieldSet]:
+    """Make the ``?fields=`` dependency of the routes returning ``read_model``."""
+
+    def sparse_fieldset(
+        fields: Optional[str] = Query(
+            None,
+            description="comma separated fields to return, e.g. id,updated_at",
+        ),
+    ) -> FieldSet:
+        return FieldSet.parse(fields, read_model)
+
+    return sparse_fieldset
+
+
+def sparse_response(
+    content: C,
+    fields: FieldSet,
+    response: Optional[Response] = None,
+) -> C:
+    """
+    Return ``content`` as is, or only its requested fields as JSON.
+
+    A sparse read model lacks required fields, so it bypasses the route's
+    ``response_model`` validation and is dumped with ``exclude_unset``.
+    The headers already set on the route's ``response`` are kept.
+    """
+    if fields.is_all:
+        return content
+    return cast(
+        C,
+        JSONResponse(
+            jsonable_encoder(content, exclude_unset=True),
+            headers=None if response is None else dict(response.headers),
+        ),
+    )
@@ -1,4 +1,4 @@
-from .book_command_model import BookCreateModel, BookUpdateModel
+from .book_command_model import BookCreateModel, BookPatchModel, BookUpdateModel
 from .book_command_usecase import (
     BookCommandUseCase,
     BookCommandUseCaseImpl,
@@ -15,6 +15,7 @@ __all__ = [
     "BookReadModel",
     "BookCreateModel",
     "BookUpdateModel",
+    "BookPatchModel",
     "BookCommandUseCaseUnitOfWork",
     "BookCommandUseCaseImpl",
     "BookQueryUseCaseImpl",
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import BaseModel, Field, validator
 
 
@@ -30,3 +32,16 @@ class BookUpdateModel(BaseModel):
                 "read_page must be between 0 and {}".format(values["page"]),
             )
         return v
+
+
+class BookPatchModel(BaseModel):
+    """BookPatchModel represents a write model to change some fields of a
+    book; only the fields given (and not null) change."""
+
+    isbn: Optional[str] = Field(default=None, example="978-0321125217")
+    title: Optional[str] = Field(
+        default=None,
+        example="Domain-Driven Design: Tackling Complexity in the Heart of Softwares",
+    )
+    page: Optional[int] = Field(default=None, ge=0, example=320)
+    read_page: Optional[int] = Field(default=None, ge=0, example=120)
@@ -3,10 +3,10 @@ from typing import Optional, cast
 from uuid import uuid4
 
 from ...domain.book.book import Book
-from ...domain.book.book_exception import BookIsbnAlreadyExistsError, BookNotFoundError
+from ...domain.book.book_exception import BookNotFoundError, BookReadPageOutOfRangeError
 from ...domain.book.book_repository import BookRepository
 from ...domain.book.isbn import Isbn
-from .book_command_model import BookCreateModel, BookUpdateModel
+from .book_command_model import BookCreateModel, BookPatchModel, BookUpdateModel
 from .book_query_model import BookReadModel
 
 
@@ -17,15 +17,15 @@ class BookCommandUseCaseUnitOfWork(ABC):
     book_repository: BookRepository
 
     @abstractmethod
-    def begin(self) -> None:
+    async def begin(self) -> None:
         raise NotImplementedError
 
     @abstractmethod
-    def commit(self) -> None:
+    async def commit(self) -> None:
         raise NotImplementedError
 
     @abstractmethod
-    def rollback(self) -> None:
+    async def rollback(self) -> None:
         raise NotImplementedError
 
 
@@ -33,11 +33,11 @@ class BookCommandUseCase(ABC):
     """BookCommandUseCase defines a command usecase inteface related Book entity."""
 
     @abstractmethod
-    def create_book(self, data: BookCreateModel) -> BookReadModel:
+    async def create_book(self, data: BookCreateModel) -> BookReadModel:
         raise NotImplementedError
 
     @abstractmethod
-    def update_book(
+    async def update_book(
         self,
         book_id: str,
         data: BookUpdateModel,
@@ -45,7 +45,24 @@ class BookCommandUseCase(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def delete_book_by_id(self, book_id: str) -> None:
+    async def patch_book(
+        self,
+        book_id: str,
+        user_id: str,
+        data: BookPatchModel,
+    ) -> BookReadModel:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete_book_by_id(self, book_id: str) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def restore_book_by_id(
+        self,
+        book_id: str,
+        user_id: str,
+    ) -> BookReadModel:
         raise NotImplementedError
 
 
@@ -58,7 +75,7 @@ class BookCommandUseCaseImpl(BookCommandUseCase):
     ):
         self.uow: BookCommandUseCaseUnitOfWork = uow
 
-    def create_book(self, data: BookCreateModel) -> BookReadModel:
+    async def create_book(self, data: BookCreateModel) -> BookReadModel:
         try:
             uuid = uuid4().hex
             isbn = Isbn(data.isbn)
@@ -70,26 +87,22 @@ class BookCommandUseCaseImpl(BookCommandUseCase):
                 user_id=data.user_id,
             )
 
-            existing_book = self.uow.book_repository.find_by_isbn(isbn.value)
-            if existing_book is not None:
-                raise BookIsbnAlreadyExistsError
-
-            self.uow.book_repository.create(book)
-            self.uow.commit()
-
-            created_book = self.uow.book_repository.find_by_id(uuid)
-            return BookReadModel.from_entity(cast(Book, created_book))
+            # a taken ISBN fails the INSERT with BookIsbnAlreadyExistsError
+            created_book = await self.uow.book_repository.create(book)
+            await self.uow.commit()
         except:
-            self.uow.rollback()
+            await self.uow.rollback()
             raise
 
-    def update_book(
+        return BookReadModel.from_entity(created_book)
+
+    async def update_book(
         self,
         book_id: str,
         data: BookUpdateModel,
     ) -> Optional[BookReadModel]:
         try:
-            existing_book = self.uow.book_repository.find_by_id(book_id)
+            existing_book = await self.uow.book_repository.find_by_id(book_id)
             if existing_book is None:
                 raise BookNotFoundError
 
@@ -102,26 +115,76 @@ class BookCommandUseCaseImpl(BookCommandUseCase):
                 read_page=data.read_page,
             )
 
-            self.uow.book_repository.update(book)
+            await self.uow.book_repository.update(book)
 
-            updated_book = self.uow.book_repository.find_by_id(book.book_id)
+            updated_book = await self.uow.book_repository.find_by_id(book.book_id)
 
-            self.uow.commit()
+            await self.uow.commit()
         except:
-            self.uow.rollback()
+            await self.uow.rollback()
             raise
 
         return BookReadModel.from_entity(cast(Book, updated_book))
 
-    def delete_book_by_id(self, book_id: str) -> None:
+    async def patch_book(
+        self,
+        book_id: str,
+        user_id: str,
+        data: BookPatchModel,
+    ) -> BookReadModel:
+        changes = data.model_dump(exclude_none=True)
+        if "isbn" in changes:
+            changes["isbn"] = Isbn(changes["isbn"]).value
         try:
-            existing_book = self.uow.book_repository.find_by_id(book_id)
+            patched_book = await self.uow.book_repository.patch(
+                book_id,
+                user_id,
+                changes,
+            )
+            if patched_book is None:
+                # the pages are checked in the UPDATE; tell that apart
+                # from a missing book only when the statement failed
+                existing_book = await self.uow.book_repository.find_by_id(book_id)
+                if existing_book is not None and existing_book.user_id == user_id:
+                    raise BookReadPageOutOfRangeError
+                raise BookNotFoundError
+            await self.uow.commit()
+        except:
+            await self.uow.rollback()
+            raise
+
+        return BookReadModel.from_entity(patched_book)
+
+    async def delete_book_by_id(self, book_id: str) -> None:
+        try:
+            existing_book = await self.uow.book_repository.find_by_id(book_id)
             if existing_book is None:
                 raise BookNotFoundError
 
-            self.uow.book_repository.delete_by_id(book_id)
+            await self.uow.book_repository.delete_by_id(book_id)
+
+            await self.uow.commit()
+        except:
+            await self.uow.rollback()
+            raise
+
+    async def restore_book_by_id(
+        self,
+        book_id: str,
+        user_id: str,
+    ) -> BookReadModel:
+        try:
+            trashed_book = await self.uow.book_repository.find_trashed_by_id(book_id)
+            if trashed_book is None or trashed_book.user_id != user_id:
+                raise BookNotFoundError
+
+            await self.uow.book_repository.restore_by_id(book_id)
 
-            self.uow.commit()
+            restored_book = await self.uow.book_repository.find_by_id(book_id)
+
+            await self.uow.commit()
         except:
-            self.uow.rollback()
+            await self.uow.rollback()
             raise
+
+        return BookReadModel.from_entity(cast(Book, restored_book))
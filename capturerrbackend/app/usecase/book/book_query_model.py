@@ -20,6 +20,7 @@ class BookReadModel(BaseModel):
     read_page: int = Field(ge=0, example=120)
     created_at: int = Field(example=1136214245000)
     updated_at: int = Field(example=1136214245000)
+    deleted_at: Optional[int] = Field(default=None, example=None)
     user: Optional[UserReadModel] = Field(default=None)
 
     @staticmethod
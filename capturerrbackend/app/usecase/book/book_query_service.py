@@ -1,6 +1,9 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Optional
 
+from ..fields import FieldSet
+from ..pagination import Page, PageParams
+from ..version import CollectionVersion
 from .book_query_model import BookReadModel
 
 
@@ -8,13 +11,43 @@ class BookQueryService(ABC):
     """BookQueryService defines a query service inteface related Book entity."""
 
     @abstractmethod
-    def find_by_id(self, id: str) -> Optional[BookReadModel]:
+    async def find_by_id(
+        self,
+        id: str,
+        fields: FieldSet = FieldSet(),
+    ) -> Optional[BookReadModel]:
         raise NotImplementedError
 
     @abstractmethod
-    def find_all(self) -> List[BookReadModel]:
+    async def find_all(
+        self,
+        page: PageParams = PageParams(),
+        fields: FieldSet = FieldSet(),
+    ) -> Page[BookReadModel]:
         raise NotImplementedError
 
     @abstractmethod
-    def find_by_user_id(self, user_id: str) -> List[BookReadModel]:
+    async def find_by_user_id(
+        self,
+        user_id: str,
+        page: PageParams = PageParams(),
+        fields: FieldSet = FieldSet(),
+    ) -> Page[BookReadModel]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def find_version(
+        self,
+        user_id: Optional[str] = None,
+    ) -> CollectionVersion:
+        """Count and newest updated_at of the books, all users without one."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def find_trashed_by_user_id(
+        self,
+        user_id: str,
+        page: PageParams = PageParams(),
+    ) -> Page[BookReadModel]:
+        """A page of the user's trash, most recently deleted first."""
         raise NotImplementedError
@@ -1,7 +1,10 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Optional
 
 from ...domain.book.book_exception import BookNotFoundError, BooksNotFoundError
+from ..fields import FieldSet
+from ..pagination import Page, PageParams
+from ..version import CollectionVersion
 from .book_query_model import BookReadModel
 from .book_query_service import BookQueryService
 
@@ -10,20 +13,47 @@ class BookQueryUseCase(ABC):
     """BookQueryUseCase defines a query usecase inteface related Book entity."""
 
     @abstractmethod
-    def fetch_book_by_id(self, book_id: str) -> Optional[BookReadModel]:
+    async def fetch_book_by_id(
+        self,
+        book_id: str,
+        fields: FieldSet = FieldSet(),
+    ) -> Optional[BookReadModel]:
         """fetch_book_by_id fetches a book by id."""
         raise NotImplementedError
 
     @abstractmethod
-    def fetch_books(self) -> List[BookReadModel]:
+    async def fetch_books(
+        self,
+        page: PageParams = PageParams(),
+        fields: FieldSet = FieldSet(),
+    ) -> Page[BookReadModel]:
         """fetch_books fetches books."""
         raise NotImplementedError
 
     @abstractmethod
-    def fetch_books_by_user_id(self, user_id: str) -> List[BookReadModel]:
+    async def fetch_books_by_user_id(
+        self,
+        user_id: str,
+        page: PageParams = PageParams(),
+        fields: FieldSet = FieldSet(),
+    ) -> Page[BookReadModel]:
         """fetch_books_by_user_id fetches books by user id."""
         raise NotImplementedError
 
+    @abstractmethod
+    async def fetch_version(self, user_id: Optional[str] = None) -> CollectionVersion:
+        """fetch_version fetches the validator of the books listing."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def fetch_trashed_books_for_user(
+        self,
+        user_id: str,
+        page: PageParams = PageParams(),
+    ) -> Page[BookReadModel]:
+        """fetch_trashed_books_for_user fetches the books in a user's trash."""
+        raise NotImplementedError
+
 
 class BookQueryUseCaseImpl(BookQueryUseCase):
     """BookQueryUseCaseImpl implements a query usecases related Book entity."""
@@ -31,10 +61,14 @@ class BookQueryUseCaseImpl(BookQueryUseCase):
     def __init__(self, book_query_service: BookQueryService):
         self.book_query_service: BookQueryService = book_query_service
 
-    def fetch_book_by_id(self, book_id: str) -> Optional[BookReadModel]:
+    async def fetch_book_by_id(
+        self,
+        book_id: str,
+        fields: FieldSet = FieldSet(),
+    ) -> Optional[BookReadModel]:
         """fetch_book_by_id fetches a book by id."""
         try:
-            book = self.book_query_service.find_by_id(book_id)
+            book = await self.book_query_service.find_by_id(book_id, fields)
             if book is None:
                 raise BookNotFoundError
         except:
@@ -42,24 +76,49 @@ class BookQueryUseCaseImpl(BookQueryUseCase):
 
         return book
 
-    def fetch_books(self) -> List[BookReadModel]:
+    async def fetch_books(
+        self,
+        page: PageParams = PageParams(),
+        fields: FieldSet = FieldSet(),
+    ) -> Page[BookReadModel]:
         """fetch_books fetches books."""
         try:
-            books = self.book_query_service.find_all()
-            if not books:
+            books = await self.book_query_service.find_all(page, fields)
+            if books.items == []:
                 raise BooksNotFoundError
         except:
             raise
 
         return books
 
-    def fetch_books_by_user_id(self, user_id: str) -> List[BookReadModel]:
+    async def fetch_books_by_user_id(
+        self,
+        user_id: str,
+        page: PageParams = PageParams(),
+        fields: FieldSet = FieldSet(),
+    ) -> Page[BookReadModel]:
         """fetch_books_by_user_id fetches books by user id."""
         try:
-            books = self.book_query_service.find_by_user_id(user_id)
+            books = await self.book_query_service.find_by_user_id(
+                user_id,
+                page,
+                fields,
+            )
             if books is None:
                 raise BooksNotFoundError
         except:
             raise
 
         return books
+
+    async def fetch_version(self, user_id: Optional[str] = None) -> CollectionVersion:
+        """fetch_version fetches the validator of the books listing."""
+        return await self.book_query_service.find_version(user_id)
+
+    async def fetch_trashed_books_for_user(
+        self,
+        user_id: str,
+        page: PageParams = PageParams(),
+    ) -> Page[BookReadModel]:
+        """fetch_trashed_books_for_user fetches the books in a user's trash."""
+        return await self.book_query_service.find_trashed_by_user_id(user_id, page)
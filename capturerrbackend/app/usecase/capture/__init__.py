@@ -1,21 +1,85 @@
-from .capture_command_model import CaptureCreateModel, CaptureUpdateModel
+from .capture_command_model import (
+    MAX_CAPTURE_BATCH,
+    MAX_CAPTURE_TAGS,
+    MAX_IMPORT_ERRORS,
+    CaptureBatchCreateModel,
+    CaptureBatchItemModel,
+    CaptureCreateModel,
+    CapturePatchModel,
+    CaptureTagLinksModel,
+    CaptureUpdateModel,
+)
 from .capture_command_usecase import (
     CaptureCommandUseCase,
     CaptureCommandUseCaseImpl,
     CaptureCommandUseCaseUnitOfWork,
 )
-from .capture_query_model import CaptureReadModel
+from .capture_import import (
+    CSV_TAG_SEPARATOR,
+    CaptureImportFormat,
+    ImportRecord,
+    read_records,
+)
+from .capture_query_model import (
+    CAPTURE_EXPORT_CHUNK,
+    CaptureBatchReadModel,
+    CaptureBatchResultModel,
+    CaptureCalendarDayModel,
+    CaptureCalendarReadModel,
+    CaptureDateField,
+    CaptureGroupField,
+    CaptureImportErrorModel,
+    CaptureImportReadModel,
+    CaptureReadModel,
+    CaptureSearchReadModel,
+    CaptureStatsCountModel,
+    CaptureStatsReadModel,
+    CaptureTagFilter,
+    CaptureTagLinksReadModel,
+    CaptureTimeFilter,
+)
 from .capture_query_service import CaptureQueryService
-from .capture_query_usecase import CaptureQueryUseCase, CaptureQueryUseCaseImpl
+from .capture_query_usecase import (
+    CaptureQueryUseCase,
+    CaptureQueryUseCaseImpl,
+    time_zone,
+)
 
 __all__ = [
     "CaptureCommandUseCase",
     "CaptureQueryUseCase",
     "CaptureQueryService",
     "CaptureReadModel",
+    "CaptureSearchReadModel",
+    "CaptureTagFilter",
+    "CaptureTimeFilter",
+    "CaptureDateField",
+    "CaptureCalendarDayModel",
+    "CaptureCalendarReadModel",
+    "CaptureGroupField",
+    "CaptureStatsCountModel",
+    "CaptureStatsReadModel",
     "CaptureCreateModel",
+    "CaptureBatchCreateModel",
+    "CaptureBatchItemModel",
+    "CaptureBatchReadModel",
+    "CaptureBatchResultModel",
+    "MAX_CAPTURE_BATCH",
+    "MAX_CAPTURE_TAGS",
+    "MAX_IMPORT_ERRORS",
+    "CAPTURE_EXPORT_CHUNK",
+    "CaptureImportFormat",
+    "CaptureImportErrorModel",
+    "CaptureImportReadModel",
+    "CSV_TAG_SEPARATOR",
+    "ImportRecord",
+    "read_records",
+    "CaptureTagLinksModel",
+    "CaptureTagLinksReadModel",
     "CaptureUpdateModel",
+    "CapturePatchModel",
     "CaptureCommandUseCaseUnitOfWork",
     "CaptureCommandUseCaseImpl",
     "CaptureQueryUseCaseImpl",
+    "time_zone",
 ]
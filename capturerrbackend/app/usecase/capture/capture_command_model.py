@@ -1,5 +1,12 @@
+from typing import List, Optional
+
 from pydantic import BaseModel, Field
 
+MAX_CAPTURE_BATCH = 1000
+MAX_CAPTURE_TAGS = 100
+MAX_IMPORT_ERRORS = 1000
+""" Row errors an import reports in full; the rest are only counted. """
+
 
 class CaptureCreateModel(BaseModel):
     """CaptureCreateModel represents a write model to create a capture."""
@@ -17,6 +24,49 @@ class CaptureCreateModel(BaseModel):
     user_id: str = Field(example="vytxeTZskVKR7C7WgdSP3d")
 
 
+class CaptureBatchItemModel(BaseModel):
+    """CaptureBatchItemModel represents one capture of a batch create, with
+    the texts of its tags.  The owner is the current user."""
+
+    entry: str = Field(example="Just ate a cheeseburger.")
+    entry_type: str = Field(example="Food journal entry")
+    notes: str = Field(
+        example="It was delicious!.",
+    )
+    location: str = Field(example="McDonalds")
+    flagged: bool = Field(example=False)
+    priority: str = Field(example="low")
+    happened_at: int = Field(example=1620000000)
+    due_date: int = Field(example=1620000000)
+    tags: List[str] = Field(default=[], max_length=MAX_CAPTURE_TAGS, example=["food"])
+
+
+class CaptureBatchCreateModel(BaseModel):
+    """CaptureBatchCreateModel represents a write model to create many
+    captures in one transaction."""
+
+    captures: List[CaptureBatchItemModel] = Field(
+        min_length=1,
+        max_length=MAX_CAPTURE_BATCH,
+    )
+
+
+class CaptureTagLinksModel(BaseModel):
+    """CaptureTagLinksModel names tags, by their text, to attach to or
+    detach from every one of some captures."""
+
+    capture_ids: List[str] = Field(
+        min_length=1,
+        max_length=MAX_CAPTURE_BATCH,
+        example=["vytxeTZskVKR7C7WgdSP3d"],
+    )
+    tags: List[str] = Field(
+        min_length=1,
+        max_length=MAX_CAPTURE_TAGS,
+        example=["food", "travel"],
+    )
+
+
 class CaptureUpdateModel(BaseModel):
     """CaptureUpdateModel represents a write model to update a capture."""
 
@@ -31,3 +81,17 @@ class CaptureUpdateModel(BaseModel):
     happened_at: int = Field(example=1620000000)
     due_date: int = Field(example=1620000000)
     user_id: str = Field(example="vytxeTZskVKR7C7WgdSP3d")
+
+
+class CapturePatchModel(BaseModel):
+    """CapturePatchModel represents a write model to change some fields of
+    a capture; only the fields given (and not null) change."""
+
+    entry: Optional[str] = Field(default=None, example="Just ate a cheeseburger.")
+    entry_type: Optional[str] = Field(default=None, example="Food journal entry")
+    notes: Optional[str] = Field(default=None, example="It was delicious!.")
+    location: Optional[str] = Field(default=None, example="McDonalds")
+    flagged: Optional[bool] = Field(default=None, example=True)
+    priority: Optional[str] = Field(default=None, example="low")
+    happened_at: Optional[int] = Field(default=None, example=1620000000)
+    due_date: Optional[int] = Field(default=None, example=1620000000)
@@ -1,16 +1,50 @@
 from abc import ABC, abstractmethod
-from typing import Optional, cast
+from typing import (
+    AsyncIterable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    cast,
+)
 from uuid import uuid4
 
+from loguru import logger
+from pydantic import TypeAdapter, ValidationError
+
 from capturerrbackend.app.domain.capture.capture_repository import CaptureRepository
+from capturerrbackend.app.domain.tag.tag_repository import TagRepository
+from capturerrbackend.app.domain.user.user_stats_repository import UserStatsRepository
 
 from ...domain.capture.capture import Capture
-from ...domain.capture.capture_exception import (
-    CaptureAlreadyExistsError,
-    CaptureNotFoundError,
+from ...domain.capture.capture_exception import CaptureNotFoundError
+from .capture_command_model import (
+    MAX_CAPTURE_BATCH,
+    MAX_IMPORT_ERRORS,
+    CaptureBatchCreateModel,
+    CaptureBatchItemModel,
+    CaptureCreateModel,
+    CapturePatchModel,
+    CaptureTagLinksModel,
+)
+from .capture_import import ImportRecord
+from .capture_query_model import (
+    CaptureBatchReadModel,
+    CaptureBatchResultModel,
+    CaptureImportErrorModel,
+    CaptureImportReadModel,
+    CaptureReadModel,
+    CaptureTagLinksReadModel,
 )
-from .capture_command_model import CaptureCreateModel, CaptureUpdateModel
-from .capture_query_model import CaptureReadModel
+
+STATS_FIELDS = {"flagged", "priority", "entry_type"}
+""" Capture fields the user stats counters are kept by. """
+
+capture_items = TypeAdapter(List[CaptureBatchItemModel])
+""" Validates a whole chunk of imported captures in one call. """
 
 
 class CaptureCommandUseCaseUnitOfWork(ABC):
@@ -18,17 +52,19 @@ class CaptureCommandUseCaseUnitOfWork(ABC):
     on Unit of Work pattern."""
 
     capture_repository: CaptureRepository
+    tag_repository: TagRepository
+    user_stats_repository: UserStatsRepository
 
     @abstractmethod
-    def begin(self) -> None:
+    async def begin(self) -> None:
         raise NotImplementedError
 
     @abstractmethod
-    def commit(self) -> None:
+    async def commit(self) -> None:
         raise NotImplementedError
 
     @abstractmethod
-    def rollback(self) -> None:
+    async def rollback(self) -> None:
         raise NotImplementedError
 
 
@@ -37,23 +73,73 @@ class CaptureCommandUseCase(ABC):
     related Capture entity."""
 
     @abstractmethod
-    def create_capture(self, data: CaptureCreateModel) -> CaptureReadModel:
+    async def create_capture(self, data: CaptureCreateModel) -> CaptureReadModel:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def create_captures(
+        self,
+        user_id: str,
+        data: CaptureBatchCreateModel,
+    ) -> CaptureBatchReadModel:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def import_captures(
+        self,
+        user_id: str,
+        records: AsyncIterable[ImportRecord],
+        chunk_size: int = MAX_CAPTURE_BATCH,
+        on_progress: Optional[Callable[[CaptureImportReadModel], None]] = None,
+    ) -> CaptureImportReadModel:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def patch_capture(
+        self,
+        capture_id: str,
+        user_id: str,
+        data: CapturePatchModel,
+    ) -> CaptureReadModel:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete_capture_by_id(
+        self,
+        capture_id: str,
+        user_id: Optional[str] = None,
+    ) -> None:
+        """Trash the capture; with ``user_id`` only if that user owns it."""
         raise NotImplementedError
 
     @abstractmethod
-    def update_capture(
+    async def restore_capture_by_id(
         self,
         capture_id: str,
-        data: CaptureUpdateModel,
-    ) -> Optional[CaptureReadModel]:
+        user_id: str,
+    ) -> CaptureReadModel:
         raise NotImplementedError
 
     @abstractmethod
-    def delete_capture_by_id(self, capture_id: str) -> None:
+    async def add_tag_to_capture(
+        self, capture_id: str, tag_id: str
+    ) -> CaptureReadModel:
         raise NotImplementedError
 
     @abstractmethod
-    def add_tag_to_capture(self, capture_id: str, tag_id: str) -> CaptureReadModel:
+    async def attach_tags(
+        self,
+        user_id: str,
+        data: CaptureTagLinksModel,
+    ) -> CaptureTagLinksReadModel:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def detach_tags(
+        self,
+        user_id: str,
+        data: CaptureTagLinksModel,
+    ) -> CaptureTagLinksReadModel:
         raise NotImplementedError
 
 
@@ -67,7 +153,7 @@ class CaptureCommandUseCaseImpl(CaptureCommandUseCase):
     ):
         self.uow: CaptureCommandUseCaseUnitOfWork = uow
 
-    def create_capture(self, data: CaptureCreateModel) -> CaptureReadModel:
+    async def create_capture(self, data: CaptureCreateModel) -> CaptureReadModel:
         try:
             uuid = uuid4().hex
             capture = Capture(
@@ -83,72 +169,338 @@ class CaptureCommandUseCaseImpl(CaptureCommandUseCase):
                 user_id=data.user_id,
             )
 
-            existing_capture = self.uow.capture_repository.find_by_entry(data.entry)
-            if existing_capture is not None:
-                raise CaptureAlreadyExistsError
+            # a taken entry fails the INSERT with CaptureAlreadyExistsError
+            created_capture = await self.uow.capture_repository.create(capture)
+            await self.uow.user_stats_repository.add_capture(capture)
+            await self.uow.commit()
+        except:
+            await self.uow.rollback()
+            raise
+
+        return CaptureReadModel.from_entity(created_capture)
 
-            self.uow.capture_repository.create(capture)
-            self.uow.commit()
+    async def create_captures(
+        self,
+        user_id: str,
+        data: CaptureBatchCreateModel,
+    ) -> CaptureBatchReadModel:
+        """
+        Create the captures of ``data`` for ``user_id`` in one transaction.
 
-            created_capture = self.uow.capture_repository.find_by_id(uuid)
-            return CaptureReadModel.from_entity(cast(Capture, created_capture))
+        Entries already taken, or repeated earlier in the batch, are reported
+        as duplicates instead of failing the batch.  Every step is a set
+        operation: one lookup of the taken entries, one INSERT of the
+        captures, one of the missing tags and one of the tag links.
+        """
+        results: List[CaptureBatchResultModel] = []
+        captures: List[Capture] = []
+        # (capture_id, tag text)
+        tagged: List[Tuple[str, str]] = []
+        try:
+            taken = await self.uow.capture_repository.find_existing_entries(
+                [item.entry for item in data.captures]
+            )
+            seen: Set[str] = set()
+            for index, item in enumerate(data.captures):
+                if item.entry in taken or item.entry in seen:
+                    results.append(
+                        CaptureBatchResultModel(
+                            index=index,
+                            entry=item.entry,
+                            status="duplicate",
+                        )
+                    )
+                    continue
+                seen.add(item.entry)
+
+                capture = Capture(
+                    capture_id=uuid4().hex,
+                    entry=item.entry,
+                    entry_type=item.entry_type,
+                    notes=item.notes,
+                    location=item.location,
+                    flagged=item.flagged,
+                    priority=item.priority,
+                    happened_at=item.happened_at,
+                    due_date=item.due_date,
+                    user_id=user_id,
+                )
+                captures.append(capture)
+                tagged.extend(
+                    (capture.capture_id, text) for text in dict.fromkeys(item.tags)
+                )
+                results.append(
+                    CaptureBatchResultModel(
+                        index=index,
+                        entry=item.entry,
+                        status="created",
+                        id=capture.capture_id,
+                    )
+                )
+
+            if len(captures) > 0:
+                await self.uow.capture_repository.create_many(captures)
+                await self.uow.user_stats_repository.add_captures(captures)
+            if len(tagged) > 0:
+                tag_ids = await self.uow.tag_repository.find_or_create_by_texts(
+                    user_id,
+                    (text for _, text in tagged),
+                )
+                await self.uow.capture_repository.add_tags_many(
+                    [(capture_id, tag_ids[text]) for capture_id, text in tagged]
+                )
+                await self.uow.user_stats_repository.count_tag_links(
+                    user_id,
+                    len(tagged),
+                )
+            await self.uow.commit()
         except:
-            self.uow.rollback()
+            await self.uow.rollback()
             raise
 
-    def update_capture(
+        return CaptureBatchReadModel(
+            created=len(captures),
+            duplicates=len(results) - len(captures),
+            results=results,
+        )
+
+    async def import_captures(
         self,
-        capture_id: str,
-        data: CaptureUpdateModel,
-    ) -> Optional[CaptureReadModel]:
+        user_id: str,
+        records: AsyncIterable[ImportRecord],
+        chunk_size: int = MAX_CAPTURE_BATCH,
+        on_progress: Optional[Callable[[CaptureImportReadModel], None]] = None,
+    ) -> CaptureImportReadModel:
+        """
+        Create the captures read from ``records`` for ``user_id``.
+
+        The records are taken ``chunk_size`` at a time, validated in one
+        ``TypeAdapter`` call and written by ``create_captures``, one commit
+        per chunk.  Only one chunk is held at a time, so memory stays flat
+        whatever the size of the file.  A chunk the database refuses is
+        rolled back and its rows reported as failed; the import goes on
+        with the next chunk.  Records that cannot be read or validated are
+        skipped and reported; ``on_progress`` gets the running tally after
+        every chunk.
+        """
+        report = CaptureImportReadModel()
+        chunk: List[ImportRecord] = []
+        async for record in records:
+            chunk.append(record)
+            if len(chunk) < chunk_size:
+                continue
+            await self._import_chunk(user_id, chunk, report)
+            chunk = []
+            if on_progress is not None:
+                on_progress(report)
+        if len(chunk) > 0:
+            await self._import_chunk(user_id, chunk, report)
+            if on_progress is not None:
+                on_progress(report)
+        return report
+
+    async def _import_chunk(
+        self,
+        user_id: str,
+        chunk: Sequence[ImportRecord],
+        report: CaptureImportReadModel,
+    ) -> None:
+        failures: Dict[int, List[str]] = {
+            index: [record.error] for index, record in enumerate(chunk) if record.error
+        }
+        valid = [index for index in range(len(chunk)) if index not in failures]
         try:
-            existing_capture = self.uow.capture_repository.find_by_id(capture_id)
-            if existing_capture is None:
-                raise CaptureNotFoundError
+            items = capture_items.validate_python([chunk[i].row for i in valid])
+        except ValidationError as error:
+            for detail in error.errors():
+                index = valid[cast(int, detail["loc"][0])]
+                field = ".".join(str(part) for part in detail["loc"][1:])
+                failures.setdefault(index, []).append(f"{field}: {detail['msg']}")
+            valid = [index for index in valid if index not in failures]
+            items = capture_items.validate_python([chunk[i].row for i in valid])
 
-            capture = Capture(
-                capture_id=capture_id,
-                user_id=data.user_id,
-                entry=data.entry,
-                entry_type=data.entry_type,
-                notes=data.notes,
-                location=data.location,
-                flagged=data.flagged,
-                priority=data.priority,
-                happened_at=data.happened_at,
-                due_date=data.due_date,
+        if len(items) > 0:
+            try:
+                batch = await self.create_captures(
+                    user_id,
+                    CaptureBatchCreateModel.model_construct(captures=items),
+                )
+            except Exception as error:
+                # create_captures rolled the chunk back; the next one may pass
+                logger.exception(f"Import of {len(valid)} captures failed")
+                for index in valid:
+                    failures[index] = [f"not saved: {type(error).__name__}"]
+            else:
+                report.created += batch.created
+                report.duplicates += batch.duplicates
+        report.rows += len(chunk)
+        report.failed += len(failures)
+        for index in sorted(failures):
+            if len(report.errors) == MAX_IMPORT_ERRORS:
+                break
+            report.errors.append(
+                CaptureImportErrorModel(
+                    line=chunk[index].line,
+                    error="; ".join(failures[index]),
+                )
             )
 
-            self.uow.capture_repository.update(capture)
+    async def patch_capture(
+        self,
+        capture_id: str,
+        user_id: str,
+        data: CapturePatchModel,
+    ) -> CaptureReadModel:
+        """
+        Change the fields given in ``data`` with one UPDATE … RETURNING,
+        scoped to the owner.  Only a change to a counted field reads the
+        capture first, as the stats counters need its old values.
+        """
+        changes = data.model_dump(exclude_none=True)
+        try:
+            existing_capture = None
+            if STATS_FIELDS & changes.keys():
+                existing_capture = await self.uow.capture_repository.find_by_id(
+                    capture_id,
+                    user_id,
+                )
 
-            updated_capture = self.uow.capture_repository.find_by_id(capture.capture_id)
+            patched_capture = await self.uow.capture_repository.patch(
+                capture_id,
+                user_id,
+                changes,
+            )
+            if patched_capture is None:
+                raise CaptureNotFoundError
 
-            self.uow.commit()
+            if existing_capture is not None:
+                await self.uow.user_stats_repository.remove_capture(existing_capture)
+                await self.uow.user_stats_repository.add_capture(patched_capture)
+            await self.uow.commit()
         except:
-            self.uow.rollback()
+            await self.uow.rollback()
             raise
 
-        return CaptureReadModel.from_entity(cast(Capture, updated_capture))
+        return CaptureReadModel.from_entity(patched_capture)
 
-    def delete_capture_by_id(self, capture_id: str) -> None:
+    async def delete_capture_by_id(
+        self,
+        capture_id: str,
+        user_id: Optional[str] = None,
+    ) -> None:
         try:
-            existing_capture = self.uow.capture_repository.find_by_id(capture_id)
+            existing_capture = await self.uow.capture_repository.find_by_id(
+                capture_id,
+                user_id,
+            )
             if existing_capture is None:
                 raise CaptureNotFoundError
 
-            self.uow.capture_repository.delete_by_id(capture_id)
-            self.uow.commit()
+            await self.uow.user_stats_repository.remove_tags(capture_id)
+            await self.uow.user_stats_repository.remove_capture(existing_capture)
+            await self.uow.capture_repository.delete_by_id(capture_id)
+            await self.uow.commit()
         except:
-            self.uow.rollback()
+            await self.uow.rollback()
             raise
 
-    def add_tag_to_capture(self, capture_id: str, tag_id: str) -> CaptureReadModel:
+    async def restore_capture_by_id(
+        self,
+        capture_id: str,
+        user_id: str,
+    ) -> CaptureReadModel:
         try:
-            self.uow.capture_repository.add_tag(capture_id, tag_id)
-            self.uow.commit()
+            trashed_capture = await self.uow.capture_repository.find_trashed_by_id(
+                capture_id
+            )
+            if trashed_capture is None or trashed_capture.user_id != user_id:
+                raise CaptureNotFoundError
+
+            await self.uow.capture_repository.restore_by_id(capture_id)
+            await self.uow.user_stats_repository.add_capture(trashed_capture)
+            await self.uow.user_stats_repository.restore_tags(capture_id)
+
+            restored_capture = await self.uow.capture_repository.find_by_id(capture_id)
+
+            await self.uow.commit()
+        except:
+            await self.uow.rollback()
+            raise
+
+        return CaptureReadModel.from_entity(cast(Capture, restored_capture))
+
+    async def add_tag_to_capture(
+        self, capture_id: str, tag_id: str
+    ) -> CaptureReadModel:
+        try:
+            await self.uow.capture_repository.add_tag(capture_id, tag_id)
+            await self.uow.user_stats_repository.add_tag(capture_id)
+            await self.uow.commit()
         except:
-            self.uow.rollback()
+            await self.uow.rollback()
             raise
 
-        created_capture = self.uow.capture_repository.find_by_id(capture_id)
+        created_capture = await self.uow.capture_repository.find_by_id(capture_id)
         return CaptureReadModel.from_entity(cast(Capture, created_capture))
+
+    async def attach_tags(
+        self,
+        user_id: str,
+        data: CaptureTagLinksModel,
+    ) -> CaptureTagLinksReadModel:
+        """
+        Tag every capture of ``data`` with every tag text, creating the tags
+        the user does not have yet.  Links already there are left alone.
+        """
+        try:
+            await self._check_owned(user_id, data.capture_ids)
+            tag_ids = await self.uow.tag_repository.find_or_create_by_texts(
+                user_id,
+                data.tags,
+            )
+            linked = await self.uow.capture_repository.attach_tags(
+                data.capture_ids,
+                list(tag_ids.values()),
+            )
+            await self.uow.user_stats_repository.count_tag_links(user_id, linked)
+            await self.uow.commit()
+        except:
+            await self.uow.rollback()
+            raise
+
+        return CaptureTagLinksReadModel(changed=linked)
+
+    async def detach_tags(
+        self,
+        user_id: str,
+        data: CaptureTagLinksModel,
+    ) -> CaptureTagLinksReadModel:
+        """Take the tag texts off every capture of ``data``; unknown texts are skipped."""
+        try:
+            await self._check_owned(user_id, data.capture_ids)
+            tag_ids = await self.uow.tag_repository.find_ids_by_texts(
+                user_id,
+                data.tags,
+            )
+            unlinked = 0
+            if len(tag_ids) > 0:
+                unlinked = await self.uow.capture_repository.detach_tags(
+                    data.capture_ids,
+                    list(tag_ids.values()),
+                )
+                await self.uow.user_stats_repository.count_tag_links(
+                    user_id,
+                    -unlinked,
+                )
+            await self.uow.commit()
+        except:
+            await self.uow.rollback()
+            raise
+
+        return CaptureTagLinksReadModel(changed=unlinked)
+
+    async def _check_owned(self, user_id: str, capture_ids: List[str]) -> None:
+        """Every capture must be a live one of the user, or none is touched."""
+        owned = await self.uow.capture_repository.find_owned_ids(user_id, capture_ids)
+        if len(owned) < len(set(capture_ids)):
+            raise CaptureNotFoundError
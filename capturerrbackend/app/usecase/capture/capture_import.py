@@ -0,0 +1,130 @@
+import codecs
+import csv
+import json
+from typing import Any, AsyncIterable, AsyncIterator, Dict, List, Literal, NamedTuple
+
+CaptureImportFormat = Literal["ndjson", "csv"]
+
+CSV_TAG_SEPARATOR = ";"
+""" Separates the tag texts in the ``tags`` column of a CSV import. """
+
+MAX_CSV_RECORD_SIZE = 64 * 1024
+""" Characters a CSV record may span, quoted line breaks included. """
+
+
+class ImportRecord(NamedTuple):
+    """One record of an import file: the fields read from it, or why it
+    could not be read, and the line it starts on."""
+
+    line: int
+    row: Dict[str, Any]
+    error: str = ""
+
+
+async def read_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """
+    Split a stream of UTF-8 bytes into lines, one chunk at a time.
+
+    Chunks may end mid-line or mid-character; only the unfinished line is
+    held back, so memory is bounded by the longest line.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.removesuffix("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.removesuffix("\r")
+
+
+async def read_ndjson(chunks: AsyncIterable[bytes]) -> AsyncIterator[ImportRecord]:
+    """One JSON object per line; blank lines are skipped."""
+    number = 0
+    async for line in read_lines(chunks):
+        number += 1
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as error:
+            yield ImportRecord(number, {}, f"invalid JSON: {error.msg}")
+            continue
+        if not isinstance(row, dict):
+            yield ImportRecord(number, {}, "expected a JSON object")
+            continue
+        yield ImportRecord(number, row)
+
+
+async def read_csv(
+    chunks: AsyncIterable[bytes],
+    max_record_size: int = MAX_CSV_RECORD_SIZE,
+) -> AsyncIterator[ImportRecord]:
+    """
+    A header line naming the fields, then one capture per record.
+
+    A quoted field may span lines: lines are joined while a record has an
+    odd number of quotes, up to ``max_record_size`` characters.  A record
+    growing past that, e.g. behind a stray quote, is reported and reading
+    starts over at the next line.  ``tags`` holds texts separated by
+    ``CSV_TAG_SEPARATOR``.
+    """
+    header: List[str] = []
+    record: List[str] = []
+    start = number = size = quotes = 0
+    async for line in read_lines(chunks):
+        number += 1
+        if not record:
+            start = number
+            size = quotes = 0
+        record.append(line)
+        size += len(line) + 1
+        quotes += line.count('"')
+        if quotes % 2 == 1:
+            if size > max_record_size:
+                record = []
+                yield ImportRecord(
+                    start,
+                    {},
+                    f"quoted field not closed within {max_record_size} characters",
+                )
+            continue
+        text = "\n".join(record)
+        record = []
+        if not text.strip():
+            continue
+
+        cells = next(csv.reader([text]))
+        if not header:
+            header = [name.strip() for name in cells]
+            continue
+        if len(cells) != len(header):
+            yield ImportRecord(
+                start,
+                {},
+                f"expected {len(header)} cells, found {len(cells)}",
+            )
+            continue
+        row: Dict[str, Any] = dict(zip(header, cells))
+        if "tags" in row:
+            row["tags"] = [
+                tag.strip()
+                for tag in row["tags"].split(CSV_TAG_SEPARATOR)
+                if tag.strip()
+            ]
+        yield ImportRecord(start, row)
+
+    if record:
+        yield ImportRecord(start, {}, "unterminated quoted field")
+
+
+def read_records(
+    chunks: AsyncIterable[bytes],
+    format: CaptureImportFormat,
+) -> AsyncIterator[ImportRecord]:
+    """Read the records of an import file streamed in ``chunks``."""
+    if format == "csv":
+        return read_csv(chunks)
+    return read_ndjson(chunks)
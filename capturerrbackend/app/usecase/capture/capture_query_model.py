@@ -1,4 +1,4 @@
-from typing import List, Optional, cast
+from typing import List, Literal, Optional, cast
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -6,6 +6,12 @@ from capturerrbackend.app.domain.capture.capture import Capture
 from capturerrbackend.app.usecase.tag.tag_query_model import TagReadModel
 from capturerrbackend.app.usecase.user.user_query_model import UserReadModel
 
+CaptureDateField = Literal["happened_at", "due_date"]
+CaptureGroupField = Literal["entry_type", "priority", "tag"]
+
+CAPTURE_EXPORT_CHUNK = 500
+""" Captures read, and tagged, per round trip of an export. """
+
 
 class CaptureReadModel(BaseModel):
     """CaptureReadModel represents data structure as a read model."""
@@ -25,6 +31,8 @@ class CaptureReadModel(BaseModel):
     user_id: str = Field(example="vytxeTZskVKR7C7WgdSP3d")
     created_at: int = Field(example=1136214245000)
     updated_at: int = Field(example=1136214245000)
+    # set while the row is in the trash (ms), else None
+    deleted_at: Optional[int] = Field(default=None, example=None)
     user: Optional[UserReadModel] = Field(default=None)
     tags: Optional[List[TagReadModel]] = Field(default=None)
 
@@ -45,3 +53,119 @@ class CaptureReadModel(BaseModel):
             created_at=cast(int, capture.created_at),
             updated_at=cast(int, capture.updated_at),
         )
+
+
+class CaptureSearchReadModel(CaptureReadModel):
+    """CaptureSearchReadModel is a capture matched by a full-text search."""
+
+    rank: float = Field(example=-4.2)
+    snippet: str = Field(example="Just ate a <mark>cheeseburger</mark>.")
+
+
+class CaptureTagFilter(BaseModel):
+    """CaptureTagFilter selects captures by the texts of their tags."""
+
+    model_config = ConfigDict(frozen=True)
+    include_all: List[str] = Field(default_factory=list, example=["work", "urgent"])
+    include_any: List[str] = Field(default_factory=list, example=["home", "garden"])
+    exclude: List[str] = Field(default_factory=list, example=["done"])
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.include_all or self.include_any or self.exclude)
+
+
+class CaptureTimeFilter(BaseModel):
+    """CaptureTimeFilter bounds happened_at/due_date to half-open
+    ``[from, to)`` epoch second ranges."""
+
+    model_config = ConfigDict(frozen=True)
+    happened_from: Optional[int] = Field(default=None, example=1620000000)
+    happened_to: Optional[int] = Field(default=None, example=1620086400)
+    due_from: Optional[int] = Field(default=None, example=1620000000)
+    due_to: Optional[int] = Field(default=None, example=1620086400)
+
+
+class CaptureCalendarDayModel(BaseModel):
+    """CaptureCalendarDayModel is the number of captures on one day."""
+
+    date: str = Field(example="2021-05-03")
+    count: int = Field(example=3)
+
+
+class CaptureCalendarReadModel(BaseModel):
+    """CaptureCalendarReadModel holds per-day capture counts for a month."""
+
+    year: int = Field(example=2021)
+    month: int = Field(example=5)
+    field: CaptureDateField = Field(example="happened_at")
+    timezone: str = Field(example="Europe/Stockholm")
+    days: List[CaptureCalendarDayModel]
+
+
+class CaptureStatsCountModel(BaseModel):
+    """CaptureStatsCountModel is the number of captures sharing one value."""
+
+    key: str = Field(example="low")
+    count: int = Field(example=3)
+
+
+class CaptureStatsReadModel(BaseModel):
+    """CaptureStatsReadModel aggregates a user's captures over a window of
+    days by their happened_at."""
+
+    timezone: str = Field(example="Europe/Stockholm")
+    happened_from: int = Field(example=1620000000)
+    happened_to: int = Field(example=1622592000)
+    total: int = Field(example=42)
+    flagged: int = Field(example=3)
+    by_entry_type: List[CaptureStatsCountModel]
+    by_priority: List[CaptureStatsCountModel]
+    by_tag: List[CaptureStatsCountModel]
+    by_day: List[CaptureCalendarDayModel]
+    by_week: List[CaptureCalendarDayModel] = Field(
+        description="counts per ISO week, dated by its Monday",
+    )
+
+
+class CaptureBatchResultModel(BaseModel):
+    """CaptureBatchResultModel is the outcome of one capture of a batch
+    create, at its index in the request."""
+
+    index: int = Field(example=0)
+    entry: str = Field(example="Just ate a cheeseburger.")
+    status: Literal["created", "duplicate"] = Field(example="created")
+    id: Optional[str] = Field(default=None, example="vytxeTZskVKR7C7WgdSP3d")
+
+
+class CaptureBatchReadModel(BaseModel):
+    """CaptureBatchReadModel reports a batch create item by item."""
+
+    created: int = Field(example=2)
+    duplicates: int = Field(example=1)
+    results: List[CaptureBatchResultModel]
+
+
+class CaptureImportErrorModel(BaseModel):
+    """CaptureImportErrorModel is why one record of an import was skipped."""
+
+    line: int = Field(example=42)
+    error: str = Field(example="happened_at: Input should be a valid integer")
+
+
+class CaptureImportReadModel(BaseModel):
+    """CaptureImportReadModel is the running tally of an import; ``errors``
+    lists the first skipped records only."""
+
+    rows: int = Field(default=0, example=10000)
+    created: int = Field(default=0, example=9990)
+    duplicates: int = Field(default=0, example=8)
+    failed: int = Field(default=0, example=2)
+    errors: List[CaptureImportErrorModel] = Field(default=[])
+
+
+class CaptureTagLinksReadModel(BaseModel):
+    """CaptureTagLinksReadModel counts the capture to tag links an attach
+    created or a detach removed."""
+
+    changed: int = Field(example=4)
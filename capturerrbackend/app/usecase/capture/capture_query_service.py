@@ -1,20 +1,109 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 
-from .capture_query_model import CaptureReadModel
+from ..fields import FieldSet
+from ..pagination import Page, PageParams
+from ..version import CollectionVersion
+from .capture_query_model import (
+    CAPTURE_EXPORT_CHUNK,
+    CaptureDateField,
+    CaptureGroupField,
+    CaptureReadModel,
+    CaptureSearchReadModel,
+    CaptureTagFilter,
+    CaptureTimeFilter,
+)
 
 
 class CaptureQueryService(ABC):
     """CaptureQueryService defines a query service inteface related Capture entity."""
 
     @abstractmethod
-    def find_by_id(self, id: str) -> Optional[CaptureReadModel]:
+    async def find_by_id(
+        self,
+        id: str,
+        fields: FieldSet = FieldSet(),
+        user_id: Optional[str] = None,
+    ) -> Optional[CaptureReadModel]:
+        """A live capture by id; with ``user_id`` only if that user owns it."""
         raise NotImplementedError
 
     @abstractmethod
-    def find_all(self) -> List[CaptureReadModel]:
+    async def find_all(
+        self,
+        page: PageParams = PageParams(),
+        fields: FieldSet = FieldSet(),
+    ) -> Page[CaptureReadModel]:
         raise NotImplementedError
 
     @abstractmethod
-    def find_by_user_id(self, user_id: str) -> List[CaptureReadModel]:
+    async def find_by_user_id(
+        self,
+        user_id: str,
+        page: PageParams = PageParams(),
+        tags: CaptureTagFilter = CaptureTagFilter(),
+        times: CaptureTimeFilter = CaptureTimeFilter(),
+        fields: FieldSet = FieldSet(),
+    ) -> Page[CaptureReadModel]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def stream_by_user_id(
+        self,
+        user_id: Optional[str] = None,
+        chunk_size: int = CAPTURE_EXPORT_CHUNK,
+    ) -> AsyncIterator[List[CaptureReadModel]]:
+        """Every live capture, of all users without ``user_id``, in chunks."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def search_by_user_id(
+        self,
+        user_id: str,
+        query: str,
+        page: PageParams = PageParams(),
+    ) -> Page[CaptureSearchReadModel]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def count_by_bucket(
+        self,
+        user_id: str,
+        field: CaptureDateField,
+        edges: List[int],
+    ) -> Dict[int, int]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def count_totals(
+        self,
+        user_id: str,
+        times: CaptureTimeFilter = CaptureTimeFilter(),
+    ) -> Tuple[int, int]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def count_by_group(
+        self,
+        user_id: str,
+        field: CaptureGroupField,
+        times: CaptureTimeFilter = CaptureTimeFilter(),
+    ) -> Dict[str, int]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def find_version(
+        self,
+        user_id: Optional[str] = None,
+    ) -> CollectionVersion:
+        """Count and newest updated_at of the captures, all users without one."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def find_trashed_by_user_id(
+        self,
+        user_id: str,
+        page: PageParams = PageParams(),
+    ) -> Page[CaptureReadModel]:
+        """A page of the user's trash, most recently deleted first."""
         raise NotImplementedError
@@ -1,11 +1,29 @@
 from abc import ABC, abstractmethod
-from typing import List
+from datetime import date, datetime, timedelta, tzinfo
+from typing import AsyncIterator, Dict, List, Optional
+
+from capturerrbackend.utils.utils import get_day_edges, get_month_day_edges, get_zone
 
 from ...domain.capture.capture_exception import (
     CaptureNotFoundError,
     CapturesNotFoundError,
+    InvalidTimeZoneError,
+)
+from ..fields import FieldSet
+from ..pagination import Page, PageParams
+from ..version import CollectionVersion
+from .capture_query_model import (
+    CAPTURE_EXPORT_CHUNK,
+    CaptureCalendarDayModel,
+    CaptureCalendarReadModel,
+    CaptureDateField,
+    CaptureReadModel,
+    CaptureSearchReadModel,
+    CaptureStatsCountModel,
+    CaptureStatsReadModel,
+    CaptureTagFilter,
+    CaptureTimeFilter,
 )
-from .capture_query_model import CaptureReadModel
 from .capture_query_service import CaptureQueryService
 
 
@@ -13,20 +31,108 @@ class CaptureQueryUseCase(ABC):
     """CaptureQueryUseCase defines a query usecase inteface related Capture entity."""
 
     @abstractmethod
-    def fetch_capture_by_id(self, capture_id: str) -> CaptureReadModel:
-        """fetch_capture_by_id fetches a capture by id."""
+    async def fetch_capture_by_id(
+        self,
+        capture_id: str,
+        fields: FieldSet = FieldSet(),
+        user_id: Optional[str] = None,
+    ) -> CaptureReadModel:
+        """fetch_capture_by_id fetches a capture by id, of ``user_id`` if given."""
         raise NotImplementedError
 
     @abstractmethod
-    def fetch_captures(self) -> List[CaptureReadModel]:
+    async def fetch_captures(
+        self,
+        page: PageParams = PageParams(),
+        fields: FieldSet = FieldSet(),
+    ) -> Page[CaptureReadModel]:
         """fetch_captures fetches captures."""
         raise NotImplementedError
 
     @abstractmethod
-    def fetch_captures_for_user(self, user_id: str) -> List[CaptureReadModel]:
+    async def fetch_captures_for_user(
+        self,
+        user_id: str,
+        page: PageParams = PageParams(),
+        tags: CaptureTagFilter = CaptureTagFilter(),
+        times: CaptureTimeFilter = CaptureTimeFilter(),
+        fields: FieldSet = FieldSet(),
+    ) -> Page[CaptureReadModel]:
         """fetch_captures_by_user_id fetches captures by user id."""
         raise NotImplementedError
 
+    @abstractmethod
+    def export_captures(
+        self,
+        user_id: Optional[str] = None,
+        chunk_size: int = CAPTURE_EXPORT_CHUNK,
+    ) -> AsyncIterator[List[CaptureReadModel]]:
+        """export_captures streams the captures of a user, or of everyone."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def search_captures_for_user(
+        self,
+        user_id: str,
+        query: str,
+        page: PageParams = PageParams(),
+    ) -> Page[CaptureSearchReadModel]:
+        """search_captures_for_user full-text searches a user's captures."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def fetch_calendar_for_user(
+        self,
+        user_id: str,
+        year: int,
+        month: int,
+        field: CaptureDateField = "happened_at",
+        timezone: str = "UTC",
+    ) -> CaptureCalendarReadModel:
+        """fetch_calendar_for_user counts a user's captures per day of a month."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def fetch_stats_for_user(
+        self,
+        user_id: str,
+        days: int = 30,
+        until: Optional[date] = None,
+        timezone: str = "UTC",
+    ) -> CaptureStatsReadModel:
+        """fetch_stats_for_user aggregates a user's captures of the last days."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def fetch_version(self, user_id: Optional[str] = None) -> CollectionVersion:
+        """fetch_version fetches the validator of the captures listing."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def fetch_trashed_captures_for_user(
+        self,
+        user_id: str,
+        page: PageParams = PageParams(),
+    ) -> Page[CaptureReadModel]:
+        """fetch_trashed_captures_for_user fetches the captures in a user's trash."""
+        raise NotImplementedError
+
+
+def time_zone(name: str) -> tzinfo:
+    """The IANA time zone ``name``, or InvalidTimeZoneError."""
+    try:
+        return get_zone(name)
+    except ValueError:
+        raise InvalidTimeZoneError
+
+
+def stats_counts(counts: Dict[str, int]) -> List[CaptureStatsCountModel]:
+    """Most frequent first, ties by key."""
+    return [
+        CaptureStatsCountModel(key=key, count=count)
+        for key, count in sorted(counts.items(), key=lambda kv: (-kv[1], kv[0]))
+    ]
+
 
 class CaptureQueryUseCaseImpl(CaptureQueryUseCase):
     """CaptureQueryUseCaseImpl implements a query usecases related Capture entity."""
@@ -34,10 +140,19 @@ class CaptureQueryUseCaseImpl(CaptureQueryUseCase):
     def __init__(self, capture_query_service: CaptureQueryService):
         self.capture_query_service: CaptureQueryService = capture_query_service
 
-    def fetch_capture_by_id(self, capture_id: str) -> CaptureReadModel:
-        """fetch_capture_by_id fetches a capture by id."""
+    async def fetch_capture_by_id(
+        self,
+        capture_id: str,
+        fields: FieldSet = FieldSet(),
+        user_id: Optional[str] = None,
+    ) -> CaptureReadModel:
+        """fetch_capture_by_id fetches a capture by id, of ``user_id`` if given."""
         try:
-            capture = self.capture_query_service.find_by_id(capture_id)
+            capture = await self.capture_query_service.find_by_id(
+                capture_id,
+                fields,
+                user_id,
+            )
             if capture is None:
                 raise CaptureNotFoundError
         except:
@@ -45,24 +160,187 @@ class CaptureQueryUseCaseImpl(CaptureQueryUseCase):
 
         return capture
 
-    def fetch_captures(self) -> List[CaptureReadModel]:
+    async def fetch_captures(
+        self,
+        page: PageParams = PageParams(),
+        fields: FieldSet = FieldSet(),
+    ) -> Page[CaptureReadModel]:
         """fetch_captures fetches captures."""
         try:
-            captures = self.capture_query_service.find_all()
-            if captures is None or captures == []:
+            captures = await self.capture_query_service.find_all(page, fields)
+            if captures.items == []:
                 raise CapturesNotFoundError
         except:
             raise
 
         return captures
 
-    def fetch_captures_for_user(self, user_id: str) -> List[CaptureReadModel]:
+    async def fetch_captures_for_user(
+        self,
+        user_id: str,
+        page: PageParams = PageParams(),
+        tags: CaptureTagFilter = CaptureTagFilter(),
+        times: CaptureTimeFilter = CaptureTimeFilter(),
+        fields: FieldSet = FieldSet(),
+    ) -> Page[CaptureReadModel]:
         """fetch_captures_by_user_id fetches captures by user id."""
         try:
-            captures = self.capture_query_service.find_by_user_id(user_id)
-            if captures is None or captures == []:
+            captures = await self.capture_query_service.find_by_user_id(
+                user_id,
+                page,
+                tags,
+                times,
+                fields,
+            )
+            if captures.items == []:
                 raise CapturesNotFoundError
         except:
             raise
 
         return captures
+
+    def export_captures(
+        self,
+        user_id: Optional[str] = None,
+        chunk_size: int = CAPTURE_EXPORT_CHUNK,
+    ) -> AsyncIterator[List[CaptureReadModel]]:
+        """export_captures streams the captures of a user, or of everyone.
+
+        Nothing is read until the chunks are iterated, and only one chunk
+        is held at a time.
+        """
+        return self.capture_query_service.stream_by_user_id(user_id, chunk_size)
+
+    async def search_captures_for_user(
+        self,
+        user_id: str,
+        query: str,
+        page: PageParams = PageParams(),
+    ) -> Page[CaptureSearchReadModel]:
+        """search_captures_for_user full-text searches a user's captures."""
+        try:
+            captures = await self.capture_query_service.search_by_user_id(
+                user_id,
+                query,
+                page,
+            )
+        except:
+            raise
+
+        return captures
+
+    async def fetch_calendar_for_user(
+        self,
+        user_id: str,
+        year: int,
+        month: int,
+        field: CaptureDateField = "happened_at",
+        timezone: str = "UTC",
+    ) -> CaptureCalendarReadModel:
+        """fetch_calendar_for_user counts a user's captures per day of a month."""
+        try:
+            edges = get_month_day_edges(year, month, time_zone(timezone))
+            counts = await self.capture_query_service.count_by_bucket(
+                user_id,
+                field,
+                edges,
+            )
+        except:
+            raise
+
+        first = date(year, month, 1)
+        return CaptureCalendarReadModel(
+            year=year,
+            month=month,
+            field=field,
+            timezone=timezone,
+            days=[
+                CaptureCalendarDayModel(
+                    date=(first + timedelta(days=i)).isoformat(),
+                    count=counts.get(i, 0),
+                )
+                for i in range(len(edges) - 1)
+            ],
+        )
+
+    async def fetch_stats_for_user(
+        self,
+        user_id: str,
+        days: int = 30,
+        until: Optional[date] = None,
+        timezone: str = "UTC",
+    ) -> CaptureStatsReadModel:
+        """fetch_stats_for_user aggregates a user's captures of the last days.
+
+        The window is the ``days`` local days ending with ``until`` (today
+        in ``timezone`` by default); every count is restricted to it.
+        """
+        try:
+            zone = time_zone(timezone)
+            if until is None:
+                until = datetime.now(zone).date()
+            first = until - timedelta(days=days - 1)
+            edges = get_day_edges(first, days, zone)
+            times = CaptureTimeFilter(happened_from=edges[0], happened_to=edges[-1])
+
+            total, flagged = await self.capture_query_service.count_totals(
+                user_id,
+                times,
+            )
+            groups = {
+                field: await self.capture_query_service.count_by_group(
+                    user_id,
+                    field,
+                    times,
+                )
+                for field in ("entry_type", "priority", "tag")
+            }
+            buckets = await self.capture_query_service.count_by_bucket(
+                user_id,
+                "happened_at",
+                edges,
+            )
+        except:
+            raise
+
+        by_day = [
+            CaptureCalendarDayModel(
+                date=(first + timedelta(days=i)).isoformat(),
+                count=buckets.get(i, 0),
+            )
+            for i in range(days)
+        ]
+        # weeks are folded from the days, no extra query needed
+        weeks: Dict[str, int] = {}
+        for i, day in enumerate(by_day):
+            current = first + timedelta(days=i)
+            monday = (current - timedelta(days=current.weekday())).isoformat()
+            weeks[monday] = weeks.get(monday, 0) + day.count
+
+        return CaptureStatsReadModel(
+            timezone=timezone,
+            happened_from=edges[0],
+            happened_to=edges[-1],
+            total=total,
+            flagged=flagged,
+            by_entry_type=stats_counts(groups["entry_type"]),
+            by_priority=stats_counts(groups["priority"]),
+            by_tag=stats_counts(groups["tag"]),
+            by_day=by_day,
+            by_week=[
+                CaptureCalendarDayModel(date=monday, count=count)
+                for monday, count in weeks.items()
+            ],
+        )
+
+    async def fetch_version(self, user_id: Optional[str] = None) -> CollectionVersion:
+        """fetch_version fetches the validator of the captures listing."""
+        return await self.capture_query_service.find_version(user_id)
+
+    async def fetch_trashed_captures_for_user(
+        self,
+        user_id: str,
+        page: PageParams = PageParams(),
+    ) -> Page[CaptureReadModel]:
+        """fetch_trashed_captures_for_user fetches the captures in a user's trash."""
+        return await self.capture_query_service.find_trashed_by_user_id(user_id, page)
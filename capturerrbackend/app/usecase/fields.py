@@ -0,0 +1,56 @@
+from typing import Any, FrozenSet, Mapping, Optional, Type
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from capturerrbackend.app.domain.custom_exception import CustomException
+
+
+class InvalidFieldsError(CustomException):
+    status_code = 400
+    detail = "The fields parameter names a field this resource does not have."
+
+    def __str__(self) -> str:
+        return InvalidFieldsError.detail
+
+
+class FieldSet(BaseModel):
+    """FieldSet is the sparse fieldset (``?fields=``) of a read request.
+
+    Without a ``read_model`` every field is wanted.  Otherwise only the
+    ``names`` of that model (``id`` is always among them) are loaded and
+    returned.
+    """
+
+    model_config = ConfigDict(frozen=True, arbitrary_types_allowed=True)
+    read_model: Optional[Type[BaseModel]] = Field(default=None)
+    names: FrozenSet[str] = Field(default_factory=frozenset)
+
+    @property
+    def is_all(self) -> bool:
+        return self.read_model is None
+
+    def includes(self, name: str) -> bool:
+        return self.is_all or name in self.names
+
+    @staticmethod
+    def parse(raw: Optional[str], read_model: Type[BaseModel]) -> "FieldSet":
+        """Parse a comma separated list of field names of ``read_model``."""
+        names = {name.strip() for name in (raw or "").split(",") if name.strip()}
+        if len(names) == 0:
+            return FieldSet()
+        if not names <= set(read_model.model_fields):
+            raise InvalidFieldsError
+        return FieldSet(read_model=read_model, names=frozenset(names | {"id"}))
+
+    def build(self, values: Mapping[str, Any]) -> Any:
+        """
+        Make a read model out of the loaded ``values``.
+
+        Only the requested names count as set, so a response dumped with
+        ``exclude_unset`` carries just those; extra key columns loaded for
+        paging or owner checks stay readable but are not sent.  The values
+        come from typed columns and are not validated again.
+        """
+        if self.read_model is None:
+            raise ValueError("build() needs a sparse fieldset")
+        return self.read_model.model_construct(_fields_set=set(self.names), **values)
@@ -0,0 +1,35 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class StoredResponse(BaseModel):
+    """StoredResponse is what an idempotent request answered the first time.
+
+    ``fingerprint`` hashes the request body, so a key reused for another
+    payload is told apart from a retry; ``expires_at`` is in milliseconds.
+    """
+
+    model_config = ConfigDict(frozen=True)
+    fingerprint: str = Field()
+    status_code: int = Field()
+    body: str = Field()
+    expires_at: int = Field()
+
+
+class IdempotencyRepository(ABC):
+    """IdempotencyRepository keeps the stored responses beyond one process."""
+
+    @abstractmethod
+    async def find(self, key: str, now: int) -> Optional[StoredResponse]:
+        """The response stored for ``key``, unless it expired by ``now``."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def save(self, key: str, response: StoredResponse) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete_expired(self, now: int) -> int:
+        raise NotImplementedError
@@ -0,0 +1,22 @@
+from .job_model import (
+    JobCreateModel,
+    JobNotFoundError,
+    JobReadModel,
+    JobStatus,
+    UnknownJobKindError,
+)
+from .job_repository import JobRepository
+from .job_usecase import JobUseCase, JobUseCaseImpl, new_job, retry_delay
+
+__all__ = [
+    "JobUseCase",
+    "JobRepository",
+    "JobCreateModel",
+    "JobReadModel",
+    "JobStatus",
+    "JobNotFoundError",
+    "UnknownJobKindError",
+    "JobUseCaseImpl",
+    "new_job",
+    "retry_delay",
+]
@@ -0,0 +1,58 @@
+from typing import Any, Dict, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+from capturerrbackend.app.domain.custom_exception import CustomException
+
+JobStatus = Literal["queued", "running", "succeeded", "failed"]
+
+
+class JobNotFoundError(CustomException):
+    """JobNotFoundError is an error that occurs when a job is not found."""
+
+    status_code = 404
+    detail = "The job you specified does not exist."
+
+    def __str__(self) -> str:
+        return JobNotFoundError.detail
+
+
+class UnknownJobKindError(CustomException):
+    """UnknownJobKindError is an error that occurs when no worker handles
+    the kind of job asked for."""
+
+    status_code = 422
+    detail = "There is no job of the kind you specified."
+
+    def __str__(self) -> str:
+        return UnknownJobKindError.detail
+
+
+class JobCreateModel(BaseModel):
+    """JobCreateModel asks for a job of a known ``kind`` to run in the
+    background with ``params``."""
+
+    kind: str = Field(example="recompute-stats")
+    params: Dict[str, Any] = Field(default={}, example={"user_id": None})
+
+
+class JobReadModel(BaseModel):
+    """JobReadModel represents a background job and how it went.
+
+    A failed attempt puts the job back in the queue until ``run_after``,
+    up to ``max_attempts``; times are in milliseconds.
+    """
+
+    id: str = Field(example="4be0643f1d98573b97cdca98a65347dd")
+    kind: str = Field(example="recompute-stats")
+    params: Dict[str, Any] = Field(default={})
+    user_id: Optional[str] = Field(default=None, example="vytxeTZskVKR7C7WgdSP3d")
+    status: JobStatus = Field(example="queued")
+    attempts: int = Field(example=0)
+    max_attempts: int = Field(example=5)
+    run_after: int = Field(example=1136214245000)
+    result: Optional[Dict[str, Any]] = Field(default=None)
+    error: Optional[str] = Field(default=None)
+    created_at: int = Field(example=1136214245000)
+    updated_at: int = Field(example=1136214245000)
+    finished_at: Optional[int] = Field(default=None, example=None)
@@ -0,0 +1,65 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+
+from .job_model import JobReadModel
+
+
+class JobRepository(ABC):
+    """JobRepository is the persistent queue of background jobs."""
+
+    @abstractmethod
+    async def create(self, job: JobReadModel) -> JobReadModel:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def add(self, job: JobReadModel) -> JobReadModel:
+        """Queue a job in the caller's transaction, committed with it."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def find_by_id(
+        self,
+        id: str,
+        user_id: Optional[str] = None,
+    ) -> Optional[JobReadModel]:
+        """A job by id; with ``user_id`` only if it was queued for that user."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def claim_next(self, worker: str, now: int) -> Optional[JobReadModel]:
+        """Take the oldest queued job that is due, for ``worker`` alone."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def renew(self, id: str, worker: str, now: int) -> bool:
+        """Extend the lease of ``worker`` on a running job; False if it lost it."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def succeed(
+        self,
+        id: str,
+        worker: str,
+        result: Dict[str, Any],
+        now: int,
+    ) -> bool:
+        """Record the result, if ``worker`` still holds the job."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def fail(
+        self,
+        id: str,
+        worker: str,
+        error: str,
+        now: int,
+        retry_at: Optional[int] = None,
+    ) -> bool:
+        """Record a failed attempt, if ``worker`` still holds the job: queue
+        it again at ``retry_at``, or give up."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def requeue_stale(self, before: int, now: int) -> int:
+        """Release the jobs claimed before ``before`` by workers that died."""
+        raise NotImplementedError
@@ -0,0 +1,113 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Collection, Optional
+from uuid import uuid4
+
+from .job_model import (
+    JobCreateModel,
+    JobNotFoundError,
+    JobReadModel,
+    UnknownJobKindError,
+)
+from .job_repository import JobRepository
+
+
+def unixtimestamp() -> int:
+    return int(datetime.now().timestamp() * 1000)
+
+
+def retry_delay(attempts: int, base: float, cap: float) -> float:
+    """Seconds to wait after the ``attempts``-th failure: doubling from
+    ``base``, at most ``cap``."""
+    return float(min(cap, base * 2 ** max(attempts - 1, 0)))
+
+
+def new_job(
+    data: JobCreateModel,
+    user_id: Optional[str] = None,
+    max_attempts: int = 5,
+) -> JobReadModel:
+    """A job ready to be queued now, on behalf of ``user_id`` if given."""
+    now = unixtimestamp()
+    return JobReadModel(
+        id=uuid4().hex,
+        kind=data.kind,
+        params=data.params,
+        user_id=user_id,
+        status="queued",
+        attempts=0,
+        max_attempts=max_attempts,
+        run_after=now,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+class JobUseCase(ABC):
+    """JobUseCase defines the usecase to queue background jobs and follow them."""
+
+    @abstractmethod
+    async def enqueue_job(
+        self,
+        data: JobCreateModel,
+        user_id: Optional[str] = None,
+    ) -> JobReadModel:
+        """enqueue_job queues a job, on behalf of ``user_id`` if given."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def fetch_job_by_id(
+        self,
+        job_id: str,
+        user_id: Optional[str] = None,
+    ) -> JobReadModel:
+        """fetch_job_by_id fetches a job, of ``user_id`` if given."""
+        raise NotImplementedError
+
+
+class JobUseCaseImpl(JobUseCase):
+    """JobUseCaseImpl implements the job usecase over a job repository.
+
+    ``kinds`` are the jobs a worker knows how to run; anything else is
+    refused up front instead of failing in the queue.
+    """
+
+    def __init__(
+        self,
+        job_repository: JobRepository,
+        kinds: Collection[str],
+        max_attempts: int = 5,
+    ):
+        self.job_repository: JobRepository = job_repository
+        self.kinds = kinds
+        self.max_attempts = max_attempts
+
+    async def enqueue_job(
+        self,
+        data: JobCreateModel,
+        user_id: Optional[str] = None,
+    ) -> JobReadModel:
+        """enqueue_job queues a job, on behalf of ``user_id`` if given."""
+        if data.kind not in self.kinds:
+            raise UnknownJobKindError
+
+        job = new_job(data, user_id, self.max_attempts)
+        try:
+            return await self.job_repository.create(job)
+        except:
+            raise
+
+    async def fetch_job_by_id(
+        self,
+        job_id: str,
+        user_id: Optional[str] = None,
+    ) -> JobReadModel:
+        """fetch_job_by_id fetches a job, of ``user_id`` if given."""
+        try:
+            job = await self.job_repository.find_by_id(job_id, user_id)
+            if job is None:
+                raise JobNotFoundError
+        except:
+            raise
+
+        return job
@@ -0,0 +1,83 @@
+import base64
+import binascii
+import json
+from typing import Any, Generic, List, Literal, Optional, Tuple, TypeVar
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from capturerrbackend.app.domain.custom_exception import CustomException
+
+M = TypeVar("M")
+
+Order = Literal["desc", "asc"]
+Direction = Literal["next", "prev"]
+
+
+class InvalidCursorError(CustomException):
+    status_code = 400
+    detail = "The pagination cursor is invalid."
+
+    def __str__(self) -> str:
+        return InvalidCursorError.detail
+
+
+class Cursor(BaseModel):
+    """Cursor is the decoded position of a keyset page boundary.
+
+    ``value``/``id`` is the sort key of the boundary row (its ``updated_at``
+    for plain listings), ``direction`` tells whether the page after or
+    before it is wanted and ``order`` pins the sort order the cursor was
+    issued for.
+    """
+
+    model_config = ConfigDict(frozen=True)
+    value: Any
+    id: str
+    direction: Direction = "next"
+    order: Order = "desc"
+
+    @property
+    def key(self) -> Tuple[Any, str]:
+        return (self.value, self.id)
+
+    def encode(self) -> str:
+        raw = json.dumps([self.value, self.id, self.direction, self.order])
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def decode(encoded: str) -> "Cursor":
+        try:
+            padded = encoded + "=" * (-len(encoded) % 4)
+            value, id, direction, order = json.loads(
+                base64.urlsafe_b64decode(padded.encode()),
+            )
+            return Cursor(
+                value=value,
+                id=id,
+                direction=direction,
+                order=order,
+            )
+        except (binascii.Error, ValueError, TypeError):
+            raise InvalidCursorError
+
+
+class PageParams(BaseModel):
+    """PageParams selects one keyset page of a list query."""
+
+    model_config = ConfigDict(frozen=True)
+    cursor: Optional[Cursor] = Field(default=None)
+    limit: int = Field(default=100, ge=1, le=500)
+    order: Order = Field(default="desc")
+
+    @property
+    def effective_order(self) -> Order:
+        """The order of an issued cursor wins over the requested one."""
+        return self.cursor.order if self.cursor is not None else self.order
+
+
+class Page(BaseModel, Generic[M]):
+    """Page is one keyset page of read models plus the cursors around it."""
+
+    items: List[M] = Field(default_factory=list)
+    next_cursor: Optional[str] = Field(default=None)
+    prev_cursor: Optional[str] = Field(default=None)
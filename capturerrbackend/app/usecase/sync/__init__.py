@@ -0,0 +1,31 @@
+from .sync_query_model import (
+    CaptureTagLinkModel,
+    InvalidSyncCursorError,
+    SyncChangesModel,
+    SyncCursor,
+    SyncPosition,
+    SyncReadModel,
+)
+from .sync_query_service import SyncQueryService
+from .sync_query_usecase import (
+    MAX_SYNC_PAGE_LIMIT,
+    SYNC_OVERLAP_MS,
+    SYNC_PAGE_LIMIT,
+    SyncQueryUseCase,
+    SyncQueryUseCaseImpl,
+)
+
+__all__ = [
+    "SyncQueryUseCase",
+    "SyncQueryService",
+    "SyncReadModel",
+    "SyncChangesModel",
+    "SyncCursor",
+    "SyncPosition",
+    "CaptureTagLinkModel",
+    "InvalidSyncCursorError",
+    "SyncQueryUseCaseImpl",
+    "SYNC_OVERLAP_MS",
+    "SYNC_PAGE_LIMIT",
+    "MAX_SYNC_PAGE_LIMIT",
+]
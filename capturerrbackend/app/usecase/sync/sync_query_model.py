@@ -0,0 +1,109 @@
+import base64
+import binascii
+import json
+from typing import Any, List, Optional, Tuple
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from capturerrbackend.app.domain.custom_exception import CustomException
+
+from ..capture.capture_query_model import CaptureReadModel
+from ..tag.tag_query_model import TagReadModel
+
+
+class InvalidSyncCursorError(CustomException):
+    status_code = 400
+    detail = "The sync cursor is invalid."
+
+    def __str__(self) -> str:
+        return InvalidSyncCursorError.detail
+
+
+class SyncPosition(BaseModel):
+    """SyncPosition is the last row sent of each kind, in sync order.
+
+    Captures and tags are ordered by ``(updated_at, id)``, tombstones by
+    ``(deleted_at, kind, id)``; None means nothing was sent yet.
+    """
+
+    model_config = ConfigDict(frozen=True)
+    captures: Optional[Tuple[int, str]] = None
+    tags: Optional[Tuple[int, str]] = None
+    tombstones: Optional[Tuple[int, str, str]] = None
+
+
+class SyncCursor(BaseModel):
+    """SyncCursor is the point in time (milliseconds) a delta sync reached.
+
+    While a sync is paged, ``until`` is where the next sync will start and
+    ``position`` where the next page does; both are None once it is done.
+    """
+
+    model_config = ConfigDict(frozen=True)
+    since: Optional[int] = None
+    until: Optional[int] = None
+    position: SyncPosition = Field(default_factory=SyncPosition)
+
+    def encode(self) -> str:
+        values: List[Any] = [self.since]
+        if self.until is not None:
+            values += [self.until, *self.position.model_dump().values()]
+        raw = json.dumps(values)
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def decode(encoded: str) -> "SyncCursor":
+        try:
+            padded = encoded + "=" * (-len(encoded) % 4)
+            values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            if len(values) == 1:
+                (since,) = values
+                if since is None:
+                    raise ValueError
+                return SyncCursor(since=since)
+            since, until, captures, tags, tombstones = values
+            return SyncCursor(
+                since=since,
+                until=until,
+                position=SyncPosition(
+                    captures=captures,
+                    tags=tags,
+                    tombstones=tombstones,
+                ),
+            )
+        except (binascii.Error, ValueError, TypeError):
+            raise InvalidSyncCursorError
+
+
+class CaptureTagLinkModel(BaseModel):
+    """CaptureTagLinkModel is one tag attached to one capture."""
+
+    capture_id: str = Field(example="vytxeTZskVKR7C7WgdSP3d")
+    tag_id: str = Field(example="nAtQ4yYAx2kLBnWJH8jJ1M")
+
+
+class SyncChangesModel(BaseModel):
+    """SyncChangesModel is what changed in a user's captures and tags.
+
+    ``links`` is the complete tag set of every capture in ``captures``;
+    attaching a tag touches the capture, so it is always among them.
+    Links of a deleted tag go with its tombstone in ``deleted_tags``.
+    ``has_more`` tells that a limit cut the changes short; ``position`` is
+    where they stopped.
+    """
+
+    captures: List[CaptureReadModel] = Field(default_factory=list)
+    tags: List[TagReadModel] = Field(default_factory=list)
+    links: List[CaptureTagLinkModel] = Field(default_factory=list)
+    deleted_captures: List[str] = Field(default_factory=list)
+    deleted_tags: List[str] = Field(default_factory=list)
+    has_more: bool = Field(default=False)
+    position: SyncPosition = Field(default_factory=SyncPosition, exclude=True)
+
+
+class SyncReadModel(SyncChangesModel):
+    """SyncReadModel is one page of a delta sync: the changes and the next
+    cursor.  With ``has_more`` the cursor fetches the next page at once."""
+
+    cursor: str = Field(example="WzE3MDAwMDAwMDAwMDBd")
+    since: Optional[int] = Field(default=None, example=1136214245000)
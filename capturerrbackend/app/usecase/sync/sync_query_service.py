@@ -0,0 +1,21 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from .sync_query_model import SyncChangesModel, SyncPosition
+
+
+class SyncQueryService(ABC):
+    """SyncQueryService defines a query service inteface for the delta sync."""
+
+    @abstractmethod
+    async def find_changes(
+        self,
+        user_id: str,
+        since: Optional[int] = None,
+        limit: Optional[int] = None,
+        after: SyncPosition = SyncPosition(),
+    ) -> SyncChangesModel:
+        """Rows updated and tombstones left at or after ``since``; all rows
+        and no tombstones without it.  With ``limit``, at most that many of
+        each kind, following ``after``."""
+        raise NotImplementedError
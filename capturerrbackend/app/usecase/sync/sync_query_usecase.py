@@ -0,0 +1,91 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Optional
+
+from .sync_query_model import SyncCursor, SyncReadModel
+from .sync_query_service import SyncQueryService
+
+SYNC_OVERLAP_MS = 5_000
+""" How far the next cursor trails the clock.
+
+``updated_at`` is stamped before a write commits, so a row may become
+visible with a slightly older timestamp than a sync that already ran.
+Overlapping syncs by a few seconds re-sends such rows instead of missing
+them; clients apply changes as idempotent upserts.
+"""
+
+SYNC_PAGE_LIMIT = 500
+""" Captures, tags and tombstones each, sent in one page of a sync. """
+
+MAX_SYNC_PAGE_LIMIT = 2000
+
+
+class SyncQueryUseCase(ABC):
+    """SyncQueryUseCase defines the delta sync usecase of offline clients."""
+
+    @abstractmethod
+    async def fetch_changes_for_user(
+        self,
+        user_id: str,
+        cursor: Optional[str] = None,
+        limit: int = SYNC_PAGE_LIMIT,
+    ) -> SyncReadModel:
+        """fetch_changes_for_user fetches what changed since the cursor."""
+        raise NotImplementedError
+
+
+class SyncQueryUseCaseImpl(SyncQueryUseCase):
+    """SyncQueryUseCaseImpl implements the delta sync usecase."""
+
+    def __init__(self, sync_query_service: SyncQueryService):
+        self.sync_query_service: SyncQueryService = sync_query_service
+
+    async def fetch_changes_for_user(
+        self,
+        user_id: str,
+        cursor: Optional[str] = None,
+        limit: int = SYNC_PAGE_LIMIT,
+    ) -> SyncReadModel:
+        """fetch_changes_for_user fetches what changed since the cursor.
+
+        Without a cursor every capture and tag is returned.  The changes
+        come ``limit`` rows of each kind at a time; the pages of one sync
+        share its ``since`` and the ``until`` fixed by its first page, so
+        the overlap holds however long the paging takes.
+        """
+        current = SyncCursor() if cursor is None else SyncCursor.decode(cursor)
+        since = current.since
+        until = current.until
+        if until is None:
+            now = int(datetime.now().timestamp() * 1000)
+            until = now - SYNC_OVERLAP_MS
+            if since is not None:
+                until = max(since, until)
+        try:
+            changes = await self.sync_query_service.find_changes(
+                user_id,
+                since,
+                limit,
+                current.position,
+            )
+        except:
+            raise
+
+        if changes.has_more:
+            next_cursor = SyncCursor(
+                since=since,
+                until=until,
+                position=changes.position,
+            )
+        else:
+            next_cursor = SyncCursor(since=until)
+        return SyncReadModel(
+            cursor=next_cursor.encode(),
+            since=since,
+            has_more=changes.has_more,
+            captures=changes.captures,
+            tags=changes.tags,
+            links=changes.links,
+            deleted_captures=changes.deleted_captures,
+            deleted_tags=changes.deleted_tags,
+        )
@@ -1,4 +1,4 @@
-from .tag_command_model import TagCreateModel, TagUpdateModel
+from .tag_command_model import TagCreateModel, TagPatchModel, TagUpdateModel
 from .tag_command_usecase import (
     TagCommandUseCase,
     TagCommandUseCaseImpl,
@@ -15,6 +15,7 @@ __all__ = [
     "TagReadModel",
     "TagCreateModel",
     "TagUpdateModel",
+    "TagPatchModel",
     "TagCommandUseCaseUnitOfWork",
     "TagCommandUseCaseImpl",
     "TagQueryUseCaseImpl",
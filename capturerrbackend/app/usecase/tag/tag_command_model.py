@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import BaseModel, Field
 
 
@@ -17,3 +19,10 @@ class TagUpdateModel(BaseModel):
         example="monotone",
     )
     user_id: str = Field(example="vytxeTZskVKR7C7WgdSP3d")
+
+
+class TagPatchModel(BaseModel):
+    """TagPatchModel represents a write model to change some fields of a
+    tag; only the fields given (and not null) change."""
+
+    text: Optional[str] = Field(default=None, example="monotone")
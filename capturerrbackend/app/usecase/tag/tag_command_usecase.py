@@ -3,13 +3,11 @@ from typing import Optional, cast
 from uuid import uuid4
 
 from capturerrbackend.app.domain.tag.tag import Tag
-from capturerrbackend.app.domain.tag.tag_exception import (
-    TagAlreadyExistsError,
-    TagNotFoundError,
-)
+from capturerrbackend.app.domain.tag.tag_exception import TagNotFoundError
 from capturerrbackend.app.domain.tag.tag_repository import TagRepository
+from capturerrbackend.app.domain.user.user_stats_repository import UserStatsRepository
 
-from .tag_command_model import TagCreateModel, TagUpdateModel
+from .tag_command_model import TagCreateModel, TagPatchModel, TagUpdateModel
 from .tag_query_model import TagReadModel
 
 
@@ -18,17 +16,18 @@ class TagCommandUseCaseUnitOfWork(ABC):
     on Unit of Work pattern."""
 
     tag_repository: TagRepository
+    user_stats_repository: UserStatsRepository
 
     @abstractmethod
-    def begin(self) -> None:
+    async def begin(self) -> None:
         raise NotImplementedError
 
     @abstractmethod
-    def commit(self) -> None:
+    async def commit(self) -> None:
         raise NotImplementedError
 
     @abstractmethod
-    def rollback(self) -> None:
+    async def rollback(self) -> None:
         raise NotImplementedError
 
 
@@ -36,15 +35,15 @@ class TagCommandUseCase(ABC):
     """TagCommandUseCase defines a command usecase inteface related Tag entity."""
 
     @abstractmethod
-    def create_tag(self, data: TagCreateModel) -> TagReadModel:
+    async def create_tag(self, data: TagCreateModel) -> TagReadModel:
         raise NotImplementedError
 
     @abstractmethod
-    def get_or_create_tag(self, data: TagCreateModel) -> TagReadModel:
+    async def get_or_create_tag(self, data: TagCreateModel) -> TagReadModel:
         raise NotImplementedError
 
     @abstractmethod
-    def update_tag(
+    async def update_tag(
         self,
         tag_id: str,
         data: TagUpdateModel,
@@ -52,7 +51,29 @@ class TagCommandUseCase(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def delete_tag_by_id(self, tag_id: str) -> None:
+    async def patch_tag(
+        self,
+        tag_id: str,
+        user_id: str,
+        data: TagPatchModel,
+    ) -> TagReadModel:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete_tag_by_id(
+        self,
+        tag_id: str,
+        user_id: Optional[str] = None,
+    ) -> None:
+        """Trash the tag; with ``user_id`` only if that user owns it."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def restore_tag_by_id(
+        self,
+        tag_id: str,
+        user_id: str,
+    ) -> TagReadModel:
         raise NotImplementedError
 
 
@@ -65,7 +86,7 @@ class TagCommandUseCaseImpl(TagCommandUseCase):
     ):
         self.uow: TagCommandUseCaseUnitOfWork = uow
 
-    def create_tag(self, data: TagCreateModel) -> TagReadModel:
+    async def create_tag(self, data: TagCreateModel) -> TagReadModel:
         try:
             uuid = uuid4().hex
             tag = Tag(
@@ -74,47 +95,37 @@ class TagCommandUseCaseImpl(TagCommandUseCase):
                 user_id=data.user_id,
             )
 
-            existing_tag = self.uow.tag_repository.find_by_text(data.text)
-            if existing_tag is not None:
-                raise TagAlreadyExistsError
-
-            self.uow.tag_repository.create(tag)
-            self.uow.commit()
-
-            created_tag = self.uow.tag_repository.find_by_id(uuid)
-            return TagReadModel.from_entity(cast(Tag, created_tag))
+            # a taken text fails the INSERT with TagAlreadyExistsError
+            created_tag = await self.uow.tag_repository.create(tag)
+            await self.uow.commit()
         except:
-            self.uow.rollback()
+            await self.uow.rollback()
             raise
 
-    def get_or_create_tag(self, data: TagCreateModel) -> TagReadModel:
+        return TagReadModel.from_entity(created_tag)
+
+    async def get_or_create_tag(self, data: TagCreateModel) -> TagReadModel:
         try:
-            existing_tag = self.uow.tag_repository.find_by_text(data.text)
-            if existing_tag is not None:
-                return TagReadModel.from_entity(existing_tag)
-            uuid = uuid4().hex
-            tag = Tag(
-                id=uuid,
-                text=data.text,
-                user_id=data.user_id,
+            # scoped to the owner: another user's tag with the text is not ours
+            tag_ids = await self.uow.tag_repository.find_or_create_by_texts(
+                data.user_id,
+                [data.text],
             )
-
-            self.uow.tag_repository.create(tag)
-            self.uow.commit()
-
-            created_tag = self.uow.tag_repository.find_by_id(uuid)
-            return TagReadModel.from_entity(cast(Tag, created_tag))
+            tag = await self.uow.tag_repository.find_by_id(tag_ids[data.text])
+            await self.uow.commit()
         except:
-            self.uow.rollback()
+            await self.uow.rollback()
             raise
 
-    def update_tag(
+        return TagReadModel.from_entity(cast(Tag, tag))
+
+    async def update_tag(
         self,
         tag_id: str,
         data: TagUpdateModel,
     ) -> Optional[TagReadModel]:
         try:
-            existing_tag = self.uow.tag_repository.find_by_id(tag_id)
+            existing_tag = await self.uow.tag_repository.find_by_id(tag_id)
             if existing_tag is None:
                 raise TagNotFoundError
 
@@ -124,26 +135,74 @@ class TagCommandUseCaseImpl(TagCommandUseCase):
                 user_id=existing_tag.user_id,
             )
 
-            self.uow.tag_repository.update(tag)
+            await self.uow.tag_repository.update(tag)
 
-            updated_tag = self.uow.tag_repository.find_by_id(tag.id)
+            updated_tag = await self.uow.tag_repository.find_by_id(tag.id)
 
-            self.uow.commit()
+            await self.uow.commit()
         except:
-            self.uow.rollback()
+            await self.uow.rollback()
             raise
 
         return TagReadModel.from_entity(cast(Tag, updated_tag))
 
-    def delete_tag_by_id(self, tag_id: str) -> None:
+    async def patch_tag(
+        self,
+        tag_id: str,
+        user_id: str,
+        data: TagPatchModel,
+    ) -> TagReadModel:
+        try:
+            patched_tag = await self.uow.tag_repository.patch(
+                tag_id,
+                user_id,
+                data.model_dump(exclude_none=True),
+            )
+            if patched_tag is None:
+                raise TagNotFoundError
+            await self.uow.commit()
+        except:
+            await self.uow.rollback()
+            raise
+
+        return TagReadModel.from_entity(patched_tag)
+
+    async def delete_tag_by_id(
+        self,
+        tag_id: str,
+        user_id: Optional[str] = None,
+    ) -> None:
         try:
-            existing_tag = self.uow.tag_repository.find_by_id(tag_id)
+            existing_tag = await self.uow.tag_repository.find_by_id(tag_id, user_id)
             if existing_tag is None:
                 raise TagNotFoundError
 
-            self.uow.tag_repository.delete_by_id(tag_id)
+            await self.uow.user_stats_repository.remove_tag_links(tag_id)
+            await self.uow.tag_repository.delete_by_id(tag_id)
 
-            self.uow.commit()
+            await self.uow.commit()
         except:
-            self.uow.rollback()
+            await self.uow.rollback()
             raise
+
+    async def restore_tag_by_id(
+        self,
+        tag_id: str,
+        user_id: str,
+    ) -> TagReadModel:
+        try:
+            trashed_tag = await self.uow.tag_repository.find_trashed_by_id(tag_id)
+            if trashed_tag is None or trashed_tag.user_id != user_id:
+                raise TagNotFoundError
+
+            await self.uow.tag_repository.restore_by_id(tag_id)
+            await self.uow.user_stats_repository.restore_tag_links(tag_id)
+
+            restored_tag = await self.uow.tag_repository.find_by_id(tag_id)
+
+            await self.uow.commit()
+        except:
+            await self.uow.rollback()
+            raise
+
+        return TagReadModel.from_entity(cast(Tag, restored_tag))
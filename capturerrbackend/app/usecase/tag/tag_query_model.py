@@ -25,6 +25,7 @@ class TagReadModel(BaseModel):
 
     created_at: int = Field(example=1136214245000)
     updated_at: int = Field(example=1136214245000)
+    deleted_at: Optional[int] = Field(default=None, example=None)
     captures: Optional[List["CaptureReadModel"]] = Field(default=None)
 
     @staticmethod
@@ -1,6 +1,9 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Dict, List, Optional
 
+from ..fields import FieldSet
+from ..pagination import Page, PageParams
+from ..version import CollectionVersion
 from .tag_query_model import TagReadModel
 
 
@@ -8,21 +11,60 @@ class TagQueryService(ABC):
     """TagQueryService defines a query service inteface related Tag entity."""
 
     @abstractmethod
-    def find_by_id(self, id: str) -> Optional[TagReadModel]:
+    async def find_by_id(
+        self,
+        id: str,
+        fields: FieldSet = FieldSet(),
+        user_id: Optional[str] = None,
+    ) -> Optional[TagReadModel]:
+        """A live tag by id; with ``user_id`` only if that user owns it."""
         raise NotImplementedError
 
     @abstractmethod
-    def find_by_text(self, text: str) -> Optional[TagReadModel]:
+    async def find_by_text(self, text: str) -> Optional[TagReadModel]:
         raise NotImplementedError
 
     @abstractmethod
-    def find_all(self) -> List[TagReadModel]:
+    async def find_all(
+        self,
+        page: PageParams = PageParams(),
+        fields: FieldSet = FieldSet(),
+    ) -> Page[TagReadModel]:
         raise NotImplementedError
 
     @abstractmethod
-    def find_by_user_id(self, user_id: str) -> List[TagReadModel]:
+    async def find_by_user_id(
+        self,
+        user_id: str,
+        page: PageParams = PageParams(),
+        fields: FieldSet = FieldSet(),
+    ) -> Page[TagReadModel]:
         raise NotImplementedError
 
     @abstractmethod
-    def find_by_capture_id(self, capture_id: str) -> List[TagReadModel]:
+    async def find_by_capture_id(self, capture_id: str) -> List[TagReadModel]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def find_by_capture_ids(
+        self,
+        capture_ids: List[str],
+    ) -> Dict[str, List[TagReadModel]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def find_version(
+        self,
+        user_id: Optional[str] = None,
+    ) -> CollectionVersion:
+        """Count and newest updated_at of the tags, all users without one."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def find_trashed_by_user_id(
+        self,
+        user_id: str,
+        page: PageParams = PageParams(),
+    ) -> Page[TagReadModel]:
+        """A page of the user's trash, most recently deleted first."""
         raise NotImplementedError
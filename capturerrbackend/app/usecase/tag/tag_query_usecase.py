@@ -1,11 +1,14 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Dict, List, Optional
 
 from capturerrbackend.app.domain.tag.tag_exception import (
     TagNotFoundError,
     TagsNotFoundError,
 )
 
+from ..fields import FieldSet
+from ..pagination import Page, PageParams
+from ..version import CollectionVersion
 from .tag_query_model import TagReadModel
 from .tag_query_service import TagQueryService
 
@@ -14,30 +17,66 @@ class TagQueryUseCase(ABC):
     """TagQueryUseCase defines a query usecase inteface related Tag entity."""
 
     @abstractmethod
-    def fetch_tag_by_id(self, tag_id: str) -> TagReadModel:
-        """fetch_tag_by_id fetches a tag by id."""
+    async def fetch_tag_by_id(
+        self,
+        tag_id: str,
+        fields: FieldSet = FieldSet(),
+        user_id: Optional[str] = None,
+    ) -> TagReadModel:
+        """fetch_tag_by_id fetches a tag by id, of ``user_id`` if given."""
         raise NotImplementedError
 
     @abstractmethod
-    def fetch_tag_by_text(self, text: str) -> TagReadModel:
+    async def fetch_tag_by_text(self, text: str) -> TagReadModel:
         """fetch_tag_by_text fetches a tag by text"""
         raise NotImplementedError
 
     @abstractmethod
-    def fetch_tags(self) -> List[TagReadModel]:
+    async def fetch_tags(
+        self,
+        page: PageParams = PageParams(),
+        fields: FieldSet = FieldSet(),
+    ) -> Page[TagReadModel]:
         """fetch_tags fetches tags."""
         raise NotImplementedError
 
     @abstractmethod
-    def fetch_tags_for_user(self, user_id: str) -> List[TagReadModel]:
+    async def fetch_tags_for_user(
+        self,
+        user_id: str,
+        page: PageParams = PageParams(),
+        fields: FieldSet = FieldSet(),
+    ) -> Page[TagReadModel]:
         """fetch_tags_by_user_id fetches tags by user id."""
         raise NotImplementedError
 
     @abstractmethod
-    def fetch_tags_for_capture(self, capture_id: str) -> List[TagReadModel]:
+    async def fetch_tags_for_capture(self, capture_id: str) -> List[TagReadModel]:
         """fetch_tags_for_capture fetches tags by capture id."""
         raise NotImplementedError
 
+    @abstractmethod
+    async def fetch_tags_for_captures(
+        self,
+        capture_ids: List[str],
+    ) -> Dict[str, List[TagReadModel]]:
+        """fetch_tags_for_captures fetches tags for many captures at once."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def fetch_version(self, user_id: Optional[str] = None) -> CollectionVersion:
+        """fetch_version fetches the validator of the tags listing."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def fetch_trashed_tags_for_user(
+        self,
+        user_id: str,
+        page: PageParams = PageParams(),
+    ) -> Page[TagReadModel]:
+        """fetch_trashed_tags_for_user fetches the tags in a user's trash."""
+        raise NotImplementedError
+
 
 class TagQueryUseCaseImpl(TagQueryUseCase):
     """TagQueryUseCaseImpl implements a query usecases related Tag entity."""
@@ -45,10 +84,19 @@ class TagQueryUseCaseImpl(TagQueryUseCase):
     def __init__(self, tag_query_service: TagQueryService):
         self.tag_query_service: TagQueryService = tag_query_service
 
-    def fetch_tag_by_id(self, tag_id: str) -> TagReadModel:
-        """fetch_tag_by_id fetches a tag by id."""
+    async def fetch_tag_by_id(
+        self,
+        tag_id: str,
+        fields: FieldSet = FieldSet(),
+        user_id: Optional[str] = None,
+    ) -> TagReadModel:
+        """fetch_tag_by_id fetches a tag by id, of ``user_id`` if given."""
         try:
-            tag = self.tag_query_service.find_by_id(tag_id)
+            tag = await self.tag_query_service.find_by_id(
+                tag_id,
+                fields,
+                user_id,
+            )
             if tag is None:
                 raise TagNotFoundError
         except:
@@ -56,10 +104,10 @@ class TagQueryUseCaseImpl(TagQueryUseCase):
 
         return tag
 
-    def fetch_tag_by_text(self, text: str) -> TagReadModel:
+    async def fetch_tag_by_text(self, text: str) -> TagReadModel:
         """fetch_tag_by_id fetches a tag by id."""
         try:
-            tag = self.tag_query_service.find_by_text(text)
+            tag = await self.tag_query_service.find_by_text(text)
             if tag is None:
                 raise TagNotFoundError
         except:
@@ -67,27 +115,58 @@ class TagQueryUseCaseImpl(TagQueryUseCase):
 
         return tag
 
-    def fetch_tags(self) -> List[TagReadModel]:
+    async def fetch_tags(
+        self,
+        page: PageParams = PageParams(),
+        fields: FieldSet = FieldSet(),
+    ) -> Page[TagReadModel]:
         """fetch_tags fetches tags."""
         try:
-            tags = self.tag_query_service.find_all()
-            if tags == []:
+            tags = await self.tag_query_service.find_all(page, fields)
+            if tags.items == []:
                 raise TagsNotFoundError
         except:
             raise
 
         return tags
 
-    def fetch_tags_for_user(self, user_id: str) -> List[TagReadModel]:
+    async def fetch_tags_for_user(
+        self,
+        user_id: str,
+        page: PageParams = PageParams(),
+        fields: FieldSet = FieldSet(),
+    ) -> Page[TagReadModel]:
         """fetch_tags_by_user_id fetches tags by user id."""
         try:
-            tags = self.tag_query_service.find_by_user_id(user_id)
-            if tags == []:
+            tags = await self.tag_query_service.find_by_user_id(
+                user_id,
+                page,
+                fields,
+            )
+            if tags.items == []:
                 raise TagsNotFoundError
         except:
             raise
 
         return tags
 
-    def fetch_tags_for_capture(self, capture_id: str) -> List[TagReadModel]:
-        return self.tag_query_service.find_by_capture_id(capture_id)
+    async def fetch_tags_for_capture(self, capture_id: str) -> List[TagReadModel]:
+        return await self.tag_query_service.find_by_capture_id(capture_id)
+
+    async def fetch_tags_for_captures(
+        self,
+        capture_ids: List[str],
+    ) -> Dict[str, List[TagReadModel]]:
+        return await self.tag_query_service.find_by_capture_ids(capture_ids)
+
+    async def fetch_version(self, user_id: Optional[str] = None) -> CollectionVersion:
+        """fetch_version fetches the validator of the tags listing."""
+        return await self.tag_query_service.find_version(user_id)
+
+    async def fetch_trashed_tags_for_user(
+        self,
+        user_id: str,
+        page: PageParams = PageParams(),
+    ) -> Page[TagReadModel]:
+        """fetch_trashed_tags_for_user fetches the tags in a user's trash."""
+        return await self.tag_query_service.find_trashed_by_user_id(user_id, page)
@@ -1,11 +1,11 @@
 from .user_auth_service import Token, TokenData, create_access_token, verify_password
-from .user_command_model import UserCreateModel, UserUpdateModel
+from .user_command_model import UserCreateModel, UserPatchModel, UserUpdateModel
 from .user_command_usecase import (
     UserCommandUseCase,
     UserCommandUseCaseImpl,
     UserCommandUseCaseUnitOfWork,
 )
-from .user_query_model import UserLoginModel, UserReadModel
+from .user_query_model import UserLoginModel, UserReadModel, UserStatsReadModel
 from .user_query_service import UserQueryService
 from .user_query_usecase import UserQueryUseCase, UserQueryUseCaseImpl
 
@@ -14,8 +14,10 @@ __all__ = [
     "UserQueryUseCase",
     "UserQueryService",
     "UserReadModel",
+    "UserStatsReadModel",
     "UserCreateModel",
     "UserUpdateModel",
+    "UserPatchModel",
     "UserCommandUseCaseUnitOfWork",
     "UserCommandUseCaseImpl",
     "UserQueryUseCaseImpl",
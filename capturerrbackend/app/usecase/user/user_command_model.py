@@ -26,3 +26,14 @@ class UserUpdateModel(UserBaseModel):
     """UserUpdateModel represents a write model to update a user."""
 
     ...
+
+
+class UserPatchModel(BaseModel):
+    """UserPatchModel represents a write model to change some fields of a
+    user; only the fields given (and not null) change."""
+
+    user_name: Optional[str] = Field(default=None, example="matt")
+    first_name: Optional[str] = Field(default=None, example="Matt")
+    last_name: Optional[str] = Field(default=None, example="Bitt")
+    email: Optional[str] = Field(default=None, example="matt@bittfurst.xyz")
+    password: Optional[str] = Field(default=None, example="password")
@@ -6,14 +6,17 @@ from uuid import uuid4
 from loguru import logger
 
 from capturerrbackend.app.domain.user.user import User
-from capturerrbackend.app.domain.user.user_exception import (
-    UserNameAlreadyExistsError,
-    UserNotFoundError,
-)
+from capturerrbackend.app.domain.user.user_exception import UserNotFoundError
 from capturerrbackend.app.domain.user.user_repository import UserRepository
+from capturerrbackend.app.usecase.job import (
+    JobCreateModel,
+    JobReadModel,
+    JobRepository,
+    new_job,
+)
 
 from .user_auth_service import get_password_hash
-from .user_command_model import UserCreateModel, UserUpdateModel
+from .user_command_model import UserCreateModel, UserPatchModel, UserUpdateModel
 from .user_query_model import UserReadModel
 
 
@@ -26,17 +29,18 @@ class UserCommandUseCaseUnitOfWork(ABC):
     on Unit of Work pattern."""
 
     user_repository: UserRepository
+    job_repository: JobRepository
 
     @abstractmethod
-    def begin(self) -> None:
+    async def begin(self) -> None:
         raise NotImplementedError
 
     @abstractmethod
-    def commit(self) -> None:
+    async def commit(self) -> None:
         raise NotImplementedError
 
     @abstractmethod
-    def rollback(self) -> None:
+    async def rollback(self) -> None:
         raise NotImplementedError
 
 
@@ -44,11 +48,11 @@ class UserCommandUseCase(ABC):
     """UserCommandUseCase defines a command usecase inteface related User entity."""
 
     @abstractmethod
-    def create_user(self, data: UserCreateModel) -> UserReadModel:
+    async def create_user(self, data: UserCreateModel) -> UserReadModel:
         raise NotImplementedError
 
     @abstractmethod
-    def update_user(
+    async def update_user(
         self,
         user_id: str,
         data: UserUpdateModel,
@@ -56,7 +60,15 @@ class UserCommandUseCase(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def delete_user_by_id(self, user_id: str) -> None:
+    async def patch_user(self, user_id: str, data: UserPatchModel) -> UserReadModel:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete_user_by_id(
+        self,
+        user_id: str,
+        requested_by: Optional[str] = None,
+    ) -> JobReadModel:
         raise NotImplementedError
 
 
@@ -66,10 +78,12 @@ class UserCommandUseCaseImpl(UserCommandUseCase):
     def __init__(
         self,
         uow: UserCommandUseCaseUnitOfWork,
+        job_max_attempts: int = 5,
     ):
         self.uow: UserCommandUseCaseUnitOfWork = uow
+        self.job_max_attempts = job_max_attempts
 
-    def create_user(self, data: UserCreateModel) -> UserReadModel:
+    async def create_user(self, data: UserCreateModel) -> UserReadModel:
         try:
             uuid = uuid4().hex
             user = User(
@@ -85,27 +99,22 @@ class UserCommandUseCaseImpl(UserCommandUseCase):
                 deleted_at=None,
             )
 
-            existing_user = self.uow.user_repository.find_by_user_name(user.user_name)
-            if existing_user is not None:
-                raise UserNameAlreadyExistsError
-
-            self.uow.user_repository.create(user)
-            self.uow.commit()
-
-            created_user = self.uow.user_repository.find_by_id(uuid)
+            # a taken user name fails the INSERT with UserNameAlreadyExistsError
+            created_user = await self.uow.user_repository.create(user)
+            await self.uow.commit()
         except:
-            self.uow.rollback()
+            await self.uow.rollback()
             raise
 
-        return UserReadModel.from_entity(cast(User, created_user))
+        return UserReadModel.from_entity(created_user)
 
-    def update_user(
+    async def update_user(
         self,
         user_id: str,
         data: UserUpdateModel,
     ) -> Optional[UserReadModel]:
         try:
-            existing_user = self.uow.user_repository.find_by_id(user_id)
+            existing_user = await self.uow.user_repository.find_by_id(user_id)
             if existing_user is None:
                 raise UserNotFoundError
 
@@ -118,27 +127,61 @@ class UserCommandUseCaseImpl(UserCommandUseCase):
                 # updated_at=cast(int, datetime.now()),
             )
 
-            self.uow.user_repository.update(user)
+            await self.uow.user_repository.update(user)
 
-            updated_user = self.uow.user_repository.find_by_id(user.user_id)
+            updated_user = await self.uow.user_repository.find_by_id(user.user_id)
 
-            self.uow.commit()
+            await self.uow.commit()
         except Exception as err:
             logger.error(err)
-            self.uow.rollback()
+            await self.uow.rollback()
             raise
 
         return UserReadModel.from_entity(cast(User, updated_user))
 
-    def delete_user_by_id(self, user_id: str) -> None:
+    async def patch_user(self, user_id: str, data: UserPatchModel) -> UserReadModel:
+        changes = data.model_dump(exclude_none=True)
+        if "password" in changes:
+            changes["hashed_password"] = get_password_hash(changes.pop("password"))
         try:
-            existing_user = self.uow.user_repository.find_by_id(user_id)
+            patched_user = await self.uow.user_repository.patch(user_id, changes)
+            if patched_user is None:
+                raise UserNotFoundError
+            await self.uow.commit()
+        except:
+            await self.uow.rollback()
+            raise
+
+        return UserReadModel.from_entity(patched_user)
+
+    async def delete_user_by_id(
+        self,
+        user_id: str,
+        requested_by: Optional[str] = None,
+    ) -> JobReadModel:
+        """Deactivate a user; what they own is deleted later, in batches,
+        by a ``delete-user`` job queued for ``requested_by``.
+
+        The job is queued in the same transaction, so a user is never left
+        deactivated with nothing coming to delete their data.
+        """
+        try:
+            existing_user = await self.uow.user_repository.find_by_id(user_id)
             if existing_user is None:
                 raise UserNotFoundError
 
-            self.uow.user_repository.delete_by_id(user_id)
+            await self.uow.user_repository.delete_by_id(user_id)
+            job = await self.uow.job_repository.add(
+                new_job(
+                    JobCreateModel(kind="delete-user", params={"user_id": user_id}),
+                    requested_by,
+                    self.job_max_attempts,
+                ),
+            )
 
-            self.uow.commit()
+            await self.uow.commit()
         except:
-            self.uow.rollback()
+            await self.uow.rollback()
             raise
+
+        return job
@@ -1,10 +1,24 @@
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 
 from capturerrbackend.app.domain.user.user import User
 
 
+class UserStatsReadModel(BaseModel):
+    """UserStatsReadModel holds the running capture counters of a user."""
+
+    captures: int = Field(default=0, example=42)
+    flagged: int = Field(default=0, example=3)
+    tags: int = Field(default=0, example=57)
+    last_activity_at: Optional[int] = Field(default=None, example=1136214245000)
+    by_priority: Dict[str, int] = Field(default_factory=dict, example={"low": 40})
+    by_entry_type: Dict[str, int] = Field(
+        default_factory=dict,
+        example={"note": 30, "food": 12},
+    )
+
+
 class UserReadModel(BaseModel):
     """UserReadModel represents data structure as a read model."""
 
@@ -26,6 +40,7 @@ class UserReadModel(BaseModel):
     hashed_password: Optional[str] = Field(example="bjcvljdsaflkrjqewoigfddsaf")
     books: Optional[List[Any]] = Field(default=None)
     captures: Optional[List[Any]] = Field(default=None)
+    stats: Optional[UserStatsReadModel] = Field(default=None)
 
     @staticmethod
     def from_entity(user: User) -> "UserReadModel":
@@ -1,20 +1,37 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Optional
 
-from .user_query_model import UserReadModel
+from ..fields import FieldSet
+from ..pagination import Page, PageParams
+from .user_query_model import UserReadModel, UserStatsReadModel
 
 
 class UserQueryService(ABC):
     """UserQueryService defines a query service inteface related User entity."""
 
     @abstractmethod
-    def find_by_id(self, id: str) -> Optional[UserReadModel]:
+    async def find_by_id(
+        self,
+        id: str,
+        fields: FieldSet = FieldSet(),
+    ) -> Optional[UserReadModel]:
         raise NotImplementedError
 
     @abstractmethod
-    def find_all(self) -> List[UserReadModel]:
+    async def find_all(
+        self,
+        page: PageParams = PageParams(),
+        fields: FieldSet = FieldSet(),
+    ) -> Page[UserReadModel]:
         raise NotImplementedError
 
     @abstractmethod
-    def find_by_user_name(self, user_name: str) -> Optional[UserReadModel]:
+    async def find_by_user_name(self, user_name: str) -> Optional[UserReadModel]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def find_stats_by_user_id(
+        self,
+        user_id: str,
+    ) -> Optional[UserStatsReadModel]:
         raise NotImplementedError
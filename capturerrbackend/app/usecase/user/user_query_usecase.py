@@ -1,5 +1,4 @@
 from abc import ABC, abstractmethod
-from typing import List
 
 from loguru import logger
 
@@ -9,8 +8,10 @@ from capturerrbackend.app.domain.user.user_exception import (
     UsersNotFoundError,
 )
 
+from ..fields import FieldSet
+from ..pagination import Page, PageParams
 from .user_auth_service import verify_password
-from .user_query_model import UserLoginModel, UserReadModel
+from .user_query_model import UserLoginModel, UserReadModel, UserStatsReadModel
 from .user_query_service import UserQueryService
 
 
@@ -18,25 +19,38 @@ class UserQueryUseCase(ABC):
     """UserQueryUseCase defines a query usecase inteface related User entity."""
 
     @abstractmethod
-    def fetch_user_by_id(self, user_id: str) -> UserReadModel:
+    async def fetch_user_by_id(
+        self,
+        user_id: str,
+        fields: FieldSet = FieldSet(),
+    ) -> UserReadModel:
         """fetch_user_by_id fetches a user by id."""
         raise NotImplementedError
 
     @abstractmethod
-    def fetch_users(self) -> List[UserReadModel]:
+    async def fetch_users(
+        self,
+        page: PageParams = PageParams(),
+        fields: FieldSet = FieldSet(),
+    ) -> Page[UserReadModel]:
         """fetch_users fetches users."""
         raise NotImplementedError
 
     @abstractmethod
-    def fetch_user_by_user_name(self, user_name: str) -> UserReadModel:
+    async def fetch_user_by_user_name(self, user_name: str) -> UserReadModel:
         """fetch_user_by_id fetches a user by id."""
         raise NotImplementedError
 
     @abstractmethod
-    def login_user(self, data: UserLoginModel) -> UserReadModel:
+    async def login_user(self, data: UserLoginModel) -> UserReadModel:
         """fetch_user_by_id fetches a user by id."""
         raise NotImplementedError
 
+    @abstractmethod
+    async def fetch_user_stats(self, user_id: str) -> UserStatsReadModel:
+        """fetch_user_stats fetches the capture counters of a user."""
+        raise NotImplementedError
+
 
 class UserQueryUseCaseImpl(UserQueryUseCase):
     """UserQueryUseCaseImpl implements a query usecases related User entity."""
@@ -44,10 +58,14 @@ class UserQueryUseCaseImpl(UserQueryUseCase):
     def __init__(self, user_query_service: UserQueryService):
         self.user_query_service: UserQueryService = user_query_service
 
-    def fetch_user_by_id(self, user_id: str) -> UserReadModel:
+    async def fetch_user_by_id(
+        self,
+        user_id: str,
+        fields: FieldSet = FieldSet(),
+    ) -> UserReadModel:
         """fetch_user_by_id fetches a user by id."""
         try:
-            user = self.user_query_service.find_by_id(user_id)
+            user = await self.user_query_service.find_by_id(user_id, fields)
             if user is None:
                 raise UserNotFoundError
         except:
@@ -55,10 +73,14 @@ class UserQueryUseCaseImpl(UserQueryUseCase):
 
         return user
 
-    def fetch_users(self) -> List[UserReadModel]:
+    async def fetch_users(
+        self,
+        page: PageParams = PageParams(),
+        fields: FieldSet = FieldSet(),
+    ) -> Page[UserReadModel]:
         """fetch_users fetches users."""
         try:
-            users = self.user_query_service.find_all()
+            users = await self.user_query_service.find_all(page, fields)
             if users is None:
                 raise UsersNotFoundError
         except:
@@ -66,10 +88,10 @@ class UserQueryUseCaseImpl(UserQueryUseCase):
 
         return users
 
-    def fetch_user_by_user_name(self, user_name: str) -> UserReadModel:
+    async def fetch_user_by_user_name(self, user_name: str) -> UserReadModel:
         """fetch_user_by_user_name fetches a user by user_name"""
         try:
-            user = self.user_query_service.find_by_user_name(user_name)
+            user = await self.user_query_service.find_by_user_name(user_name)
             if user is None:
                 raise UserNotFoundError
         except:
@@ -77,10 +99,12 @@ class UserQueryUseCaseImpl(UserQueryUseCase):
 
         return user
 
-    def login_user(self, data: UserLoginModel) -> UserReadModel:
+    async def login_user(self, data: UserLoginModel) -> UserReadModel:
         logger.debug("In login_user usecase")
         try:
-            existing_user = self.user_query_service.find_by_user_name(data.user_name)
+            existing_user = await self.user_query_service.find_by_user_name(
+                data.user_name
+            )
             if existing_user is None:
                 raise UserNotFoundError
             if existing_user.hashed_password is None:
@@ -88,10 +112,20 @@ class UserQueryUseCaseImpl(UserQueryUseCase):
             if not verify_password(data.password, existing_user.hashed_password):
                 raise UserBadCredentialsError
 
-            user = self.user_query_service.find_by_user_name(data.user_name)
+            user = await self.user_query_service.find_by_user_name(data.user_name)
             if user is None:
                 raise UserNotFoundError
         except:
             raise
 
         return user
+
+    async def fetch_user_stats(self, user_id: str) -> UserStatsReadModel:
+        """fetch_user_stats fetches the capture counters of a user."""
+        try:
+            stats = await self.user_query_service.find_stats_by_user_id(user_id)
+        except:
+            raise
+
+        # a user who never wrote a capture has no row yet
+        return stats if stats is not None else UserStatsReadModel()
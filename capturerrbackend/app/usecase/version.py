@@ -0,0 +1,16 @@
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class CollectionVersion(BaseModel):
+    """CollectionVersion is the cheap validator of a listing.
+
+    Any insert or update moves ``updated_at`` (the newest one, in
+    milliseconds) and a delete lowers ``count``, so the pair changes
+    whenever the rows behind the listing do.
+    """
+
+    model_config = ConfigDict(frozen=True)
+    count: int = Field(default=0)
+    updated_at: Optional[int] = Field(default=None)
@@ -2,7 +2,7 @@
 import os
 import site
 import sys
-from typing import Tuple, Type, Union
+from typing import Literal, Tuple, Type, Union
 
 # Third party modules
 from pydantic import Field, field_validator
@@ -100,6 +100,47 @@ class Common(BaseSettings):
     db_base: str = "postgres-db"
     db_echo: bool = False
 
+    # connection pool (one engine per process)
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+
+    # SQLite PRAGMA preset: "durable", "throughput" or "none"
+    db_sqlite_profile: Literal["durable", "throughput", "none"] = "durable"
+
+    # trash: deleted rows are purged for good after trash_retention_days,
+    # in batches, by a background task that only works in the
+    # [purge_window_start, purge_window_end) hours (UTC)
+    trash_retention_days: int = 30
+    purge_enabled: bool = True
+    purge_batch_size: int = 500
+    purge_batch_pause: float = 0.1
+    purge_interval_seconds: int = 900
+    purge_window_start: int = 2
+    purge_window_end: int = 5
+
+    # Idempotency-Key: the responses of keyed POSTs are replayed for
+    # idempotency_ttl_seconds from an LRU of idempotency_cache_size keys
+    # per process, and from the idempotency_keys table across processes
+    # when idempotency_db_enabled
+    idempotency_cache_size: int = 10000
+    idempotency_ttl_seconds: int = 86400
+    idempotency_db_enabled: bool = False
+
+    # background jobs: job_workers run in the API process when jobs_enabled
+    # (and in any `python -m capturerrbackend worker`); a failed job is
+    # retried after job_retry_base_seconds, doubling up to
+    # job_retry_max_seconds, job_max_attempts times in all; a job running
+    # for job_lease_seconds is taken for lost and queued again
+    jobs_enabled: bool = True
+    job_workers: int = 2
+    job_poll_seconds: float = 1.0
+    job_max_attempts: int = 5
+    job_retry_base_seconds: float = 5.0
+    job_retry_max_seconds: float = 600.0
+    job_lease_seconds: int = 3600
+
     # Normal stuff.
     # routingDbPort: int = 8012
     # trackingDbPort: int = 8006
@@ -152,7 +193,8 @@ class Dev(Common):
     # mqServer: str = "localhost"
     # dbServer: str = "localhost:3306"
     # portalApi: str = "http://localhost"
-    db_url: str = "sqlite:///mydata.db"
+    db_url: str = "sqlite+aiosqlite:///mydata.db"
+    db_sqlite_profile: Literal["durable", "throughput", "none"] = "throughput"
     db_echo: bool = True
     log_level: str = "DEBUG"
     model_config = SettingsConfigDict(env_file=f"{site.USER_BASE}f/{env}.env")
@@ -168,7 +210,10 @@ class Test(Common):
 
     env: str = "test"
     # dbServer: str = "t-l-docker01:3306"
-    db_url: str = "sqlite:///capturerr-testing-db.db"
+    db_url: str = "sqlite+aiosqlite:///capturerr-testing-db.db"
+    db_sqlite_profile: Literal["durable", "throughput", "none"] = "throughput"
+    purge_enabled: bool = False
+    jobs_enabled: bool = False
     db_echo: bool = True
     log_level: str = "DEBUG"
 
@@ -184,7 +229,7 @@ class Stage(Common):
     """
 
     env: str = "stage"
-    db_url: str = "sqlite:///mydata-staging.db"
+    db_url: str = "sqlite+aiosqlite:///mydata-staging.db"
     log_level: str = "INFO"
 
     model_config = SettingsConfigDict(env_file=f"{site.USER_BASE}f/{env}.env")
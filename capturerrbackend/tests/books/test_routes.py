@@ -6,6 +6,7 @@ from fastapi.testclient import TestClient
 from capturerrbackend.app.domain.book.book_exception import (
     BookIsbnAlreadyExistsError,
     BookNotFoundError,
+    BookReadPageOutOfRangeError,
     BooksNotFoundError,
 )
 
@@ -61,6 +62,30 @@ def test_get_books(client: TestClient, fake_book: dict[str, Any]) -> None:
     assert len(response.json()) > 0
 
 
+def test_get_books_conditional(client: TestClient, fake_book: dict[str, Any]) -> None:
+    # Arrange
+    response = client.post("/api/books", json=fake_book)
+    book_id = response.json()["id"]
+    response = client.get("/api/books")
+    etag = response.headers["ETag"]
+
+    # Act
+    response = client.get("/api/books", headers={"If-None-Match": f'"x", {etag}'})
+
+    # Assert
+    assert response.status_code == 304
+
+    response = client.get(
+        "/api/books",
+        headers={"If-Modified-Since": "Thu, 01 Jan 1970 00:00:00 GMT"},
+    )
+    assert response.status_code == 200
+
+    client.delete(f"/api/books/{book_id}")
+    response = client.get("/api/books", headers={"If-None-Match": etag})
+    assert response.status_code == 404
+
+
 def test_get_books_with_no_books(client: TestClient) -> None:
     # Arrange
 
@@ -84,6 +109,28 @@ def test_get_book(client: TestClient, fake_book: dict[str, Any]) -> None:
     assert response.json()["id"] == book_id
 
 
+def test_get_books_sparse_fields(
+    client: TestClient,
+    fake_book: dict[str, Any],
+) -> None:
+    # Arrange
+    response = client.post("/api/books", json=fake_book)
+    book_id = response.json()["id"]
+
+    # Act
+    response = client.get("/api/books", params={"fields": "title"})
+
+    # Assert
+    assert response.status_code == 200
+    assert response.json()["items"] == [{"id": book_id, "title": fake_book["title"]}]
+
+    response = client.get(f"/api/books/{book_id}", params={"fields": "isbn"})
+    assert response.json() == {"id": book_id, "isbn": fake_book["isbn"]}
+
+    response = client.get("/api/books", params={"fields": "title,summary"})
+    assert response.status_code == 400
+
+
 def test_get_book_with_invalid_id(client: TestClient) -> None:
     # Arrange
     book_id = 999
@@ -142,6 +189,25 @@ def test_update_book_with_invalid_id(
     assert response.json()["detail"] == BookNotFoundError.detail
 
 
+def test_patch_book(client: TestClient, fake_book: dict[str, Any]) -> None:
+    # Arrange
+    book_id = client.post("/api/books", json=fake_book).json()["id"]
+
+    # Act
+    response = client.patch(f"/api/me/books/{book_id}", json={"read_page": 100})
+
+    # Assert
+    assert response.status_code == 200
+    assert response.json()["read_page"] == 100
+    assert response.json()["title"] == fake_book["title"]
+
+    # read_page is checked against the stored page count
+    response = client.patch(f"/api/me/books/{book_id}", json={"page": 99})
+    assert response.status_code == BookReadPageOutOfRangeError.status_code
+    response = client.patch("/api/me/books/not-an-id", json={"page": 99})
+    assert response.status_code == BookNotFoundError.status_code
+
+
 def test_delete_book(client: TestClient, fake_book: dict[str, Any]) -> None:
     # Arrange
     response = client.post("/api/books", json=fake_book)
@@ -158,6 +224,29 @@ def test_delete_book(client: TestClient, fake_book: dict[str, Any]) -> None:
     assert books.status_code == 404
 
 
+def test_trash_and_restore_book(client: TestClient, fake_book: dict[str, Any]) -> None:
+    # Arrange
+    response = client.post("/api/books", json=fake_book)
+    book_id = response.json()["id"]
+    client.delete(f"/api/books/{book_id}")
+
+    trash = client.get("/api/me/books/trash")
+    assert trash.status_code == 200
+    assert [book["id"] for book in trash.json()["items"]] == [book_id]
+
+    # the isbn stays taken while the book is in the trash
+    response = client.post("/api/books", json=fake_book)
+    assert response.status_code == BookIsbnAlreadyExistsError.status_code
+
+    # Act
+    response = client.post(f"/api/me/books/{book_id}/restore")
+
+    # Assert
+    assert response.status_code == 200
+    assert client.get(f"/api/books/{book_id}").status_code == 200
+    assert client.get("/api/me/books/trash").json()["count"] == 0
+
+
 @pytest.mark.anyio
 def test_delete_book_with_invalid_id(client: TestClient) -> None:
     # Arrange
@@ -1,6 +1,6 @@
 from typing import Any
 
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from capturerrbackend.app.infrastructure.sqlite.book import BookQueryServiceImpl
 
@@ -12,8 +12,8 @@ from capturerrbackend.app.usecase.book import (
 )
 
 
-def test_book_query_service(
-    db_fixture: Session,
+async def test_book_query_service(
+    db_fixture: AsyncSession,
     book_command_usecase: BookCommandUseCaseImpl,
     fake_book: dict[str, Any],
 ) -> None:
@@ -21,7 +21,7 @@ def test_book_query_service(
     assert isinstance(book_query_service, BookQueryServiceImpl)
 
     book_model = BookCreateModel.model_validate(fake_book)
-    book = book_command_usecase.create_book(
+    book = await book_command_usecase.create_book(
         book_model,
     )
     assert book is not None
@@ -29,15 +29,15 @@ def test_book_query_service(
     fake_book["isbn"] = "978-1-445-85436-18"
 
     book_model2 = BookCreateModel.model_validate(fake_book)
-    book = book_command_usecase.create_book(
+    book = await book_command_usecase.create_book(
         book_model2,
     )
     assert book is not None
-    new_book = book_query_service.find_by_id(test_id)
+    new_book = await book_query_service.find_by_id(test_id)
     assert new_book is not None
     assert new_book.id == test_id
 
-    books = book_query_service.find_all()
-    assert len(books) == 2
-    assert books[0].title == fake_book["title"]
-    assert books[0].id == test_id
+    books = await book_query_service.find_all()
+    assert len(books.items) == 2
+    assert books.items[0].title == fake_book["title"]
+    assert test_id in [b.id for b in books.items]
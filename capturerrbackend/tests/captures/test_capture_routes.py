@@ -1,3 +1,4 @@
+import json
 from typing import Any
 
 import pytest
@@ -8,7 +9,11 @@ from capturerrbackend.app.domain.capture.capture_exception import (
     CaptureNotFoundError,
     CapturesNotFoundError,
 )
-from capturerrbackend.app.usecase.capture import CaptureReadModel
+from capturerrbackend.app.presentation.idempotency import (
+    REPLAYED_HEADER,
+    IdempotencyKeyReusedError,
+)
+from capturerrbackend.app.usecase.capture import MAX_CAPTURE_BATCH, CaptureReadModel
 from capturerrbackend.app.usecase.user import UserReadModel
 
 # app = FastAPI()
@@ -46,6 +51,218 @@ def test_create_capture_with_existing_text(
     assert response.json()["detail"] == CaptureAlreadyExistsError.detail
 
 
+def test_create_capture_with_idempotency_key(
+    client: TestClient,
+    fake_capture: dict[str, Any],
+) -> None:
+    # Arrange
+    headers = {"Idempotency-Key": "create-capture-1"}
+    first = client.post("/api/me/captures", json=fake_capture, headers=headers)
+
+    # Act: the retry is answered from the stored response
+    retry = client.post("/api/me/captures", json=fake_capture, headers=headers)
+
+    # Assert
+    assert first.status_code == retry.status_code == 201
+    assert retry.json() == first.json()
+    assert retry.headers[REPLAYED_HEADER] == "true"
+    assert REPLAYED_HEADER not in first.headers
+
+    # the same key for another body is refused, no key means a new request
+    response = client.post(
+        "/api/me/captures",
+        json={**fake_capture, "entry": "Another one."},
+        headers=headers,
+    )
+    assert response.status_code == IdempotencyKeyReusedError.status_code
+    response = client.post("/api/me/captures", json=fake_capture)
+    assert response.status_code == CaptureAlreadyExistsError.status_code
+
+
+def test_tag_capture_with_idempotency_key(
+    client: TestClient,
+    fake_capture: dict[str, Any],
+) -> None:
+    # Arrange
+    capture = client.post("/api/me/captures", json=fake_capture).json()
+    url = f"/api/me/captures/{capture['id']}/tags"
+    data = {"text": "work", "user_id": capture["user_id"]}
+    headers = {"Idempotency-Key": "tag-capture-1"}
+
+    # Act
+    first = client.post(url, json=data, headers=headers)
+    retry = client.post(url, json=data, headers=headers)
+
+    # Assert
+    assert first.status_code == retry.status_code == 201
+    assert retry.json() == first.json()
+    tagged = client.get(f"/api/me/captures/{capture['id']}?fields=id,tags").json()
+    assert [tag["text"] for tag in tagged["tags"]] == ["work"]
+    assert client.get("/api/users/me/stats").json()["tags"] == 1
+
+
+def test_create_captures_batch(
+    client: TestClient,
+    fake_capture: dict[str, Any],
+) -> None:
+    # Act
+    response = client.post(
+        "/api/me/captures:batch",
+        json={
+            "captures": [
+                {**fake_capture, "tags": ["work"]},
+                {**fake_capture, "entry": "Another one."},
+                fake_capture,
+            ],
+        },
+    )
+
+    # Assert
+    assert response.status_code == 201
+    assert response.json()["created"] == 2
+    assert response.json()["duplicates"] == 1
+    assert response.json()["results"][2]["status"] == "duplicate"
+    capture_id = response.json()["results"][0]["id"]
+    response = client.get(f"/api/me/captures/{capture_id}?fields=entry,tags")
+    assert response.json()["tags"][0]["text"] == "work"
+
+
+def test_create_captures_batch_too_large(
+    client: TestClient,
+    fake_capture: dict[str, Any],
+) -> None:
+    response = client.post(
+        "/api/me/captures:batch",
+        json={"captures": [fake_capture] * (MAX_CAPTURE_BATCH + 1)},
+    )
+    assert response.status_code == 422
+
+    response = client.post("/api/me/captures:batch", json={"captures": []})
+    assert response.status_code == 422
+
+
+def test_import_captures(client: TestClient, fake_capture: dict[str, Any]) -> None:
+    # Arrange
+    ndjson = "\n".join(
+        json.dumps({**fake_capture, "entry": f"capture {i}"}) for i in range(3)
+    )
+    fields = ["entry", "entry_type", "notes", "location", "flagged", "priority"]
+    csv = "\n".join(
+        [
+            ",".join([*fields, "happened_at", "due_date", "tags"]),
+            "capture 2,journal,,home,false,low,1000,2000,",
+            "capture 3,journal,,home,true,low,1000,2000,x;y",
+            "capture 4,journal,,home,true,low,soon,2000,",
+        ],
+    )
+
+    # Act
+    from_ndjson = client.post(
+        "/api/me/captures:import",
+        content=ndjson.encode(),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    from_csv = client.post(
+        "/api/me/captures:import?format=csv",
+        content=csv.encode(),
+        headers={"Content-Type": "text/csv"},
+    )
+
+    # Assert
+    assert from_ndjson.status_code == 200
+    assert from_ndjson.json()["created"] == 3
+    assert from_csv.status_code == 200
+    report = from_csv.json()
+    assert (report["created"], report["duplicates"], report["failed"]) == (1, 1, 1)
+    assert report["errors"][0]["line"] == 4
+    stats = client.get("/api/users/me/stats").json()
+    assert (stats["captures"], stats["tags"]) == (4, 2)
+
+
+def test_export_my_captures(
+    client: TestClient,
+    fake_capture: dict[str, Any],
+    fake_super_user: dict[str, Any],
+) -> None:
+    # Arrange
+    client.post(
+        "/api/me/captures:batch",
+        json={
+            "captures": [
+                {**fake_capture, "entry": "one, with a comma", "tags": ["x", "y"]},
+                {**fake_capture, "entry": "two"},
+            ],
+        },
+    )
+
+    # Act
+    ndjson = client.get("/api/me/captures/export")
+    as_json = client.get("/api/me/captures/export?format=json")
+    as_csv = client.get("/api/me/captures/export?format=csv")
+
+    # Assert
+    assert ndjson.status_code == 200
+    assert ndjson.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in ndjson.text.splitlines()]
+    assert sorted(line["entry"] for line in lines) == ["one, with a comma", "two"]
+    assert as_json.json() == lines
+    tags = {line["entry"]: [tag["text"] for tag in line["tags"]] for line in lines}
+    assert sorted(tags["one, with a comma"]) == ["x", "y"]
+    assert as_csv.headers["content-disposition"] == (
+        'attachment; filename="captures.csv"'
+    )
+    assert as_csv.text.startswith("id,entry,")
+    # a CSV export reads back in as an import
+    reimport = client.post(
+        "/api/me/captures:import?format=csv",
+        content=as_csv.content,
+        headers={"Content-Type": "text/csv"},
+    )
+    assert reimport.json()["duplicates"] == 2
+    # a super user streams everyone's captures, and has none of their own
+    client.post("/api/users", json=fake_super_user)
+    everyone = client.get("/api/captures?format=ndjson")
+    assert len(everyone.text.splitlines()) == 2
+    assert client.get("/api/me/captures/export?format=json").json() == []
+
+
+def test_attach_and_detach_tags(
+    client: TestClient,
+    fake_capture: dict[str, Any],
+) -> None:
+    # Arrange
+    response = client.post(
+        "/api/me/captures:batch",
+        json={"captures": [fake_capture, {**fake_capture, "entry": "Another one."}]},
+    )
+    ids = [result["id"] for result in response.json()["results"]]
+    before = client.get(f"/api/me/captures/{ids[0]}").json()["updated_at"]
+
+    # Act
+    response = client.post(
+        "/api/me/captures:attach-tags",
+        json={"capture_ids": ids, "tags": ["work", "home"]},
+    )
+
+    # Assert
+    assert response.status_code == 200
+    assert response.json()["changed"] == 4
+    response = client.post(
+        "/api/me/captures:detach-tags",
+        json={"capture_ids": [ids[0]], "tags": ["home"]},
+    )
+    assert response.json()["changed"] == 1
+    capture = client.get(f"/api/me/captures/{ids[0]}?fields=updated_at,tags").json()
+    assert [tag["text"] for tag in capture["tags"]] == ["work"]
+    assert capture["updated_at"] >= before
+
+    response = client.post(
+        "/api/me/captures:detach-tags",
+        json={"capture_ids": [ids[0], "not-mine"], "tags": ["work"]},
+    )
+    assert response.status_code == 404
+
+
 def test_get_captures(client: TestClient, fake_capture: dict[str, Any]) -> None:
     # Arrange
     response = client.post("/api/me/captures", json=fake_capture)
@@ -77,6 +294,8 @@ def test_get_capture(client: TestClient, new_capture_in_db: CaptureReadModel) ->
     # Assert
     assert response.status_code == 200
     assert response.json()["id"] == capture_id
+    # tags are embedded by default, as in the listings
+    assert response.json()["tags"] == []
 
 
 def test_get_capture_with_invalid_id(client: TestClient) -> None:
@@ -126,6 +345,59 @@ def test_update_capture_with_invalid_id(
     assert response.json()["detail"] == CaptureNotFoundError.detail
 
 
+def test_capture_of_another_user_is_not_found(
+    client: TestClient,
+    fake_capture: dict[str, Any],
+    fake_super_user: dict[str, Any],
+) -> None:
+    # Arrange: a newer user becomes the current one
+    capture = client.post("/api/me/captures", json=fake_capture).json()
+    client.post("/api/users", json=fake_super_user)
+    assert client.get("/api/users/me").json()["user_name"] == "admin"
+    url = f"/api/me/captures/{capture['id']}"
+
+    # Act / Assert
+    for response in (
+        client.get(url),
+        client.put(url, json=capture),
+        client.delete(url),
+    ):
+        assert response.status_code == CaptureNotFoundError.status_code
+        assert response.json()["detail"] == CaptureNotFoundError.detail
+
+
+def test_patch_capture(client: TestClient, fake_capture: dict[str, Any]) -> None:
+    # Arrange
+    capture = client.post("/api/me/captures", json=fake_capture).json()
+
+    # Act
+    response = client.patch(
+        f"/api/me/captures/{capture['id']}",
+        json={"notes": "Only the notes change.", "priority": "low"},
+    )
+
+    # Assert
+    assert response.status_code == 200
+    assert response.json()["notes"] == "Only the notes change."
+    assert response.json()["entry"] == fake_capture["entry"]
+    assert response.json()["updated_at"] >= capture["updated_at"]
+    stats = client.get("/api/users/me/stats").json()
+    assert stats["by_priority"] == {"low": 1}
+
+    response = client.patch("/api/me/captures/not-an-id", json={"notes": "x"})
+    assert response.status_code == CaptureNotFoundError.status_code
+
+    other = client.post(
+        "/api/me/captures",
+        json={**fake_capture, "entry": "Another one."},
+    ).json()
+    response = client.patch(
+        f"/api/me/captures/{other['id']}",
+        json={"entry": fake_capture["entry"]},
+    )
+    assert response.status_code == CaptureAlreadyExistsError.status_code
+
+
 def test_delete_capture(client: TestClient, fake_capture: dict[str, Any]) -> None:
     # Arrange
     response = client.post("/api/me/captures", json=fake_capture)
@@ -142,6 +414,45 @@ def test_delete_capture(client: TestClient, fake_capture: dict[str, Any]) -> Non
     assert captures.status_code == 404
 
 
+def test_trash_and_restore_capture(
+    client: TestClient,
+    fake_capture: dict[str, Any],
+) -> None:
+    # Arrange
+    response = client.post("/api/me/captures", json=fake_capture)
+    capture_id = response.json()["id"]
+    response = client.post(
+        f"/api/me/captures/{capture_id}/tags",
+        json={"text": "work", "user_id": fake_capture["user_id"]},
+    )
+    assert response.status_code == 201
+    client.delete(f"/api/me/captures/{capture_id}")
+
+    trash = client.get("/api/me/captures/trash")
+    assert trash.status_code == 200
+    assert trash.json()["count"] == 1
+    trashed = trash.json()["items"][0]
+    assert trashed["id"] == capture_id
+    assert trashed["deleted_at"] is not None
+    assert [tag["text"] for tag in trashed["tags"]] == ["work"]
+    assert client.get(f"/api/me/captures/{capture_id}").status_code == 404
+
+    # Act
+    response = client.post(f"/api/me/captures/{capture_id}/restore")
+
+    # Assert
+    assert response.status_code == 200
+    assert response.json()["deleted_at"] is None
+    captures = client.get("/api/me/captures")
+    assert captures.json()["items"][0]["id"] == capture_id
+    assert [tag["text"] for tag in captures.json()["items"][0]["tags"]] == ["work"]
+    assert client.get("/api/me/captures/trash").json()["count"] == 0
+
+    # only what is in the trash can be restored
+    response = client.post(f"/api/me/captures/{capture_id}/restore")
+    assert response.status_code == CaptureNotFoundError.status_code
+
+
 @pytest.mark.anyio
 def test_delete_capture_with_invalid_id(client: TestClient) -> None:
     # Arrange
@@ -154,3 +465,211 @@ def test_delete_capture_with_invalid_id(client: TestClient) -> None:
         # Assert
         assert err.status_code == CaptureNotFoundError.status_code
         assert err.detail == CaptureNotFoundError.detail
+
+
+def test_search_my_captures(client: TestClient, fake_capture: dict[str, Any]) -> None:
+    # Arrange
+    response = client.post("/api/me/captures", json=fake_capture)
+    assert response.status_code == 201
+    fake_capture["entry"] = "Ate a cheeseburger for lunch."
+    fake_capture["notes"] = "Should have been a salad."
+    response = client.post("/api/me/captures", json=fake_capture)
+    assert response.status_code == 201
+
+    # Act
+    response = client.get("/api/me/captures/search", params={"q": "cheeseburger"})
+
+    # Assert
+    assert response.status_code == 200
+    assert response.json()["count"] == 1
+    item = response.json()["items"][0]
+    assert item["entry"] == fake_capture["entry"]
+    assert "<mark>cheeseburger</mark>" in item["snippet"]
+
+    response = client.get("/api/me/captures/search", params={"q": "sal"})
+    assert response.json()["items"][0]["entry"] == fake_capture["entry"]
+
+    response = client.get("/api/me/captures/search", params={"q": 'pizza "OR'})
+    assert response.status_code == 200
+    assert response.json()["count"] == 0
+
+
+def test_get_my_captures_filtered_by_tags(
+    client: TestClient,
+    fake_capture: dict[str, Any],
+) -> None:
+    # Arrange
+    response = client.post("/api/me/captures", json=fake_capture)
+    capture_id = response.json()["id"]
+    response = client.post(
+        f"/api/me/captures/{capture_id}/tags",
+        json={"text": "work", "user_id": fake_capture["user_id"]},
+    )
+    assert response.status_code == 201
+    fake_capture["entry"] = "An untagged capture."
+    response = client.post("/api/me/captures", json=fake_capture)
+    assert response.status_code == 201
+
+    # Act
+    response = client.get("/api/me/captures", params={"all_tags": ["work"]})
+
+    # Assert
+    assert response.status_code == 200
+    assert [c["id"] for c in response.json()["items"]] == [capture_id]
+    assert response.json()["items"][0]["tags"][0]["text"] == "work"
+
+    response = client.get("/api/me/captures", params={"exclude_tags": ["work"]})
+    assert [c["entry"] for c in response.json()["items"]] == [fake_capture["entry"]]
+
+
+def test_get_my_captures_filtered_by_dates(
+    client: TestClient,
+    fake_capture: dict[str, Any],
+) -> None:
+    # Arrange
+    fake_capture["due_date"] = 1000
+    response = client.post("/api/me/captures", json=fake_capture)
+    overdue_id = response.json()["id"]
+    fake_capture["entry"] = "Due in the far future."
+    fake_capture["due_date"] = 4102444800
+    response = client.post("/api/me/captures", json=fake_capture)
+    assert response.status_code == 201
+
+    # Act
+    response = client.get("/api/me/captures", params={"due": "overdue"})
+
+    # Assert
+    assert response.status_code == 200
+    assert [c["id"] for c in response.json()["items"]] == [overdue_id]
+
+    response = client.get("/api/me/captures", params={"due_after": 1001})
+    assert [c["entry"] for c in response.json()["items"]] == [fake_capture["entry"]]
+
+    response = client.get(
+        "/api/me/captures",
+        params={"due": "this_week", "tz": "Europe/Stockholm"},
+    )
+    assert response.status_code == 404
+
+
+def test_get_my_capture_calendar(
+    client: TestClient,
+    fake_capture: dict[str, Any],
+) -> None:
+    # Arrange
+    fake_capture["happened_at"] = 1617229800  # 2021-03-31 22:30 UTC
+    response = client.post("/api/me/captures", json=fake_capture)
+    assert response.status_code == 201
+
+    # Act
+    response = client.get(
+        "/api/me/captures/calendar",
+        params={"year": 2021, "month": 4, "tz": "Europe/Stockholm"},
+    )
+
+    # Assert
+    assert response.status_code == 200
+    calendar = response.json()
+    assert calendar["field"] == "happened_at"
+    assert len(calendar["days"]) == 30
+    assert calendar["days"][0] == {"date": "2021-04-01", "count": 1}
+    assert sum(day["count"] for day in calendar["days"]) == 1
+
+    response = client.get(
+        "/api/me/captures/calendar",
+        params={"year": 2021, "month": 4, "tz": "Nowhere/Special"},
+    )
+    assert response.status_code == 400
+
+
+def test_get_my_capture_stats(
+    client: TestClient,
+    fake_capture: dict[str, Any],
+) -> None:
+    # Arrange
+    response = client.post("/api/me/captures", json=fake_capture)
+    assert response.status_code == 201
+
+    # Act
+    response = client.get("/api/me/captures/stats", params={"days": 7})
+
+    # Assert
+    assert response.status_code == 200
+    stats = response.json()
+    assert stats["total"] == 1
+    assert stats["by_priority"] == [{"key": "high", "count": 1}]
+    assert len(stats["by_day"]) == 7
+    assert stats["by_day"][-1]["count"] == 1
+
+    response = client.get("/api/me/captures/stats", params={"days": 0})
+    assert response.status_code == 422
+
+
+def test_get_my_captures_sparse_fields(
+    client: TestClient,
+    fake_capture: dict[str, Any],
+) -> None:
+    # Arrange
+    response = client.post("/api/me/captures", json=fake_capture)
+    capture_id = response.json()["id"]
+
+    # Act
+    response = client.get("/api/me/captures", params={"fields": "entry"})
+
+    # Assert
+    assert response.status_code == 200
+    assert response.json()["items"] == [
+        {"id": capture_id, "entry": fake_capture["entry"]},
+    ]
+    assert response.json()["count"] == 1
+
+    response = client.get(
+        f"/api/me/captures/{capture_id}",
+        params={"fields": "flagged,tags"},
+    )
+    assert response.json() == {"id": capture_id, "flagged": False, "tags": []}
+
+    response = client.get("/api/me/captures", params={"fields": "entry,secret"})
+    assert response.status_code == 400
+
+
+def test_get_my_captures_conditional(
+    client: TestClient,
+    fake_capture: dict[str, Any],
+) -> None:
+    # Arrange
+    response = client.post("/api/me/captures", json=fake_capture)
+    capture_id = response.json()["id"]
+    response = client.get("/api/me/captures")
+    etag = response.headers["ETag"]
+    last_modified = response.headers["Last-Modified"]
+
+    # Act
+    response = client.get("/api/me/captures", headers={"If-None-Match": etag})
+
+    # Assert
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+
+    response = client.get(
+        "/api/me/captures",
+        headers={"If-Modified-Since": last_modified},
+    )
+    assert response.status_code == 304
+
+    response = client.get(
+        "/api/me/captures",
+        params={"fields": "entry"},
+        headers={"If-None-Match": etag},
+    )
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+    response = client.post(
+        f"/api/me/captures/{capture_id}/tags",
+        json={"text": "work", "user_id": fake_capture["user_id"]},
+    )
+    response = client.get("/api/me/captures", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["items"][0]["tags"][0]["text"] == "work"
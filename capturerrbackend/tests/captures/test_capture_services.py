@@ -1,25 +1,517 @@
-from sqlalchemy.orm import Session
+from datetime import date
+from typing import List
 
-from capturerrbackend.app.infrastructure.sqlite.capture import CaptureQueryServiceImpl
-from capturerrbackend.app.usecase.capture import CaptureQueryService, CaptureReadModel
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from capturerrbackend.app.domain.capture.capture_exception import InvalidTimeZoneError
+from capturerrbackend.app.infrastructure.sqlite.associations import capture_tags
+from capturerrbackend.app.infrastructure.sqlite.capture import (
+    CaptureDTO,
+    CaptureQueryServiceImpl,
+)
+from capturerrbackend.app.infrastructure.sqlite.tag import TagDTO
+from capturerrbackend.app.usecase.capture import (
+    CaptureQueryService,
+    CaptureQueryUseCaseImpl,
+    CaptureReadModel,
+    CaptureTagFilter,
+    CaptureTimeFilter,
+)
+from capturerrbackend.app.usecase.fields import FieldSet, InvalidFieldsError
+from capturerrbackend.app.usecase.pagination import (
+    Cursor,
+    InvalidCursorError,
+    PageParams,
+)
+from capturerrbackend.app.usecase.user import UserReadModel
+from capturerrbackend.app.usecase.version import CollectionVersion
 
-def test_capture_query_service_find(
-    db_fixture: Session,
+
+async def test_capture_query_service_find(
+    db_fixture: AsyncSession,
     new_capture_in_db: CaptureReadModel,
 ) -> None:
     capture_query_service: CaptureQueryService = CaptureQueryServiceImpl(db_fixture)
     assert isinstance(capture_query_service, CaptureQueryServiceImpl)
 
-    new_capture = capture_query_service.find_by_id(new_capture_in_db.id)
+    new_capture = await capture_query_service.find_by_id(new_capture_in_db.id)
     assert new_capture is not None
     assert new_capture.id == new_capture_in_db.id
 
     _user_id = new_capture.user_id
-    new_capture2 = capture_query_service.find_by_user_id(_user_id)
+    new_capture2 = await capture_query_service.find_by_user_id(_user_id)
     assert new_capture2 is not None
-    assert new_capture2[0] == new_capture
+    assert new_capture2.items[0] == new_capture
+
+    captures = await capture_query_service.find_all()
+    assert len(captures.items) == 1
+    assert captures.items[0].entry == new_capture_in_db.entry
+
+
+async def test_capture_query_service_keyset_pages(
+    db_fixture: AsyncSession,
+    new_user_in_db: UserReadModel,
+) -> None:
+    for i in range(5):
+        db_fixture.add(
+            CaptureDTO(
+                id=f"capture-{i}",
+                entry=f"entry {i}",
+                entry_type="note",
+                notes="",
+                location="",
+                flagged=False,
+                priority="low",
+                happened_at=1000,
+                due_date=1000,
+                user_id=new_user_in_db.id,
+                created_at=1000 + i,
+                updated_at=1000 + i,
+            ),
+        )
+    await db_fixture.commit()
+    capture_query_service = CaptureQueryServiceImpl(db_fixture)
+
+    first = await capture_query_service.find_by_user_id(
+        new_user_in_db.id,
+        PageParams(limit=2),
+    )
+    assert [c.id for c in first.items] == ["capture-4", "capture-3"]
+    assert first.prev_cursor is None
+    assert first.next_cursor is not None
+
+    second = await capture_query_service.find_by_user_id(
+        new_user_in_db.id,
+        PageParams(limit=2, cursor=Cursor.decode(first.next_cursor)),
+    )
+    assert [c.id for c in second.items] == ["capture-2", "capture-1"]
+    assert second.prev_cursor is not None
+
+    last = await capture_query_service.find_by_user_id(
+        new_user_in_db.id,
+        PageParams(limit=2, cursor=Cursor.decode(second.next_cursor or "")),
+    )
+    assert [c.id for c in last.items] == ["capture-0"]
+    assert last.next_cursor is None
+
+    back = await capture_query_service.find_by_user_id(
+        new_user_in_db.id,
+        PageParams(limit=2, cursor=Cursor.decode(second.prev_cursor or "")),
+    )
+    assert [c.id for c in back.items] == ["capture-4", "capture-3"]
+    assert back.prev_cursor is None
+    assert back.next_cursor is not None
+
+    ascending = await capture_query_service.find_all(PageParams(limit=3, order="asc"))
+    assert [c.id for c in ascending.items] == ["capture-0", "capture-1", "capture-2"]
+
+
+async def test_capture_query_service_stream(
+    db_fixture: AsyncSession,
+    new_user_in_db: UserReadModel,
+) -> None:
+    for i in range(5):
+        db_fixture.add(
+            CaptureDTO(
+                id=f"capture-{i}",
+                entry=f"entry {i}",
+                entry_type="note",
+                notes="",
+                location="",
+                flagged=False,
+                priority="low",
+                happened_at=1000,
+                due_date=1000,
+                user_id=new_user_in_db.id,
+                created_at=1000 + i,
+                updated_at=1000 + i,
+                deleted_at=2000 if i == 2 else None,
+            ),
+        )
+    await db_fixture.commit()
+    capture_query_service = CaptureQueryServiceImpl(db_fixture)
+
+    chunks = [
+        [c.id for c in chunk]
+        async for chunk in capture_query_service.stream_by_user_id(
+            new_user_in_db.id,
+            chunk_size=2,
+        )
+    ]
+    # newest first, a chunk at a time, without the deleted one
+    assert chunks == [["capture-4", "capture-3"], ["capture-1", "capture-0"]]
+
+    everyone = [len(chunk) async for chunk in capture_query_service.stream_by_user_id()]
+    assert everyone == [4]
+    assert [
+        chunk async for chunk in capture_query_service.stream_by_user_id("nobody")
+    ] == []
+
+
+async def test_capture_query_service_sparse_fields(
+    db_fixture: AsyncSession,
+    new_capture_in_db: CaptureReadModel,
+) -> None:
+    capture_query_service = CaptureQueryServiceImpl(db_fixture)
+    fields = FieldSet.parse("entry,created_at", CaptureReadModel)
+
+    page = await capture_query_service.find_by_user_id(
+        new_capture_in_db.user_id,
+        PageParams(limit=1),
+        fields=fields,
+    )
+    capture = page.items[0]
+    assert capture.model_fields_set == {"id", "entry", "created_at"}
+    assert capture.entry == new_capture_in_db.entry
+    assert capture.created_at == new_capture_in_db.created_at
+    assert "notes" not in capture.__dict__
+
+    found = await capture_query_service.find_by_id(capture.id, fields)
+    assert found is not None
+    assert found.model_dump(exclude_unset=True) == capture.model_dump(
+        exclude_unset=True,
+    )
+
+    with pytest.raises(InvalidFieldsError):
+        FieldSet.parse("entry,password", CaptureReadModel)
+
+
+async def test_capture_query_service_version(
+    db_fixture: AsyncSession,
+    new_capture_in_db: CaptureReadModel,
+) -> None:
+    capture_query_service = CaptureQueryServiceImpl(db_fixture)
+
+    version = await capture_query_service.find_version(new_capture_in_db.user_id)
+    assert version == CollectionVersion(
+        count=1,
+        updated_at=new_capture_in_db.updated_at,
+    )
+    assert await capture_query_service.find_version("someone-else") == (
+        CollectionVersion(count=0, updated_at=None)
+    )
+
+
+def test_invalid_cursor() -> None:
+    with pytest.raises(InvalidCursorError):
+        Cursor.decode("not-a-cursor")
+
+
+async def test_capture_query_service_search(
+    db_fixture: AsyncSession,
+    new_user_in_db: UserReadModel,
+    new_super_user_in_db: UserReadModel,
+) -> None:
+    entries = [
+        ("capture-0", new_user_in_db.id, "coffee with milk", "coffee coffee"),
+        ("capture-1", new_user_in_db.id, "tea", "no coffee today"),
+        ("capture-2", new_user_in_db.id, "coffee", ""),
+        ("capture-3", new_super_user_in_db.id, "coffee for the admin", ""),
+    ]
+    for id, user_id, entry, notes in entries:
+        db_fixture.add(
+            CaptureDTO(
+                id=id,
+                entry=entry,
+                entry_type="note",
+                notes=notes,
+                location="",
+                flagged=False,
+                priority="low",
+                happened_at=1000,
+                due_date=1000,
+                user_id=user_id,
+                created_at=1000,
+                updated_at=1000,
+            ),
+        )
+    await db_fixture.commit()
+    capture_query_service = CaptureQueryServiceImpl(db_fixture)
+
+    first = await capture_query_service.search_by_user_id(
+        new_user_in_db.id,
+        "coffee",
+        PageParams(limit=2),
+    )
+    # entry hits outrank the notes-only hit; the admin's capture is not seen
+    assert {c.id for c in first.items} == {"capture-0", "capture-2"}
+    assert first.items[0].rank <= first.items[1].rank
+    assert "<mark>coffee</mark>" in first.items[0].snippet
+
+    rest = await capture_query_service.search_by_user_id(
+        new_user_in_db.id,
+        "coffee",
+        PageParams(limit=2, cursor=Cursor.decode(first.next_cursor or "")),
+    )
+    assert [c.id for c in rest.items] == ["capture-1"]
+    assert rest.next_cursor is None
+
+    none = await capture_query_service.search_by_user_id(new_user_in_db.id, "  ")
+    assert none.items == []
+
+
+async def test_capture_query_service_tag_filter(
+    db_fixture: AsyncSession,
+    new_user_in_db: UserReadModel,
+) -> None:
+    tagged = {
+        "capture-0": ["work", "urgent"],
+        "capture-1": ["work"],
+        "capture-2": ["work", "urgent", "done"],
+        "capture-3": ["home"],
+    }
+    for text in ("work", "urgent", "done", "home"):
+        db_fixture.add(TagDTO(id=f"tag-{text}", text=text, user_id=new_user_in_db.id))
+    for i, capture_id in enumerate(tagged):
+        db_fixture.add(
+            CaptureDTO(
+                id=capture_id,
+                entry=f"entry {i}",
+                entry_type="note",
+                notes="",
+                location="",
+                flagged=False,
+                priority="low",
+                happened_at=1000,
+                due_date=1000,
+                user_id=new_user_in_db.id,
+                created_at=1000 + i,
+                updated_at=1000 + i,
+            ),
+        )
+    await db_fixture.flush()
+    await db_fixture.execute(
+        insert(capture_tags),
+        [
+            {"capture_id": capture_id, "tag_id": f"tag-{text}"}
+            for capture_id, texts in tagged.items()
+            for text in texts
+        ],
+    )
+    await db_fixture.commit()
+    capture_query_service = CaptureQueryServiceImpl(db_fixture)
+
+    async def ids(tags: CaptureTagFilter) -> List[str]:
+        page = await capture_query_service.find_by_user_id(
+            new_user_in_db.id,
+            PageParams(order="asc"),
+            tags,
+        )
+        return [c.id for c in page.items]
+
+    assert await ids(CaptureTagFilter()) == list(tagged)
+    assert await ids(CaptureTagFilter(include_all=["work", "urgent"])) == [
+        "capture-0",
+        "capture-2",
+    ]
+    assert await ids(
+        CaptureTagFilter(include_all=["work", "urgent"], exclude=["done"]),
+    ) == ["capture-0"]
+    assert await ids(CaptureTagFilter(include_any=["urgent", "home"])) == [
+        "capture-0",
+        "capture-2",
+        "capture-3",
+    ]
+    assert await ids(CaptureTagFilter(exclude=["work"])) == ["capture-3"]
+    assert await ids(CaptureTagFilter(include_all=["work", "nope"])) == []
+
+
+async def test_capture_query_service_time_filter(
+    db_fixture: AsyncSession,
+    new_user_in_db: UserReadModel,
+) -> None:
+    dates = {
+        "capture-0": (1000, 5000),
+        "capture-1": (2000, 9000),
+        "capture-2": (3000, 7000),
+    }
+    for i, (capture_id, (happened_at, due_date)) in enumerate(dates.items()):
+        db_fixture.add(
+            CaptureDTO(
+                id=capture_id,
+                entry=f"entry {i}",
+                entry_type="note",
+                notes="",
+                location="",
+                flagged=False,
+                priority="low",
+                happened_at=happened_at,
+                due_date=due_date,
+                user_id=new_user_in_db.id,
+                created_at=1000 + i,
+                updated_at=1000 + i,
+            ),
+        )
+    await db_fixture.commit()
+    capture_query_service = CaptureQueryServiceImpl(db_fixture)
+
+    async def ids(times: CaptureTimeFilter) -> List[str]:
+        page = await capture_query_service.find_by_user_id(
+            new_user_in_db.id,
+            PageParams(order="asc"),
+            times=times,
+        )
+        return [c.id for c in page.items]
+
+    assert await ids(CaptureTimeFilter(happened_from=2000)) == [
+        "capture-1",
+        "capture-2",
+    ]
+    # the upper bound is exclusive
+    assert await ids(CaptureTimeFilter(happened_to=2000)) == ["capture-0"]
+    assert await ids(CaptureTimeFilter(due_to=6000)) == ["capture-0"]
+    assert await ids(CaptureTimeFilter(due_from=6000, due_to=9000)) == ["capture-2"]
+
+
+async def test_capture_query_usecase_calendar(
+    db_fixture: AsyncSession,
+    new_user_in_db: UserReadModel,
+) -> None:
+    # late evening UTC is already the next day in Stockholm, which moves
+    # from +01:00 to +02:00 on 2021-03-28
+    happened = [
+        1616715000,  # 03-25 23:30 UTC
+        1616716800,  # 03-26 00:00 UTC
+        1616932800,  # 03-28 12:00 UTC
+        1616970600,  # 03-28 22:30 UTC
+        1617229800,  # 03-31 22:30 UTC
+    ]
+    for i, happened_at in enumerate(happened):
+        db_fixture.add(
+            CaptureDTO(
+                id=f"capture-{i}",
+                entry=f"entry {i}",
+                entry_type="note",
+                notes="",
+                location="",
+                flagged=False,
+                priority="low",
+                happened_at=happened_at,
+                due_date=None,
+                user_id=new_user_in_db.id,
+                created_at=1000,
+                updated_at=1000,
+            ),
+        )
+    await db_fixture.commit()
+    capture_query_usecase = CaptureQueryUseCaseImpl(
+        CaptureQueryServiceImpl(db_fixture),
+    )
+
+    utc = await capture_query_usecase.fetch_calendar_for_user(
+        new_user_in_db.id,
+        2021,
+        3,
+    )
+    assert len(utc.days) == 31
+    assert utc.days[0].date == "2021-03-01"
+    counts = {day.date: day.count for day in utc.days if day.count > 0}
+    assert counts == {
+        "2021-03-25": 1,
+        "2021-03-26": 1,
+        "2021-03-28": 2,
+        "2021-03-31": 1,
+    }
+
+    stockholm = await capture_query_usecase.fetch_calendar_for_user(
+        new_user_in_db.id,
+        2021,
+        3,
+        timezone="Europe/Stockholm",
+    )
+    counts = {day.date: day.count for day in stockholm.days if day.count > 0}
+    assert counts == {"2021-03-26": 2, "2021-03-28": 1, "2021-03-29": 1}
+
+
+async def test_capture_query_usecase_calendar_invalid_zone(
+    db_fixture: AsyncSession,
+    new_user_in_db: UserReadModel,
+) -> None:
+    capture_query_usecase = CaptureQueryUseCaseImpl(
+        CaptureQueryServiceImpl(db_fixture),
+    )
+    with pytest.raises(InvalidTimeZoneError):
+        await capture_query_usecase.fetch_calendar_for_user(
+            new_user_in_db.id,
+            2021,
+            3,
+            timezone="Mars/Olympus_Mons",
+        )
+
+
+async def test_capture_query_usecase_stats(
+    db_fixture: AsyncSession,
+    new_user_in_db: UserReadModel,
+) -> None:
+    captures = [
+        # id, entry_type, priority, flagged, happened_at
+        ("capture-0", "food", "low", True, 1617235200),  # Thu 2021-04-01
+        ("capture-1", "food", "high", False, 1617321600),  # Fri 2021-04-02
+        ("capture-2", "note", "high", False, 1617580800),  # Mon 2021-04-05
+        ("capture-3", "note", "low", True, 1617148800),  # Wed 2021-03-31
+    ]
+    for capture_id, entry_type, priority, flagged, happened_at in captures:
+        db_fixture.add(
+            CaptureDTO(
+                id=capture_id,
+                entry=f"entry {capture_id}",
+                entry_type=entry_type,
+                notes="",
+                location="",
+                flagged=flagged,
+                priority=priority,
+                happened_at=happened_at,
+                due_date=None,
+                user_id=new_user_in_db.id,
+                created_at=1000,
+                updated_at=1000,
+            ),
+        )
+    db_fixture.add(TagDTO(id="tag-work", text="work", user_id=new_user_in_db.id))
+    await db_fixture.flush()
+    await db_fixture.execute(
+        insert(capture_tags),
+        [
+            {"capture_id": "capture-0", "tag_id": "tag-work"},
+            {"capture_id": "capture-2", "tag_id": "tag-work"},
+            {"capture_id": "capture-3", "tag_id": "tag-work"},
+        ],
+    )
+    await db_fixture.commit()
+    capture_query_usecase = CaptureQueryUseCaseImpl(
+        CaptureQueryServiceImpl(db_fixture),
+    )
+
+    stats = await capture_query_usecase.fetch_stats_for_user(
+        new_user_in_db.id,
+        days=7,
+        until=date(2021, 4, 7),
+    )
+
+    # 2021-03-31 falls outside the 7 day window
+    assert stats.total == 3
+    assert stats.flagged == 1
+    assert [(c.key, c.count) for c in stats.by_entry_type] == [
+        ("food", 2),
+        ("note", 1),
+    ]
+    assert [(c.key, c.count) for c in stats.by_priority] == [("high", 2), ("low", 1)]
+    assert [(c.key, c.count) for c in stats.by_tag] == [("work", 2)]
+    assert [d.count for d in stats.by_day] == [1, 1, 0, 0, 1, 0, 0]
+    assert stats.by_day[0].date == "2021-04-01"
+    assert [(w.date, w.count) for w in stats.by_week] == [
+        ("2021-03-29", 2),
+        ("2021-04-05", 1),
+    ]
 
-    captures = capture_query_service.find_all()
-    assert len(captures) == 1
-    assert captures[0].entry == new_capture_in_db.entry
+    # in Los Angeles the first capture still happened on March 31st
+    stats = await capture_query_usecase.fetch_stats_for_user(
+        new_user_in_db.id,
+        days=7,
+        until=date(2021, 4, 7),
+        timezone="America/Los_Angeles",
+    )
+    assert stats.total == 2
+    assert [d.count for d in stats.by_day] == [1, 0, 0, 1, 0, 0, 0]
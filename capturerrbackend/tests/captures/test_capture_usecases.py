@@ -1,28 +1,41 @@
+import json
 from datetime import datetime
-from typing import Any
+from typing import Any, AsyncIterator, List
 
+import pytest
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from capturerrbackend.app.domain.capture.capture import Capture
 from capturerrbackend.app.domain.capture.capture_exception import (
     CaptureAlreadyExistsError,
     CaptureNotFoundError,
     CapturesNotFoundError,
 )
+from capturerrbackend.app.infrastructure.sqlite.user import UserStatsRepositoryImpl
 from capturerrbackend.app.usecase.capture import (
+    CaptureBatchCreateModel,
     CaptureCommandUseCaseImpl,
     CaptureCreateModel,
+    CaptureImportReadModel,
+    CapturePatchModel,
     CaptureQueryUseCaseImpl,
     CaptureReadModel,
-    CaptureUpdateModel,
+    CaptureTagLinksModel,
+    ImportRecord,
+    read_records,
 )
+from capturerrbackend.app.usecase.capture.capture_import import read_csv
 from capturerrbackend.app.usecase.tag import (
     TagCommandUseCaseImpl,
     TagCreateModel,
     TagQueryUseCaseImpl,
 )
-from capturerrbackend.app.usecase.user import UserReadModel
+from capturerrbackend.app.usecase.user import UserQueryUseCaseImpl, UserReadModel
 from capturerrbackend.utils.utils import get_int_timestamp
 
 
-def test_create_capture(
+async def test_create_capture(
     fake_capture: dict[str, Any],
     capture_command_usecase: CaptureCommandUseCaseImpl,
     capture_query_usecase: CaptureQueryUseCaseImpl,
@@ -30,17 +43,17 @@ def test_create_capture(
     # Arrange
 
     capture_model = CaptureCreateModel.model_validate(fake_capture)
-    capture = capture_command_usecase.create_capture(
+    capture = await capture_command_usecase.create_capture(
         capture_model,
     )
     assert capture is not None
 
-    all_captures = capture_query_usecase.fetch_captures()
-    assert len(all_captures) > 0
-    assert all_captures[0].entry == fake_capture["entry"]
+    all_captures = await capture_query_usecase.fetch_captures()
+    assert len(all_captures.items) > 0
+    assert all_captures.items[0].entry == fake_capture["entry"]
 
 
-def test_create_capture_duplicate_entry(
+async def test_create_capture_duplicate_entry(
     fake_capture: dict[str, Any],
     capture_command_usecase: CaptureCommandUseCaseImpl,
     capture_query_usecase: CaptureQueryUseCaseImpl,
@@ -48,13 +61,13 @@ def test_create_capture_duplicate_entry(
     # Arrange
 
     capture_model = CaptureCreateModel.model_validate(fake_capture)
-    capture = capture_command_usecase.create_capture(
+    capture = await capture_command_usecase.create_capture(
         capture_model,
     )
     assert capture is not None
     try:
         # add the same capture again
-        capture_command_usecase.create_capture(
+        await capture_command_usecase.create_capture(
             capture_model,
         )
         assert True is False
@@ -65,7 +78,23 @@ def test_create_capture_duplicate_entry(
         raise
 
 
-def test_get_capture(
+async def test_create_capture_conflict_leaves_no_trace(
+    fake_capture: dict[str, Any],
+    capture_command_usecase: CaptureCommandUseCaseImpl,
+    user_query_usecase: UserQueryUseCaseImpl,
+) -> None:
+    capture_model = CaptureCreateModel.model_validate(fake_capture)
+    created = await capture_command_usecase.create_capture(capture_model)
+    assert created.created_at is not None
+
+    with pytest.raises(CaptureAlreadyExistsError):
+        await capture_command_usecase.create_capture(capture_model)
+
+    stats = await user_query_usecase.fetch_user_stats(fake_capture["user_id"])
+    assert stats.captures == 1
+
+
+async def test_get_capture(
     fake_capture: dict[str, Any],
     capture_command_usecase: CaptureCommandUseCaseImpl,
     capture_query_usecase: CaptureQueryUseCaseImpl,
@@ -73,17 +102,17 @@ def test_get_capture(
     # Arrange
 
     capture_model = CaptureCreateModel.model_validate(fake_capture)
-    capture = capture_command_usecase.create_capture(
+    capture = await capture_command_usecase.create_capture(
         capture_model,
     )
     assert capture is not None
 
-    capture2 = capture_query_usecase.fetch_capture_by_id(capture.id)
+    capture2 = await capture_query_usecase.fetch_capture_by_id(capture.id)
     assert capture2 is not None
     assert capture2.entry == fake_capture["entry"]
 
 
-def test_get_capture_for_user(
+async def test_get_capture_for_user(
     fake_capture: dict[str, Any],
     new_user_in_db: UserReadModel,
     new_super_user_in_db: UserReadModel,
@@ -96,7 +125,7 @@ def test_get_capture_for_user(
     # create first capture
 
     capture_model = CaptureCreateModel.model_validate(fake_capture)
-    capture = capture_command_usecase.create_capture(
+    capture = await capture_command_usecase.create_capture(
         capture_model,
     )
     assert capture is not None
@@ -104,7 +133,7 @@ def test_get_capture_for_user(
     # create first capture
     fake_capture["entry"] = "new entry"
     capture_model = CaptureCreateModel.model_validate(fake_capture)
-    capture = capture_command_usecase.create_capture(
+    capture = await capture_command_usecase.create_capture(
         capture_model,
     )
     assert capture is not None
@@ -113,29 +142,29 @@ def test_get_capture_for_user(
     fake_capture["entry"] = "another new entry.  this time from the admin"
     fake_capture["user_id"] = new_super_user_in_db.id
     capture_model = CaptureCreateModel.model_validate(fake_capture)
-    capture = capture_command_usecase.create_capture(
+    capture = await capture_command_usecase.create_capture(
         capture_model,
     )
 
-    my_caps = capture_query_usecase.fetch_captures_for_user(new_user_in_db.id)
-    assert len(my_caps) == 2
-    assert my_caps[0].entry == initial_entry
+    my_caps = await capture_query_usecase.fetch_captures_for_user(new_user_in_db.id)
+    assert len(my_caps.items) == 2
+    assert initial_entry in [cap.entry for cap in my_caps.items]
 
 
-def test_get_capture_no_captures(
+async def test_get_capture_no_captures(
     capture_command_usecase: CaptureCommandUseCaseImpl,
     capture_query_usecase: CaptureQueryUseCaseImpl,
 ) -> None:
     # Arrange
     try:
-        capture_query_usecase.fetch_captures()
+        await capture_query_usecase.fetch_captures()
         assert False
     except CapturesNotFoundError as e:
         assert e.status_code == CapturesNotFoundError.status_code
         assert e.detail == CapturesNotFoundError.detail
 
 
-def test_update_capture_bad_id(
+async def test_patch_capture_bad_id(
     fake_capture: dict[str, Any],
     capture_command_usecase: CaptureCommandUseCaseImpl,
     capture_query_usecase: CaptureQueryUseCaseImpl,
@@ -143,22 +172,24 @@ def test_update_capture_bad_id(
     # Arrange
 
     capture_model = CaptureCreateModel.model_validate(fake_capture)
-    capture = capture_command_usecase.create_capture(
+    capture = await capture_command_usecase.create_capture(
         capture_model,
     )
     assert capture is not None
-    capture.entry_type = "updated entry type"
-    updated_capture = CaptureUpdateModel.model_validate(capture.model_dump())
 
     try:
-        capture_command_usecase.update_capture("bad_id", updated_capture)
+        await capture_command_usecase.patch_capture(
+            "bad_id",
+            capture.user_id,
+            CapturePatchModel(entry_type="updated entry type"),
+        )
         assert False
     except CaptureNotFoundError as e:
         assert e.status_code == CaptureNotFoundError.status_code
         assert e.detail == CaptureNotFoundError.detail
 
 
-def test_add_new_tag_to_capture(
+async def test_add_new_tag_to_capture(
     new_capture_in_db: CaptureReadModel,
     capture_command_usecase: CaptureCommandUseCaseImpl,
     capture_query_usecase: CaptureQueryUseCaseImpl,
@@ -175,16 +206,16 @@ def test_add_new_tag_to_capture(
         "updated_at": get_int_timestamp(datetime.now()),
     }
     tag_model = TagCreateModel.model_validate(tag_info)
-    tag = tag_command_usecase.get_or_create_tag(tag_model)
+    tag = await tag_command_usecase.get_or_create_tag(tag_model)
 
     # new_tag = tag_command_usecase.create_tag(tag)
 
     # assert capture.tags is None
     # assert tag.captures is None
-    capture_command_usecase.add_tag_to_capture(capture.id, tag.id)
-    new_tag = tag_query_usecase.fetch_tag_by_text(tag.text)
+    await capture_command_usecase.add_tag_to_capture(capture.id, tag.id)
+    new_tag = await tag_query_usecase.fetch_tag_by_text(tag.text)
     assert new_tag is not None
-    capture.tags = tag_query_usecase.fetch_tags_for_capture(capture.id)
+    capture.tags = await tag_query_usecase.fetch_tags_for_capture(capture.id)
 
     # updated_capture = capture_query_usecase.fetch_capture_by_id(capture.id)
     # updated_tag = capture_query_usecase.fetch_tag_by_id(tag.id)
@@ -192,3 +223,365 @@ def test_add_new_tag_to_capture(
     # assert tag.captures is not None
     assert capture.tags[0].id is not None
     # assert tag.captures[0].id == capture.id
+
+
+async def test_capture_writes_maintain_user_stats(
+    fake_capture: dict[str, Any],
+    capture_command_usecase: CaptureCommandUseCaseImpl,
+    tag_command_usecase: TagCommandUseCaseImpl,
+    user_query_usecase: UserQueryUseCaseImpl,
+    db_fixture: AsyncSession,
+) -> None:
+    # Arrange
+    user_id = fake_capture["user_id"]
+    first = await capture_command_usecase.create_capture(
+        CaptureCreateModel.model_validate(fake_capture),
+    )
+    fake_capture["entry"] = "A second capture."
+    fake_capture["flagged"] = True
+    fake_capture["priority"] = "low"
+    second = await capture_command_usecase.create_capture(
+        CaptureCreateModel.model_validate(fake_capture),
+    )
+    tag = await tag_command_usecase.get_or_create_tag(
+        TagCreateModel.model_validate({"user_id": user_id, "text": "work"}),
+    )
+    await capture_command_usecase.add_tag_to_capture(first.id, tag.id)
+
+    stats = await user_query_usecase.fetch_user_stats(user_id)
+    assert (stats.captures, stats.flagged, stats.tags) == (2, 1, 1)
+    assert stats.by_priority == {"high": 1, "low": 1}
+    assert stats.last_activity_at is not None
+
+    # Act
+    fake_capture["priority"] = "high"
+    await capture_command_usecase.patch_capture(
+        second.id,
+        user_id,
+        CapturePatchModel(priority="high"),
+    )
+    await capture_command_usecase.delete_capture_by_id(first.id)
+
+    # Assert
+    stats = await user_query_usecase.fetch_user_stats(user_id)
+    assert (stats.captures, stats.flagged, stats.tags) == (1, 1, 0)
+    assert stats.by_priority == {"high": 1}
+    assert stats.by_entry_type == {fake_capture["entry_type"]: 1}
+
+    # a full recompute agrees with the running counters
+    await UserStatsRepositoryImpl(db_fixture).recompute(user_id)
+    recomputed = await user_query_usecase.fetch_user_stats(user_id)
+    assert recomputed.model_dump(exclude={"last_activity_at"}) == stats.model_dump(
+        exclude={"last_activity_at"},
+    )
+
+    # deleting a tag takes its capture links out of the counters too
+    await capture_command_usecase.add_tag_to_capture(second.id, tag.id)
+    await tag_command_usecase.delete_tag_by_id(tag.id)
+    stats = await user_query_usecase.fetch_user_stats(user_id)
+    assert stats.tags == 0
+
+    # restores put back what the trash took out
+    await tag_command_usecase.restore_tag_by_id(tag.id, user_id)
+    await capture_command_usecase.restore_capture_by_id(first.id, user_id)
+    stats = await user_query_usecase.fetch_user_stats(user_id)
+    assert (stats.captures, stats.flagged, stats.tags) == (2, 1, 2)
+    await UserStatsRepositoryImpl(db_fixture).recompute(user_id)
+    recomputed = await user_query_usecase.fetch_user_stats(user_id)
+    assert (recomputed.captures, recomputed.tags) == (2, 2)
+
+
+async def test_create_captures_batch(
+    fake_capture: dict[str, Any],
+    capture_command_usecase: CaptureCommandUseCaseImpl,
+    tag_command_usecase: TagCommandUseCaseImpl,
+    tag_query_usecase: TagQueryUseCaseImpl,
+    user_query_usecase: UserQueryUseCaseImpl,
+    db_fixture: AsyncSession,
+) -> None:
+    # Arrange: the first entry is taken, "work" exists already
+    user_id = fake_capture["user_id"]
+    await capture_command_usecase.create_capture(
+        CaptureCreateModel.model_validate(fake_capture),
+    )
+    work = await tag_command_usecase.get_or_create_tag(
+        TagCreateModel.model_validate({"user_id": user_id, "text": "work"}),
+    )
+    items = [
+        fake_capture,
+        {**fake_capture, "entry": "one", "tags": ["work", "home", "work"]},
+        {**fake_capture, "entry": "two", "tags": ["home"], "flagged": True},
+        {**fake_capture, "entry": "one"},
+    ]
+
+    # Act
+    batch = await capture_command_usecase.create_captures(
+        user_id,
+        CaptureBatchCreateModel.model_validate({"captures": items}),
+    )
+
+    # Assert
+    assert (batch.created, batch.duplicates) == (2, 2)
+    assert [result.status for result in batch.results] == [
+        "duplicate",
+        "created",
+        "created",
+        "duplicate",
+    ]
+    one, two = batch.results[1].id, batch.results[2].id
+    assert one is not None and two is not None
+    tags = await tag_query_usecase.fetch_tags_for_captures([one, two])
+    assert sorted(tag.text for tag in tags[one]) == ["home", "work"]
+    assert work.id in [tag.id for tag in tags[one]]
+    assert [tag.text for tag in tags[two]] == ["home"]
+    assert tags[two][0].id in [tag.id for tag in tags[one]]
+
+    stats = await user_query_usecase.fetch_user_stats(user_id)
+    assert (stats.captures, stats.flagged, stats.tags) == (3, 1, 3)
+    await UserStatsRepositoryImpl(db_fixture).recompute(user_id)
+    recomputed = await user_query_usecase.fetch_user_stats(user_id)
+    assert recomputed.model_dump(exclude={"last_activity_at"}) == stats.model_dump(
+        exclude={"last_activity_at"},
+    )
+
+
+async def test_create_captures_batch_at_scale(
+    fake_capture: dict[str, Any],
+    capture_command_usecase: CaptureCommandUseCaseImpl,
+    user_query_usecase: UserQueryUseCaseImpl,
+) -> None:
+    # ten full batches stand in for a 10k capture import
+    user_id = fake_capture["user_id"]
+    for batch_number in range(10):
+        items = [
+            {**fake_capture, "entry": f"capture {batch_number}-{i}", "tags": ["bulk"]}
+            for i in range(1000)
+        ]
+        batch = await capture_command_usecase.create_captures(
+            user_id,
+            CaptureBatchCreateModel.model_validate({"captures": items}),
+        )
+        assert batch.created == 1000
+
+    stats = await user_query_usecase.fetch_user_stats(user_id)
+    assert (stats.captures, stats.tags) == (10000, 10000)
+
+
+async def test_attach_and_detach_tags(
+    fake_capture: dict[str, Any],
+    capture_command_usecase: CaptureCommandUseCaseImpl,
+    tag_query_usecase: TagQueryUseCaseImpl,
+    user_query_usecase: UserQueryUseCaseImpl,
+    db_fixture: AsyncSession,
+) -> None:
+    # Arrange
+    user_id = fake_capture["user_id"]
+    batch = await capture_command_usecase.create_captures(
+        user_id,
+        CaptureBatchCreateModel.model_validate(
+            {
+                "captures": [
+                    {**fake_capture, "entry": "one", "tags": ["work"]},
+                    {**fake_capture, "entry": "two"},
+                ],
+            },
+        ),
+    )
+    ids = [str(result.id) for result in batch.results]
+
+    # Act
+    attached = await capture_command_usecase.attach_tags(
+        user_id,
+        CaptureTagLinksModel(capture_ids=ids, tags=["work", "home"]),
+    )
+
+    # Assert: "one" had "work" already
+    assert attached.changed == 3
+    tags = await tag_query_usecase.fetch_tags_for_captures(ids)
+    assert sorted(tag.text for tag in tags[ids[1]]) == ["home", "work"]
+    stats = await user_query_usecase.fetch_user_stats(user_id)
+    assert stats.tags == 4
+
+    detached = await capture_command_usecase.detach_tags(
+        user_id,
+        CaptureTagLinksModel(capture_ids=ids, tags=["work", "unknown"]),
+    )
+    assert detached.changed == 2
+    tags = await tag_query_usecase.fetch_tags_for_captures(ids)
+    assert [tag.text for tag in tags[ids[0]]] == ["home"]
+    stats = await user_query_usecase.fetch_user_stats(user_id)
+    await UserStatsRepositoryImpl(db_fixture).recompute(user_id)
+    recomputed = await user_query_usecase.fetch_user_stats(user_id)
+    assert stats.tags == recomputed.tags == 2
+
+
+async def chunked(data: bytes, size: int) -> AsyncIterator[bytes]:
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+async def test_read_import_records() -> None:
+    # chunks of 3 bytes split lines and the two bytes of "é"
+    ndjson = '{"entry": "café"}\n\nnot json\n[1]\r\n{"entry": "last"}'
+    records = [r async for r in read_records(chunked(ndjson.encode(), 3), "ndjson")]
+    assert records == [
+        ImportRecord(1, {"entry": "café"}),
+        ImportRecord(3, {}, "invalid JSON: Expecting value"),
+        ImportRecord(4, {}, "expected a JSON object"),
+        ImportRecord(5, {"entry": "last"}),
+    ]
+
+    csv = 'entry,notes,tags\none,"two\nlines",a; b\nshort\nthree,,\n'
+    records = [r async for r in read_records(chunked(csv.encode(), 4), "csv")]
+    assert records == [
+        ImportRecord(2, {"entry": "one", "notes": "two\nlines", "tags": ["a", "b"]}),
+        ImportRecord(4, {}, "expected 3 cells, found 1"),
+        ImportRecord(5, {"entry": "three", "notes": "", "tags": []}),
+    ]
+
+
+async def test_read_csv_resyncs_after_unclosed_quote() -> None:
+    csv = 'entry,notes\nbad,"never closed\nfiller one\nfiller two\nok,1\nalso ok,2\n'
+    records = [r async for r in read_csv(chunked(csv.encode(), 5), 30)]
+    assert records == [
+        ImportRecord(2, {}, "quoted field not closed within 30 characters"),
+        ImportRecord(5, {"entry": "ok", "notes": "1"}),
+        ImportRecord(6, {"entry": "also ok", "notes": "2"}),
+    ]
+
+
+async def test_import_captures_in_chunks(
+    fake_capture: dict[str, Any],
+    capture_command_usecase: CaptureCommandUseCaseImpl,
+    user_query_usecase: UserQueryUseCaseImpl,
+) -> None:
+    # Arrange: seven lines, one of them unreadable, one invalid, one repeated
+    user_id = fake_capture["user_id"]
+    rows = [
+        {**fake_capture, "entry": f"capture {i}", "tags": ["import"]} for i in range(4)
+    ]
+    rows.insert(2, {**fake_capture, "happened_at": "yesterday"})
+    rows.append({**fake_capture, "entry": "capture 0"})
+    lines = [json.dumps(row) for row in rows]
+    lines.insert(1, "{")
+    progress: List[CaptureImportReadModel] = []
+
+    # Act
+    report = await capture_command_usecase.import_captures(
+        user_id,
+        read_records(chunked("\n".join(lines).encode(), 100), "ndjson"),
+        chunk_size=3,
+        on_progress=lambda tally: progress.append(tally.model_copy()),
+    )
+
+    # Assert
+    assert (report.rows, report.created, report.duplicates, report.failed) == (
+        7,
+        4,
+        1,
+        2,
+    )
+    assert [error.line for error in report.errors] == [2, 4]
+    assert report.errors[1].error.startswith("happened_at: ")
+    # one commit and one report per chunk
+    assert [tally.rows for tally in progress] == [3, 6, 7]
+    stats = await user_query_usecase.fetch_user_stats(user_id)
+    assert (stats.captures, stats.tags) == (4, 4)
+
+
+async def test_import_goes_on_after_a_failed_chunk(
+    fake_capture: dict[str, Any],
+    capture_command_usecase: CaptureCommandUseCaseImpl,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # Arrange: three chunks of two; the database refuses the second one
+    user_id = fake_capture["user_id"]
+    lines = [json.dumps({**fake_capture, "entry": f"capture {i}"}) for i in range(6)]
+    repository = capture_command_usecase.uow.capture_repository
+    create_many = repository.create_many
+    calls: List[int] = []
+
+    async def refuse_second(captures: List[Capture]) -> None:
+        calls.append(len(captures))
+        if len(calls) == 2:
+            raise IntegrityError("INSERT", {}, Exception("UNIQUE constraint failed"))
+        await create_many(captures)
+
+    monkeypatch.setattr(repository, "create_many", refuse_second)
+
+    # Act
+    report = await capture_command_usecase.import_captures(
+        user_id,
+        read_records(chunked("\n".join(lines).encode(), 100), "ndjson"),
+        chunk_size=2,
+    )
+
+    # Assert: the third chunk was still written
+    assert calls == [2, 2, 2]
+    assert (report.rows, report.created, report.failed) == (6, 4, 2)
+    assert [(error.line, error.error) for error in report.errors] == [
+        (3, "not saved: IntegrityError"),
+        (4, "not saved: IntegrityError"),
+    ]
+    entries = await repository.find_existing_entries(
+        [f"capture {i}" for i in range(6)],
+    )
+    assert sorted(entries) == ["capture 0", "capture 1", "capture 4", "capture 5"]
+
+
+async def test_attach_tags_to_another_users_capture(
+    new_capture_in_db: CaptureReadModel,
+    capture_command_usecase: CaptureCommandUseCaseImpl,
+    tag_query_usecase: TagQueryUseCaseImpl,
+) -> None:
+    with pytest.raises(CaptureNotFoundError):
+        await capture_command_usecase.attach_tags(
+            "someone-else",
+            CaptureTagLinksModel(capture_ids=[new_capture_in_db.id], tags=["x"]),
+        )
+
+    # nothing was written, not even the tag
+    tags = await tag_query_usecase.fetch_tags_for_captures([new_capture_in_db.id])
+    assert tags[new_capture_in_db.id] == []
+
+
+async def test_capture_of_another_user(
+    new_capture_in_db: CaptureReadModel,
+    capture_command_usecase: CaptureCommandUseCaseImpl,
+    capture_query_usecase: CaptureQueryUseCaseImpl,
+) -> None:
+    with pytest.raises(CaptureNotFoundError):
+        await capture_query_usecase.fetch_capture_by_id(
+            new_capture_in_db.id,
+            user_id="someone-else",
+        )
+    with pytest.raises(CaptureNotFoundError):
+        await capture_command_usecase.delete_capture_by_id(
+            new_capture_in_db.id,
+            "someone-else",
+        )
+
+    capture = await capture_query_usecase.fetch_capture_by_id(new_capture_in_db.id)
+    assert capture.deleted_at is None
+
+
+async def test_restore_capture_of_another_user(
+    new_capture_in_db: CaptureReadModel,
+    capture_command_usecase: CaptureCommandUseCaseImpl,
+) -> None:
+    await capture_command_usecase.delete_capture_by_id(new_capture_in_db.id)
+
+    with pytest.raises(CaptureNotFoundError):
+        await capture_command_usecase.restore_capture_by_id(
+            new_capture_in_db.id,
+            "someone-else",
+        )
+
+
+async def test_fetch_user_stats_without_captures(
+    new_user_in_db: UserReadModel,
+    user_query_usecase: UserQueryUseCaseImpl,
+) -> None:
+    stats = await user_query_usecase.fetch_user_stats(new_user_in_db.id)
+    assert stats.captures == 0
+    assert stats.by_priority == {}
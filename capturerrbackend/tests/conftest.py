@@ -1,4 +1,4 @@
-from collections.abc import AsyncIterator, Iterator
+from collections.abc import AsyncIterator
 from datetime import datetime
 from typing import Annotated, Any
 
@@ -7,22 +7,22 @@ from fastapi import Depends, FastAPI, HTTPException, status
 from fastapi.testclient import TestClient
 from httpx import AsyncClient
 from loguru import logger
-from sqlalchemy import create_engine
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
 
 from capturerrbackend.app.application import get_app
 from capturerrbackend.app.domain.book.book_repository import BookRepository
 from capturerrbackend.app.domain.capture.capture_repository import CaptureRepository
 from capturerrbackend.app.domain.tag.tag_repository import TagRepository
 from capturerrbackend.app.domain.user.user_repository import UserRepository
+from capturerrbackend.app.domain.user.user_stats_repository import UserStatsRepository
 from capturerrbackend.app.infrastructure.dependencies import (
     book_command_usecase as new_bcu,
 )
 from capturerrbackend.app.infrastructure.dependencies import (
+    get_async_session,
     get_current_active_super_user,
     get_current_active_user,
-    get_sync_session,
 )
 from capturerrbackend.app.infrastructure.dependencies import (
     tag_command_usecase as new_tcu,
@@ -40,7 +40,11 @@ from capturerrbackend.app.infrastructure.sqlite.capture import (
     CaptureQueryServiceImpl,
     CaptureRepositoryImpl,
 )
-from capturerrbackend.app.infrastructure.sqlite.database import Base
+from capturerrbackend.app.infrastructure.sqlite.database import (
+    Base,
+    apply_sqlite_profile,
+)
+from capturerrbackend.app.infrastructure.sqlite.job import JobRepositoryImpl
 from capturerrbackend.app.infrastructure.sqlite.tag import (
     TagCommandUseCaseUnitOfWorkImpl,
     TagQueryServiceImpl,
@@ -50,6 +54,7 @@ from capturerrbackend.app.infrastructure.sqlite.user import (
     UserCommandUseCaseUnitOfWorkImpl,
     UserQueryServiceImpl,
     UserRepositoryImpl,
+    UserStatsRepositoryImpl,
 )
 from capturerrbackend.app.usecase.book import (
     BookCommandUseCase,
@@ -71,6 +76,7 @@ from capturerrbackend.app.usecase.capture import (
     CaptureQueryUseCaseImpl,
     CaptureReadModel,
 )
+from capturerrbackend.app.usecase.job import JobRepository
 from capturerrbackend.app.usecase.tag import (
     TagCommandUseCase,
     TagCommandUseCaseImpl,
@@ -94,15 +100,19 @@ from capturerrbackend.app.usecase.user import (
 from capturerrbackend.config.configurator import config
 from capturerrbackend.utils.utils import get_int_timestamp
 
-engine = create_engine(str(config.db_url), connect_args={"check_same_thread": False})
-Base.metadata.drop_all(engine)
-Base.metadata.create_all(engine)
+engine = create_async_engine(str(config.db_url), poolclass=NullPool)
+apply_sqlite_profile(engine.sync_engine, config.db_sqlite_profile)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = async_sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    expire_on_commit=False,
+    bind=engine,
+)
 
 
 @pytest.fixture
-def fake_book() -> dict[str, Any]:
+def fake_book(new_user_in_db: UserReadModel) -> dict[str, Any]:
     return {
         "title": "Test Book",
         "read_page": 80,
@@ -111,7 +121,7 @@ def fake_book() -> dict[str, Any]:
         "created_at": get_int_timestamp(datetime.now()),
         "updated_at": get_int_timestamp(datetime.now()),
         "deleted_at": None,
-        "user_id": "vytxeTZskVKR7C7WgdSP3d",
+        "user_id": new_user_in_db.id,
     }
 
 
@@ -146,18 +156,18 @@ def fake_super_user() -> dict[str, Any]:
 
 
 @pytest.fixture
-def fake_tag() -> dict[str, Any]:
+def fake_tag(new_user_in_db: UserReadModel) -> dict[str, Any]:
     return {
         "text": "test-monotone",
         "created_at": get_int_timestamp(datetime.now()),
         "updated_at": get_int_timestamp(datetime.now()),
         "deleted_at": None,
-        "user_id": "vytxeTZskVKR7C7WgdSP3d",
+        "user_id": new_user_in_db.id,
     }
 
 
 @pytest.fixture
-def fake_capture() -> dict[str, Any]:
+def fake_capture(new_user_in_db: UserReadModel) -> dict[str, Any]:
     return {
         "entry": "Still coding at 530 in the am.",
         "entry_type": "asdf",
@@ -170,34 +180,34 @@ def fake_capture() -> dict[str, Any]:
         "created_at": get_int_timestamp(datetime.now()),
         "updated_at": get_int_timestamp(datetime.now()),
         "deleted_at": None,
-        "user_id": "vytxeTZskVKR7C7WgdSP3d",
+        "user_id": new_user_in_db.id,
         "capture_id": "y8ghf;fldsjrewqpiog",
     }
 
 
 @pytest.fixture
-def new_user_in_db(
+async def new_user_in_db(
     fake_user: dict[str, Any],
     user_command_usecase: Annotated[UserCommandUseCase, Depends(new_ucu)],
 ) -> UserReadModel:
     ...
     user = UserCreateModel.model_validate(fake_user)
 
-    user_in_db = user_command_usecase.create_user(user)
+    user_in_db = await user_command_usecase.create_user(user)
 
     assert user_in_db is not None
     return user_in_db
 
 
 @pytest.fixture
-def new_super_user_in_db(
+async def new_super_user_in_db(
     fake_super_user: dict[str, Any],
     user_command_usecase: Annotated[UserCommandUseCase, Depends(new_ucu)],
 ) -> UserReadModel:
     ...
     user = UserCreateModel.model_validate(fake_super_user)
 
-    user_in_db = user_command_usecase.create_user(user)
+    user_in_db = await user_command_usecase.create_user(user)
 
     assert user_in_db is not None
     assert user_in_db.is_superuser is True
@@ -205,7 +215,7 @@ def new_super_user_in_db(
 
 
 @pytest.fixture
-def new_book_in_db(
+async def new_book_in_db(
     new_user_in_db: UserReadModel,
     fake_book: dict[str, Any],
     book_command_usecase: Annotated[BookCommandUseCase, Depends(new_bcu)],
@@ -214,13 +224,13 @@ def new_book_in_db(
     fake_book["user_id"] = new_user_in_db.id
     book = BookCreateModel.model_validate(fake_book)
 
-    book_in_db = book_command_usecase.create_book(book)
+    book_in_db = await book_command_usecase.create_book(book)
     assert book_in_db is not None
     return book_in_db
 
 
 @pytest.fixture
-def new_tag_in_db(
+async def new_tag_in_db(
     new_user_in_db: UserReadModel,
     fake_tag: dict[str, Any],
     tag_command_usecase: Annotated[TagCommandUseCase, Depends(new_tcu)],
@@ -229,13 +239,13 @@ def new_tag_in_db(
     fake_tag["user_id"] = new_user_in_db.id
     tag = TagCreateModel.model_validate(fake_tag)
 
-    tag_in_db = tag_command_usecase.create_tag(tag)
+    tag_in_db = await tag_command_usecase.create_tag(tag)
     assert tag_in_db is not None
     return tag_in_db
 
 
 @pytest.fixture
-def new_capture_in_db(
+async def new_capture_in_db(
     new_user_in_db: UserReadModel,
     fake_capture: dict[str, Any],
     capture_command_usecase: Annotated[CaptureCommandUseCase, Depends(new_tcu)],
@@ -244,24 +254,25 @@ def new_capture_in_db(
     fake_capture["user_id"] = new_user_in_db.id
     capture = CaptureCreateModel.model_validate(fake_capture)
 
-    capture_in_db = capture_command_usecase.create_capture(capture)
+    capture_in_db = await capture_command_usecase.create_capture(capture)
     assert capture_in_db is not None
     return capture_in_db
 
 
-def reset_db() -> None:
-    Base.metadata.drop_all(engine)
-    Base.metadata.create_all(engine)
+async def reset_db() -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
 
 
 @pytest.fixture(scope="function")
-def db_fixture() -> Iterator[Session]:
-    reset_db()
+async def db_fixture() -> AsyncIterator[AsyncSession]:
+    await reset_db()
+    db = SessionLocal()
     try:
-        db = SessionLocal()
         yield db
     finally:
-        db.close()
+        await db.close()
 
 
 @pytest.fixture(scope="session")
@@ -313,7 +324,7 @@ async def fastapi_app_async(
     :return: fastapi app with mocked dependencies.
     """
     application = get_app()
-    application.dependency_overrides[get_sync_session] = lambda: db_session
+    application.dependency_overrides[get_async_session] = lambda: db_session
     # application.dependency_overrides[get_current_active_user] = test_user
 
     return application  # noqa: WPS331
@@ -327,14 +338,14 @@ async def async_client(fastapi_app: FastAPI) -> AsyncIterator[AsyncClient]:
 
 
 @pytest.fixture()
-def book_query_usecase(db_fixture: Session) -> BookQueryUseCase:
+def book_query_usecase(db_fixture: AsyncSession) -> BookQueryUseCase:
     """Get a book query use case."""
     book_query_service: BookQueryService = BookQueryServiceImpl(db_fixture)
     return BookQueryUseCaseImpl(book_query_service)
 
 
 @pytest.fixture()
-def book_command_usecase(db_fixture: Session) -> BookCommandUseCase:
+def book_command_usecase(db_fixture: AsyncSession) -> BookCommandUseCase:
     book_repository: BookRepository = BookRepositoryImpl(db_fixture)
     uow: BookCommandUseCaseUnitOfWork = BookCommandUseCaseUnitOfWorkImpl(
         db_fixture,
@@ -344,69 +355,77 @@ def book_command_usecase(db_fixture: Session) -> BookCommandUseCase:
 
 
 @pytest.fixture()
-def user_query_usecase(db_fixture: Session) -> UserQueryUseCase:
+def user_query_usecase(db_fixture: AsyncSession) -> UserQueryUseCase:
     """Get a user query use case."""
     user_query_service: UserQueryService = UserQueryServiceImpl(db_fixture)
     return UserQueryUseCaseImpl(user_query_service)
 
 
 @pytest.fixture()
-def user_command_usecase(db_fixture: Session) -> UserCommandUseCase:
+def user_command_usecase(db_fixture: AsyncSession) -> UserCommandUseCase:
     user_repository: UserRepository = UserRepositoryImpl(db_fixture)
+    job_repository: JobRepository = JobRepositoryImpl(db_fixture)
     uow: UserCommandUseCaseUnitOfWork = UserCommandUseCaseUnitOfWorkImpl(
         db_fixture,
         user_repository=user_repository,
+        job_repository=job_repository,
     )
     return UserCommandUseCaseImpl(uow)
 
 
 @pytest.fixture()
-def tag_query_usecase(db_fixture: Session) -> TagQueryUseCase:
+def tag_query_usecase(db_fixture: AsyncSession) -> TagQueryUseCase:
     """Get a tag query use case."""
     tag_query_service: TagQueryService = TagQueryServiceImpl(db_fixture)
     return TagQueryUseCaseImpl(tag_query_service)
 
 
 @pytest.fixture()
-def tag_command_usecase(db_fixture: Session) -> TagCommandUseCase:
+def tag_command_usecase(db_fixture: AsyncSession) -> TagCommandUseCase:
     tag_repository: TagRepository = TagRepositoryImpl(db_fixture)
+    user_stats_repository: UserStatsRepository = UserStatsRepositoryImpl(db_fixture)
     uow: TagCommandUseCaseUnitOfWork = TagCommandUseCaseUnitOfWorkImpl(
         db_fixture,
         tag_repository=tag_repository,
+        user_stats_repository=user_stats_repository,
     )
     return TagCommandUseCaseImpl(uow)
 
 
 @pytest.fixture()
-def capture_query_usecase(db_fixture: Session) -> CaptureQueryUseCase:
+def capture_query_usecase(db_fixture: AsyncSession) -> CaptureQueryUseCase:
     """Get a capture query use case."""
     capture_query_service: CaptureQueryService = CaptureQueryServiceImpl(db_fixture)
     return CaptureQueryUseCaseImpl(capture_query_service)
 
 
 @pytest.fixture()
-def capture_command_usecase(db_fixture: Session) -> CaptureCommandUseCase:
+def capture_command_usecase(db_fixture: AsyncSession) -> CaptureCommandUseCase:
     capture_repository: CaptureRepository = CaptureRepositoryImpl(db_fixture)
+    tag_repository: TagRepository = TagRepositoryImpl(db_fixture)
+    user_stats_repository: UserStatsRepository = UserStatsRepositoryImpl(db_fixture)
     uow: CaptureCommandUseCaseUnitOfWork = CaptureCommandUseCaseUnitOfWorkImpl(
         db_fixture,
         capture_repository=capture_repository,
+        tag_repository=tag_repository,
+        user_stats_repository=user_stats_repository,
     )
     return CaptureCommandUseCaseImpl(uow)
 
 
 @pytest.fixture
 def client(
-    db_fixture: Session,
+    db_fixture: AsyncSession,
     user_query_usecase: UserQueryUseCase,
     user_command_usecase: UserCommandUseCase,
     fake_user: dict[str, Any],
 ) -> TestClient:
-    def _get_db_override() -> Session:
+    def _get_db_override() -> AsyncSession:
         return db_fixture
 
-    def _get_current_active_user_override() -> UserReadModel:
+    async def _get_current_active_user_override() -> UserReadModel:
         try:
-            user = user_query_usecase.fetch_users()[0]
+            user = (await user_query_usecase.fetch_users()).items[0]
         except IndexError:
             logger.debug("Creating a fake user since none exist yet")
             user_model = UserCreateModel.model_validate(fake_user)
@@ -414,18 +433,18 @@ def client(
                 raise HTTPException(
                     status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 )
-            user = user_command_usecase.create_user(
+            user = await user_command_usecase.create_user(
                 user_model,
             )
         return user
 
-    def _get_current_active_super_user_override() -> UserReadModel:
-        user = _get_current_active_user_override()
+    async def _get_current_active_super_user_override() -> UserReadModel:
+        user = await _get_current_active_user_override()
         user.is_superuser = True
         return user
 
     app = get_app()
-    app.dependency_overrides[get_sync_session] = _get_db_override
+    app.dependency_overrides[get_async_session] = _get_db_override
     app.dependency_overrides[
         get_current_active_super_user
     ] = _get_current_active_super_user_override
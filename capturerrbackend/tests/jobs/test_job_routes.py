@@ -0,0 +1,37 @@
+from fastapi.testclient import TestClient
+
+from capturerrbackend.app.usecase.job import JobNotFoundError, UnknownJobKindError
+
+
+def test_create_job(client: TestClient) -> None:
+    # Act
+    response = client.post(
+        "/api/jobs",
+        json={"kind": "recompute-stats", "params": {"user_id": None}},
+    )
+
+    # Assert
+    assert response.status_code == 202
+    job = response.json()
+    assert (job["kind"], job["status"], job["attempts"]) == (
+        "recompute-stats",
+        "queued",
+        0,
+    )
+    assert response.headers["location"] == f"/api/jobs/{job['id']}"
+    assert client.get(response.headers["location"]).json() == job
+    assert client.get(f"/api/me/jobs/{job['id']}").json() == job
+
+
+def test_create_job_of_unknown_kind(client: TestClient) -> None:
+    response = client.post("/api/jobs", json={"kind": "mine-bitcoin"})
+
+    assert response.status_code == UnknownJobKindError.status_code
+    assert response.json()["detail"] == UnknownJobKindError.detail
+
+
+def test_get_missing_job(client: TestClient) -> None:
+    for url in ("/api/jobs/nope", "/api/me/jobs/nope"):
+        response = client.get(url)
+
+        assert response.status_code == JobNotFoundError.status_code
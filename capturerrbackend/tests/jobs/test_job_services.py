@@ -0,0 +1,180 @@
+from contextlib import nullcontext
+from typing import Any, Dict
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from capturerrbackend.app.infrastructure.sqlite.job import (
+    JobRepositoryImpl,
+    run_next_job,
+)
+from capturerrbackend.app.usecase.job import (
+    JobCreateModel,
+    JobNotFoundError,
+    JobReadModel,
+    JobUseCaseImpl,
+    UnknownJobKindError,
+    retry_delay,
+)
+from capturerrbackend.config.configurator import config
+
+
+def job(id: str, run_after: int = 1000, max_attempts: int = 3) -> JobReadModel:
+    return JobReadModel(
+        id=id,
+        kind="test",
+        params={"n": 1},
+        user_id="someone",
+        status="queued",
+        attempts=0,
+        max_attempts=max_attempts,
+        run_after=run_after,
+        created_at=run_after,
+        updated_at=run_after,
+    )
+
+
+def test_retry_delay() -> None:
+    assert [retry_delay(n, 5, 30) for n in range(1, 6)] == [5, 10, 20, 30, 30]
+
+
+async def test_job_repository_claim_and_retry(db_fixture: AsyncSession) -> None:
+    repository = JobRepositoryImpl(db_fixture)
+    await repository.create(job("late", run_after=3000))
+    await repository.create(job("early", run_after=1000))
+
+    first = await repository.claim_next("w1", 2000)
+    assert first is not None
+    assert (first.id, first.status, first.attempts) == ("early", "running", 1)
+    # "late" is not due yet, and "early" is taken
+    assert await repository.claim_next("w2", 2000) is None
+
+    assert await repository.fail("early", "w1", "boom", 2000, retry_at=2500)
+    assert await repository.claim_next("w2", 2400) is None
+    again = await repository.claim_next("w2", 2500)
+    assert again is not None
+    assert (again.id, again.attempts, again.error) == ("early", 2, "boom")
+
+    # w1 no longer holds it, so it cannot report on w2's run
+    assert not await repository.succeed("early", "w1", {}, 2550)
+    assert await repository.succeed("early", "w2", {"done": True}, 2600)
+    done = await repository.find_by_id("early", "someone")
+    assert done is not None
+    assert (done.status, done.result, done.finished_at) == (
+        "succeeded",
+        {"done": True},
+        2600,
+    )
+    assert await repository.find_by_id("early", "someone-else") is None
+
+
+async def test_job_repository_requeue_stale(db_fixture: AsyncSession) -> None:
+    repository = JobRepositoryImpl(db_fixture)
+    await repository.create(job("lost"))
+    await repository.create(job("spent", max_attempts=1))
+    await repository.create(job("long"))
+    await repository.claim_next("dead", 1000)
+    await repository.claim_next("dead", 1000)
+    await repository.claim_next("alive", 1000)
+    # the live worker renews its lease, the dead one cannot
+    assert await repository.renew("long", "alive", 3000)
+    assert not await repository.renew("lost", "alive", 3000)
+
+    assert await repository.requeue_stale(500, 5000) == 0
+    assert await repository.requeue_stale(2000, 5000) == 2
+
+    lost = await repository.find_by_id("lost")
+    spent = await repository.find_by_id("spent")
+    assert lost is not None and spent is not None
+    assert (lost.status, lost.run_after) == ("queued", 5000)
+    assert (spent.status, spent.finished_at) == ("failed", 5000)
+    long = await repository.find_by_id("long")
+    assert long is not None and long.status == "running"
+    assert await repository.requeue_stale(2500, 5000) == 0
+    # the dead worker's late result is dropped
+    assert not await repository.succeed("lost", "dead", {}, 6000)
+
+
+async def test_run_next_job_retries_then_fails(
+    db_fixture: AsyncSession,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(config, "job_retry_base_seconds", 0)
+    calls = []
+
+    async def flaky(session: AsyncSession, params: Dict[str, Any]) -> Dict[str, Any]:
+        calls.append(params)
+        raise RuntimeError(f"attempt {len(calls)}")
+
+    repository = JobRepositoryImpl(db_fixture)
+    await repository.create(job("flaky", max_attempts=2))
+
+    def run() -> Any:
+        return run_next_job(
+            "w1",
+            {"test": flaky},
+            session_factory=lambda: nullcontext(db_fixture),
+        )
+
+    assert (await run()) is not None
+    retried = await repository.find_by_id("flaky")
+    assert retried is not None
+    assert (retried.status, retried.error) == ("queued", "attempt 1")
+
+    assert (await run()) is not None
+    failed = await repository.find_by_id("flaky")
+    assert failed is not None
+    assert (failed.status, failed.attempts, failed.error) == ("failed", 2, "attempt 2")
+    assert await run() is None
+    assert calls == [{"n": 1}, {"n": 1}]
+
+
+async def test_run_next_job_succeeds(db_fixture: AsyncSession) -> None:
+    async def double(session: AsyncSession, params: Dict[str, Any]) -> Dict[str, Any]:
+        return {"n": params["n"] * 2}
+
+    repository = JobRepositoryImpl(db_fixture)
+    await repository.create(job("double"))
+    await run_next_job(
+        "w1",
+        {"test": double},
+        session_factory=lambda: nullcontext(db_fixture),
+    )
+
+    done = await repository.find_by_id("double")
+    assert done is not None
+    assert (done.status, done.result, done.attempts) == ("succeeded", {"n": 2}, 1)
+
+
+async def test_run_next_job_unknown_kind_fails_at_once(
+    db_fixture: AsyncSession,
+) -> None:
+    repository = JobRepositoryImpl(db_fixture)
+    await repository.create(job("orphan"))
+
+    await run_next_job("w1", {}, session_factory=lambda: nullcontext(db_fixture))
+
+    failed = await repository.find_by_id("orphan")
+    assert failed is not None
+    assert (failed.status, failed.attempts, failed.error) == (
+        "failed",
+        1,
+        "unknown job kind: 'test'",
+    )
+
+
+async def test_job_usecase(db_fixture: AsyncSession) -> None:
+    job_usecase = JobUseCaseImpl(JobRepositoryImpl(db_fixture), {"test"}, 4)
+
+    queued = await job_usecase.enqueue_job(JobCreateModel(kind="test"), "someone")
+    assert (queued.status, queued.max_attempts, queued.user_id) == (
+        "queued",
+        4,
+        "someone",
+    )
+    assert await job_usecase.fetch_job_by_id(queued.id, "someone") == queued
+
+    with pytest.raises(UnknownJobKindError):
+        await job_usecase.enqueue_job(JobCreateModel(kind="nope"))
+    with pytest.raises(JobNotFoundError):
+        await job_usecase.fetch_job_by_id(queued.id, "someone-else")
@@ -0,0 +1,42 @@
+from typing import Any
+
+from fastapi.testclient import TestClient
+
+from capturerrbackend.app.usecase.sync import InvalidSyncCursorError
+
+
+def test_get_my_changes(client: TestClient, fake_capture: dict[str, Any]) -> None:
+    # Arrange
+    response = client.post("/api/me/captures", json=fake_capture)
+    capture_id = response.json()["id"]
+    response = client.post(
+        f"/api/me/captures/{capture_id}/tags",
+        json={"text": "work", "user_id": fake_capture["user_id"]},
+    )
+    assert response.status_code == 201
+    tag_id = client.get("/api/me/tags").json()["items"][0]["id"]
+
+    # Act
+    response = client.get("/api/me/sync")
+
+    # Assert
+    assert response.status_code == 200
+    full = response.json()
+    assert [c["id"] for c in full["captures"]] == [capture_id]
+    assert [t["id"] for t in full["tags"]] == [tag_id]
+    assert full["links"] == [{"capture_id": capture_id, "tag_id": tag_id}]
+    assert full["since"] is None
+
+    response = client.delete(f"/api/me/tags/{tag_id}")
+    assert response.status_code == 202
+    response = client.delete(f"/api/me/captures/{capture_id}")
+    assert response.status_code == 202
+
+    response = client.get("/api/me/sync", params={"since": full["cursor"]})
+    delta = response.json()
+    assert delta["captures"] == []
+    assert delta["deleted_captures"] == [capture_id]
+    assert delta["deleted_tags"] == [tag_id]
+
+    response = client.get("/api/me/sync", params={"since": "not-a-cursor"})
+    assert response.status_code == InvalidSyncCursorError.status_code
@@ -0,0 +1,149 @@
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from capturerrbackend.app.infrastructure.sqlite.capture import CaptureDTO
+from capturerrbackend.app.infrastructure.sqlite.sync import SyncQueryServiceImpl
+from capturerrbackend.app.infrastructure.sqlite.tombstones import sync_tombstones
+from capturerrbackend.app.usecase.sync import (
+    SYNC_OVERLAP_MS,
+    InvalidSyncCursorError,
+    SyncCursor,
+    SyncQueryUseCaseImpl,
+)
+from capturerrbackend.app.usecase.user import UserReadModel
+
+
+async def test_sync_query_service_changes_since(
+    db_fixture: AsyncSession,
+    new_user_in_db: UserReadModel,
+) -> None:
+    for i in range(4):
+        db_fixture.add(
+            CaptureDTO(
+                id=f"capture-{i}",
+                entry=f"entry {i}",
+                entry_type="note",
+                notes="",
+                location="",
+                flagged=False,
+                priority="low",
+                happened_at=1000,
+                due_date=1000,
+                user_id=new_user_in_db.id,
+                created_at=1000,
+                updated_at=1000 + i,
+            ),
+        )
+    await db_fixture.execute(
+        insert(sync_tombstones).values(
+            [
+                {
+                    "kind": "capture",
+                    "object_id": "gone-early",
+                    "user_id": new_user_in_db.id,
+                    "deleted_at": 1000,
+                },
+                {
+                    "kind": "tag",
+                    "object_id": "gone-late",
+                    "user_id": new_user_in_db.id,
+                    "deleted_at": 1003,
+                },
+            ],
+        ),
+    )
+    await db_fixture.commit()
+    sync_query_service = SyncQueryServiceImpl(db_fixture)
+
+    full = await sync_query_service.find_changes(new_user_in_db.id)
+    assert len(full.captures) == 4
+    assert full.deleted_captures == full.deleted_tags == []
+
+    delta = await sync_query_service.find_changes(new_user_in_db.id, since=1002)
+    assert [c.id for c in delta.captures] == ["capture-2", "capture-3"]
+    assert delta.deleted_captures == []
+    assert delta.deleted_tags == ["gone-late"]
+
+    sync = await SyncQueryUseCaseImpl(sync_query_service).fetch_changes_for_user(
+        new_user_in_db.id,
+        SyncCursor(since=1002).encode(),
+    )
+    assert sync.since == 1002
+    next_since = SyncCursor.decode(sync.cursor).since
+    assert next_since is not None and next_since > 1002 + SYNC_OVERLAP_MS
+
+
+async def test_sync_in_pages(
+    db_fixture: AsyncSession,
+    new_user_in_db: UserReadModel,
+) -> None:
+    # five captures, two of them updated in the same millisecond
+    for i, updated_at in enumerate((1000, 1001, 1001, 1002, 1003)):
+        db_fixture.add(
+            CaptureDTO(
+                id=f"capture-{i}",
+                entry=f"entry {i}",
+                entry_type="note",
+                notes="",
+                location="",
+                flagged=False,
+                priority="low",
+                happened_at=1000,
+                due_date=1000,
+                user_id=new_user_in_db.id,
+                created_at=1000,
+                updated_at=updated_at,
+            ),
+        )
+    await db_fixture.execute(
+        insert(sync_tombstones).values(
+            [
+                {
+                    "kind": "capture",
+                    "object_id": f"gone-{i}",
+                    "user_id": new_user_in_db.id,
+                    "deleted_at": 1001,
+                }
+                for i in range(3)
+            ],
+        ),
+    )
+    await db_fixture.commit()
+    sync_query_usecase = SyncQueryUseCaseImpl(SyncQueryServiceImpl(db_fixture))
+
+    pages = []
+    cursor = SyncCursor(since=1000).encode()
+    while True:
+        page = await sync_query_usecase.fetch_changes_for_user(
+            new_user_in_db.id,
+            cursor,
+            limit=2,
+        )
+        pages.append(page)
+        cursor = page.cursor
+        if not page.has_more:
+            break
+
+    assert [[c.id for c in page.captures] for page in pages] == [
+        ["capture-0", "capture-1"],
+        ["capture-2", "capture-3"],
+        ["capture-4"],
+    ]
+    assert [page.deleted_captures for page in pages] == [
+        ["gone-0", "gone-1"],
+        ["gone-2"],
+        [],
+    ]
+    # every page belongs to the same sync; the last one ends it
+    assert {page.since for page in pages} == {1000}
+    done = SyncCursor.decode(pages[-1].cursor)
+    assert done.until is None
+    assert done.since == SyncCursor.decode(pages[0].cursor).until
+
+
+def test_invalid_sync_cursor() -> None:
+    with pytest.raises(InvalidSyncCursorError):
+        SyncCursor.decode("bm9wZQ")
+    with pytest.raises(InvalidSyncCursorError):
+        SyncCursor.decode(SyncCursor(since=1, until=2).encode()[:-2])
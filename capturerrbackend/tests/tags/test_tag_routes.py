@@ -55,6 +55,29 @@ def test_get_tags(client: TestClient, fake_tag: dict[str, Any]) -> None:
     assert len(response.json()) > 0
 
 
+def test_get_my_tags_conditional(
+    client: TestClient,
+    fake_tag: dict[str, Any],
+) -> None:
+    # Arrange
+    response = client.post("/api/me/tags", json=fake_tag)
+    response = client.get("/api/me/tags")
+    etag = response.headers["ETag"]
+
+    # Act
+    response = client.get("/api/me/tags", headers={"If-None-Match": etag})
+
+    # Assert
+    assert response.status_code == 304
+
+    tag_id = client.get("/api/me/tags").json()["items"][0]["id"]
+    response = client.delete(f"/api/me/tags/{tag_id}")
+    fake_tag["text"] = "another-tag"
+    response = client.post("/api/me/tags", json=fake_tag)
+    response = client.get("/api/me/tags", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+
+
 def test_get_tags_with_no_tags(client: TestClient) -> None:
     # Arrange
 
@@ -76,6 +99,24 @@ def test_get_tag(client: TestClient, new_tag_in_db: TagReadModel) -> None:
     assert response.json()["id"] == tag_id
 
 
+def test_get_tag_sparse_fields(
+    client: TestClient,
+    new_tag_in_db: TagReadModel,
+) -> None:
+    # Arrange
+    tag_id = new_tag_in_db.id
+
+    # Act
+    response = client.get(f"/api/me/tags/{tag_id}", params={"fields": "text"})
+
+    # Assert
+    assert response.status_code == 200
+    assert response.json() == {"id": tag_id, "text": new_tag_in_db.text}
+
+    response = client.get("/api/me/tags", params={"fields": "text"})
+    assert response.json()["items"] == [{"id": tag_id, "text": new_tag_in_db.text}]
+
+
 def test_get_tag_with_invalid_id(client: TestClient) -> None:
     # Arrange
     tag_id = 999
@@ -121,6 +162,41 @@ def test_update_tag_with_invalid_id(
     assert response.json()["detail"] == TagNotFoundError.detail
 
 
+def test_patch_tag(client: TestClient, new_tag_in_db: TagReadModel) -> None:
+    # Act
+    response = client.patch(
+        f"/api/me/tags/{new_tag_in_db.id}",
+        json={"text": "patched"},
+    )
+
+    # Assert
+    assert response.status_code == 200
+    assert response.json()["text"] == "patched"
+    response = client.patch("/api/me/tags/not-an-id", json={"text": "x"})
+    assert response.status_code == TagNotFoundError.status_code
+
+
+def test_tag_of_another_user_is_not_found(
+    client: TestClient,
+    fake_tag: dict[str, Any],
+    fake_super_user: dict[str, Any],
+) -> None:
+    # Arrange: a newer user becomes the current one
+    tag = client.post("/api/me/tags", json=fake_tag).json()
+    client.post("/api/users", json=fake_super_user)
+    assert client.get("/api/users/me").json()["user_name"] == "admin"
+    url = f"/api/me/tags/{tag['id']}"
+
+    # Act / Assert
+    for response in (
+        client.get(url),
+        client.put(url, json=tag),
+        client.delete(url),
+    ):
+        assert response.status_code == TagNotFoundError.status_code
+        assert response.json()["detail"] == TagNotFoundError.detail
+
+
 def test_delete_tag(client: TestClient, fake_tag: dict[str, Any]) -> None:
     # Arrange
     response = client.post("/api/me/tags", json=fake_tag)
@@ -137,6 +213,30 @@ def test_delete_tag(client: TestClient, fake_tag: dict[str, Any]) -> None:
     assert tags.status_code == 404
 
 
+def test_trash_and_restore_tag(client: TestClient, fake_tag: dict[str, Any]) -> None:
+    # Arrange
+    response = client.post("/api/me/tags", json=fake_tag)
+    tag_id = response.json()["id"]
+    client.delete(f"/api/me/tags/{tag_id}")
+
+    trash = client.get("/api/me/tags/trash")
+    assert trash.status_code == 200
+    assert [tag["id"] for tag in trash.json()["items"]] == [tag_id]
+    assert trash.json()["items"][0]["deleted_at"] is not None
+
+    # Act
+    response = client.post(f"/api/me/tags/{tag_id}/restore")
+
+    # Assert
+    assert response.status_code == 200
+    assert response.json()["id"] == tag_id
+    assert client.get("/api/me/tags").json()["items"][0]["id"] == tag_id
+    assert client.get("/api/me/tags/trash").json()["count"] == 0
+
+    response = client.post("/api/me/tags/999/restore")
+    assert response.status_code == TagNotFoundError.status_code
+
+
 @pytest.mark.anyio
 def test_delete_tag_with_invalid_id(client: TestClient) -> None:
     # Arrange
@@ -1,33 +1,40 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from capturerrbackend.app.infrastructure.sqlite.tag import TagQueryServiceImpl
-from capturerrbackend.app.usecase.capture import CaptureReadModel
+from capturerrbackend.app.usecase.capture import (
+    CaptureCommandUseCaseImpl,
+    CaptureReadModel,
+)
 
 # from ..app.infrastructure.dependencies import tag_command_usecase, tag_query_usecase
-from capturerrbackend.app.usecase.tag import TagCreateModel, TagQueryService
+from capturerrbackend.app.usecase.tag import (
+    TagCreateModel,
+    TagQueryService,
+    TagReadModel,
+)
 
 
-def test_tag_query_service_find(
-    db_fixture: Session,
+async def test_tag_query_service_find(
+    db_fixture: AsyncSession,
     new_tag_in_db: TagCreateModel,
     new_capture_in_db: CaptureReadModel,
 ) -> None:
     tag_query_service: TagQueryService = TagQueryServiceImpl(db_fixture)
     assert isinstance(tag_query_service, TagQueryServiceImpl)
 
-    new_tag = tag_query_service.find_by_text(new_tag_in_db.text)
+    new_tag = await tag_query_service.find_by_text(new_tag_in_db.text)
     assert new_tag is not None
     assert new_tag.text == new_tag_in_db.text
 
     _id = new_tag.id
-    new_tag2 = tag_query_service.find_by_id(_id)
+    new_tag2 = await tag_query_service.find_by_id(_id)
     assert new_tag2 is not None
     assert new_tag2 == new_tag
 
     _user_id = new_tag.user_id
-    new_tag3 = tag_query_service.find_by_user_id(_user_id)
-    assert len(new_tag3) == 1
-    assert new_tag3[0] == new_tag
+    new_tag3 = await tag_query_service.find_by_user_id(_user_id)
+    assert len(new_tag3.items) == 1
+    assert new_tag3.items[0] == new_tag
 
     # _capture_id = new_capture_in_db.id
 
@@ -35,6 +42,28 @@ def test_tag_query_service_find(
     # assert len(new_tag4) == 1
     # assert new_tag4[0] == new_tag
 
-    tags = tag_query_service.find_all()
-    assert len(tags) == 1
-    assert tags[0] == new_tag_in_db
+    tags = await tag_query_service.find_all()
+    assert len(tags.items) == 1
+    assert tags.items[0] == new_tag_in_db
+
+
+async def test_tag_query_service_find_by_capture_ids(
+    db_fixture: AsyncSession,
+    new_tag_in_db: TagReadModel,
+    new_capture_in_db: CaptureReadModel,
+    capture_command_usecase: CaptureCommandUseCaseImpl,
+) -> None:
+    tag_query_service: TagQueryService = TagQueryServiceImpl(db_fixture)
+    await capture_command_usecase.add_tag_to_capture(
+        new_capture_in_db.id,
+        new_tag_in_db.id,
+    )
+
+    tags = await tag_query_service.find_by_capture_ids(
+        [new_capture_in_db.id, "no-such-capture"],
+    )
+    assert len(tags[new_capture_in_db.id]) == 1
+    assert tags[new_capture_in_db.id][0].id == new_tag_in_db.id
+    assert tags["no-such-capture"] == []
+
+    assert await tag_query_service.find_by_capture_ids([]) == {}
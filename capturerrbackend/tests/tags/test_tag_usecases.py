@@ -1,5 +1,7 @@
 from typing import Any
 
+import pytest
+
 from capturerrbackend.app.domain.tag.tag_exception import (
     TagAlreadyExistsError,
     TagNotFoundError,
@@ -9,11 +11,13 @@ from capturerrbackend.app.usecase.tag import (
     TagCommandUseCaseImpl,
     TagCreateModel,
     TagQueryUseCaseImpl,
+    TagReadModel,
     TagUpdateModel,
 )
+from capturerrbackend.app.usecase.user import UserReadModel
 
 
-def test_create_tag(
+async def test_create_tag(
     fake_tag: dict[str, Any],
     tag_command_usecase: TagCommandUseCaseImpl,
     tag_query_usecase: TagQueryUseCaseImpl,
@@ -21,17 +25,17 @@ def test_create_tag(
     # Arrange
 
     tag_model = TagCreateModel.model_validate(fake_tag)
-    tag = tag_command_usecase.create_tag(
+    tag = await tag_command_usecase.create_tag(
         tag_model,
     )
     assert tag is not None
 
-    all_tags = tag_query_usecase.fetch_tags()
-    assert len(all_tags) > 0
-    assert all_tags[0].text == fake_tag["text"]
+    all_tags = await tag_query_usecase.fetch_tags()
+    assert len(all_tags.items) > 0
+    assert all_tags.items[0].text == fake_tag["text"]
 
 
-def test_create_tag_duplicate_text(
+async def test_create_tag_duplicate_text(
     fake_tag: dict[str, Any],
     tag_command_usecase: TagCommandUseCaseImpl,
     tag_query_usecase: TagQueryUseCaseImpl,
@@ -39,13 +43,13 @@ def test_create_tag_duplicate_text(
     # Arrange
 
     tag_model = TagCreateModel.model_validate(fake_tag)
-    tag = tag_command_usecase.create_tag(
+    tag = await tag_command_usecase.create_tag(
         tag_model,
     )
     assert tag is not None
     try:
         # add the same tag again
-        tag_command_usecase.create_tag(
+        await tag_command_usecase.create_tag(
             tag_model,
         )
         assert True is False
@@ -56,7 +60,23 @@ def test_create_tag_duplicate_text(
         raise
 
 
-def test_get_tag(
+async def test_create_tag_text_again_after_trash(
+    fake_tag: dict[str, Any],
+    tag_command_usecase: TagCommandUseCaseImpl,
+) -> None:
+    tag_model = TagCreateModel.model_validate(fake_tag)
+    tag = await tag_command_usecase.create_tag(tag_model)
+    with pytest.raises(TagAlreadyExistsError):
+        await tag_command_usecase.create_tag(tag_model)
+
+    # the conflict rolled back cleanly; a trashed text is free again
+    await tag_command_usecase.delete_tag_by_id(tag.id)
+    again = await tag_command_usecase.create_tag(tag_model)
+    assert again.id != tag.id
+    assert again.text == fake_tag["text"]
+
+
+async def test_get_tag(
     fake_tag: dict[str, Any],
     tag_command_usecase: TagCommandUseCaseImpl,
     tag_query_usecase: TagQueryUseCaseImpl,
@@ -64,30 +84,30 @@ def test_get_tag(
     # Arrange
 
     tag_model = TagCreateModel.model_validate(fake_tag)
-    tag = tag_command_usecase.create_tag(
+    tag = await tag_command_usecase.create_tag(
         tag_model,
     )
     assert tag is not None
 
-    tag2 = tag_query_usecase.fetch_tag_by_id(tag.id)
+    tag2 = await tag_query_usecase.fetch_tag_by_id(tag.id)
     assert tag2 is not None
     assert tag2.text == fake_tag["text"]
 
 
-def test_get_tag_no_tags(
+async def test_get_tag_no_tags(
     tag_command_usecase: TagCommandUseCaseImpl,
     tag_query_usecase: TagQueryUseCaseImpl,
 ) -> None:
     # Arrange
     try:
-        tag_query_usecase.fetch_tags()
+        await tag_query_usecase.fetch_tags()
         assert False
     except TagsNotFoundError as e:
         assert e.status_code == TagsNotFoundError.status_code
         assert e.detail == TagsNotFoundError.detail
 
 
-def test_update_tag_bad_id(
+async def test_update_tag_bad_id(
     fake_tag: dict[str, Any],
     tag_command_usecase: TagCommandUseCaseImpl,
     tag_query_usecase: TagQueryUseCaseImpl,
@@ -95,15 +115,44 @@ def test_update_tag_bad_id(
     # Arrange
 
     tag_model = TagCreateModel.model_validate(fake_tag)
-    tag = tag_command_usecase.create_tag(
+    tag = await tag_command_usecase.create_tag(
         tag_model,
     )
     assert tag is not None
     updated_tag = TagUpdateModel.model_validate(tag.model_dump())
 
     try:
-        tag_command_usecase.update_tag("bad_id", updated_tag)
+        await tag_command_usecase.update_tag("bad_id", updated_tag)
         assert False
     except TagNotFoundError as e:
         assert e.status_code == TagNotFoundError.status_code
         assert e.detail == TagNotFoundError.detail
+
+
+async def test_tag_of_another_user(
+    new_tag_in_db: TagReadModel,
+    tag_command_usecase: TagCommandUseCaseImpl,
+    tag_query_usecase: TagQueryUseCaseImpl,
+) -> None:
+    with pytest.raises(TagNotFoundError):
+        await tag_query_usecase.fetch_tag_by_id(new_tag_in_db.id, user_id="other")
+    with pytest.raises(TagNotFoundError):
+        await tag_command_usecase.delete_tag_by_id(new_tag_in_db.id, "other")
+
+    # the owner still has it
+    tag = await tag_query_usecase.fetch_tag_by_id(
+        new_tag_in_db.id,
+        user_id=new_tag_in_db.user_id,
+    )
+    assert tag.id == new_tag_in_db.id
+
+
+async def test_get_or_create_tag_per_user(
+    new_tag_in_db: TagReadModel,
+    new_user_in_db: UserReadModel,
+    tag_command_usecase: TagCommandUseCaseImpl,
+) -> None:
+    same = await tag_command_usecase.get_or_create_tag(
+        TagCreateModel(text=new_tag_in_db.text, user_id=new_user_in_db.id),
+    )
+    assert same.id == new_tag_in_db.id
@@ -0,0 +1,65 @@
+import pytest
+from sqlalchemy import create_engine, text
+
+from capturerrbackend.app.infrastructure.sqlite.database import (
+    SQLITE_PROFILES,
+    apply_sqlite_profile,
+    engine_options,
+)
+from capturerrbackend.app.infrastructure.sqlite.database_async import (
+    DatabaseSessionManager,
+)
+from capturerrbackend.config.configurator import config
+
+
+def test_engine_options_file_database() -> None:
+    options = engine_options("sqlite+aiosqlite:///some-file.db")
+    assert options["pool_size"] == config.db_pool_size
+    assert options["max_overflow"] == config.db_max_overflow
+    assert options["pool_recycle"] == config.db_pool_recycle
+    assert options["pool_pre_ping"] == config.db_pool_pre_ping
+    assert options["connect_args"] == {"check_same_thread": False}
+
+
+def test_engine_options_memory_database() -> None:
+    options = engine_options("sqlite+aiosqlite://")
+    assert "pool_size" not in options
+    assert "max_overflow" not in options
+
+
+async def test_session_manager_reuses_one_engine() -> None:
+    manager = DatabaseSessionManager()
+    assert manager.is_initialized is False
+
+    manager.init(str(config.db_url))
+    engine = manager.engine
+    async with manager.session() as first:
+        result = await first.execute(text("select 1"))
+        assert result.scalar() == 1
+    async with manager.session() as second:
+        assert second.bind is engine
+
+    await manager.close()
+    assert manager.is_initialized is False
+
+
+async def test_sqlite_profile_pragmas_applied() -> None:
+    manager = DatabaseSessionManager()
+    manager.init(str(config.db_url))
+    expected = SQLITE_PROFILES[config.db_sqlite_profile]
+
+    async with manager.session() as session:
+        journal_mode = await session.execute(text("PRAGMA journal_mode"))
+        synchronous = await session.execute(text("PRAGMA synchronous"))
+        foreign_keys = await session.execute(text("PRAGMA foreign_keys"))
+        assert journal_mode.scalar() == expected["journal_mode"].lower()
+        assert synchronous.scalar() == {"NORMAL": 1, "FULL": 2}[expected["synchronous"]]
+        assert foreign_keys.scalar() == 1
+
+    await manager.close()
+
+
+def test_unknown_sqlite_profile() -> None:
+    engine = create_engine("sqlite://")
+    with pytest.raises(ValueError):
+        apply_sqlite_profile(engine, "fastest")
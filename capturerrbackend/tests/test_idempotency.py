@@ -0,0 +1,74 @@
+import asyncio
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from capturerrbackend.app.infrastructure.sqlite.idempotency import (
+    IdempotencyRepositoryImpl,
+)
+from capturerrbackend.app.presentation.idempotency import IdempotencyCache
+from capturerrbackend.app.usecase.idempotency import StoredResponse
+
+
+def stored(expires_at: int = 2000) -> StoredResponse:
+    return StoredResponse(
+        fingerprint="abc",
+        status_code=201,
+        body='{"id": "x"}',
+        expires_at=expires_at,
+    )
+
+
+def test_cache_evicts_least_recently_used_and_expired() -> None:
+    cache = IdempotencyCache(max_size=2)
+    cache.put("a", stored())
+    cache.put("b", stored())
+    assert cache.get("a", 1000) is not None
+    cache.put("c", stored())
+
+    # "b" was the least recently used
+    assert cache.get("b", 1000) is None
+    assert cache.get("a", 1000) is not None
+    # and nothing is replayed past its expiry
+    assert cache.get("c", 2000) is None
+    assert list(cache.responses) == ["a"]
+
+
+async def test_cache_duplicate_waits_for_the_first_request() -> None:
+    cache = IdempotencyCache(max_size=10)
+    assert await cache.claim("key") is None
+
+    duplicate = asyncio.create_task(cache.claim("key"))
+    await asyncio.sleep(0)
+    assert not duplicate.done()
+
+    response = stored(expires_at=2**62)
+    cache.release("key", response)
+    assert await duplicate == response
+
+
+async def test_cache_duplicate_runs_again_after_a_failure() -> None:
+    cache = IdempotencyCache(max_size=10)
+    assert await cache.claim("key") is None
+
+    duplicate = asyncio.create_task(cache.claim("key"))
+    await asyncio.sleep(0)
+    cache.release("key", None)
+
+    # the duplicate now owns the key
+    assert await duplicate is None
+    assert "key" in cache.in_flight
+
+
+async def test_idempotency_repository(db_fixture: AsyncSession) -> None:
+    repository = IdempotencyRepositoryImpl(db_fixture)
+    await repository.save("key", stored(expires_at=2000))
+
+    assert await repository.find("key", 1000) == stored(expires_at=2000)
+    assert await repository.find("key", 2000) is None
+
+    # an expired key is taken over
+    await repository.save("key", stored(expires_at=3000))
+    assert await repository.find("key", 2500) == stored(expires_at=3000)
+
+    assert await repository.delete_expired(3000) == 1
+    assert await repository.find("key", 0) is None
@@ -0,0 +1,212 @@
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from capturerrbackend.app.infrastructure.sqlite import BookDTO, UserDTO
+from capturerrbackend.app.infrastructure.sqlite.associations import capture_tags
+from capturerrbackend.app.infrastructure.sqlite.capture import CaptureDTO
+from capturerrbackend.app.infrastructure.sqlite.purge import (
+    USER_OWNED,
+    delete_rows_batch,
+    in_window,
+    purge_trash,
+    purge_user,
+)
+from capturerrbackend.app.infrastructure.sqlite.tag import TagDTO
+from capturerrbackend.app.infrastructure.sqlite.tombstones import sync_tombstones
+from capturerrbackend.app.infrastructure.sqlite.user.user_stats import (
+    user_stats,
+    user_stats_counts,
+)
+from capturerrbackend.app.usecase.user import UserReadModel
+
+
+async def test_purge_trash_in_batches(
+    db_fixture: AsyncSession,
+    new_user_in_db: UserReadModel,
+) -> None:
+    # Arrange: five old captures in the trash, one recent, one live
+    for i in range(7):
+        db_fixture.add(
+            CaptureDTO(
+                id=f"capture-{i}",
+                entry=f"capture {i}",
+                user_id=new_user_in_db.id,
+                created_at=1000,
+                updated_at=1000,
+                deleted_at=None if i == 6 else (5000 if i == 5 else 1000 + i),
+            ),
+        )
+    db_fixture.add(
+        TagDTO(
+            id="tag",
+            text="work",
+            user_id=new_user_in_db.id,
+            created_at=1000,
+            updated_at=1000,
+        ),
+    )
+    await db_fixture.commit()
+    for i in (0, 5, 6):
+        await db_fixture.execute(
+            insert(capture_tags).values(capture_id=f"capture-{i}", tag_id="tag"),
+        )
+    await db_fixture.commit()
+
+    # Act
+    purged = await purge_trash(db_fixture, before=2000, batch_size=2)
+
+    # Assert
+    assert purged == {"capture": 5, "tag": 0, "book": 0}
+    result = await db_fixture.execute(select(CaptureDTO.id).order_by(CaptureDTO.id))
+    assert list(result.scalars()) == ["capture-5", "capture-6"]
+    result = await db_fixture.execute(
+        select(capture_tags.c.capture_id).order_by(capture_tags.c.capture_id),
+    )
+    assert list(result.scalars()) == ["capture-5", "capture-6"]
+
+    # a trashed tag goes with its links
+    await db_fixture.execute(
+        update(TagDTO).where(TagDTO.id == "tag").values(deleted_at=1000),
+    )
+    await db_fixture.commit()
+    purged = await purge_trash(db_fixture, before=2000)
+    assert purged["tag"] == 1
+    links = await db_fixture.execute(select(func.count()).select_from(capture_tags))
+    assert links.scalar_one() == 0
+
+
+async def test_purge_user_in_batches(
+    db_fixture: AsyncSession,
+    new_user_in_db: UserReadModel,
+    new_super_user_in_db: UserReadModel,
+) -> None:
+    # Arrange: five captures, two tags on all of them, a book, stats and
+    # tombstones, and another user's capture
+    for i in range(5):
+        db_fixture.add(
+            CaptureDTO(
+                id=f"capture-{i}",
+                entry=f"capture {i}",
+                user_id=new_user_in_db.id,
+                created_at=1000,
+                updated_at=1000,
+            ),
+        )
+    for text in ("work", "home"):
+        db_fixture.add(
+            TagDTO(
+                id=text,
+                text=text,
+                user_id=new_user_in_db.id,
+                created_at=1000,
+                updated_at=1000,
+            ),
+        )
+    db_fixture.add(
+        BookDTO(
+            id="book",
+            isbn="978-1-445-85436-1",
+            title="Test Book",
+            page=123,
+            user_id=new_user_in_db.id,
+            created_at=1000,
+            updated_at=1000,
+        ),
+    )
+    db_fixture.add(
+        CaptureDTO(
+            id="kept",
+            entry="not theirs",
+            user_id=new_super_user_in_db.id,
+            created_at=1000,
+            updated_at=1000,
+        ),
+    )
+    await db_fixture.commit()
+    await db_fixture.execute(
+        insert(capture_tags),
+        [
+            {"capture_id": f"capture-{i}", "tag_id": text}
+            for i in range(5)
+            for text in ("work", "home")
+        ],
+    )
+    await db_fixture.execute(
+        insert(user_stats).prefix_with("OR REPLACE"),
+        {"user_id": new_user_in_db.id, "captures": 5, "flagged": 0, "tags": 10},
+    )
+    await db_fixture.execute(
+        insert(user_stats_counts),
+        {"user_id": new_user_in_db.id, "field": "priority", "key": "", "count": 5},
+    )
+    await db_fixture.execute(
+        insert(sync_tombstones),
+        [
+            {
+                "kind": "capture",
+                "object_id": f"gone-{i}",
+                "user_id": new_user_in_db.id,
+                "deleted_at": 1500,
+            }
+            for i in range(3)
+        ],
+    )
+    await db_fixture.commit()
+
+    # Act: an active user is not purged
+    assert await purge_user(db_fixture, new_user_in_db.id) == {}
+    await db_fixture.execute(
+        update(UserDTO)
+        .where(UserDTO.id == new_user_in_db.id)
+        .values(is_active=False, deleted_at=2000),
+    )
+    await db_fixture.commit()
+    purged = await purge_user(db_fixture, new_user_in_db.id, batch_size=2)
+
+    # Assert
+    assert purged == {
+        "capture": 5,
+        "tag": 2,
+        "book": 1,
+        "user_stats_counts": 1,
+        "user_stats": 1,
+        "sync_tombstones": 3,
+        "user": 1,
+    }
+    result = await db_fixture.execute(select(CaptureDTO.id))
+    assert list(result.scalars()) == ["kept"]
+    links = await db_fixture.execute(select(func.count()).select_from(capture_tags))
+    assert links.scalar_one() == 0
+    for table in (user_stats, user_stats_counts, sync_tombstones):
+        rows = await db_fixture.execute(
+            select(func.count())
+            .select_from(table)
+            .where(table.c.user_id == new_user_in_db.id),
+        )
+        assert rows.scalar_one() == 0
+    users = await db_fixture.execute(select(UserDTO.id))
+    assert list(users.scalars()) == [new_super_user_in_db.id]
+    # and again, there is nothing left to do
+    assert await purge_user(db_fixture, new_user_in_db.id) == {}
+
+
+def test_delete_rows_batch_is_portable() -> None:
+    # picked by primary key, not by SQLite's rowid
+    for table in USER_OWNED:
+        sql = str(
+            delete_rows_batch(table, [table.c.user_id == "u"], 100).compile(
+                dialect=postgresql.dialect(),
+            ),
+        )
+        assert "rowid" not in sql
+        assert "LIMIT" in sql
+
+
+def test_purge_window() -> None:
+    assert in_window(3, 2, 5)
+    assert not in_window(5, 2, 5)
+    # a window across midnight
+    assert in_window(23, 22, 4)
+    assert in_window(1, 22, 4)
+    assert not in_window(12, 22, 4)
@@ -0,0 +1,161 @@
+from typing import Any, List
+
+from sqlalchemy import Select, func, select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from capturerrbackend.app.infrastructure.sqlite.associations import capture_tags
+from capturerrbackend.app.infrastructure.sqlite.book import BookDTO
+from capturerrbackend.app.infrastructure.sqlite.capture import CaptureDTO
+from capturerrbackend.app.infrastructure.sqlite.capture.capture_query_service import (
+    tag_filter_clauses,
+)
+from capturerrbackend.app.infrastructure.sqlite.capture.capture_search import (
+    capture_fts,
+    capture_fts_table,
+)
+from capturerrbackend.app.infrastructure.sqlite.tag import TagDTO
+from capturerrbackend.app.infrastructure.sqlite.tombstones import sync_tombstones
+from capturerrbackend.app.infrastructure.sqlite.trash import live, trashed
+from capturerrbackend.app.usecase.capture import CaptureTagFilter
+
+
+async def query_plan(session: AsyncSession, stmt: Select[Any]) -> List[str]:
+    sql = stmt.compile(
+        dialect=session.bind.dialect,
+        compile_kwargs={"literal_binds": True},
+    )
+    result = await session.execute(text(f"EXPLAIN QUERY PLAN {sql}"))
+    return [row[-1] for row in result.all()]
+
+
+async def test_user_listing_uses_keyset_index(db_fixture: AsyncSession) -> None:
+    for dto in (CaptureDTO, BookDTO, TagDTO):
+        stmt = (
+            select(dto)
+            .where(dto.user_id == "some-user", live(dto))
+            .where(tuple_(dto.updated_at, dto.id) < (1000, "some-id"))
+            .order_by(dto.updated_at.desc(), dto.id.desc())
+            .limit(101)
+        )
+        plan = " | ".join(await query_plan(db_fixture, stmt))
+
+        index = f"ix_{dto.__tablename__}_user_id_updated_at_id"
+        assert f"USING INDEX {index}" in plan
+        assert "TEMP B-TREE" not in plan
+
+
+async def test_tag_text_lookup_uses_index(db_fixture: AsyncSession) -> None:
+    stmt = select(TagDTO).where(
+        TagDTO.user_id == "some-user",
+        TagDTO.text == "x",
+        live(TagDTO),
+    )
+    plan = " | ".join(await query_plan(db_fixture, stmt))
+
+    assert "USING INDEX ix_tag_user_id_text" in plan
+
+
+async def test_capture_tags_lookup_by_tag_uses_index(
+    db_fixture: AsyncSession,
+) -> None:
+    stmt = select(capture_tags.c.capture_id).where(capture_tags.c.tag_id == "t")
+    plan = " | ".join(await query_plan(db_fixture, stmt))
+
+    assert "USING COVERING INDEX ix_capture_tags_tag_id_capture_id" in plan
+
+
+async def test_capture_search_uses_fts_index(db_fixture: AsyncSession) -> None:
+    stmt = (
+        select(CaptureDTO.id)
+        .select_from(capture_fts_table)
+        .join(CaptureDTO, CaptureDTO.search_id == capture_fts_table.c.rowid)
+        .where(capture_fts.op("MATCH")('"coffee"*'))
+        .where(CaptureDTO.user_id == "some-user")
+    )
+    plan = await query_plan(db_fixture, stmt)
+
+    assert any(step.startswith("SCAN capture_fts VIRTUAL TABLE INDEX") for step in plan)
+    assert "SCAN capture" not in plan
+
+
+async def test_capture_tag_filter_walks_tag_postings(db_fixture: AsyncSession) -> None:
+    tags = CaptureTagFilter(include_all=["a", "b"], exclude=["c"])
+    stmt = (
+        select(CaptureDTO)
+        .where(CaptureDTO.user_id == "some-user", live(CaptureDTO))
+        .where(*tag_filter_clauses("some-user", tags))
+    )
+    plan = " | ".join(await query_plan(db_fixture, stmt))
+
+    assert "USING COVERING INDEX ix_capture_tags_tag_id_capture_id" in plan
+    assert "USING INDEX ix_tag_user_id_text" in plan
+    assert "SCAN capture_tags" not in plan
+
+
+async def test_capture_date_ranges_use_indexes(db_fixture: AsyncSession) -> None:
+    for column, index in (
+        (CaptureDTO.happened_at, "ix_capture_user_id_happened_at"),
+        (CaptureDTO.due_date, "ix_capture_user_id_due_date"),
+    ):
+        stmt = (
+            select(func.count())
+            .where(CaptureDTO.user_id == "some-user", live(CaptureDTO))
+            .where(column >= 1000, column < 2000)
+        )
+        plan = " | ".join(await query_plan(db_fixture, stmt))
+
+        assert f"USING COVERING INDEX {index}" in plan
+
+
+async def test_collection_version_reads_only_the_index(
+    db_fixture: AsyncSession,
+) -> None:
+    for dto in (CaptureDTO, BookDTO, TagDTO):
+        stmt = select(func.count(), func.max(dto.updated_at)).where(
+            dto.user_id == "some-user",
+            live(dto),
+        )
+        plan = " | ".join(await query_plan(db_fixture, stmt))
+
+        index = f"ix_{dto.__tablename__}_user_id_updated_at_id"
+        assert f"USING COVERING INDEX {index}" in plan
+
+
+async def test_sync_tombstones_use_index(db_fixture: AsyncSession) -> None:
+    stmt = (
+        select(sync_tombstones.c.kind, sync_tombstones.c.object_id)
+        .where(sync_tombstones.c.user_id == "some-user")
+        .where(sync_tombstones.c.deleted_at >= 1000)
+    )
+    plan = " | ".join(await query_plan(db_fixture, stmt))
+
+    assert "USING INDEX ix_sync_tombstones_user_id_deleted_at" in plan
+
+
+async def test_trash_listing_uses_trash_index(db_fixture: AsyncSession) -> None:
+    for dto in (CaptureDTO, BookDTO, TagDTO):
+        stmt = (
+            select(dto)
+            .where(dto.user_id == "some-user", trashed(dto))
+            .where(tuple_(dto.deleted_at, dto.id) < (1000, "some-id"))
+            .order_by(dto.deleted_at.desc(), dto.id.desc())
+            .limit(101)
+        )
+        plan = " | ".join(await query_plan(db_fixture, stmt))
+
+        assert f"USING INDEX ix_{dto.__tablename__}_trash" in plan
+        assert "TEMP B-TREE" not in plan
+
+
+async def test_purge_uses_purge_index(db_fixture: AsyncSession) -> None:
+    for dto in (CaptureDTO, BookDTO, TagDTO):
+        stmt = (
+            select(dto.id)
+            .where(trashed(dto), dto.deleted_at < 1000)
+            .order_by(dto.deleted_at)
+            .limit(500)
+        )
+        plan = " | ".join(await query_plan(db_fixture, stmt))
+
+        assert f"USING INDEX ix_{dto.__tablename__}_purge" in plan
+        assert "TEMP B-TREE" not in plan
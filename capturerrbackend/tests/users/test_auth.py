@@ -23,7 +23,7 @@ def test_verify_token_access() -> None:
     ...
 
 
-def test_get_current_user(
+async def test_get_current_user(
     client: TestClient,
     fake_user: dict[str, Any],
     user_query_usecase: UserQueryUseCaseImpl,
@@ -33,5 +33,8 @@ def test_get_current_user(
     # Assert
     assert response.status_code == 201
     token = Token(access_token=create_access_token(fake_user), token_type="bearer")
-    user = get_current_user(token=token.access_token, user_query=user_query_usecase)
+    user = await get_current_user(
+        token=token.access_token,
+        user_query=user_query_usecase,
+    )
     assert user.user_name == fake_user["user_name"]
@@ -5,6 +5,7 @@ from fastapi.testclient import TestClient
 from capturerrbackend.app.domain.user.user_exception import (
     UserNameAlreadyExistsError,
     UserNotFoundError,
+    UserNotSuperError,
 )
 from capturerrbackend.app.usecase.book import BookReadModel
 from capturerrbackend.app.usecase.user import UserReadModel
@@ -51,8 +52,8 @@ def test_get_users(client: TestClient, new_user_in_db: UserReadModel) -> None:
 
     # Assert
     assert response.status_code == 200
-    assert len(response.json()) > 0
-    assert response.json()[0]["id"] == new_user_in_db.id
+    assert response.json()["count"] > 0
+    assert response.json()["items"][0]["id"] == new_user_in_db.id
 
 
 def test_get_users_with_no_users(client: TestClient) -> None:
@@ -97,6 +98,26 @@ def test_get_user_with_book(
     assert response.json()["books"][0]["id"] == new_book_in_db.id
 
 
+def test_get_user_sparse_fields(
+    client: TestClient,
+    new_user_in_db: UserReadModel,
+    new_book_in_db: BookReadModel,
+) -> None:
+    # Arrange
+    user_id = new_user_in_db.id
+
+    # Act
+    response = client.get(f"/api/users/{user_id}", params={"fields": "user_name"})
+
+    # Assert
+    assert response.status_code == 200
+    assert response.json() == {"id": user_id, "user_name": new_user_in_db.user_name}
+
+    response = client.get("/api/users/me", params={"fields": "books"})
+    assert response.json()["books"][0]["id"] == new_book_in_db.id
+    assert "stats" not in response.json()
+
+
 def test_get_user_with_invalid_id(client: TestClient) -> None:
     # Arrange
     user_id = 999
@@ -156,6 +177,16 @@ def test_update_user_with_invalid_id(
     assert response.json()["detail"] == UserNotFoundError.detail
 
 
+def test_patch_me(client: TestClient, new_user_in_db: UserReadModel) -> None:
+    # Act
+    response = client.patch("/api/users/me", json={"last_name": "Bizzle"})
+
+    # Assert
+    assert response.status_code == 200
+    assert response.json()["last_name"] == "Bizzle"
+    assert response.json()["first_name"] == new_user_in_db.first_name
+
+
 def test_delete_user(client: TestClient, new_user_in_db: UserReadModel) -> None:
     # Arrange
     user_id = new_user_in_db.id
@@ -165,11 +196,38 @@ def test_delete_user(client: TestClient, new_user_in_db: UserReadModel) -> None:
 
     # Assert
     assert response.status_code == 202
+    job = response.json()
+    assert (job["kind"], job["params"], job["status"]) == (
+        "delete-user",
+        {"user_id": user_id},
+        "queued",
+    )
+    assert job["user_id"] == user_id
+    assert response.headers["location"] == f"/api/me/jobs/{job['id']}"
+    assert client.get(response.headers["location"]).status_code == 200
 
     users = client.get("/api/users")
     assert users.status_code == 200
-    assert users.json()[0]["id"] == user_id
-    assert users.json()[0]["deleted_at"] is not None
+    assert users.json()["items"][0]["id"] == user_id
+    assert users.json()["items"][0]["deleted_at"] is not None
+
+
+def test_delete_other_user_is_refused(
+    client: TestClient,
+    new_user_in_db: UserReadModel,
+    fake_user: dict[str, Any],
+) -> None:
+    # Arrange: the newest user is the one making the request
+    fake_user["user_name"] = "someone-else"
+    response = client.post("/api/users", json=fake_user)
+    assert response.status_code == 201
+
+    # Act
+    response = client.delete(f"/api/users/{new_user_in_db.id}")
+
+    # Assert
+    assert response.status_code == UserNotSuperError.status_code
+    assert response.json()["detail"] == UserNotSuperError.detail
 
 
 def test_delete_user_with_invalid_id(client: TestClient) -> None:
@@ -197,3 +255,20 @@ def test_login_user(client: TestClient, new_user_in_db: UserReadModel) -> None:
     # Assert
     assert response.status_code == 200
     assert len(response.json()) > 0
+
+
+def test_get_my_stats(client: TestClient, fake_capture: dict[str, Any]) -> None:
+    # Arrange
+    response = client.post("/api/me/captures", json=fake_capture)
+    assert response.status_code == 201
+
+    # Act
+    response = client.get("/api/users/me/stats")
+
+    # Assert
+    assert response.status_code == 200
+    assert response.json()["captures"] == 1
+    assert response.json()["by_priority"] == {"high": 1}
+
+    response = client.get("/api/users/me")
+    assert response.json()["stats"]["captures"] == 1
@@ -1,6 +1,6 @@
 from typing import Any
 
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from capturerrbackend.app.infrastructure.sqlite.user import UserQueryServiceImpl
 
@@ -12,8 +12,8 @@ from capturerrbackend.app.usecase.user import (
 )
 
 
-def test_user_query_service(
-    db_fixture: Session,
+async def test_user_query_service(
+    db_fixture: AsyncSession,
     user_command_usecase: UserCommandUseCaseImpl,
     fake_user: dict[str, Any],
 ) -> None:
@@ -22,7 +22,7 @@ def test_user_query_service(
 
     # create 1st user
     user_model = UserCreateModel.model_validate(fake_user)
-    user = user_command_usecase.create_user(
+    user = await user_command_usecase.create_user(
         user_model,
     )
     assert user is not None
@@ -32,22 +32,22 @@ def test_user_query_service(
     # create 2nd user
     fake_user["user_name"] = "linzc1st"
     user_model2 = UserCreateModel.model_validate(fake_user)
-    user = user_command_usecase.create_user(
+    user = await user_command_usecase.create_user(
         user_model2,
     )
     assert user is not None
-    new_user = user_query_service.find_by_id(test_id)
+    new_user = await user_query_service.find_by_id(test_id)
     assert new_user is not None
     assert new_user.id == test_id
 
-    new_user = user_query_service.find_by_user_name(user_name=test_user_name)
+    new_user = await user_query_service.find_by_user_name(user_name=test_user_name)
     assert new_user is not None
     assert new_user.id == test_id
 
-    users = user_query_service.find_all()
-    assert len(users) == 2
+    users = await user_query_service.find_all()
+    assert len(users.items) == 2
 
-    assert users[0].first_name == fake_user["first_name"]
-    assert users[0].id == test_id
+    assert users.items[0].first_name == fake_user["first_name"]
+    assert test_id in [u.id for u in users.items]
 
-    assert users[1].user_name == fake_user["user_name"]
+    assert fake_user["user_name"] in [u.user_name for u in users.items]
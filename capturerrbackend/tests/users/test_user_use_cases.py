@@ -12,7 +12,7 @@ from capturerrbackend.app.usecase.user import (
 )
 
 
-def test_create_user(
+async def test_create_user(
     fake_user: dict[str, Any],
     user_command_usecase: UserCommandUseCaseImpl,
     user_query_usecase: UserQueryUseCaseImpl,
@@ -20,17 +20,17 @@ def test_create_user(
     # Arrange
 
     user_model = UserCreateModel.model_validate(fake_user)
-    user = user_command_usecase.create_user(
+    user = await user_command_usecase.create_user(
         user_model,
     )
     assert user is not None
 
-    all_users = user_query_usecase.fetch_users()
-    assert len(all_users) > 0
-    assert all_users[0].first_name == fake_user["first_name"]
+    all_users = await user_query_usecase.fetch_users()
+    assert len(all_users.items) > 0
+    assert all_users.items[0].first_name == fake_user["first_name"]
 
 
-def test_create_super_user(
+async def test_create_super_user(
     fake_super_user: dict[str, Any],
     user_command_usecase: UserCommandUseCaseImpl,
     user_query_usecase: UserQueryUseCaseImpl,
@@ -38,30 +38,30 @@ def test_create_super_user(
     # Arrange
 
     user_model = UserCreateModel.model_validate(fake_super_user)
-    user = user_command_usecase.create_user(
+    user = await user_command_usecase.create_user(
         user_model,
     )
     assert user is not None
 
-    all_users = user_query_usecase.fetch_users()
-    assert len(all_users) > 0
-    assert all_users[0].is_superuser is True
+    all_users = await user_query_usecase.fetch_users()
+    assert len(all_users.items) > 0
+    assert all_users.items[0].is_superuser is True
 
 
-def test_create_user_duplicate_username(
+async def test_create_user_duplicate_username(
     fake_user: dict[str, Any],
     user_command_usecase: UserCommandUseCaseImpl,
 ) -> None:
     # Arrange
 
     user_model = UserCreateModel.model_validate(fake_user)
-    user = user_command_usecase.create_user(
+    user = await user_command_usecase.create_user(
         user_model,
     )
     assert user is not None
     try:
         # add the same user again
-        user_command_usecase.create_user(
+        await user_command_usecase.create_user(
             user_model,
         )
         assert True is False
@@ -72,32 +72,32 @@ def test_create_user_duplicate_username(
         raise
 
 
-def test_login_query_usecase(
+async def test_login_query_usecase(
     fake_user: dict[str, Any],
     user_command_usecase: UserCommandUseCaseImpl,
     user_query_usecase: UserQueryUseCaseImpl,
 ) -> None:
     # create user
     user_model = UserCreateModel.model_validate(fake_user)
-    user_command_usecase.create_user(
+    await user_command_usecase.create_user(
         user_model,
     )
 
     # login
     data = {"user_name": "matt", "password": "matt"}
     u = UserLoginModel.model_validate(data)
-    user = user_query_usecase.login_user(u)
+    user = await user_query_usecase.login_user(u)
     assert user is not None
 
 
-def test_login_query_usecase_bad_password(
+async def test_login_query_usecase_bad_password(
     fake_user: dict[str, Any],
     user_command_usecase: UserCommandUseCaseImpl,
     user_query_usecase: UserQueryUseCaseImpl,
 ) -> None:
     # create user
     user_model = UserCreateModel.model_validate(fake_user)
-    user_command_usecase.create_user(
+    await user_command_usecase.create_user(
         user_model,
     )
 
@@ -105,7 +105,7 @@ def test_login_query_usecase_bad_password(
     data = {"user_name": "matt", "password": "incorrect password"}
     u = UserLoginModel.model_validate(data)
     try:
-        user_query_usecase.login_user(u)
+        await user_query_usecase.login_user(u)
     except UserBadCredentialsError:
         assert True
     except:
@@ -1,5 +1,42 @@
-from datetime import datetime
+from calendar import monthrange
+from datetime import date, datetime, time, timedelta, tzinfo
+from typing import List, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 
 def get_int_timestamp(dt: datetime) -> int:
     return int(dt.timestamp())
+
+
+def get_day_edges(start: date, days: int, tz: tzinfo) -> List[int]:
+    """
+    Return the ``days + 1`` epoch timestamps of local midnight in ``tz``
+    from ``start`` on, so bucket ``i`` is ``edges[i] <= t < edges[i + 1]``.
+
+    Computed per day, which keeps 23 and 25 hour DST days exact.
+    """
+    return [
+        get_int_timestamp(datetime.combine(start + timedelta(days=i), time(), tz))
+        for i in range(days + 1)
+    ]
+
+
+def get_month_day_edges(year: int, month: int, tz: tzinfo) -> List[int]:
+    """Local midnights of every day in ``year``/``month`` plus the next 1st."""
+    return get_day_edges(date(year, month, 1), monthrange(year, month)[1], tz)
+
+
+def get_week_edges(now: datetime, tz: tzinfo) -> Tuple[int, int]:
+    """Local Monday midnight of the week holding ``now`` and the next one."""
+    today = now.astimezone(tz).date()
+    edges = get_day_edges(today - timedelta(days=today.weekday()), 7, tz)
+    return edges[0], edges[-1]
+
+
+def get_zone(name: str) -> tzinfo:
+    """Look up an IANA time zone such as ``Europe/Stockholm``; raises
+    ValueError for a name that is not one."""
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError) as error:
+        raise ValueError(f"unknown time zone: {name!r}") from error
@@ -0,0 +1,50 @@
+# type: ignore
+"""Index the per-user listing and tag lookup query shapes.
+
+The tables themselves are created by ``Base.metadata.create_all``; this
+revision only adds the secondary indexes.
+
+Revision ID: 5c1e9a0f3b7d
+Revises:
+Create Date: 2026-10-18 13:30:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "5c1e9a0f3b7d"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_capture_user_id_updated_at_id",
+        "capture",
+        ["user_id", "updated_at", "id"],
+    )
+    op.create_index(
+        "ix_book_user_id_updated_at_id",
+        "book",
+        ["user_id", "updated_at", "id"],
+    )
+    op.create_index(
+        "ix_tag_user_id_updated_at_id",
+        "tag",
+        ["user_id", "updated_at", "id"],
+    )
+    op.create_index("ix_tag_user_id_text", "tag", ["user_id", "text"])
+    op.create_index(
+        "ix_capture_tags_tag_id_capture_id",
+        "capture_tags",
+        ["tag_id", "capture_id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_capture_tags_tag_id_capture_id", table_name="capture_tags")
+    op.drop_index("ix_tag_user_id_text", table_name="tag")
+    op.drop_index("ix_tag_user_id_updated_at_id", table_name="tag")
+    op.drop_index("ix_book_user_id_updated_at_id", table_name="book")
+    op.drop_index("ix_capture_user_id_updated_at_id", table_name="capture")
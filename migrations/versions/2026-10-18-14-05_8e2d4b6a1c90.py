@@ -0,0 +1,40 @@
+# type: ignore
+"""Add the FTS5 full-text index over capture entry and notes.
+
+SQLite only: creates the external-content table and the triggers that
+keep it in sync, then indexes the captures that already exist.
+
+Revision ID: 8e2d4b6a1c90
+Revises: 5c1e9a0f3b7d
+Create Date: 2026-10-18 14:05:00.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+from capturerrbackend.app.infrastructure.sqlite.capture.capture_search import (
+    DROP_CAPTURE_FTS,
+    REBUILD_CAPTURE_FTS,
+    capture_fts_ddl,
+)
+
+# revision identifiers, used by Alembic.
+revision = "8e2d4b6a1c90"
+down_revision = "5c1e9a0f3b7d"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for ddl in capture_fts_ddl("rowid"):
+        op.execute(sa.text(ddl))
+    op.execute(sa.text(REBUILD_CAPTURE_FTS))
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for ddl in DROP_CAPTURE_FTS:
+        op.execute(sa.text(ddl))
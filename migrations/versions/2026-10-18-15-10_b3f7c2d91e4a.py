@@ -0,0 +1,108 @@
+# type: ignore
+"""Store capture happened_at/due_date as integer epoch seconds.
+
+Existing text values are converted in place: digit strings are cast,
+ISO-8601 strings are parsed and anything unparsable becomes NULL.  On
+SQLite the table is rebuilt, which drops the full-text triggers and
+renumbers rowids, so both are recreated and the index rebuilt.
+
+Revision ID: b3f7c2d91e4a
+Revises: 8e2d4b6a1c90
+Create Date: 2026-10-18 15:10:00.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+from capturerrbackend.app.infrastructure.sqlite.capture.capture_search import (
+    REBUILD_CAPTURE_FTS,
+    capture_fts_ddl,
+)
+
+# revision identifiers, used by Alembic.
+revision = "b3f7c2d91e4a"
+down_revision = "8e2d4b6a1c90"
+branch_labels = None
+depends_on = None
+
+COLUMNS = ("happened_at", "due_date")
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "sqlite":
+        for name in COLUMNS:
+            op.execute(
+                sa.text(
+                    f"""
+                    UPDATE capture SET {name} = CASE
+                        WHEN {name} NOT GLOB '*[^0-9]*' AND {name} != ''
+                        THEN CAST({name} AS INTEGER)
+                        ELSE CAST(strftime('%s', {name}) AS INTEGER)
+                    END
+                    WHERE {name} IS NOT NULL
+                    """,
+                ),
+            )
+        with op.batch_alter_table("capture", recreate="always") as batch_op:
+            for name in COLUMNS:
+                batch_op.alter_column(
+                    name,
+                    existing_type=sa.String(),
+                    type_=sa.BigInteger(),
+                    existing_nullable=True,
+                )
+        for ddl in capture_fts_ddl("rowid"):
+            op.execute(sa.text(ddl))
+        op.execute(sa.text(REBUILD_CAPTURE_FTS))
+    else:
+        for name in COLUMNS:
+            op.alter_column(
+                "capture",
+                name,
+                existing_type=sa.String(),
+                type_=sa.BigInteger(),
+                existing_nullable=True,
+                postgresql_using=(
+                    f"CASE WHEN {name} ~ '^[0-9]+$' THEN {name}::bigint "
+                    f"ELSE extract(epoch FROM {name}::timestamptz)::bigint END"
+                ),
+            )
+
+    op.create_index(
+        "ix_capture_user_id_happened_at",
+        "capture",
+        ["user_id", "happened_at"],
+    )
+    op.create_index(
+        "ix_capture_user_id_due_date",
+        "capture",
+        ["user_id", "due_date"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_capture_user_id_due_date", table_name="capture")
+    op.drop_index("ix_capture_user_id_happened_at", table_name="capture")
+
+    if op.get_bind().dialect.name == "sqlite":
+        with op.batch_alter_table("capture", recreate="always") as batch_op:
+            for name in COLUMNS:
+                batch_op.alter_column(
+                    name,
+                    existing_type=sa.BigInteger(),
+                    type_=sa.String(),
+                    existing_nullable=True,
+                )
+        for ddl in capture_fts_ddl("rowid"):
+            op.execute(sa.text(ddl))
+        op.execute(sa.text(REBUILD_CAPTURE_FTS))
+    else:
+        for name in COLUMNS:
+            op.alter_column(
+                "capture",
+                name,
+                existing_type=sa.BigInteger(),
+                type_=sa.String(),
+                existing_nullable=True,
+                postgresql_using=f"{name}::text",
+            )
@@ -0,0 +1,55 @@
+# type: ignore
+"""Add the per-user capture statistics tables and backfill them.
+
+Revision ID: d41a6e8f2c57
+Revises: b3f7c2d91e4a
+Create Date: 2026-10-18 16:20:00.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+from capturerrbackend.app.infrastructure.sqlite.user.user_stats import (
+    recompute_statements,
+)
+
+# revision identifiers, used by Alembic.
+revision = "d41a6e8f2c57"
+down_revision = "b3f7c2d91e4a"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "user_stats",
+        sa.Column(
+            "user_id",
+            sa.String(),
+            sa.ForeignKey("user.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("captures", sa.Integer(), nullable=False),
+        sa.Column("flagged", sa.Integer(), nullable=False),
+        sa.Column("tags", sa.Integer(), nullable=False),
+        sa.Column("last_activity_at", sa.Integer(), nullable=True),
+    )
+    op.create_table(
+        "user_stats_counts",
+        sa.Column(
+            "user_id",
+            sa.String(),
+            sa.ForeignKey("user.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("field", sa.String(), primary_key=True),
+        sa.Column("key", sa.String(), primary_key=True),
+        sa.Column("count", sa.Integer(), nullable=False),
+    )
+    for statement in recompute_statements():
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    op.drop_table("user_stats_counts")
+    op.drop_table("user_stats")
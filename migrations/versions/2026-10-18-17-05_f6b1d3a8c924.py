@@ -0,0 +1,41 @@
+# type: ignore
+"""Add the sync_tombstones table deletes leave for the delta sync.
+
+Revision ID: f6b1d3a8c924
+Revises: d41a6e8f2c57
+Create Date: 2026-10-18 17:05:00.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "f6b1d3a8c924"
+down_revision = "d41a6e8f2c57"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "sync_tombstones",
+        sa.Column("kind", sa.String(), primary_key=True),
+        sa.Column("object_id", sa.String(), primary_key=True),
+        sa.Column(
+            "user_id",
+            sa.String(),
+            sa.ForeignKey("user.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("deleted_at", sa.BigInteger(), nullable=False),
+    )
+    op.create_index(
+        "ix_sync_tombstones_user_id_deleted_at",
+        "sync_tombstones",
+        ["user_id", "deleted_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_sync_tombstones_user_id_deleted_at", "sync_tombstones")
+    op.drop_table("sync_tombstones")
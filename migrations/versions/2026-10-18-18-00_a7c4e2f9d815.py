@@ -0,0 +1,67 @@
+# type: ignore
+"""Make the listing indexes skip the trash and index the trash itself.
+
+Revision ID: a7c4e2f9d815
+Revises: f6b1d3a8c924
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "a7c4e2f9d815"
+down_revision = "f6b1d3a8c924"
+branch_labels = None
+depends_on = None
+
+LIVE = sa.text("deleted_at IS NULL")
+TRASHED = sa.text("deleted_at IS NOT NULL")
+
+LIVE_INDEXES = [
+    ("ix_capture_user_id_updated_at_id", "capture", ["user_id", "updated_at", "id"]),
+    ("ix_capture_user_id_happened_at", "capture", ["user_id", "happened_at"]),
+    ("ix_capture_user_id_due_date", "capture", ["user_id", "due_date"]),
+    ("ix_tag_user_id_updated_at_id", "tag", ["user_id", "updated_at", "id"]),
+    ("ix_tag_user_id_text", "tag", ["user_id", "text"]),
+    ("ix_book_user_id_updated_at_id", "book", ["user_id", "updated_at", "id"]),
+]
+
+TRASH_TABLES = ["capture", "tag", "book"]
+
+
+def upgrade() -> None:
+    for name, table, columns in LIVE_INDEXES:
+        op.drop_index(name, table)
+        # deleted_at trails so SQLite can check the predicate in the index
+        op.create_index(
+            name,
+            table,
+            [*columns, "deleted_at"],
+            sqlite_where=LIVE,
+            postgresql_where=LIVE,
+        )
+    for table in TRASH_TABLES:
+        op.create_index(
+            f"ix_{table}_trash",
+            table,
+            ["user_id", "deleted_at", "id"],
+            sqlite_where=TRASHED,
+            postgresql_where=TRASHED,
+        )
+        op.create_index(
+            f"ix_{table}_purge",
+            table,
+            ["deleted_at"],
+            sqlite_where=TRASHED,
+            postgresql_where=TRASHED,
+        )
+
+
+def downgrade() -> None:
+    for table in TRASH_TABLES:
+        op.drop_index(f"ix_{table}_purge", table)
+        op.drop_index(f"ix_{table}_trash", table)
+    for name, table, columns in LIVE_INDEXES:
+        op.drop_index(name, table)
+        op.create_index(name, table, columns)
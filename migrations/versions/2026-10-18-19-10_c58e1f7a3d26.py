@@ -0,0 +1,100 @@
+# type: ignore
+"""Make a user's live tag texts unique, as the arbiter of tag upserts.
+
+Live tags of a user that share a text are merged first: their captures
+move to the oldest of them and the others are trashed, with a tombstone
+for the sync, so the unique index can be built.
+
+Revision ID: c58e1f7a3d26
+Revises: a7c4e2f9d815
+Create Date: 2026-10-18 19:10:00.000000
+
+"""
+from datetime import datetime
+
+import sqlalchemy as sa
+from alembic import op
+
+from capturerrbackend.app.infrastructure.sqlite.tag.tag_dto import TagDTO
+from capturerrbackend.app.infrastructure.sqlite.tombstones import bury
+from capturerrbackend.app.infrastructure.sqlite.user.user_stats import (
+    recompute_statements,
+)
+
+# revision identifiers, used by Alembic.
+revision = "c58e1f7a3d26"
+down_revision = "a7c4e2f9d815"
+branch_labels = None
+depends_on = None
+
+LIVE = sa.text("deleted_at IS NULL")
+
+MERGED = sa.text("id IN (SELECT id FROM tag_merge)")
+
+
+def merge_duplicate_tags() -> None:
+    # every live tag that repeats a text, and the oldest one it merges into
+    op.execute(
+        """
+        CREATE TEMPORARY TABLE tag_merge AS
+        SELECT t.id AS id, (
+            SELECT s.id FROM tag s
+            WHERE s.user_id = t.user_id
+              AND s.text = t.text
+              AND s.deleted_at IS NULL
+            ORDER BY s.created_at, s.id
+            LIMIT 1
+        ) AS survivor
+        FROM tag t
+        WHERE t.deleted_at IS NULL
+        """,
+    )
+    op.execute("DELETE FROM tag_merge WHERE id = survivor")
+    # link their captures to the survivor, unless they already are
+    op.execute(
+        """
+        INSERT INTO capture_tags (capture_id, tag_id)
+        SELECT DISTINCT ct.capture_id, m.survivor
+        FROM capture_tags ct JOIN tag_merge m ON m.id = ct.tag_id
+        WHERE NOT EXISTS (
+            SELECT 1 FROM capture_tags e
+            WHERE e.capture_id = ct.capture_id AND e.tag_id = m.survivor
+        )
+        """,
+    )
+    op.execute("DELETE FROM capture_tags WHERE tag_id IN (SELECT id FROM tag_merge)")
+    now = int(datetime.now().timestamp() * 1000)
+    op.execute(bury(TagDTO, "tag", MERGED))
+    op.execute(
+        sa.update(TagDTO.__table__)
+        .where(MERGED)
+        .values(deleted_at=now, updated_at=now),
+    )
+    op.execute("DROP TABLE tag_merge")
+    # the tag link counters no longer hold after the merge
+    for statement in recompute_statements():
+        op.execute(statement)
+
+
+def upgrade() -> None:
+    merge_duplicate_tags()
+    op.drop_index("ix_tag_user_id_text", "tag")
+    op.create_index(
+        "ix_tag_user_id_text",
+        "tag",
+        ["user_id", "text"],
+        unique=True,
+        sqlite_where=LIVE,
+        postgresql_where=LIVE,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tag_user_id_text", "tag")
+    op.create_index(
+        "ix_tag_user_id_text",
+        "tag",
+        ["user_id", "text", "deleted_at"],
+        sqlite_where=LIVE,
+        postgresql_where=LIVE,
+    )
@@ -0,0 +1,45 @@
+# type: ignore
+"""Add the job table of the background job queue.
+
+Revision ID: 4f2b8d6e1c97
+Revises: e93b7c1d5a40
+Create Date: 2026-10-18 20:40:00.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "4f2b8d6e1c97"
+down_revision = "e93b7c1d5a40"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "job",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("kind", sa.String(), nullable=False),
+        sa.Column("params", sa.JSON(), nullable=False),
+        sa.Column("user_id", sa.String(), nullable=True),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("max_attempts", sa.Integer(), nullable=False),
+        sa.Column("run_after", sa.BigInteger(), nullable=False),
+        sa.Column("locked_by", sa.String(), nullable=True),
+        sa.Column("locked_at", sa.BigInteger(), nullable=True),
+        sa.Column("result", sa.JSON(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.BigInteger(), nullable=False),
+        sa.Column("updated_at", sa.BigInteger(), nullable=False),
+        sa.Column("finished_at", sa.BigInteger(), nullable=True),
+    )
+    op.create_index("ix_job_user_id", "job", ["user_id"])
+    op.create_index("ix_job_status_run_after", "job", ["status", "run_after"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_job_status_run_after", "job")
+    op.drop_index("ix_job_user_id", "job")
+    op.drop_table("job")
@@ -0,0 +1,56 @@
+# type: ignore
+"""Key the capture full-text index by a stable search_id column.
+
+The index was keyed by the implicit rowid of capture, which VACUUM and
+table rebuilds may renumber.  search_id starts out as the current rowid;
+on SQLite the FTS5 table and its triggers are recreated on it and the
+index rebuilt.
+
+Revision ID: 6a9e3c1f8b20
+Revises: 4f2b8d6e1c97
+Create Date: 2026-10-18 21:15:00.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+from capturerrbackend.app.infrastructure.sqlite.capture.capture_search import (
+    CREATE_CAPTURE_FTS,
+    DROP_CAPTURE_FTS,
+    REBUILD_CAPTURE_FTS,
+    capture_fts_ddl,
+)
+
+# revision identifiers, used by Alembic.
+revision = "6a9e3c1f8b20"
+down_revision = "4f2b8d6e1c97"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    sqlite = op.get_bind().dialect.name == "sqlite"
+    op.add_column("capture", sa.Column("search_id", sa.Integer(), nullable=True))
+    if sqlite:
+        op.execute("UPDATE capture SET search_id = rowid")
+    op.create_index("ix_capture_search_id", "capture", ["search_id"], unique=True)
+    if sqlite:
+        for ddl in DROP_CAPTURE_FTS:
+            op.execute(sa.text(ddl))
+        for ddl in CREATE_CAPTURE_FTS:
+            op.execute(sa.text(ddl))
+        op.execute(sa.text(REBUILD_CAPTURE_FTS))
+
+
+def downgrade() -> None:
+    sqlite = op.get_bind().dialect.name == "sqlite"
+    if sqlite:
+        for ddl in DROP_CAPTURE_FTS:
+            op.execute(sa.text(ddl))
+    op.drop_index("ix_capture_search_id", table_name="capture")
+    with op.batch_alter_table("capture") as batch_op:
+        batch_op.drop_column("search_id")
+    if sqlite:
+        for ddl in capture_fts_ddl("rowid"):
+            op.execute(sa.text(ddl))
+        op.execute(sa.text(REBUILD_CAPTURE_FTS))
@@ -0,0 +1,85 @@
+"""Rough requests/second benchmark for ``GET /api/me/captures``.
+
+Runs the application in-process through ``TestClient`` against the database of
+the selected environment (``test`` by default), seeds one user with a page of
+captures and then hammers the listing endpoint.
+
+Usage::
+
+    ENVIRONMENT=test python sandbox/bench_me_captures.py --requests 500
+"""
+import argparse
+import os
+import time
+from uuid import uuid4
+
+os.environ.setdefault("ENVIRONMENT", "test")
+os.environ.setdefault("DB_ECHO", "false")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from capturerrbackend.app.application import get_app  # noqa: E402
+
+
+def seed(client: TestClient, captures: int) -> dict[str, str]:
+    user_name = f"bench-{uuid4().hex[:8]}"
+    response = client.post(
+        "/api/users",
+        json={
+            "user_name": user_name,
+            "first_name": "Bench",
+            "last_name": "Mark",
+            "email": "bench@example.com",
+            "password": "bench",
+        },
+    )
+    response.raise_for_status()
+    token = client.post(
+        "/api/users/login",
+        json={"user_name": user_name, "password": "bench"},
+    ).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    for index in range(captures):
+        client.post(
+            "/api/me/captures",
+            headers=headers,
+            json={
+                "entry": f"{user_name} capture {index}",
+                "entry_type": "bench",
+                "notes": "",
+                "location": "",
+                "flagged": False,
+                "priority": "low",
+                "happened_at": 0,
+                "due_date": 0,
+                "user_id": "",
+            },
+        ).raise_for_status()
+    return headers
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--captures", type=int, default=20)
+    args = parser.parse_args()
+
+    with TestClient(get_app()) as client:
+        headers = seed(client, args.captures)
+        client.get("/api/me/captures", headers=headers).raise_for_status()
+
+        started = time.perf_counter()
+        for _ in range(args.requests):
+            client.get("/api/me/captures", headers=headers).raise_for_status()
+        elapsed = time.perf_counter() - started
+
+    print(
+        f"{args.requests} requests in {elapsed:.2f}s "
+        f"-> {args.requests / elapsed:.1f} req/s",
+    )
+
+
+if __name__ == "__main__":
+    main()